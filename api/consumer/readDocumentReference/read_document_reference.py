@@ -37,7 +37,7 @@ def handler(
     logger.log(LogReference.CONREAD000)
 
     parsed_id = urllib.parse.unquote(path.id)
-    result = repository.get_by_id(parsed_id)
+    result = repository.get_by_id(parsed_id, fields=["type", "document"])
 
     if result is None:
         logger.log(LogReference.CONREAD001)
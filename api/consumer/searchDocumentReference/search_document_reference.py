@@ -1,15 +1,16 @@
-from pydantic import ValidationError
-
-from nrlf.consumer.fhir.r4.model import Bundle, DocumentReference
-from nrlf.core.codes import SpineErrorConcept
-from nrlf.core.config import Config
+from nrlf.consumer.fhir.r4.model import DocumentReference
 from nrlf.core.decorators import request_handler
 from nrlf.core.dynamodb.repository import DocumentPointerRepository
-from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata, ConsumerRequestParams
+from nrlf.core.pagination import get_next_link, get_search_context, get_start_key
 from nrlf.core.response import Response, SpineErrorResponse
-from nrlf.core.validators import validate_type_system
+from nrlf.core.search import get_resources, get_search_link
+from nrlf.core.validators import (
+    filter_pointer_types_by_category,
+    validate_category,
+    validate_type_system,
+)
 
 
 @request_handler(params=ConsumerRequestParams)
@@ -42,9 +43,6 @@ def handler(
             diagnostics="A valid NHS number is required to search for document references",
             expression="subject:identifier",
         )
-    config = Config()
-    base_url = f"https://{config.ENVIRONMENT}.api.service.nhs.uk/"
-    self_link = f"{base_url}record-locator/consumer/FHIR/R4/DocumentReference?subject:identifier=https://fhir.nhs.uk/Id/nhs-number|{params.nhs_number}"
 
     # TODO - Add checks for the type code as well as system
     if not validate_type_system(params.type, metadata.pointer_types):
@@ -58,63 +56,112 @@ def handler(
             expression="type",
         )
 
+    if not validate_category(params.category):
+        logger.log(LogReference.CONSEARCH002a, category=params.category)
+        return SpineErrorResponse.INVALID_CODE_SYSTEM(
+            diagnostics="Invalid query parameter (The provided category is not a supported category)",
+            expression="category",
+        )
+
+    try:
+        created_from, created_to = params.created_window
+    except ValueError as exc:
+        logger.log(LogReference.CONSEARCH002b, date=params.date, error=str(exc))
+        return SpineErrorResponse.INVALID_PARAMETER(
+            diagnostics="Invalid query parameter (The provided date is not a valid date or dateTime)",
+            expression="date",
+        )
+
     custodian_id = (
         params.custodian_identifier.root.split("|", maxsplit=1)[1]
         if params.custodian_identifier
         else None
     )
-    if custodian_id:
-        self_link += f"&custodian:identifier=https://fhir.nhs.uk/Id/ods-organization-code|{custodian_id}"
-
     pointer_types = [params.type.root] if params.type else metadata.pointer_types
-    if params.type:
-        self_link += f"&type={params.type.root}"
+    pointer_types = filter_pointer_types_by_category(pointer_types, params.category)
 
-    bundle = {
-        "resourceType": "Bundle",
-        "type": "searchset",
-        "link": [{"relation": "self", "url": self_link}],
-        "total": 0,
-        "entry": [],
-    }
+    self_link = get_search_link(
+        "consumer",
+        params.nhs_number,
+        custodian=custodian_id,
+        pointer_type=params.type.root if params.type else None,
+        category=params.category.root if params.category else None,
+        created_from=created_from,
+        created_to=created_to,
+        newest_first=params.newest_first,
+    )
+    link = [{"relation": "self", "url": self_link}]
 
     logger.log(
         LogReference.CONSEARCH003,
         nhs_number=params.nhs_number,
         custodian=custodian_id,
         pointer_types=pointer_types,
+        created_from=created_from,
+        created_to=created_to,
+        newest_first=params.newest_first,
     )
 
-    for result in repository.search(
-        nhs_number=params.nhs_number,
+    if not pointer_types:
+        logger.log(LogReference.CONSEARCH006, category=params.category)
+        return Response.from_searchset([], link=link)
+
+    search_context = get_search_context(
+        params.nhs_number,
+        pointer_types,
         custodian=custodian_id,
-        pointer_types=pointer_types,
-    ):
-        try:
-            document_reference = DocumentReference.model_validate_json(result.document)
-            bundle["total"] += 1
-            bundle["entry"].append(
-                {"resource": document_reference.model_dump(exclude_none=True)}
-            )
-            logger.log(
-                LogReference.CONSEARCH004,
-                id=document_reference.id,
-                count=bundle["total"],
-            )
+        created_from=created_from,
+        created_to=created_to,
+        newest_first=params.newest_first,
+    )
+    start_key = get_start_key(
+        params.next_page_token.root if params.next_page_token else None,
+        search_context,
+        LogReference.CONSEARCH007,
+    )
 
-        except ValidationError as exc:
-            logger.log(
-                LogReference.CONSEARCH005, error=str(exc), document=result.document
+    last_evaluated_key = None
+    if params.count:
+        results, last_evaluated_key = repository.search_page(
+            nhs_number=params.nhs_number,
+            custodian=custodian_id,
+            pointer_types=pointer_types,
+            limit=params.count.root,
+            start_key=start_key,
+            fields=["document"],
+            created_from=created_from,
+            created_to=created_to,
+            newest_first=params.newest_first,
+        )
+    else:
+        results = repository.search(
+            nhs_number=params.nhs_number,
+            custodian=custodian_id,
+            pointer_types=pointer_types,
+            start_key=start_key,
+            fields=["document"],
+            created_from=created_from,
+            created_to=created_to,
+            newest_first=params.newest_first,
+        )
+
+    resources = get_resources(
+        repository,
+        results,
+        DocumentReference,
+        invalid_log_reference=LogReference.CONSEARCH005,
+        found_log_reference=LogReference.CONSEARCH004,
+    )
+
+    if last_evaluated_key:
+        logger.log(LogReference.CONSEARCH008, last_evaluated_key=last_evaluated_key)
+        link.append(
+            get_next_link(
+                self_link, params.count.root, last_evaluated_key, search_context
             )
-            raise OperationOutcomeError(
-                status_code="500",
-                severity="error",
-                code="exception",
-                details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
-                diagnostics="An error occurred whilst parsing the document reference search results",
-            ) from exc
-
-    response = Response.from_resource(Bundle.model_validate(bundle))
+        )
+
+    response = Response.from_searchset(resources, link=link)
     logger.log(LogReference.CONSEARCH999)
 
     return response
@@ -1,43 +1,269 @@
-from pydantic import ValidationError
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice, takewhile
+from typing import List, Optional, Tuple
 
-from nrlf.consumer.fhir.r4.model import Bundle, DocumentReference
+from nrlf.consumer.fhir.r4.model import DocumentReference
 from nrlf.core.codes import SpineErrorConcept
 from nrlf.core.config import Config
 from nrlf.core.decorators import request_handler
 from nrlf.core.dynamodb.repository import DocumentPointerRepository
 from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
-from nrlf.core.model import ConnectionMetadata, ConsumerRequestParams
+from nrlf.core.model import ConnectionMetadata, ConsumerSearchPostRequestParams
+from nrlf.core.pagination import get_next_link, get_search_context, get_start_key
 from nrlf.core.response import Response, SpineErrorResponse
-from nrlf.core.validators import validate_type_system
+from nrlf.core.search import get_resources, get_search_link
+from nrlf.core.validators import (
+    filter_pointer_types_by_category,
+    validate_category,
+    validate_type_system,
+)
+from nrlf.producer.fhir.r4.model import (
+    ExpressionItem,
+    OperationOutcome,
+    OperationOutcomeIssue,
+)
 
+MAX_PATIENT_SEARCH_WORKERS = 4
 
-@request_handler(body=ConsumerRequestParams)
-def handler(
-    body: ConsumerRequestParams,
-    metadata: ConnectionMetadata,
+
+def _get_patient_outcome(idx: int, issues: List[OperationOutcomeIssue]) -> str:
+    """
+    Build the OperationOutcome for a failed search of one of the subject:identifiers
+    """
+    expression = [ExpressionItem(root=f"subject:identifiers[{idx}]")]
+    return OperationOutcome(
+        resourceType="OperationOutcome",
+        issue=[issue.model_copy(update={"expression": expression}) for issue in issues],
+    ).model_dump_json(exclude_none=True)
+
+
+def _search_patient(
+    idx: int,
+    nhs_number: Optional[str],
+    repository: DocumentPointerRepository,
+    custodian_id: Optional[str],
+    pointer_types: List[str],
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    newest_first: bool = False,
+    max_results: Optional[int] = None,
+    stop_event: Optional[threading.Event] = None,
+) -> Tuple[List[str], Optional[str]]:
+    """
+    Search for the document references of one of the subject:identifiers
+    Returns the resources found, stopping after max_results when provided or
+    once stop_event is set, or the OperationOutcome if the search failed
+    """
+    if not nhs_number:
+        logger.log(LogReference.CONPOSTSEARCH012, idx=idx)
+        return [], _get_patient_outcome(
+            idx,
+            [
+                OperationOutcomeIssue(
+                    severity="error",
+                    code="invalid",
+                    details=SpineErrorConcept.from_code("INVALID_NHS_NUMBER"),
+                    diagnostics="A valid NHS number is required to search for document references",
+                )
+            ],
+        )
+
+    try:
+        results = repository.search(
+            nhs_number=nhs_number,
+            custodian=custodian_id,
+            pointer_types=pointer_types,
+            fields=["document"],
+            created_from=created_from,
+            created_to=created_to,
+            newest_first=newest_first,
+            limit=max_results,
+        )
+        if stop_event:
+            results = takewhile(lambda _: not stop_event.is_set(), results)
+        resources = get_resources(
+            repository,
+            islice(results, max_results),
+            DocumentReference,
+            invalid_log_reference=LogReference.CONPOSTSEARCH005,
+            found_log_reference=LogReference.CONPOSTSEARCH004,
+        )
+        return resources, None
+
+    except OperationOutcomeError as exc:
+        return [], _get_patient_outcome(idx, exc.operation_outcome.issue)
+
+    except Exception as exc:
+        logger.log(LogReference.CONPOSTSEARCH013, idx=idx, error=str(exc))
+        return [], _get_patient_outcome(
+            idx,
+            [
+                OperationOutcomeIssue(
+                    severity="error",
+                    code="exception",
+                    details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+                    diagnostics="An error occurred whilst searching for the document references of this patient",
+                )
+            ],
+        )
+
+
+@functools.cache
+def _get_patient_search_executor() -> ThreadPoolExecutor:
+    """
+    Returns the executor shared by every multi-patient search in this container,
+    so concurrent requests do not each start their own pool of threads
+    """
+    return ThreadPoolExecutor(
+        max_workers=MAX_PATIENT_SEARCH_WORKERS, thread_name_prefix="patient-search"
+    )
+
+
+def _search_patients(
+    nhs_numbers: List[Optional[str]],
     repository: DocumentPointerRepository,
+    custodian_id: Optional[str],
+    pointer_types: List[str],
+    max_results: int,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    newest_first: bool = False,
+) -> Optional[Tuple[List[str], List[str]]]:
+    """
+    Search each patient's partition concurrently on the shared patient search executor
+    Returns the resources found in request order, and an OperationOutcome for
+    each patient that could not be searched, or None once the running total
+    of resources found passes max_results. The searches still to run are then
+    cancelled and those in progress stop reading.
+    """
+    searches = []
+    searched_nhs_numbers = set()
+    for idx, nhs_number in enumerate(nhs_numbers):
+        if nhs_number and nhs_number in searched_nhs_numbers:
+            continue
+        searched_nhs_numbers.add(nhs_number)
+        searches.append((idx, nhs_number))
+
+    executor = _get_patient_search_executor()
+    stop_event = threading.Event()
+    futures = [
+        executor.submit(
+            _search_patient,
+            *search,
+            repository,
+            custodian_id,
+            pointer_types,
+            created_from=created_from,
+            created_to=created_to,
+            newest_first=newest_first,
+            max_results=max_results + 1,
+            stop_event=stop_event,
+        )
+        for search in searches
+    ]
+
+    total = 0
+    for future in as_completed(futures):
+        patient_resources, _ = future.result()
+        total += len(patient_resources)
+        if total > max_results:
+            stop_event.set()
+            for pending in futures:
+                pending.cancel()
+            return None
+
+    results = [future.result() for future in futures]
+    resources = [
+        resource for patient_resources, _ in results for resource in patient_resources
+    ]
+    outcomes = [outcome for _, outcome in results if outcome]
+    return resources, outcomes
+
+
+def _search_patients_response(
+    body: ConsumerSearchPostRequestParams,
+    repository: DocumentPointerRepository,
+    custodian_id: Optional[str],
+    pointer_types: List[str],
+    link: List[dict],
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
 ) -> Response:
     """
-    Search for document references based on the provided parameters.
+    Search for the document references of every one of the subject:identifiers
+    Returns the searchset Bundle, or an error response if the search matched
+    more than SEARCH_MAX_RESULTS document references
+    """
+    logger.log(
+        LogReference.CONPOSTSEARCH011,
+        count=len(body.subject_identifiers),
+        custodian_id=custodian_id,
+        pointer_types=pointer_types,
+    )
+    max_results = Config().SEARCH_MAX_RESULTS
+    search_results = _search_patients(
+        body.nhs_numbers,
+        repository,
+        custodian_id,
+        pointer_types,
+        max_results,
+        created_from=created_from,
+        created_to=created_to,
+        newest_first=body.newest_first,
+    )
+    if search_results is None:
+        logger.log(LogReference.CONPOSTSEARCH014, max_results=max_results)
+        return SpineErrorResponse.INVALID_PARAMETER(
+            diagnostics=f"Invalid subject:identifiers (The search matched more than {max_results} document references, search fewer NHS numbers or filter by type, category or date)",
+            expression="subject:identifiers",
+        )
 
-    Args:
-        body (ConsumerRequestParams): The request parameters for the search.
-        metadata (ConnectionMetadata): The metadata containing pointer types.
-        repository (DocumentPointerRepository): The repository for document pointers.
+    resources, outcomes = search_results
+    logger.log(LogReference.CONPOSTSEARCH999)
+    return Response.from_searchset(resources, link=link, outcomes=outcomes)
 
-    Returns:
-        Response: The response containing the search results.
 
-    Raises:
-        SpineErrorResponse.INVALID_NHS_NUMBER: If a valid NHS number is not provided.
-        SpineErrorResponse.INVALID_CODE_SYSTEM: If the provided type system is invalid.
-        OperationOutcomeError: If an error occurs while parsing the document reference.
+def _validate_search_params(
+    body: ConsumerSearchPostRequestParams, metadata: ConnectionMetadata
+) -> Optional[Response]:
+    """
+    Check the subject, type and category parameters of the search
+    Returns the error response for the first parameter that is not valid
     """
+    if body.subject_identifiers:
+        if body.subject_identifier or body.count or body.next_page_token:
+            logger.log(LogReference.CONPOSTSEARCH009)
+            return SpineErrorResponse.INVALID_PARAMETER(
+                diagnostics="Invalid parameters (subject:identifiers cannot be used with subject:identifier, _count or next-page-token)",
+                expression="subject:identifiers",
+            )
 
-    logger.log(LogReference.CONPOSTSEARCH000)
+        max_nhs_numbers = Config().SEARCH_MAX_NHS_NUMBERS
+        if len(body.subject_identifiers) > max_nhs_numbers:
+            logger.log(
+                LogReference.CONPOSTSEARCH010,
+                count=len(body.subject_identifiers),
+                max_nhs_numbers=max_nhs_numbers,
+            )
+            return SpineErrorResponse.INVALID_PARAMETER(
+                diagnostics=f"Invalid subject:identifiers (A maximum of {max_nhs_numbers} NHS numbers can be searched in a single request)",
+                expression="subject:identifiers",
+            )
+
+    elif not body.subject_identifier:
+        logger.log(LogReference.CONPOSTSEARCH001, subject_identifier=None)
+        raise OperationOutcomeError(
+            severity="error",
+            code="invalid",
+            details=SpineErrorConcept.from_code("MESSAGE_NOT_WELL_FORMED"),
+            diagnostics="Request body could not be parsed (subject:identifier: Field required)",
+            expression=["subject:identifier"],
+        )
 
-    if not body.nhs_number:
+    elif not body.nhs_number:
         logger.log(
             LogReference.CONPOSTSEARCH001, subject_identifier=body.subject_identifier
         )
@@ -46,10 +272,6 @@ def handler(
             expression="subject:identifier",
         )
 
-    config = Config()
-    base_url = f"https://{config.ENVIRONMENT}.api.service.nhs.uk/"
-    self_link = f"{base_url}record-locator/consumer/FHIR/R4/DocumentReference?subject:identifier=https://fhir.nhs.uk/Id/nhs-number|{body.nhs_number}"
-
     if not validate_type_system(body.type, metadata.pointer_types):
         logger.log(
             LogReference.CONPOSTSEARCH002,
@@ -61,25 +283,93 @@ def handler(
             expression="type",
         )
 
+    if not validate_category(body.category):
+        logger.log(LogReference.CONPOSTSEARCH002a, category=body.category)
+        return SpineErrorResponse.INVALID_CODE_SYSTEM(
+            diagnostics="Invalid category (The provided category is not a supported category)",
+            expression="category",
+        )
+
+    return None
+
+
+@request_handler(body=ConsumerSearchPostRequestParams)
+def handler(
+    body: ConsumerSearchPostRequestParams,
+    metadata: ConnectionMetadata,
+    repository: DocumentPointerRepository,
+) -> Response:
+    """
+    Search for document references based on the provided parameters.
+
+    Args:
+        body (ConsumerSearchPostRequestParams): The request parameters for the search.
+        metadata (ConnectionMetadata): The metadata containing pointer types.
+        repository (DocumentPointerRepository): The repository for document pointers.
+
+    Returns:
+        Response: The response containing the search results.
+
+    Raises:
+        SpineErrorResponse.INVALID_NHS_NUMBER: If a valid NHS number is not provided.
+        SpineErrorResponse.INVALID_CODE_SYSTEM: If the provided type system is invalid.
+        OperationOutcomeError: If an error occurs while parsing the document reference.
+    """
+
+    logger.log(LogReference.CONPOSTSEARCH000)
+
+    if error_response := _validate_search_params(body, metadata):
+        return error_response
+
+    try:
+        created_from, created_to = body.created_window
+    except ValueError as exc:
+        logger.log(LogReference.CONPOSTSEARCH002b, date=body.date, error=str(exc))
+        return SpineErrorResponse.INVALID_PARAMETER(
+            diagnostics="Invalid date (The provided date is not a valid date or dateTime)",
+            expression="date",
+        )
+
     custodian_id = (
         body.custodian_identifier.root.split("|", maxsplit=1)[1]
         if body.custodian_identifier
         else None
     )
-    if custodian_id:
-        self_link += f"&custodian:identifier=https://fhir.nhs.uk/Id/ods-organization-code|{custodian_id}"
-
     pointer_types = [body.type.root] if body.type else metadata.pointer_types
-    if body.type:
-        self_link += f"&type={body.type.root}"
+    pointer_types = filter_pointer_types_by_category(pointer_types, body.category)
 
-    bundle = {
-        "resourceType": "Bundle",
-        "type": "searchset",
-        "link": [{"relation": "self", "url": self_link}],
-        "total": 0,
-        "entry": [],
-    }
+    config = Config()
+    if body.subject_identifiers:
+        # Several patients cannot be searched with a GET, so the self link is the
+        # search endpoint, which replays the search when POSTed the same body
+        self_link = f"https://{config.ENVIRONMENT}.api.service.nhs.uk/record-locator/consumer/FHIR/R4/DocumentReference/_search"
+    else:
+        self_link = get_search_link(
+            "consumer",
+            body.nhs_number,
+            custodian=custodian_id,
+            pointer_type=body.type.root if body.type else None,
+            category=body.category.root if body.category else None,
+            created_from=created_from,
+            created_to=created_to,
+            newest_first=body.newest_first,
+        )
+    link = [{"relation": "self", "url": self_link}]
+
+    if not pointer_types:
+        logger.log(LogReference.CONPOSTSEARCH006, category=body.category)
+        return Response.from_searchset([], link=link)
+
+    if body.subject_identifiers:
+        return _search_patients_response(
+            body,
+            repository,
+            custodian_id,
+            pointer_types,
+            link,
+            created_from=created_from,
+            created_to=created_to,
+        )
 
     logger.log(
         LogReference.CONPOSTSEARCH003,
@@ -88,34 +378,62 @@ def handler(
         pointer_types=pointer_types,
     )
 
-    for result in repository.search(
-        nhs_number=body.nhs_number, custodian=custodian_id, pointer_types=pointer_types
-    ):
-        try:
-            document_reference = DocumentReference.model_validate_json(result.document)
-            bundle["total"] += 1
-            bundle["entry"].append(
-                {"resource": document_reference.model_dump(exclude_none=True)}
-            )
-            logger.log(
-                LogReference.CONPOSTSEARCH004,
-                id=document_reference.id,
-                count=bundle["total"],
-            )
+    search_context = get_search_context(
+        body.nhs_number,
+        pointer_types,
+        custodian=custodian_id,
+        created_from=created_from,
+        created_to=created_to,
+        newest_first=body.newest_first,
+    )
+    start_key = get_start_key(
+        body.next_page_token.root if body.next_page_token else None,
+        search_context,
+        LogReference.CONPOSTSEARCH007,
+    )
 
-        except ValidationError as exc:
-            logger.log(
-                LogReference.CONPOSTSEARCH005, error=str(exc), document=result.document
+    last_evaluated_key = None
+    if body.count:
+        results, last_evaluated_key = repository.search_page(
+            nhs_number=body.nhs_number,
+            custodian=custodian_id,
+            pointer_types=pointer_types,
+            limit=body.count.root,
+            start_key=start_key,
+            fields=["document"],
+            created_from=created_from,
+            created_to=created_to,
+            newest_first=body.newest_first,
+        )
+    else:
+        results = repository.search(
+            nhs_number=body.nhs_number,
+            custodian=custodian_id,
+            pointer_types=pointer_types,
+            start_key=start_key,
+            fields=["document"],
+            created_from=created_from,
+            created_to=created_to,
+            newest_first=body.newest_first,
+        )
+
+    resources = get_resources(
+        repository,
+        results,
+        DocumentReference,
+        invalid_log_reference=LogReference.CONPOSTSEARCH005,
+        found_log_reference=LogReference.CONPOSTSEARCH004,
+    )
+
+    if last_evaluated_key:
+        logger.log(LogReference.CONPOSTSEARCH008, last_evaluated_key=last_evaluated_key)
+        link.append(
+            get_next_link(
+                self_link, body.count.root, last_evaluated_key, search_context
             )
-            raise OperationOutcomeError(
-                status_code="500",
-                severity="error",
-                code="exception",
-                details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
-                diagnostics="An error occurred whilst parsing the document reference search results",
-            ) from exc
-
-    response = Response.from_resource(Bundle.model_validate(bundle))
+        )
+
+    response = Response.from_searchset(resources, link=link)
     logger.log(LogReference.CONPOSTSEARCH999)
 
     return response
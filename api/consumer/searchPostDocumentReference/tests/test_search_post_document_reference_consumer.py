@@ -1,10 +1,16 @@
 import json
+import os
+import time
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
 
 from moto import mock_aws
 
 from api.consumer.searchPostDocumentReference.search_post_document_reference import (
+    _search_patients,
     handler,
 )
+from nrlf.core.constants import Categories, PointerTypes
 from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
 from nrlf.tests.data import load_document_reference
 from nrlf.tests.dynamodb import mock_repository
@@ -310,9 +316,10 @@ def test_search_post_document_reference_invalid_type(
     }
 
 
+@patch.dict(os.environ, {"STRICT_READ_VALIDATION": "true"})
 @mock_aws
 @mock_repository
-def test_search_post_document_reference_invalid_json(
+def test_search_post_document_reference_invalid_json_with_strict_read_validation(
     repository: DocumentPointerRepository,
 ):
     doc_ref = load_document_reference("Y05868-736253002-Valid")
@@ -357,3 +364,493 @@ def test_search_post_document_reference_invalid_json(
             }
         ],
     }
+
+
+@mock_aws
+@mock_repository
+def test_search_post_document_reference_filters_by_category(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_pointer = DocumentPointer.from_document_reference(doc_ref)
+    repository.create(doc_pointer)
+
+    news2_doc_ref = load_document_reference("Y05868-736253002-Valid")
+    news2_doc_ref.id = "Y05868-99999-99999-999998"
+    news2_doc_ref.type.coding[0].code = PointerTypes.NEWS2_CHART.coding_value()
+    news2_doc_ref.category[0].coding[0].code = Categories.OBSERVATIONS.coding_value()
+    repository.create(DocumentPointer.from_document_reference(news2_doc_ref))
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                "category": Categories.CARE_PLAN.value,
+            }
+        ),
+    )
+
+    result = handler(event, create_mock_context())
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "200",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "link": [
+            {
+                "relation": "self",
+                "url": "https://pytest.api.service.nhs.uk/record-locator/consumer/FHIR/R4/DocumentReference?subject:identifier=https://fhir.nhs.uk/Id/nhs-number|6700028191&category=http://snomed.info/sct|734163000",
+            }
+        ],
+        "total": 1,
+        "entry": [{"resource": doc_ref.model_dump(exclude_none=True)}],
+    }
+
+
+@mock_aws
+@mock_repository
+def test_search_post_document_reference_invalid_category(
+    repository: DocumentPointerRepository,
+):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                "category": "http://snomed.info/sct|invalid",
+            }
+        ),
+    )
+
+    result = handler(event, create_mock_context())
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "400",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "OperationOutcome",
+        "issue": [
+            {
+                "severity": "error",
+                "code": "code-invalid",
+                "details": {
+                    "coding": [
+                        {
+                            "code": "INVALID_CODE_SYSTEM",
+                            "display": "Invalid code system",
+                            "system": "https://fhir.nhs.uk/ValueSet/Spine-ErrorOrWarningCode-1",
+                        }
+                    ]
+                },
+                "diagnostics": "Invalid category (The provided category is not a supported category)",
+                "expression": ["category"],
+            }
+        ],
+    }
+
+
+def _search(search_params: dict) -> dict:
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                **search_params,
+            }
+        ),
+    )
+
+    return handler(event, create_mock_context())
+
+
+@mock_aws
+@mock_repository
+def test_search_post_document_reference_paged_with_next_link(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    for idx in range(3):
+        doc_ref.id = f"Y05868-99999-99999-99999{idx}"
+        repository.create(DocumentPointer.from_document_reference(doc_ref))
+
+    result = _search({"_count": "2"})
+
+    assert result["statusCode"] == "200"
+    first_page = json.loads(result["body"])
+    assert first_page["total"] == 2
+    assert [entry["resource"]["id"] for entry in first_page["entry"]] == [
+        "Y05868-99999-99999-999990",
+        "Y05868-99999-99999-999991",
+    ]
+
+    next_link = [link for link in first_page["link"] if link["relation"] == "next"]
+    assert len(next_link) == 1
+    next_params = parse_qs(urlparse(next_link[0]["url"]).query)
+    assert next_params["_count"] == ["2"]
+
+    result = _search(
+        {"_count": "2", "next-page-token": next_params["next-page-token"][0]}
+    )
+
+    assert result["statusCode"] == "200"
+    second_page = json.loads(result["body"])
+    assert [entry["resource"]["id"] for entry in second_page["entry"]] == [
+        "Y05868-99999-99999-999992"
+    ]
+    assert all(link["relation"] != "next" for link in second_page.get("link", []))
+
+
+@mock_aws
+@mock_repository
+def test_search_post_document_reference_invalid_next_page_token(
+    repository: DocumentPointerRepository,
+):
+    result = _search({"_count": "2", "next-page-token": "not-a-valid-token"})
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "400",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body["issue"][0]["details"]["coding"][0]["code"] == (
+        "INVALID_PARAMETER"
+    )
+    assert parsed_body["issue"][0]["expression"] == ["next-page-token"]
+
+
+def _create_pointer_for_patient(
+    repository: DocumentPointerRepository, nhs_number: str, document_id: str
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.id = f"Y05868-{document_id}"
+    doc_ref.subject.identifier.value = nhs_number
+    repository.create(DocumentPointer.from_document_reference(doc_ref))
+    return doc_ref
+
+
+@mock_aws
+@mock_repository
+def test_search_post_document_reference_multiple_nhs_numbers(
+    repository: DocumentPointerRepository,
+):
+    first_doc_ref = _create_pointer_for_patient(repository, "6700028191", "first")
+    second_doc_ref = _create_pointer_for_patient(repository, "9278693472", "second")
+    _create_pointer_for_patient(repository, "4409815415", "not-requested")
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifiers": [
+                    "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                    "https://fhir.nhs.uk/Id/nhs-number|9278693472",
+                    "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                ]
+            }
+        ),
+    )
+
+    result = handler(event, create_mock_context())
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "200",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "link": [
+            {
+                "relation": "self",
+                "url": "https://pytest.api.service.nhs.uk/record-locator/consumer/FHIR/R4/DocumentReference/_search",
+            }
+        ],
+        "total": 2,
+        "entry": [
+            {"resource": first_doc_ref.model_dump(exclude_none=True)},
+            {"resource": second_doc_ref.model_dump(exclude_none=True)},
+        ],
+    }
+
+
+@mock_aws
+@mock_repository
+def test_search_post_document_reference_multiple_nhs_numbers_with_failures(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = _create_pointer_for_patient(repository, "6700028191", "first")
+    search = repository.search
+
+    def _failing_search(nhs_number, **kwargs):
+        if nhs_number == "9278693472":
+            raise Exception("Search failed")
+        return search(nhs_number=nhs_number, **kwargs)
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifiers": [
+                    "https://fhir.nhs.uk/Id/nhs-number|123",
+                    "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                    "https://fhir.nhs.uk/Id/nhs-number|9278693472",
+                ]
+            }
+        ),
+    )
+
+    with patch.object(DocumentPointerRepository, "search", side_effect=_failing_search):
+        result = handler(event, create_mock_context())
+
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "200"
+    assert parsed_body["total"] == 1
+    assert parsed_body["entry"] == [
+        {"resource": doc_ref.model_dump(exclude_none=True)},
+        {
+            "resource": {
+                "resourceType": "OperationOutcome",
+                "issue": [
+                    {
+                        "severity": "error",
+                        "code": "invalid",
+                        "details": {
+                            "coding": [
+                                {
+                                    "code": "INVALID_NHS_NUMBER",
+                                    "display": "Invalid NHS number",
+                                    "system": "https://fhir.nhs.uk/ValueSet/Spine-ErrorOrWarningCode-1",
+                                }
+                            ]
+                        },
+                        "diagnostics": "A valid NHS number is required to search for document references",
+                        "expression": ["subject:identifiers[0]"],
+                    }
+                ],
+            },
+            "search": {"mode": "outcome"},
+        },
+        {
+            "resource": {
+                "resourceType": "OperationOutcome",
+                "issue": [
+                    {
+                        "severity": "error",
+                        "code": "exception",
+                        "details": {
+                            "coding": [
+                                {
+                                    "code": "INTERNAL_SERVER_ERROR",
+                                    "display": "Unexpected internal server error",
+                                    "system": "https://fhir.nhs.uk/ValueSet/Spine-ErrorOrWarningCode-1",
+                                }
+                            ]
+                        },
+                        "diagnostics": "An error occurred whilst searching for the document references of this patient",
+                        "expression": ["subject:identifiers[2]"],
+                    }
+                ],
+            },
+            "search": {"mode": "outcome"},
+        },
+    ]
+
+
+@mock_aws
+@mock_repository
+def test_search_post_document_reference_multiple_nhs_numbers_with_count(
+    repository: DocumentPointerRepository,
+):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifiers": [
+                    "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                ],
+                "_count": 10,
+            }
+        ),
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert parsed_body["issue"][0]["details"]["coding"][0]["code"] == (
+        "INVALID_PARAMETER"
+    )
+    assert parsed_body["issue"][0]["expression"] == ["subject:identifiers"]
+
+
+@mock_aws
+@mock_repository
+@patch.dict(os.environ, {"SEARCH_MAX_NHS_NUMBERS": "1"})
+def test_search_post_document_reference_too_many_nhs_numbers(
+    repository: DocumentPointerRepository,
+):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifiers": [
+                    "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                    "https://fhir.nhs.uk/Id/nhs-number|9278693472",
+                ]
+            }
+        ),
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert parsed_body["issue"][0]["diagnostics"] == (
+        "Invalid subject:identifiers (A maximum of 1 NHS numbers can be searched in a single request)"
+    )
+
+
+@mock_aws
+@mock_repository
+@patch.dict(os.environ, {"SEARCH_MAX_RESULTS": "2"})
+def test_search_post_document_reference_multiple_nhs_numbers_too_many_results(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_for_patient(repository, "6700028191", "first")
+    _create_pointer_for_patient(repository, "6700028191", "second")
+    _create_pointer_for_patient(repository, "9278693472", "third")
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifiers": [
+                    "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                    "https://fhir.nhs.uk/Id/nhs-number|9278693472",
+                ]
+            }
+        ),
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert parsed_body["issue"][0]["diagnostics"] == (
+        "Invalid subject:identifiers (The search matched more than 2 document references, search fewer NHS numbers or filter by type, category or date)"
+    )
+    assert parsed_body["issue"][0]["expression"] == ["subject:identifiers"]
+
+
+@mock_aws
+@mock_repository
+@patch.dict(os.environ, {"SEARCH_MAX_RESULTS": "2"})
+def test_search_post_document_reference_multiple_nhs_numbers_at_max_results(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_for_patient(repository, "6700028191", "first")
+    _create_pointer_for_patient(repository, "9278693472", "second")
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifiers": [
+                    "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                    "https://fhir.nhs.uk/Id/nhs-number|9278693472",
+                ]
+            }
+        ),
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "200"
+    assert parsed_body["total"] == 2
+
+
+def test_search_patients_stops_once_total_passes_max_results():
+    def _search(nhs_number: str, **kwargs):
+        for idx in range(3):
+            if nhs_number != "6700028191":
+                time.sleep(0.1)
+            yield Mock(id=f"{nhs_number}-{idx}", document="{}")
+
+    repository = Mock(strict_read_validation=False)
+    repository.search = Mock(side_effect=_search)
+    nhs_numbers = ["6700028191", *(f"90000000{idx:02d}" for idx in range(7))]
+
+    result = _search_patients(
+        nhs_numbers,
+        repository,
+        None,
+        [PointerTypes.MENTAL_HEALTH_PLAN.value],
+        max_results=2,
+    )
+
+    assert result is None
+    assert repository.search.call_count < len(nhs_numbers)
+
+
+def _create_dated_pointers(repository: DocumentPointerRepository) -> list[str]:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    ids = []
+    for idx in range(4):
+        doc_ref.id = f"Y05868-99999-99999-99999{idx}"
+        repository.create(
+            DocumentPointer.from_document_reference(
+                doc_ref, created_on=f"2024-01-0{idx + 1}T09:00:00.000Z"
+            )
+        )
+        ids.append(doc_ref.id)
+
+    return ids
+
+
+@mock_aws
+@mock_repository
+def test_search_post_document_reference_newest_first_in_date_range(
+    repository: DocumentPointerRepository,
+):
+    ids = _create_dated_pointers(repository)
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                "date": ["ge2024-01-03"],
+                "_sort": "-date",
+            }
+        ),
+    )
+    result = handler(event, create_mock_context())
+
+    assert result["statusCode"] == "200"
+    parsed_body = json.loads(result["body"])
+    assert [entry["resource"]["id"] for entry in parsed_body["entry"]] == [
+        ids[3],
+        ids[2],
+    ]
@@ -21,7 +21,7 @@ def handler(event, context) -> Response:
 
         logger.log(LogReference.STATUS002)
         repository = DocumentPointerRepository(table_name=config.TABLE_NAME)
-        repository.get_by_id("ODSX-NULL")
+        repository.get_by_id("ODSX-NULL", fields=["id"])
 
         response = Response(statusCode="200", body="OK")
         logger.log(LogReference.STATUS999)
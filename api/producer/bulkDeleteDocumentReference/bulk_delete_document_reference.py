@@ -0,0 +1,155 @@
+import time
+
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from nrlf.core.config import Config
+from nrlf.core.decorators import DocumentPointerRepository, request_handler
+from nrlf.core.logger import LogReference, logger
+from nrlf.core.model import ConnectionMetadata, ProducerDeleteRequestParams
+from nrlf.core.pagination import (
+    decode_page_token,
+    encode_page_token,
+    get_search_context,
+)
+from nrlf.core.response import NRLResponse, Response, SpineErrorResponse
+from nrlf.core.validators import (
+    filter_pointer_types_by_category,
+    validate_category,
+    validate_type_system,
+)
+
+# API Gateway stops waiting for the integration after 29 seconds
+API_GATEWAY_TIMEOUT_SECONDS = 29
+DEADLINE_MARGIN_SECONDS = 5
+
+
+def _get_delete_link(params: ProducerDeleteRequestParams) -> str:
+    """
+    Build the URL for the delete, used as the base of the next link
+    """
+    config = Config()
+    delete_link = f"https://{config.ENVIRONMENT}.api.service.nhs.uk/record-locator/producer/FHIR/R4/DocumentReference?subject:identifier=https://fhir.nhs.uk/Id/nhs-number|{params.nhs_number}"
+
+    if params.type:
+        delete_link += f"&type={params.type.root}"
+
+    if params.category:
+        delete_link += f"&category={params.category.root}"
+
+    return delete_link
+
+
+def _get_deadline(context: LambdaContext) -> float:
+    """
+    Get the time.monotonic() value after which no more pointers should be
+    deleted, leaving time to respond before the request times out
+    """
+    remaining_seconds = min(
+        context.get_remaining_time_in_millis() / 1000, API_GATEWAY_TIMEOUT_SECONDS
+    )
+    return time.monotonic() + remaining_seconds - DEADLINE_MARGIN_SECONDS
+
+
+@request_handler(params=ProducerDeleteRequestParams)
+def handler(
+    metadata: ConnectionMetadata,
+    params: ProducerDeleteRequestParams,
+    repository: DocumentPointerRepository,
+    context: LambdaContext,
+) -> Response:
+    """
+    Deletes all of the organisation's document references for a patient,
+    optionally filtered by type or category.
+
+    Args:
+        metadata (ConnectionMetadata): The connection metadata.
+        params (ProducerDeleteRequestParams): The request parameters.
+        repository (DocumentPointerRepository): The document pointer repository.
+        context (LambdaContext): The Lambda context, used for the request deadline.
+
+    Returns:
+        Response: The response with the number of document references deleted.
+    """
+    logger.log(LogReference.PROBULKDELETE000)
+
+    if not params.nhs_number:
+        logger.log(
+            LogReference.PROBULKDELETE001, subject_identifier=params.subject_identifier
+        )
+        return SpineErrorResponse.INVALID_NHS_NUMBER(
+            diagnostics="A valid NHS number is required to delete document references",
+            expression="subject:identifier",
+        )
+
+    if not validate_type_system(params.type, metadata.pointer_types):
+        logger.log(
+            LogReference.PROBULKDELETE002,
+            type=params.type,
+            pointer_types=metadata.pointer_types,
+        )
+        return SpineErrorResponse.INVALID_CODE_SYSTEM(
+            diagnostics="Invalid query parameter (The provided type system does not match the allowed types for this organisation)",
+            expression="type",
+        )
+
+    if not validate_category(params.category):
+        logger.log(LogReference.PROBULKDELETE002a, category=params.category)
+        return SpineErrorResponse.INVALID_CODE_SYSTEM(
+            diagnostics="Invalid query parameter (The provided category is not a supported category)",
+            expression="category",
+        )
+
+    pointer_types = [params.type.root] if params.type else metadata.pointer_types
+    pointer_types = filter_pointer_types_by_category(pointer_types, params.category)
+
+    logger.log(
+        LogReference.PROBULKDELETE003,
+        custodian=metadata.ods_code,
+        custodian_suffix=metadata.ods_code_extension,
+        nhs_number=params.nhs_number,
+        pointer_types=pointer_types,
+    )
+
+    if not pointer_types:
+        logger.log(LogReference.PROBULKDELETE004, category=params.category)
+        return NRLResponse.RESOURCES_DELETED(count=0)
+
+    delete_context = "delete|" + get_search_context(
+        params.nhs_number,
+        pointer_types,
+        custodian=metadata.ods_code,
+        custodian_suffix=metadata.ods_code_extension,
+    )
+    try:
+        start_key = (
+            decode_page_token(params.next_page_token.root, delete_context)
+            if params.next_page_token
+            else None
+        )
+    except ValueError as exc:
+        logger.log(LogReference.PROBULKDELETE005, error=str(exc))
+        return SpineErrorResponse.INVALID_PARAMETER(
+            diagnostics="Invalid next-page-token (The token is invalid or was issued for a different request)",
+            expression="next-page-token",
+        )
+
+    deleted_count, last_evaluated_key = repository.delete_by_nhs_number(
+        nhs_number=params.nhs_number,
+        ods_code_parts=metadata.ods_code_parts,
+        pointer_types=pointer_types,
+        start_key=start_key,
+        deadline=_get_deadline(context),
+    )
+
+    next_link = None
+    if last_evaluated_key:
+        logger.log(
+            LogReference.PROBULKDELETE006,
+            deleted_count=deleted_count,
+            last_evaluated_key=last_evaluated_key,
+        )
+        page_token = encode_page_token(last_evaluated_key, delete_context)
+        next_link = f"{_get_delete_link(params)}&next-page-token={page_token}"
+
+    logger.log(LogReference.PROBULKDELETE999, deleted_count=deleted_count)
+    return NRLResponse.RESOURCES_DELETED(count=deleted_count, next_link=next_link)
@@ -0,0 +1,202 @@
+import json
+import re
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from moto import mock_aws
+
+from api.producer.bulkDeleteDocumentReference.bulk_delete_document_reference import (
+    handler,
+)
+from nrlf.core.constants import PointerTypes
+from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
+from nrlf.tests.data import load_document_reference
+from nrlf.tests.dynamodb import mock_repository
+from nrlf.tests.events import (
+    create_headers,
+    create_mock_context,
+    create_test_api_gateway_event,
+    default_response_headers,
+)
+
+
+def _create_pointer(
+    repository: DocumentPointerRepository,
+    document_id: str,
+    custodian: str = "Y05868",
+) -> DocumentPointer:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.id = f"{custodian}-{document_id}"
+    doc_ref.custodian.identifier.value = custodian
+    return repository.create(DocumentPointer.from_document_reference(doc_ref))
+
+
+def _create_context(remaining_time_in_millis: int = 30000):
+    context = create_mock_context()
+    context.get_remaining_time_in_millis.return_value = remaining_time_in_millis
+    return context
+
+
+@mock_aws
+@mock_repository
+def test_bulk_delete_document_reference_happy_path(
+    repository: DocumentPointerRepository,
+):
+    first = _create_pointer(repository, "first")
+    second = _create_pointer(repository, "second")
+    other_producer = _create_pointer(repository, "other", custodian="X26")
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+        },
+    )
+
+    result = handler(event, _create_context())
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "200",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "OperationOutcome",
+        "issue": [
+            {
+                "severity": "information",
+                "code": "informational",
+                "details": {
+                    "coding": [
+                        {
+                            "code": "RESOURCE_DELETED",
+                            "display": "Resource deleted",
+                            "system": "https://fhir.nhs.uk/ValueSet/NRL-ResponseCode",
+                        }
+                    ]
+                },
+                "diagnostics": "2 DocumentReferences have been deleted",
+            }
+        ],
+    }
+
+    assert repository.get_by_id(first.id) is None
+    assert repository.get_by_id(second.id) is None
+    assert repository.get_by_id(other_producer.id) is not None
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 1
+    }
+
+
+@mock_aws
+@mock_repository
+def test_bulk_delete_document_reference_with_type_not_present(
+    repository: DocumentPointerRepository,
+):
+    pointer = _create_pointer(repository, "first")
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            "type": PointerTypes.EOL_CARE_PLAN.value,
+        },
+    )
+
+    result = handler(event, _create_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "200"
+    assert parsed_body["issue"][0]["diagnostics"] == (
+        "0 DocumentReferences have been deleted"
+    )
+    assert repository.get_by_id(pointer.id) is not None
+
+
+@mock_aws
+@mock_repository
+def test_bulk_delete_document_reference_returns_next_link_at_deadline(
+    repository: DocumentPointerRepository,
+):
+    for idx in range(3):
+        _create_pointer(repository, f"pointer-{idx}")
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+        },
+    )
+
+    with patch("nrlf.core.dynamodb.repository.MAX_DELETE_PAGE_SIZE", 2):
+        result = handler(event, _create_context(remaining_time_in_millis=0))
+
+    parsed_body = json.loads(result["body"])
+    assert result["statusCode"] == "200"
+    assert parsed_body["issue"][0]["diagnostics"] == (
+        "2 DocumentReferences have been deleted, repeat the request using the next link to delete the remaining DocumentReferences"
+    )
+
+    next_link = re.fullmatch(r'<(.+)>; rel="next"', result["headers"]["Link"])
+    assert next_link is not None
+    next_params = parse_qs(urlparse(next_link.group(1)).query)
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            "next-page-token": next_params["next-page-token"][0],
+        },
+    )
+    result = handler(event, _create_context())
+
+    parsed_body = json.loads(result["body"])
+    assert parsed_body["issue"][0]["diagnostics"] == (
+        "1 DocumentReferences have been deleted"
+    )
+    assert "Link" not in result["headers"]
+    assert repository.count_by_nhs_number("6700028191") == 0
+
+
+@mock_aws
+@mock_repository
+def test_bulk_delete_document_reference_invalid_nhs_number(
+    repository: DocumentPointerRepository,
+):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|123",
+        },
+    )
+
+    result = handler(event, _create_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert parsed_body["issue"][0]["details"]["coding"][0]["code"] == (
+        "INVALID_NHS_NUMBER"
+    )
+
+
+@mock_aws
+@mock_repository
+def test_bulk_delete_document_reference_invalid_next_page_token(
+    repository: DocumentPointerRepository,
+):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            "next-page-token": "invalid.token",
+        },
+    )
+
+    result = handler(event, _create_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert parsed_body["issue"][0]["expression"] == ["next-page-token"]
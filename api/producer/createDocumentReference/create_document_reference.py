@@ -2,45 +2,23 @@ from uuid import uuid4
 
 from nrlf.core.codes import SpineErrorConcept
 from nrlf.core.constants import (
-    PERMISSION_AUDIT_DATES_FROM_PAYLOAD,
+    PERMISSION_IDEMPOTENT_CREATE,
     PERMISSION_SUPERSEDE_IGNORE_DELETE_FAIL,
-    TYPE_CATEGORIES,
 )
+from nrlf.core.create import check_create_permissions, set_create_time_fields
 from nrlf.core.decorators import request_handler
-from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
+from nrlf.core.dynamodb.repository import (
+    DELETE_FIELDS,
+    DocumentPointer,
+    DocumentPointerRepository,
+)
 from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata
 from nrlf.core.response import NRLResponse, Response, SpineErrorResponse
 from nrlf.core.utils import create_fhir_instant
 from nrlf.core.validators import DocumentReferenceValidator
-from nrlf.producer.fhir.r4.model import DocumentReference, Meta
-
-
-def _set_create_time_fields(
-    create_time: str, document_reference: DocumentReference, nrl_permissions: list[str]
-) -> DocumentReference:
-    """
-    Set the date and lastUpdated timestamps on the provided DocumentReference
-    """
-    if not document_reference.meta:
-        document_reference.meta = Meta()
-    document_reference.meta.lastUpdated = create_time
-
-    if (
-        document_reference.date
-        and PERMISSION_AUDIT_DATES_FROM_PAYLOAD in nrl_permissions
-    ):
-        # Perserving the original date if it exists and the permission is set
-        logger.log(
-            LogReference.PROCREATE011,
-            id=document_reference.id,
-            date=document_reference.date,
-        )
-    else:
-        document_reference.date = create_time
-
-    return document_reference
+from nrlf.producer.fhir.r4.model import DocumentReference
 
 
 def _create_core_model(resource: DocumentReference, metadata: ConnectionMetadata):
@@ -48,7 +26,7 @@ def _create_core_model(resource: DocumentReference, metadata: ConnectionMetadata
     Create the DocumentPointer model from the provided DocumentReference
     """
     creation_time = create_fhir_instant()
-    document_reference = _set_create_time_fields(
+    document_reference = set_create_time_fields(
         creation_time,
         document_reference=resource,
         nrl_permissions=metadata.nrl_permissions,
@@ -59,52 +37,6 @@ def _create_core_model(resource: DocumentReference, metadata: ConnectionMetadata
     )
 
 
-def _check_permissions(
-    core_model: DocumentPointer, metadata: ConnectionMetadata
-) -> Response | None:
-    """
-    Check the requester has permissions to create the DocumentReference
-    """
-    custodian_parts = tuple(
-        filter(None, (core_model.custodian, core_model.custodian_suffix))
-    )
-    if metadata.ods_code_parts != custodian_parts:
-        logger.log(
-            LogReference.PROCREATE004,
-            ods_code_parts=metadata.ods_code_parts,
-            custodian_parts=custodian_parts,
-        )
-        return SpineErrorResponse.BAD_REQUEST(
-            diagnostics="The custodian of the provided DocumentReference does not match the expected ODS code for this organisation",
-            expression="custodian.identifier.value",
-        )
-
-    if core_model.type not in metadata.pointer_types:
-        logger.log(
-            LogReference.PROCREATE005,
-            ods_code=metadata.ods_code,
-            type=core_model.type,
-            pointer_types=metadata.pointer_types,
-        )
-        return SpineErrorResponse.AUTHOR_CREDENTIALS_ERROR(
-            diagnostics="The type of the provided DocumentReference is not in the list of allowed types for this organisation",
-            expression="type.coding[0].code",
-        )
-
-    type_category = TYPE_CATEGORIES.get(core_model.type)
-    if type_category != core_model.category:
-        logger.log(
-            LogReference.PROCREATE005a,
-            ods_code=metadata.ods_code,
-            type=core_model.type,
-            category=core_model.category,
-        )
-        return SpineErrorResponse.BAD_REQUEST(
-            diagnostics=f"The Category code of the provided document '{core_model.category}' must match the allowed category for pointer type '{core_model.type}' with a category value of '{type_category}'",
-            expression="category.coding[0].code",
-        )
-
-
 def _get_document_ids_to_supersede(
     resource: DocumentReference,
     core_model: DocumentPointer,
@@ -119,16 +51,23 @@ def _get_document_ids_to_supersede(
         return []
 
     logger.log(LogReference.PROCREATE006, relatesTo=resource.relatesTo)
-    ids_to_delete = []
+    identifiers = []
 
     for idx, relates_to in enumerate(resource.relatesTo):
         identifier = _validate_identifier(relates_to, idx)
         _validate_producer_id(identifier, metadata, idx)
-
-        if not can_ignore_delete_fail:
-            existing_pointer = _check_existing_pointer(identifier, repository, idx)
+        identifiers.append(identifier)
+
+    if not can_ignore_delete_fail:
+        existing_pointers = repository.get_many_by_id(identifiers, fields=DELETE_FIELDS)
+        for idx, identifier in enumerate(identifiers):
+            existing_pointer = _check_existing_pointer(
+                identifier, existing_pointers, idx
+            )
             _validate_pointer_details(existing_pointer, core_model, identifier, idx)
 
+    ids_to_delete = []
+    for relates_to, identifier in zip(resource.relatesTo, identifiers):
         _append_id_if_replaces(relates_to, ids_to_delete, identifier)
 
     return ids_to_delete
@@ -164,11 +103,11 @@ def _validate_producer_id(identifier, metadata, idx):
         )
 
 
-def _check_existing_pointer(identifier, repository, idx):
+def _check_existing_pointer(identifier, existing_pointers, idx):
     """
     Check that there is an existing pointer that will be deleted when superseding
     """
-    existing_pointer = repository.get_by_id(identifier)
+    existing_pointer = existing_pointers.get(identifier)
     if not existing_pointer:
         logger.log(LogReference.PROCREATE007c, related_identifier=identifier)
         _raise_operation_outcome_error(
@@ -222,6 +161,45 @@ def _raise_operation_outcome_error(diagnostics, idx):
     )
 
 
+def _check_master_identifier(
+    core_model: DocumentPointer,
+    metadata: ConnectionMetadata,
+    repository: DocumentPointerRepository,
+) -> Response | None:
+    """
+    Check whether the organisation has already created a pointer with the same
+    masterIdentifier, so a retried create does not write a second pointer
+    """
+    existing_pointer = repository.get_by_master_identifier(
+        ods_code_parts=metadata.ods_code_parts,
+        master_identifier=core_model.master_identifier,
+        fields=["nhs_number", "type"],
+    )
+    if not existing_pointer:
+        return None
+
+    if (
+        existing_pointer.nhs_number == core_model.nhs_number
+        and existing_pointer.type == core_model.type
+    ):
+        logger.log(
+            LogReference.PROCREATE012,
+            master_identifier=core_model.master_identifier,
+            existing_pointer_id=existing_pointer.id,
+        )
+        return NRLResponse.RESOURCE_EXISTS(resource_id=existing_pointer.id)
+
+    logger.log(
+        LogReference.PROCREATE013,
+        master_identifier=core_model.master_identifier,
+        existing_pointer_id=existing_pointer.id,
+    )
+    return SpineErrorResponse.DUPLICATE_REJECTED(
+        diagnostics="The masterIdentifier has already been used for a DocumentReference with a different subject or type",
+        expression="masterIdentifier.value",
+    )
+
+
 @request_handler(body=DocumentReference)
 def handler(
     metadata: ConnectionMetadata,
@@ -253,9 +231,18 @@ def handler(
         return Response.from_issues(issues=result.issues, statusCode="400")
 
     core_model = _create_core_model(result.resource, metadata)
-    if error_response := _check_permissions(core_model, metadata):
+    if error_response := check_create_permissions(core_model, metadata):
         return error_response
 
+    if (
+        PERMISSION_IDEMPOTENT_CREATE in metadata.nrl_permissions
+        and core_model.master_identifier
+    ):
+        if existing_response := _check_master_identifier(
+            core_model, metadata, repository
+        ):
+            return existing_response
+
     can_ignore_delete_fail = (
         PERMISSION_SUPERSEDE_IGNORE_DELETE_FAIL in metadata.nrl_permissions
     )
@@ -1,14 +1,11 @@
 import json
+from unittest.mock import patch
 
 from freeze_uuid import freeze_uuid
 from freezegun import freeze_time
 from moto import mock_aws
-from pytest import mark
 
-from api.producer.createDocumentReference.create_document_reference import (
-    _set_create_time_fields,
-    handler,
-)
+from api.producer.createDocumentReference.create_document_reference import handler
 from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
 from nrlf.producer.fhir.r4.model import (
     DocumentReferenceRelatesTo,
@@ -962,6 +959,46 @@ def test_create_document_reference_supersede_deletes_old_pointers_replace(
     assert old_doc_pointer is None
 
 
+@mock_aws
+@mock_repository
+@freeze_uuid("00000000-0000-0000-0000-000000000001")
+def test_create_document_reference_supersede_multiple_targets_single_batch_read(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    target_ids = ["Y05868-99999-99999-999999", "Y05868-99999-99999-888888"]
+    for target_id in target_ids:
+        doc_ref.id = target_id
+        repository.create(DocumentPointer.from_document_reference(doc_ref))
+
+    doc_ref.id = "Y05868-99999-99999-123456"
+    doc_ref.relatesTo = [
+        DocumentReferenceRelatesTo(
+            code="replaces",
+            target=Reference(reference=None, identifier=Identifier(value=target_id)),
+        )
+        for target_id in target_ids
+    ]
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=doc_ref.model_dump_json(exclude_none=True),
+    )
+
+    with patch.object(
+        DocumentPointerRepository,
+        "get_many_by_id",
+        autospec=True,
+        side_effect=DocumentPointerRepository.get_many_by_id,
+    ) as mock_get_many_by_id:
+        result = handler(event, create_mock_context())
+
+    assert result["statusCode"] == "201"
+    mock_get_many_by_id.assert_called_once()
+    assert mock_get_many_by_id.call_args.args[1] == target_ids
+    assert all(repository.get_by_id(target_id) is None for target_id in target_ids)
+
+
 @mock_aws
 @mock_repository
 @freeze_uuid("00000000-0000-0000-0000-000000000001")
@@ -1336,67 +1373,114 @@ def test_create_document_reference_with_date_overidden(
     }
 
 
-@freeze_time("2024-03-25")
-@mark.parametrize(
-    "doc_ref_name",
-    [
-        "Y05868-736253002-Valid",
-        "Y05868-736253002-Valid-with-date",
-        "Y05868-736253002-Valid-with-date-and-meta-lastupdated",
-    ],
-)
-def test__set_create_time_fields(doc_ref_name: str):
-    test_time = "2024-03-24T12:34:56.789Z"
-    test_doc_ref = load_document_reference(doc_ref_name)
-    test_perms = []
+def _create_with_master_identifier(nhs_number: str = "6700028191", **kwargs):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.masterIdentifier = Identifier(
+        system="urn:ietf:rfc:3986", value="urn:oid:1.3.6.1.4.1.21367.2005.3.7"
+    )
+    doc_ref.subject.identifier.value = nhs_number
+    event = create_test_api_gateway_event(
+        body=doc_ref.model_dump_json(exclude_none=True), **kwargs
+    )
+    return handler(event, create_mock_context())
 
-    response = _set_create_time_fields(test_time, test_doc_ref, test_perms)
 
-    assert response.model_dump(exclude_none=True) == {
-        **test_doc_ref.model_dump(exclude_none=True),
-        "meta": {
-            "lastUpdated": "2024-03-24T12:34:56.789Z",
+@mock_aws
+@mock_repository
+def test_create_document_reference_idempotent_create_returns_existing_pointer(
+    repository: DocumentPointerRepository,
+):
+    headers = create_headers(nrl_permissions=["idempotent-create"])
+
+    first_result = _create_with_master_identifier(headers=headers)
+    retry_result = _create_with_master_identifier(headers=headers)
+
+    assert first_result["statusCode"] == "201"
+    body = retry_result.pop("body")
+    assert retry_result == {
+        "statusCode": "200",
+        "headers": {
+            "Location": first_result["headers"]["Location"],
+            **default_response_headers(),
         },
-        "date": "2024-03-24T12:34:56.789Z",
+        "isBase64Encoded": False,
     }
 
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "OperationOutcome",
+        "issue": [
+            {
+                "severity": "information",
+                "code": "informational",
+                "details": {
+                    "coding": [
+                        {
+                            "code": "RESOURCE_CREATED",
+                            "display": "Resource created",
+                            "system": "https://fhir.nhs.uk/ValueSet/NRL-ResponseCode",
+                        }
+                    ],
+                },
+                "diagnostics": "The document has already been created",
+            }
+        ],
+    }
 
-@freeze_time("2024-03-25")
-@mark.parametrize(
-    "doc_ref_name",
-    [
-        "Y05868-736253002-Valid-with-date",
-        "Y05868-736253002-Valid-with-date-and-meta-lastupdated",
-    ],
-)
-def test__set_create_time_fields_when_doc_has_date_and_perms(doc_ref_name: str):
-    test_time = "2024-03-24T12:34:56.789Z"
-    test_doc_ref = load_document_reference(doc_ref_name)
-    test_perms = ["audit-dates-from-payload"]
+    assert repository.get_by_id("Y05868-00000000-0000-0000-0000-000000000002") is None
 
-    response = _set_create_time_fields(test_time, test_doc_ref, test_perms)
 
-    assert response.model_dump(exclude_none=True) == {
-        **test_doc_ref.model_dump(exclude_none=True),
-        "meta": {
-            "lastUpdated": test_time,
-        },
-        "date": test_doc_ref.date,
+@mock_aws
+@mock_repository
+def test_create_document_reference_idempotent_create_rejects_different_subject(
+    repository: DocumentPointerRepository,
+):
+    headers = create_headers(nrl_permissions=["idempotent-create"])
+
+    _create_with_master_identifier(headers=headers)
+    result = _create_with_master_identifier(nhs_number="9278693472", headers=headers)
+
+    body = result.pop("body")
+    assert result == {
+        "statusCode": "409",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
     }
 
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "OperationOutcome",
+        "issue": [
+            {
+                "severity": "error",
+                "code": "conflict",
+                "details": {
+                    "coding": [
+                        {
+                            "code": "DUPLICATE_REJECTED",
+                            "display": "Create would lead to creation of a duplicate resource",
+                            "system": "https://fhir.nhs.uk/ValueSet/Spine-ErrorOrWarningCode-1",
+                        }
+                    ]
+                },
+                "diagnostics": "The masterIdentifier has already been used for a DocumentReference with a different subject or type",
+                "expression": ["masterIdentifier.value"],
+            }
+        ],
+    }
 
-@freeze_time("2024-03-25")
-def test__set_create_time_fields_when_no_date_but_perms():
-    test_time = "2024-03-24T12:34:56.789Z"
-    test_doc_ref = load_document_reference("Y05868-736253002-Valid")
-    test_perms = ["audit-dates-from-payload"]
+    assert repository.get_pointer_counts("9278693472") is None
 
-    response = _set_create_time_fields(test_time, test_doc_ref, test_perms)
 
-    assert response.model_dump(exclude_none=True) == {
-        **test_doc_ref.model_dump(exclude_none=True),
-        "meta": {
-            "lastUpdated": test_time,
-        },
-        "date": test_time,
+@mock_aws
+@mock_repository
+def test_create_document_reference_without_idempotent_create_creates_duplicate(
+    repository: DocumentPointerRepository,
+):
+    _create_with_master_identifier(headers=create_headers())
+    result = _create_with_master_identifier(headers=create_headers())
+
+    assert result["statusCode"] == "201"
+    assert repository.get_pointer_counts("6700028191") == {
+        "http://snomed.info/sct|736253002": 2
     }
@@ -38,13 +38,25 @@ def handler(
             diagnostics="The requested DocumentReference cannot be deleted because it belongs to another organisation",
         )
 
-    if not (core_model := repository.get_by_id(pointer_id)):
+    deleted, existing_model = repository.delete_for_producer(
+        pointer_id, metadata.ods_code_parts
+    )
+    if not deleted and not existing_model:
         logger.log(LogReference.PRODELETE002, pointer_id=pointer_id)
         return SpineErrorResponse.NO_RECORD_FOUND(
             diagnostics="The requested DocumentReference could not be found",
         )
 
-    repository.delete(core_model)
+    if not deleted:
+        logger.log(
+            LogReference.PRODELETE003,
+            ods_code_parts=metadata.ods_code_parts,
+            custodian=existing_model.custodian,
+            custodian_suffix=existing_model.custodian_suffix,
+        )
+        return SpineErrorResponse.AUTHOR_CREDENTIALS_ERROR(
+            diagnostics="The requested DocumentReference cannot be deleted because it belongs to another organisation",
+        )
 
     logger.log(LogReference.PRODELETE999)
     return NRLResponse.RESOURCE_DELETED()
@@ -3,6 +3,7 @@ import json
 from moto import mock_aws
 
 from api.producer.deleteDocumentReference.delete_document_reference import handler
+from nrlf.core.dynamodb.attribute_values import serialize_document_pointer
 from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
 from nrlf.tests.data import load_document_reference
 from nrlf.tests.dynamodb import mock_repository
@@ -165,3 +166,53 @@ def test_delete_document_reference_not_exists(repository: DocumentPointerReposit
             }
         ],
     }
+
+
+@mock_aws
+@mock_repository
+def test_delete_document_reference_different_custodian(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_pointer = DocumentPointer.from_document_reference(doc_ref)
+    repository.client.put_item(
+        TableName=repository.table_name,
+        Item=serialize_document_pointer(
+            {**doc_pointer.model_dump(), "custodian": "X26"}
+        ),
+    )
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(), path_parameters={"id": "Y05868-99999-99999-999999"}
+    )
+
+    result = handler(event, create_mock_context())
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "403",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "OperationOutcome",
+        "issue": [
+            {
+                "severity": "error",
+                "code": "forbidden",
+                "details": {
+                    "coding": [
+                        {
+                            "code": "AUTHOR_CREDENTIALS_ERROR",
+                            "display": "Author credentials error",
+                            "system": "https://fhir.nhs.uk/ValueSet/Spine-ErrorOrWarningCode-1",
+                        }
+                    ]
+                },
+                "diagnostics": "The requested DocumentReference cannot be deleted because it belongs to another organisation",
+            }
+        ],
+    }
+    assert repository.get_by_id("Y05868-99999-99999-999999") is not None
@@ -0,0 +1,195 @@
+from typing import Dict, Optional
+
+from nrlf.core.codes import SpineErrorConcept
+from nrlf.core.config import Config
+from nrlf.core.decorators import DocumentPointerRepository, request_handler
+from nrlf.core.errors import OperationOutcomeError
+from nrlf.core.logger import LogReference, logger
+from nrlf.core.model import ConnectionMetadata, ProducerListRequestParams
+from nrlf.core.pagination import get_next_link, get_search_context, get_start_key
+from nrlf.core.response import Response, SpineErrorResponse
+from nrlf.core.search import get_resources
+from nrlf.core.utils import normalise_fhir_datetime
+from nrlf.core.validators import (
+    filter_pointer_types_by_category,
+    validate_category,
+    validate_type_system,
+)
+from nrlf.producer.fhir.r4.model import DocumentReference, RequestQueryFormat
+
+DEFAULT_PAGE_SIZE = 1000
+
+# The query parameter of each window bound, and whether it is the end of the window
+WINDOW_PARAMETERS = {
+    "created_from": ("created-from", False),
+    "created_to": ("created-to", True),
+    "updated_from": ("updated-from", False),
+    "updated_to": ("updated-to", True),
+}
+
+
+def _get_windows(params: ProducerListRequestParams) -> Dict[str, Optional[str]]:
+    """
+    Get the bounds of the created and updated windows as stored instants
+
+    Raises a ValueError naming the query parameter of any invalid bound
+    """
+    windows = {}
+    for field, (parameter, end_of_day) in WINDOW_PARAMETERS.items():
+        value = getattr(params, field)
+        try:
+            windows[field] = (
+                normalise_fhir_datetime(value.root, end_of_day=end_of_day)
+                if value
+                else None
+            )
+        except ValueError:
+            raise ValueError(parameter) from None
+
+    return windows
+
+
+def _get_list_link(
+    params: ProducerListRequestParams, windows: Dict[str, Optional[str]]
+) -> str:
+    """
+    Build the URL for the listing, used as the base of the next link
+    """
+    config = Config()
+    list_format = (params.format or RequestQueryFormat.json).value
+    list_link = f"https://{config.ENVIRONMENT}.api.service.nhs.uk/record-locator/producer/FHIR/R4/DocumentReference/_list?_format={list_format}"
+
+    if params.type:
+        list_link += f"&type={params.type.root}"
+
+    if params.category:
+        list_link += f"&category={params.category.root}"
+
+    for field, (parameter, _) in WINDOW_PARAMETERS.items():
+        if windows[field]:
+            list_link += f"&{parameter}={windows[field]}"
+
+    return list_link
+
+
+@request_handler(params=ProducerListRequestParams)
+def handler(
+    metadata: ConnectionMetadata,
+    params: ProducerListRequestParams,
+    repository: DocumentPointerRepository,
+) -> Response:
+    """
+    Lists all of the organisation's document references, oldest first,
+    optionally filtered by type, category and created or updated window.
+
+    Args:
+        metadata (ConnectionMetadata): The connection metadata.
+        params (ProducerListRequestParams): The request parameters.
+        repository (DocumentPointerRepository): The document pointer repository.
+
+    Returns:
+        Response: A page of document references, as a Bundle or as NDJSON.
+    """
+    logger.log(LogReference.PROLIST000)
+
+    if not repository.producer_index_enabled:
+        # Pointers are only found once backfilled with their producer_gsi keys
+        logger.log(LogReference.PROLIST000a)
+        raise OperationOutcomeError(
+            status_code="501",
+            severity="error",
+            code="not-supported",
+            details=SpineErrorConcept.from_code("BAD_REQUEST"),
+            diagnostics="Listing document references is not yet available in this environment",
+        )
+
+    if not validate_type_system(params.type, metadata.pointer_types):
+        logger.log(
+            LogReference.PROLIST001,
+            type=params.type,
+            pointer_types=metadata.pointer_types,
+        )
+        return SpineErrorResponse.INVALID_CODE_SYSTEM(
+            diagnostics="Invalid query parameter (The provided type system does not match the allowed types for this organisation)",
+            expression="type",
+        )
+
+    if not validate_category(params.category):
+        logger.log(LogReference.PROLIST001a, category=params.category)
+        return SpineErrorResponse.INVALID_CODE_SYSTEM(
+            diagnostics="Invalid query parameter (The provided category is not a supported category)",
+            expression="category",
+        )
+
+    try:
+        windows = _get_windows(params)
+    except ValueError as exc:
+        logger.log(LogReference.PROLIST002, parameter=str(exc))
+        return SpineErrorResponse.INVALID_PARAMETER(
+            diagnostics=f"Invalid {exc} (The value is not a valid date or dateTime)",
+            expression=str(exc),
+        )
+
+    pointer_types = [params.type.root] if params.type else metadata.pointer_types
+    pointer_types = filter_pointer_types_by_category(pointer_types, params.category)
+    is_ndjson = params.format == RequestQueryFormat.ndjson
+
+    logger.log(
+        LogReference.PROLIST003,
+        custodian=metadata.ods_code,
+        custodian_suffix=metadata.ods_code_extension,
+        pointer_types=pointer_types,
+        **windows,
+    )
+
+    list_context = "|".join(
+        [
+            "list",
+            get_search_context(
+                "",
+                pointer_types,
+                custodian=metadata.ods_code,
+                custodian_suffix=metadata.ods_code_extension,
+            ),
+            *(window or "" for window in windows.values()),
+        ]
+    )
+    start_key = get_start_key(
+        params.next_page_token.root if params.next_page_token else None,
+        list_context,
+        LogReference.PROLIST004,
+        diagnostics="Invalid next-page-token (The token is invalid or was issued for a different request)",
+    )
+
+    count = params.count.root if params.count else DEFAULT_PAGE_SIZE
+    results, last_evaluated_key = repository.list_page_by_custodian(
+        ods_code_parts=metadata.ods_code_parts,
+        pointer_types=pointer_types,
+        limit=count,
+        start_key=start_key,
+        fields=["document"],
+        **windows,
+    )
+
+    resources = get_resources(
+        repository,
+        results,
+        DocumentReference,
+        invalid_log_reference=LogReference.PROLIST005,
+        diagnostics="An error occurred whilst parsing the document reference list results",
+    )
+
+    next_link = None
+    if last_evaluated_key:
+        logger.log(LogReference.PROLIST006, last_evaluated_key=last_evaluated_key)
+        next_link = get_next_link(
+            _get_list_link(params, windows), count, last_evaluated_key, list_context
+        )
+
+    logger.log(LogReference.PROLIST999, count=len(resources))
+    if is_ndjson:
+        return Response.from_ndjson(
+            resources, next_link=next_link["url"] if next_link else None
+        )
+
+    return Response.from_searchset(resources, link=[next_link] if next_link else [])
@@ -0,0 +1,188 @@
+import json
+import os
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from moto import mock_aws
+
+from api.producer.listDocumentReference.list_document_reference import handler
+from nrlf.core.constants import PointerTypes
+from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
+from nrlf.tests.data import load_document_reference
+from nrlf.tests.dynamodb import mock_repository
+from nrlf.tests.events import (
+    create_headers,
+    create_mock_context,
+    create_test_api_gateway_event,
+    default_response_headers,
+)
+
+
+def _create_pointer(
+    repository: DocumentPointerRepository,
+    document_id: str,
+    created_on: str,
+    custodian: str = "Y05868",
+) -> DocumentPointer:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.id = f"{custodian}-{document_id}"
+    doc_ref.custodian.identifier.value = custodian
+    return repository.create(
+        DocumentPointer.from_document_reference(doc_ref, created_on=created_on)
+    )
+
+
+@mock_aws
+@mock_repository
+@patch.dict(os.environ, {"PRODUCER_INDEX_ENABLED": "true"})
+def test_list_document_reference_happy_path(repository: DocumentPointerRepository):
+    second = _create_pointer(repository, "second", "2024-01-02T09:00:00.000Z")
+    first = _create_pointer(repository, "first", "2024-01-01T09:00:00.000Z")
+    _create_pointer(repository, "other", "2024-01-01T09:00:00.000Z", custodian="X26")
+
+    event = create_test_api_gateway_event(headers=create_headers())
+
+    result = handler(event, create_mock_context())
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "200",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "total": 2,
+        "entry": [
+            {"resource": json.loads(first.document)},
+            {"resource": json.loads(second.document)},
+        ],
+    }
+
+
+@mock_aws
+@mock_repository
+@patch.dict(os.environ, {"PRODUCER_INDEX_ENABLED": "true"})
+def test_list_document_reference_ndjson_pages(repository: DocumentPointerRepository):
+    pointers = [
+        _create_pointer(repository, f"pointer-{idx}", f"2024-01-0{idx + 1}T09:00:00Z")
+        for idx in range(3)
+    ]
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={"_format": "ndjson", "_count": "2"},
+    )
+    result = handler(event, create_mock_context())
+
+    assert result["statusCode"] == "200"
+    assert result["headers"]["Content-Type"] == "application/fhir+ndjson"
+    assert result["body"].splitlines() == [pointer.document for pointer in pointers[:2]]
+
+    next_link = result["headers"]["Link"].removeprefix("<").split(">;")[0]
+    next_params = parse_qs(urlparse(next_link).query)
+    assert next_params["_format"] == ["ndjson"]
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={key: values[0] for key, values in next_params.items()},
+    )
+    result = handler(event, create_mock_context())
+
+    assert result["body"].splitlines() == [pointers[2].document]
+    assert "Link" not in result["headers"]
+
+
+@mock_aws
+@mock_repository
+@patch.dict(os.environ, {"PRODUCER_INDEX_ENABLED": "true"})
+def test_list_document_reference_created_window(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer(repository, "before", "2024-01-01T23:59:59.999Z")
+    during = _create_pointer(repository, "during", "2024-01-02T12:00:00.000Z")
+    _create_pointer(repository, "after", "2024-01-03T00:00:00.000Z")
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "created-from": "2024-01-02",
+            "created-to": "2024-01-02",
+            "type": PointerTypes.MENTAL_HEALTH_PLAN.value,
+        },
+    )
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "200"
+    assert [entry["resource"]["id"] for entry in parsed_body["entry"]] == [during.id]
+
+
+@mock_aws
+@mock_repository
+@patch.dict(os.environ, {"PRODUCER_INDEX_ENABLED": "true"})
+def test_list_document_reference_invalid_date(repository: DocumentPointerRepository):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={"updated-from": "2024-02-30"},
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert parsed_body["issue"][0]["expression"] == ["updated-from"]
+
+
+@mock_aws
+@mock_repository
+@patch.dict(os.environ, {"PRODUCER_INDEX_ENABLED": "true"})
+def test_list_document_reference_invalid_type(repository: DocumentPointerRepository):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "type": "https://fhir.nhs.uk/CodeSystem/Document-Type|invalid"
+        },
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert parsed_body["issue"][0]["expression"] == ["type"]
+
+
+@mock_aws
+@mock_repository
+@patch.dict(os.environ, {"PRODUCER_INDEX_ENABLED": "true"})
+def test_list_document_reference_invalid_next_page_token(
+    repository: DocumentPointerRepository,
+):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={"next-page-token": "invalid.token"},
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert parsed_body["issue"][0]["expression"] == ["next-page-token"]
+
+
+@mock_aws
+@mock_repository
+def test_list_document_reference_producer_index_disabled(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer(repository, "first", "2024-01-01T09:00:00.000Z")
+    event = create_test_api_gateway_event(headers=create_headers())
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "501"
+    assert parsed_body["issue"][0]["code"] == "not-supported"
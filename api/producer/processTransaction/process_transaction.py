@@ -0,0 +1,188 @@
+import json
+from typing import List, Tuple
+from uuid import uuid4
+
+from nrlf.core.codes import SpineErrorConcept
+from nrlf.core.config import Config
+from nrlf.core.create import check_create_permissions, set_create_time_fields
+from nrlf.core.decorators import request_handler
+from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
+from nrlf.core.logger import LogReference, logger
+from nrlf.core.model import ConnectionMetadata
+from nrlf.core.response import NRLResponse, Response, SpineErrorResponse
+from nrlf.core.utils import create_fhir_instant
+from nrlf.core.validators import DocumentReferenceValidator
+from nrlf.producer.fhir.r4.model import (
+    Bundle,
+    BundleEntry,
+    DocumentReference,
+    OperationOutcomeIssue,
+)
+
+
+def _create_core_model(
+    resource: DocumentReference, metadata: ConnectionMetadata, creation_time: str
+):
+    """
+    Create the DocumentPointer model from the provided DocumentReference
+    """
+    document_reference = set_create_time_fields(
+        creation_time,
+        document_reference=resource,
+        nrl_permissions=metadata.nrl_permissions,
+    )
+
+    return DocumentPointer.from_document_reference(
+        document_reference, created_on=creation_time
+    )
+
+
+def _locate_issues(response: Response, expression_prefix: str) -> Response:
+    """
+    Prefix the expression of each issue in an error response with the location
+    of the Bundle entry it relates to
+    """
+    outcome = json.loads(response.body)
+    for issue in outcome.get("issue", []):
+        issue["expression"] = [
+            f"{expression_prefix}.{expression}"
+            for expression in issue.get("expression", [])
+        ] or [expression_prefix]
+
+    return response.model_copy(update={"body": json.dumps(outcome, indent=2)})
+
+
+def _prepare_entry(
+    entry: BundleEntry,
+    idx: int,
+    metadata: ConnectionMetadata,
+    validator: DocumentReferenceValidator,
+    creation_time: str,
+) -> Tuple[DocumentPointer | None, Response | None]:
+    """
+    Validate a Bundle entry and build the DocumentPointer it creates
+    Returns the DocumentPointer, or the error response for the entry
+    """
+    if not entry.request or entry.request.method != "POST":
+        logger.log(LogReference.PROTRANS003, idx=idx, request=entry.request)
+        return None, SpineErrorResponse.BAD_REQUEST(
+            diagnostics="Only POST requests are supported in a Bundle entry",
+            expression=f"entry[{idx}].request.method",
+        )
+
+    if entry.request.url != "DocumentReference" or not entry.resource:
+        logger.log(LogReference.PROTRANS003, idx=idx, request=entry.request)
+        return None, SpineErrorResponse.BAD_REQUEST(
+            diagnostics="A Bundle entry must create a DocumentReference resource",
+            expression=f"entry[{idx}].request.url",
+        )
+
+    resource = entry.resource
+    if resource.relatesTo:
+        logger.log(LogReference.PROTRANS005, idx=idx)
+        return None, SpineErrorResponse.BAD_REQUEST(
+            diagnostics="relatesTo is not supported in a Bundle entry, use createDocumentReference to supersede a DocumentReference",
+            expression=f"entry[{idx}].resource.relatesTo",
+        )
+
+    id_prefix = "|".join(metadata.ods_code_parts)
+    resource.id = f"{id_prefix}-{uuid4()}"
+
+    result = validator.validate(resource)
+    if not result.is_valid:
+        logger.log(LogReference.PROTRANS004, idx=idx)
+        return None, _locate_issues(
+            Response.from_issues(issues=result.issues, statusCode="400"),
+            f"entry[{idx}].resource",
+        )
+
+    core_model = _create_core_model(result.resource, metadata, creation_time)
+    if error_response := check_create_permissions(core_model, metadata):
+        return None, _locate_issues(error_response, f"entry[{idx}].resource")
+
+    return core_model, None
+
+
+def _write_failed_response() -> Response:
+    """
+    The response for an entry whose pointer could not be written
+    """
+    return Response.from_issues(
+        issues=[
+            OperationOutcomeIssue(
+                severity="error",
+                code="transient",
+                details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+                diagnostics="The DocumentReference could not be created, the entry can be retried",
+            )
+        ],
+        statusCode="500",
+    )
+
+
+@request_handler(body=Bundle)
+def handler(
+    metadata: ConnectionMetadata,
+    repository: DocumentPointerRepository,
+    body: Bundle,
+) -> Response:
+    """
+    Creates the document references in a batch Bundle.
+
+    Every entry is validated before any are written. The valid entries are
+    written and the outcome of each entry is reported. Transaction Bundles are
+    rejected, as the entries are written with BatchWriteItem, which cannot
+    create them atomically.
+
+    Args:
+        metadata (ConnectionMetadata): The connection metadata.
+        repository (DocumentPointerRepository): The document pointer repository.
+        body (Bundle): The Bundle of document references to create.
+
+    Returns:
+        Response: The Bundle with the response to each entry.
+    """
+    logger.log(LogReference.PROTRANS000)
+
+    if body.type != "batch":
+        logger.log(LogReference.PROTRANS001, type=body.type)
+        return SpineErrorResponse.BAD_REQUEST(
+            diagnostics="Bundle type must be batch",
+            expression="type",
+        )
+
+    max_entries = Config().TRANSACTION_MAX_ENTRIES
+    entries = body.entry or []
+    if not entries or len(entries) > max_entries:
+        logger.log(
+            LogReference.PROTRANS002, count=len(entries), max_entries=max_entries
+        )
+        return SpineErrorResponse.BAD_REQUEST(
+            diagnostics=f"Bundle must contain between 1 and {max_entries} entries",
+            expression="entry",
+        )
+
+    validator = DocumentReferenceValidator()
+    creation_time = create_fhir_instant()
+    prepared_entries: List[Tuple[DocumentPointer | None, Response | None]] = [
+        _prepare_entry(entry, idx, metadata, validator, creation_time)
+        for idx, entry in enumerate(entries)
+    ]
+
+    pointers = [pointer for pointer, _ in prepared_entries if pointer]
+    logger.log(LogReference.PROTRANS007, count=len(pointers))
+    unprocessed_ids = set(repository.create_many(pointers))
+    if unprocessed_ids:
+        logger.log(LogReference.PROTRANS008, unprocessed_ids=sorted(unprocessed_ids))
+
+    entry_responses = []
+    for pointer, error_response in prepared_entries:
+        if error_response:
+            entry_responses.append(error_response)
+        elif pointer.id in unprocessed_ids:
+            entry_responses.append(_write_failed_response())
+        else:
+            entry_responses.append(NRLResponse.RESOURCE_CREATED(resource_id=pointer.id))
+
+    logger.log(LogReference.PROTRANS999)
+    return Response.from_entry_responses("batch-response", entry_responses)
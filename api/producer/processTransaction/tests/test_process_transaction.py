@@ -0,0 +1,262 @@
+import json
+import os
+from unittest.mock import patch
+
+from freezegun import freeze_time
+from moto import mock_aws
+
+from api.producer.processTransaction.process_transaction import handler
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+from nrlf.producer.fhir.r4.model import (
+    DocumentReferenceRelatesTo,
+    Identifier,
+    Reference,
+)
+from nrlf.tests.data import load_document_reference_json
+from nrlf.tests.dynamodb import mock_repository
+from nrlf.tests.events import (
+    create_headers,
+    create_mock_context,
+    create_test_api_gateway_event,
+    default_response_headers,
+)
+
+LOCATION_PREFIX = "/producer/FHIR/R4/DocumentReference/"
+
+
+def _create_bundle(resources: list[dict], bundle_type: str = "batch") -> str:
+    return json.dumps(
+        {
+            "resourceType": "Bundle",
+            "type": bundle_type,
+            "entry": [
+                {
+                    "resource": resource,
+                    "request": {"method": "POST", "url": "DocumentReference"},
+                }
+                for resource in resources
+            ],
+        }
+    )
+
+
+def _get_created_ids(entries: list[dict]) -> list[str]:
+    return [
+        entry["response"]["location"].removeprefix(LOCATION_PREFIX)
+        for entry in entries
+        if entry["response"]["status"] == "201"
+    ]
+
+
+@mock_aws
+@mock_repository
+@freeze_time("2024-03-21T12:34:56.789")
+def test_process_transaction_batch_happy_path(repository: DocumentPointerRepository):
+    doc_ref = load_document_reference_json("Y05868-736253002-Valid")
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle([doc_ref, doc_ref]),
+    )
+
+    result = handler(event, create_mock_context())
+    body = json.loads(result.pop("body"))
+
+    assert result == {
+        "statusCode": "200",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+    assert body["resourceType"] == "Bundle"
+    assert body["type"] == "batch-response"
+    assert [entry["response"]["status"] for entry in body["entry"]] == [
+        "201",
+        "201",
+    ]
+    assert body["entry"][0]["response"]["outcome"]["issue"][0]["details"]["coding"][0][
+        "code"
+    ] == ("RESOURCE_CREATED")
+
+    created_ids = _get_created_ids(body["entry"])
+    assert len(set(created_ids)) == 2
+    for created_id in created_ids:
+        assert created_id.startswith("Y05868-")
+        pointer = repository.get_by_id(created_id)
+        assert pointer is not None
+        assert pointer.created_on == "2024-03-21T12:34:56.789Z"
+
+    assert repository.get_pointer_counts("6700028191") == {
+        "http://snomed.info/sct|736253002": 2
+    }
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_batch_reports_invalid_entries(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference_json("Y05868-736253002-Valid")
+    wrong_custodian = load_document_reference_json("Y05868-736253002-Valid")
+    wrong_custodian["custodian"]["identifier"]["value"] = "N0TME"
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle([doc_ref, wrong_custodian]),
+    )
+
+    result = handler(event, create_mock_context())
+    body = json.loads(result["body"])
+
+    assert result["statusCode"] == "200"
+    assert [entry["response"]["status"] for entry in body["entry"]] == [
+        "201",
+        "400",
+    ]
+    assert body["entry"][1]["response"]["outcome"]["issue"] == [
+        {
+            "severity": "error",
+            "code": "invalid",
+            "details": {
+                "coding": [
+                    {
+                        "code": "BAD_REQUEST",
+                        "display": "Bad request",
+                        "system": "https://fhir.nhs.uk/ValueSet/Spine-ErrorOrWarningCode-1",
+                    }
+                ]
+            },
+            "diagnostics": "The custodian of the provided DocumentReference does not match the expected ODS code for this organisation",
+            "expression": ["entry[1].resource.custodian.identifier.value"],
+        }
+    ]
+
+    created_ids = _get_created_ids(body["entry"])
+    assert len(created_ids) == 1
+    assert repository.get_by_id(created_ids[0]) is not None
+    assert repository.get_pointer_counts("6700028191") == {
+        "http://snomed.info/sct|736253002": 1
+    }
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_transaction_bundle_rejected(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference_json("Y05868-736253002-Valid")
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle([doc_ref], bundle_type="transaction"),
+    )
+
+    result = handler(event, create_mock_context())
+    body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert body["issue"][0]["diagnostics"] == "Bundle type must be batch"
+    assert body["issue"][0]["expression"] == ["type"]
+    assert repository.get_pointer_counts("6700028191") is None
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_rejects_unsupported_entries(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference_json("Y05868-736253002-Valid")
+    superseding = load_document_reference_json("Y05868-736253002-Valid")
+    superseding["relatesTo"] = [
+        DocumentReferenceRelatesTo(
+            code="replaces",
+            target=Reference(identifier=Identifier(value="Y05868-existing")),
+        ).model_dump(exclude_none=True)
+    ]
+
+    bundle = json.loads(_create_bundle([doc_ref, superseding]))
+    bundle["entry"][0]["request"] = {
+        "method": "PUT",
+        "url": "DocumentReference/Y05868-existing",
+    }
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(bundle),
+    )
+
+    result = handler(event, create_mock_context())
+    body = json.loads(result["body"])
+
+    assert [entry["response"]["status"] for entry in body["entry"]] == [
+        "400",
+        "400",
+    ]
+    assert [
+        entry["response"]["outcome"]["issue"][0]["expression"]
+        for entry in body["entry"]
+    ] == [["entry[0].request.method"], ["entry[1].resource.relatesTo"]]
+    assert repository.get_pointer_counts("6700028191") is None
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_unsupported_bundle_type(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference_json("Y05868-736253002-Valid")
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle([doc_ref], bundle_type="collection"),
+    )
+
+    result = handler(event, create_mock_context())
+    body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert body["issue"][0]["diagnostics"] == "Bundle type must be batch"
+
+
+@mock_aws
+@mock_repository
+@patch.dict(os.environ, {"TRANSACTION_MAX_ENTRIES": "1"})
+def test_process_transaction_too_many_entries(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference_json("Y05868-736253002-Valid")
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle([doc_ref, doc_ref]),
+    )
+
+    result = handler(event, create_mock_context())
+    body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert body["issue"][0]["diagnostics"] == (
+        "Bundle must contain between 1 and 1 entries"
+    )
+    assert repository.get_pointer_counts("6700028191") is None
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_reports_unwritten_entries(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference_json("Y05868-736253002-Valid")
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle([doc_ref, doc_ref]),
+    )
+
+    def _create_many(pointers):
+        return [pointers[1].id]
+
+    with patch.object(
+        DocumentPointerRepository, "create_many", side_effect=_create_many
+    ):
+        result = handler(event, create_mock_context())
+
+    body = json.loads(result["body"])
+    assert [entry["response"]["status"] for entry in body["entry"]] == [
+        "201",
+        "500",
+    ]
+    assert body["entry"][1]["response"]["outcome"]["issue"][0]["code"] == ("transient")
@@ -48,7 +48,7 @@ def handler(
             diagnostics="The requested DocumentReference cannot be read because it belongs to another organisation",
         )
 
-    result = repository.get_by_id(parsed_id)
+    result = repository.get_by_id(parsed_id, fields=["document"])
     if result is None:
         logger.log(LogReference.PROREAD002)
         return SpineErrorResponse.NO_RECORD_FOUND(
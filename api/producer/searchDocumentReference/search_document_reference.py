@@ -1,13 +1,15 @@
-from pydantic import ValidationError
-
-from nrlf.core.codes import SpineErrorConcept
 from nrlf.core.decorators import DocumentPointerRepository, request_handler
-from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata, ProducerRequestParams
+from nrlf.core.pagination import get_next_link, get_search_context, get_start_key
 from nrlf.core.response import Response, SpineErrorResponse
-from nrlf.core.validators import validate_type_system
-from nrlf.producer.fhir.r4.model import Bundle, DocumentReference
+from nrlf.core.search import get_by_master_identifier, get_resources, get_search_link
+from nrlf.core.validators import (
+    filter_pointer_types_by_category,
+    validate_category,
+    validate_type_system,
+)
+from nrlf.producer.fhir.r4.model import DocumentReference
 
 
 @request_handler(params=ProducerRequestParams)
@@ -39,7 +41,7 @@ def handler(
             expression="subject:identifier",
         )
 
-    if not params.nhs_number:
+    if not params.nhs_number and not params.master_identifier:
         logger.log(
             LogReference.PROSEARCH001, subject_identifier=params.subject_identifier
         )
@@ -59,8 +61,24 @@ def handler(
             expression="type",
         )
 
+    if not validate_category(params.category):
+        logger.log(LogReference.PROSEARCH002a, category=params.category)
+        return SpineErrorResponse.INVALID_CODE_SYSTEM(
+            diagnostics="Invalid query parameter (The provided category is not a supported category)",
+            expression="category",
+        )
+
+    try:
+        created_from, created_to = params.created_window
+    except ValueError as exc:
+        logger.log(LogReference.PROSEARCH002b, date=params.date, error=str(exc))
+        return SpineErrorResponse.INVALID_PARAMETER(
+            diagnostics="Invalid query parameter (The provided date is not a valid date or dateTime)",
+            expression="date",
+        )
+
     pointer_types = [params.type.root] if params.type else metadata.pointer_types
-    bundle = {"resourceType": "Bundle", "type": "searchset", "total": 0, "entry": []}
+    pointer_types = filter_pointer_types_by_category(pointer_types, params.category)
 
     logger.log(
         LogReference.PROSEARCH003,
@@ -68,38 +86,100 @@ def handler(
         custodian_suffix=metadata.ods_code_extension,
         nhs_number=params.nhs_number,
         pointer_types=pointer_types,
+        created_from=created_from,
+        created_to=created_to,
+        newest_first=params.newest_first,
     )
 
-    for result in repository.search(
-        custodian=metadata.ods_code,
-        custodian_suffix=metadata.ods_code_extension,
-        nhs_number=params.nhs_number,
-        pointer_types=pointer_types,
-    ):
-        try:
-            document_reference = DocumentReference.model_validate_json(result.document)
-            bundle["total"] += 1
-            bundle["entry"].append(
-                {"resource": document_reference.model_dump(exclude_none=True)}
+    if not pointer_types:
+        logger.log(LogReference.PROSEARCH006, category=params.category)
+        return Response.from_searchset([])
+
+    last_evaluated_key = None
+    if params.master_identifier:
+        logger.log(
+            LogReference.PROSEARCH009,
+            custodian=metadata.ods_code,
+            custodian_suffix=metadata.ods_code_extension,
+            master_identifier=params.master_identifier,
+        )
+        results = get_by_master_identifier(
+            repository,
+            metadata.ods_code_parts,
+            params.master_identifier,
+            pointer_types,
+            nhs_number=params.nhs_number,
+        )
+    else:
+        search_context = get_search_context(
+            params.nhs_number,
+            pointer_types,
+            custodian=metadata.ods_code,
+            custodian_suffix=metadata.ods_code_extension,
+            created_from=created_from,
+            created_to=created_to,
+            newest_first=params.newest_first,
+        )
+        start_key = get_start_key(
+            params.next_page_token.root if params.next_page_token else None,
+            search_context,
+            LogReference.PROSEARCH007,
+        )
+
+        if params.count:
+            results, last_evaluated_key = repository.search_page(
+                custodian=metadata.ods_code,
+                custodian_suffix=metadata.ods_code_extension,
+                nhs_number=params.nhs_number,
+                pointer_types=pointer_types,
+                limit=params.count.root,
+                start_key=start_key,
+                fields=["document"],
+                created_from=created_from,
+                created_to=created_to,
+                newest_first=params.newest_first,
             )
-            logger.log(
-                LogReference.PROSEARCH004,
-                id=document_reference.id,
-                count=bundle["total"],
+        else:
+            results = repository.search(
+                custodian=metadata.ods_code,
+                custodian_suffix=metadata.ods_code_extension,
+                nhs_number=params.nhs_number,
+                pointer_types=pointer_types,
+                start_key=start_key,
+                fields=["document"],
+                created_from=created_from,
+                created_to=created_to,
+                newest_first=params.newest_first,
             )
 
-        except ValidationError as exc:
-            logger.log(
-                LogReference.PROSEARCH005, error=str(exc), document=result.document
-            )
-            raise OperationOutcomeError(
-                status_code="500",
-                severity="error",
-                code="exception",
-                details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
-                diagnostics="An error occurred whilst parsing the document reference search results",
+    resources = get_resources(
+        repository,
+        results,
+        DocumentReference,
+        invalid_log_reference=LogReference.PROSEARCH005,
+        found_log_reference=LogReference.PROSEARCH004,
+    )
+
+    link = []
+    if last_evaluated_key:
+        logger.log(LogReference.PROSEARCH008, last_evaluated_key=last_evaluated_key)
+        link.append(
+            get_next_link(
+                get_search_link(
+                    "producer",
+                    params.nhs_number,
+                    pointer_type=params.type.root if params.type else None,
+                    category=params.category.root if params.category else None,
+                    created_from=created_from,
+                    created_to=created_to,
+                    newest_first=params.newest_first,
+                ),
+                params.count.root,
+                last_evaluated_key,
+                search_context,
             )
+        )
 
-    response = Response.from_resource(Bundle.model_validate(bundle))
+    response = Response.from_searchset(resources, link=link)
     logger.log(LogReference.PROSEARCH999)
     return response
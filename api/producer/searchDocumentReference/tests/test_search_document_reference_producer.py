@@ -1,10 +1,14 @@
 import json
+import os
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
 
 from moto import mock_aws
 
 from api.producer.searchDocumentReference.search_document_reference import handler
-from nrlf.core.constants import PointerTypes
+from nrlf.core.constants import Categories, PointerTypes
 from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
+from nrlf.producer.fhir.r4.model import Identifier
 from nrlf.tests.data import load_document_reference
 from nrlf.tests.dynamodb import mock_repository
 from nrlf.tests.events import (
@@ -306,9 +310,12 @@ def test_search_document_reference_filters_by_pointer_types(
     }
 
 
+@patch.dict(os.environ, {"STRICT_READ_VALIDATION": "true"})
 @mock_aws
 @mock_repository
-def test_search_document_reference_invalid_json(repository: DocumentPointerRepository):
+def test_search_document_reference_invalid_json_with_strict_read_validation(
+    repository: DocumentPointerRepository,
+):
     doc_ref = load_document_reference("Y05868-736253002-Valid")
     doc_pointer = DocumentPointer.from_document_reference(doc_ref)
     doc_pointer.document = "invalid json"
@@ -351,3 +358,306 @@ def test_search_document_reference_invalid_json(repository: DocumentPointerRepos
             }
         ],
     }
+
+
+@mock_aws
+@mock_repository
+def test_search_document_reference_filters_by_category(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_pointer = DocumentPointer.from_document_reference(doc_ref)
+    repository.create(doc_pointer)
+
+    news2_doc_ref = load_document_reference("Y05868-736253002-Valid")
+    news2_doc_ref.id = "Y05868-99999-99999-999998"
+    news2_doc_ref.type.coding[0].code = PointerTypes.NEWS2_CHART.coding_value()
+    news2_doc_ref.category[0].coding[0].code = Categories.OBSERVATIONS.coding_value()
+    repository.create(DocumentPointer.from_document_reference(news2_doc_ref))
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            "category": Categories.CARE_PLAN.value,
+        },
+    )
+
+    result = handler(event, create_mock_context())
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "200",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "total": 1,
+        "entry": [{"resource": doc_ref.model_dump(exclude_none=True)}],
+    }
+
+
+@mock_aws
+@mock_repository
+def test_search_document_reference_invalid_category(
+    repository: DocumentPointerRepository,
+):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            "category": "http://snomed.info/sct|invalid",
+        },
+    )
+
+    result = handler(event, create_mock_context())
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "400",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "OperationOutcome",
+        "issue": [
+            {
+                "severity": "error",
+                "code": "code-invalid",
+                "details": {
+                    "coding": [
+                        {
+                            "code": "INVALID_CODE_SYSTEM",
+                            "display": "Invalid code system",
+                            "system": "https://fhir.nhs.uk/ValueSet/Spine-ErrorOrWarningCode-1",
+                        }
+                    ]
+                },
+                "diagnostics": "Invalid query parameter (The provided category is not a supported category)",
+                "expression": ["category"],
+            }
+        ],
+    }
+
+
+def _search(search_params: dict) -> dict:
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            **search_params,
+        },
+    )
+
+    return handler(event, create_mock_context())
+
+
+@mock_aws
+@mock_repository
+def test_search_document_reference_paged_with_next_link(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    for idx in range(3):
+        doc_ref.id = f"Y05868-99999-99999-99999{idx}"
+        repository.create(DocumentPointer.from_document_reference(doc_ref))
+
+    result = _search({"_count": "2"})
+
+    assert result["statusCode"] == "200"
+    first_page = json.loads(result["body"])
+    assert first_page["total"] == 2
+    assert [entry["resource"]["id"] for entry in first_page["entry"]] == [
+        "Y05868-99999-99999-999990",
+        "Y05868-99999-99999-999991",
+    ]
+
+    next_link = [link for link in first_page["link"] if link["relation"] == "next"]
+    assert len(next_link) == 1
+    next_params = parse_qs(urlparse(next_link[0]["url"]).query)
+    assert next_params["_count"] == ["2"]
+
+    result = _search(
+        {"_count": "2", "next-page-token": next_params["next-page-token"][0]}
+    )
+
+    assert result["statusCode"] == "200"
+    second_page = json.loads(result["body"])
+    assert [entry["resource"]["id"] for entry in second_page["entry"]] == [
+        "Y05868-99999-99999-999992"
+    ]
+    assert all(link["relation"] != "next" for link in second_page.get("link", []))
+
+
+@mock_aws
+@mock_repository
+def test_search_document_reference_invalid_next_page_token(
+    repository: DocumentPointerRepository,
+):
+    result = _search({"_count": "2", "next-page-token": "not-a-valid-token"})
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "400",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body["issue"][0]["details"]["coding"][0]["code"] == (
+        "INVALID_PARAMETER"
+    )
+    assert parsed_body["issue"][0]["expression"] == ["next-page-token"]
+
+
+@mock_aws
+@mock_repository
+def test_search_document_reference_by_master_identifier(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.masterIdentifier = Identifier(
+        system="urn:ietf:rfc:3986", value="urn:oid:1.3.6.1.4.1.21367.2005.3.7"
+    )
+    repository.create(DocumentPointer.from_document_reference(doc_ref))
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "identifier": "urn:ietf:rfc:3986|urn:oid:1.3.6.1.4.1.21367.2005.3.7"
+        },
+    )
+
+    result = handler(event, create_mock_context())
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "200",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "total": 1,
+        "entry": [{"resource": doc_ref.model_dump(exclude_none=True)}],
+    }
+
+
+@mock_aws
+@mock_repository
+def test_search_document_reference_by_master_identifier_filters_by_nhs_number(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.masterIdentifier = Identifier(
+        system="urn:ietf:rfc:3986", value="urn:oid:1.3.6.1.4.1.21367.2005.3.7"
+    )
+    repository.create(DocumentPointer.from_document_reference(doc_ref))
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|9278693472",
+            "identifier": "urn:oid:1.3.6.1.4.1.21367.2005.3.7",
+        },
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "200"
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "total": 0,
+        "entry": [],
+    }
+
+
+def _create_dated_pointers(repository: DocumentPointerRepository) -> list[str]:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    ids = []
+    for idx in range(4):
+        doc_ref.id = f"Y05868-99999-99999-99999{idx}"
+        repository.create(
+            DocumentPointer.from_document_reference(
+                doc_ref, created_on=f"2024-01-0{idx + 1}T09:00:00.000Z"
+            )
+        )
+        ids.append(doc_ref.id)
+
+    return ids
+
+
+@mock_aws
+@mock_repository
+def test_search_document_reference_newest_first_in_date_range(
+    repository: DocumentPointerRepository,
+):
+    ids = _create_dated_pointers(repository)
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        multi_value_query_string_parameters={
+            "subject:identifier": ["https://fhir.nhs.uk/Id/nhs-number|6700028191"],
+            "date": ["ge2024-01-02", "le2024-01-04"],
+            "_sort": ["-date"],
+            "_count": ["2"],
+        },
+    )
+    result = handler(event, create_mock_context())
+
+    assert result["statusCode"] == "200"
+    first_page = json.loads(result["body"])
+    assert [entry["resource"]["id"] for entry in first_page["entry"]] == [
+        ids[3],
+        ids[2],
+    ]
+
+    next_link = [link for link in first_page["link"] if link["relation"] == "next"]
+    next_params = parse_qs(urlparse(next_link[0]["url"]).query)
+    assert next_params["date"] == [
+        "ge2024-01-02T00:00:00.000Z",
+        "le2024-01-04T23:59:59.999Z",
+    ]
+    assert next_params["_sort"] == ["-date"]
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(), multi_value_query_string_parameters=next_params
+    )
+    result = handler(event, create_mock_context())
+
+    assert result["statusCode"] == "200"
+    second_page = json.loads(result["body"])
+    assert [entry["resource"]["id"] for entry in second_page["entry"]] == [ids[1]]
+    assert all(link["relation"] != "next" for link in second_page.get("link", []))
+
+
+@mock_aws
+@mock_repository
+def test_search_document_reference_invalid_date(
+    repository: DocumentPointerRepository,
+):
+    result = _search({"date": "ge2024-02-30"})
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "400",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body["issue"][0]["details"]["coding"][0]["code"] == (
+        "INVALID_PARAMETER"
+    )
+    assert parsed_body["issue"][0]["expression"] == ["date"]
@@ -1,13 +1,15 @@
-from pydantic import ValidationError
-
-from nrlf.core.codes import SpineErrorConcept
 from nrlf.core.decorators import DocumentPointerRepository, request_handler
-from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata, ProducerRequestParams
+from nrlf.core.pagination import get_next_link, get_search_context, get_start_key
 from nrlf.core.response import Response, SpineErrorResponse
-from nrlf.core.validators import validate_type_system
-from nrlf.producer.fhir.r4.model import Bundle, DocumentReference
+from nrlf.core.search import get_by_master_identifier, get_resources, get_search_link
+from nrlf.core.validators import (
+    filter_pointer_types_by_category,
+    validate_category,
+    validate_type_system,
+)
+from nrlf.producer.fhir.r4.model import DocumentReference
 
 
 @request_handler(body=ProducerRequestParams)
@@ -33,7 +35,7 @@ def handler(
 
     logger.log(LogReference.PROPOSTSEARCH000)
 
-    if not body.nhs_number:
+    if not body.nhs_number and (body.subject_identifier or not body.master_identifier):
         logger.log(
             LogReference.PROPOSTSEARCH001, subject_identifier=body.subject_identifier
         )
@@ -53,8 +55,24 @@ def handler(
             expression="type",
         )
 
+    if not validate_category(body.category):
+        logger.log(LogReference.PROPOSTSEARCH002a, category=body.category)
+        return SpineErrorResponse.INVALID_CODE_SYSTEM(
+            diagnostics="The provided category is not a supported category",
+            expression="category",
+        )
+
+    try:
+        created_from, created_to = body.created_window
+    except ValueError as exc:
+        logger.log(LogReference.PROPOSTSEARCH002b, date=body.date, error=str(exc))
+        return SpineErrorResponse.INVALID_PARAMETER(
+            diagnostics="Invalid query parameter (The provided date is not a valid date or dateTime)",
+            expression="date",
+        )
+
     pointer_types = [body.type.root] if body.type else metadata.pointer_types
-    bundle = {"resourceType": "Bundle", "type": "searchset", "total": 0, "entry": []}
+    pointer_types = filter_pointer_types_by_category(pointer_types, body.category)
 
     logger.log(
         LogReference.PROPOSTSEARCH003,
@@ -62,37 +80,99 @@ def handler(
         custodian_suffix=metadata.ods_code_extension,
         nhs_number=body.nhs_number,
         pointer_types=pointer_types,
+        created_from=created_from,
+        created_to=created_to,
+        newest_first=body.newest_first,
     )
 
-    for result in repository.search(
-        custodian=metadata.ods_code,
-        custodian_suffix=metadata.ods_code_extension,
-        nhs_number=body.nhs_number,
-        pointer_types=pointer_types,
-    ):
-        try:
-            document_reference = DocumentReference.model_validate_json(result.document)
-            bundle["total"] += 1
-            bundle["entry"].append(
-                {"resource": document_reference.model_dump(exclude_none=True)}
+    if not pointer_types:
+        logger.log(LogReference.PROPOSTSEARCH006, category=body.category)
+        return Response.from_searchset([])
+
+    last_evaluated_key = None
+    if body.master_identifier:
+        logger.log(
+            LogReference.PROPOSTSEARCH009,
+            custodian=metadata.ods_code,
+            custodian_suffix=metadata.ods_code_extension,
+            master_identifier=body.master_identifier,
+        )
+        results = get_by_master_identifier(
+            repository,
+            metadata.ods_code_parts,
+            body.master_identifier,
+            pointer_types,
+            nhs_number=body.nhs_number,
+        )
+    else:
+        search_context = get_search_context(
+            body.nhs_number,
+            pointer_types,
+            custodian=metadata.ods_code,
+            custodian_suffix=metadata.ods_code_extension,
+            created_from=created_from,
+            created_to=created_to,
+            newest_first=body.newest_first,
+        )
+        start_key = get_start_key(
+            body.next_page_token.root if body.next_page_token else None,
+            search_context,
+            LogReference.PROPOSTSEARCH007,
+        )
+
+        if body.count:
+            results, last_evaluated_key = repository.search_page(
+                custodian=metadata.ods_code,
+                custodian_suffix=metadata.ods_code_extension,
+                nhs_number=body.nhs_number,
+                pointer_types=pointer_types,
+                limit=body.count.root,
+                start_key=start_key,
+                fields=["document"],
+                created_from=created_from,
+                created_to=created_to,
+                newest_first=body.newest_first,
             )
-            logger.log(
-                LogReference.PROPOSTSEARCH004,
-                id=document_reference.id,
-                count=bundle["total"],
+        else:
+            results = repository.search(
+                custodian=metadata.ods_code,
+                custodian_suffix=metadata.ods_code_extension,
+                nhs_number=body.nhs_number,
+                pointer_types=pointer_types,
+                start_key=start_key,
+                fields=["document"],
+                created_from=created_from,
+                created_to=created_to,
+                newest_first=body.newest_first,
             )
 
-        except ValidationError as exc:
-            logger.log(
-                LogReference.PROPOSTSEARCH005, error=str(exc), document=result.document
-            )
-            raise OperationOutcomeError(
-                status_code="500",
-                severity="error",
-                code="exception",
-                details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
-                diagnostics="An error occurred whilst parsing the document reference search results",
+    resources = get_resources(
+        repository,
+        results,
+        DocumentReference,
+        invalid_log_reference=LogReference.PROPOSTSEARCH005,
+        found_log_reference=LogReference.PROPOSTSEARCH004,
+    )
+
+    link = []
+    if last_evaluated_key:
+        logger.log(LogReference.PROPOSTSEARCH008, last_evaluated_key=last_evaluated_key)
+        link.append(
+            get_next_link(
+                get_search_link(
+                    "producer",
+                    body.nhs_number,
+                    pointer_type=body.type.root if body.type else None,
+                    category=body.category.root if body.category else None,
+                    created_from=created_from,
+                    created_to=created_to,
+                    newest_first=body.newest_first,
+                ),
+                body.count.root,
+                last_evaluated_key,
+                search_context,
             )
+        )
 
     logger.log(LogReference.PROPOSTSEARCH999)
-    return Response.from_resource(Bundle.model_validate(bundle))
+    return Response.from_searchset(resources, link=link)
@@ -1,4 +1,5 @@
 import json
+from unittest.mock import patch
 
 from freezegun import freeze_time
 from moto import mock_aws
@@ -8,6 +9,10 @@ from api.producer.updateDocumentReference.update_document_reference import (
     _set_update_time_fields,
     handler,
 )
+from nrlf.core.dynamodb.attribute_values import (
+    deserialize_document_pointer,
+    serialize_document_pointer,
+)
 from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
 from nrlf.producer.fhir.r4.model import DocumentReference
 from nrlf.tests.data import load_document_reference
@@ -811,6 +816,78 @@ def test_update_document_reference_with_invalid_date_ignored(
     assert updated_doc_ref.date == "2024-03-20T00:00:01.000Z"
 
 
+@mock_aws
+@mock_repository
+def test_update_document_reference_written_in_place(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid-with-date")
+    repository.create(DocumentPointer.from_document_reference(doc_ref))
+
+    doc_ref.docStatus = "entered-in-error"
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        path_parameters={"id": "Y05868-99999-99999-999999"},
+        body=doc_ref.model_dump_json(),
+    )
+
+    with patch.object(DocumentPointerRepository, "update") as mock_update:
+        result = handler(event, create_mock_context())
+
+    assert result["statusCode"] == "200"
+    mock_update.assert_not_called()
+
+    updated_doc_pointer = repository.get_by_id("Y05868-99999-99999-999999")
+    updated_doc_ref = DocumentReference.model_validate_json(
+        updated_doc_pointer.document
+    )
+    assert updated_doc_ref.docStatus == "entered-in-error"
+
+
+@mock_aws
+@mock_repository
+@freeze_time("2024-03-21T12:34:56.789")
+def test_update_document_reference_without_stored_fingerprint(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_pointer = DocumentPointer.from_document_reference(
+        doc_ref, created_on="2024-01-01T00:00:00.000Z"
+    )
+    item = doc_pointer.model_dump()
+    item.pop("update_fingerprint")
+    repository.client.put_item(
+        TableName=repository.table_name, Item=serialize_document_pointer(item)
+    )
+
+    doc_ref.docStatus = "entered-in-error"
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        path_parameters={"id": "Y05868-99999-99999-999999"},
+        body=doc_ref.model_dump_json(),
+    )
+
+    result = handler(event, create_mock_context())
+
+    assert result["statusCode"] == "200"
+
+    updated_item = deserialize_document_pointer(
+        repository.client.get_item(
+            TableName=repository.table_name,
+            Key=serialize_document_pointer(
+                {"pk": doc_pointer.pk, "sk": doc_pointer.sk}
+            ),
+        )["Item"]
+    )
+    assert updated_item["created_on"] == "2024-01-01T00:00:00.000Z"
+    assert updated_item["updated_on"] == "2024-03-21T12:34:56.789Z"
+    assert updated_item["update_fingerprint"] == doc_pointer.update_fingerprint
+    assert (
+        DocumentReference.model_validate_json(updated_item["document"]).docStatus
+        == "entered-in-error"
+    )
+
+
 @mock_aws
 @mock_repository
 def test_update_document_reference_existing_invalid_json(
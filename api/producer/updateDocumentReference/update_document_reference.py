@@ -4,7 +4,11 @@ from pydantic import ValidationError
 
 from nrlf.core.codes import SpineErrorConcept
 from nrlf.core.decorators import DocumentPointerRepository, request_handler
-from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.core.dynamodb.model import (
+    IMMUTABLE_FIELDS,
+    PRESERVED_FIELDS,
+    DocumentPointer,
+)
 from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata, UpdateDocumentReferencePathParams
@@ -71,13 +75,27 @@ def handler(
             diagnostics="The id of the provided DocumentReference does not include the expected ODS code for this organisation"
         )
 
+    document_pointer_update = DocumentPointer.from_document_reference(
+        document_reference
+    )
+    document_pointer_update.updated_on = update_time
+
+    # Where the immutable and preserved fields are unchanged, a single
+    # conditional write applies the update without reading the stored pointer
+    updated, existing_model = repository.update_in_place(document_pointer_update)
+    if updated:
+        logger.log(LogReference.PROUPDATE008)
+        logger.log(LogReference.PROUPDATE999)
+        return NRLResponse.RESOURCE_UPDATED()
+
     pointer_id = urllib.parse.quote_plus(path.id)
-    if not (existing_model := repository.get_by_id(pointer_id)):
+    if not existing_model:
         logger.log(LogReference.PROUPDATE005, pointer_id=pointer_id)
         return SpineErrorResponse.NO_RECORD_FOUND(
             diagnostics="The requested DocumentReference could not be found"
         )
 
+    logger.log(LogReference.PROUPDATE009, pointer_id=pointer_id)
     try:
         existing_resource = DocumentReference.model_validate_json(
             existing_model.document
@@ -92,8 +110,7 @@ def handler(
             diagnostics="An error occurred whilst parsing the existing document reference",
         )
 
-    preserved_fields = ["date"]
-    for field in preserved_fields:
+    for field in PRESERVED_FIELDS:
         provided_field = getattr(result.resource, field, None)
         existing_field = getattr(existing_resource, field, None)
         if provided_field and provided_field != existing_field:
@@ -104,18 +121,7 @@ def handler(
             )
         setattr(document_reference, field, existing_field)
 
-    immutable_fields = [
-        "masterIdentifier",
-        "id",
-        "identifier",
-        "status",
-        "type",
-        "subject",
-        "custodian",
-        "relatesTo",
-        "author",
-    ]
-    for field in immutable_fields:
+    for field in IMMUTABLE_FIELDS:
         if getattr(result.resource, field) != getattr(existing_resource, field):
             logger.log(LogReference.PROUPDATE006, field=field)
             return SpineErrorResponse.BAD_REQUEST(
@@ -129,7 +135,7 @@ def handler(
     document_pointer_update.created_on = existing_model.created_on
     document_pointer_update.updated_on = update_time
 
-    repository.update(document_pointer_update)
+    repository.update(document_pointer_update, previous_item=existing_model)
 
     logger.log(LogReference.PROUPDATE999)
     return NRLResponse.RESOURCE_UPDATED()
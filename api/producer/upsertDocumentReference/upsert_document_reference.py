@@ -5,7 +5,11 @@ from nrlf.core.constants import (
     TYPE_CATEGORIES,
 )
 from nrlf.core.decorators import request_handler
-from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
+from nrlf.core.dynamodb.repository import (
+    DELETE_FIELDS,
+    DocumentPointer,
+    DocumentPointerRepository,
+)
 from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata
@@ -117,21 +121,29 @@ def _get_document_ids_to_supersede(
         return []
 
     logger.log(LogReference.PROUPSERT006, relatesTo=resource.relatesTo)
-    ids_to_delete = []
+    identifiers = []
 
     for idx, relates_to in enumerate(resource.relatesTo):
         identifier = _validate_identifier(relates_to, idx)
         _validate_producer_id(identifier, metadata, idx)
-        if can_ignore_delete_fail:
-            logger.log(
-                LogReference.PROUPSERT006a,
-                pointer_id=resource.id,
-                relatesTo=resource.relatesTo,
+        identifiers.append(identifier)
+
+    if can_ignore_delete_fail:
+        logger.log(
+            LogReference.PROUPSERT006a,
+            pointer_id=resource.id,
+            relatesTo=resource.relatesTo,
+        )
+    else:
+        existing_pointers = repository.get_many_by_id(identifiers, fields=DELETE_FIELDS)
+        for idx, identifier in enumerate(identifiers):
+            existing_pointer = _check_existing_pointer(
+                identifier, existing_pointers, idx
             )
-        else:
-            existing_pointer = _check_existing_pointer(identifier, repository, idx)
             _validate_pointer_details(existing_pointer, core_model, identifier, idx)
 
+    ids_to_delete = []
+    for relates_to, identifier in zip(resource.relatesTo, identifiers):
         _append_id_if_replaces(relates_to, ids_to_delete, identifier)
 
     return ids_to_delete
@@ -167,11 +179,11 @@ def _validate_producer_id(identifier, metadata, idx):
         )
 
 
-def _check_existing_pointer(identifier, repository, idx):
+def _check_existing_pointer(identifier, existing_pointers, idx):
     """
     Check that there is an existing pointer that will be deleted when superseding
     """
-    existing_pointer = repository.get_by_id(identifier)
+    existing_pointer = existing_pointers.get(identifier)
     if not existing_pointer:
         logger.log(LogReference.PROUPSERT007c, related_identifier=identifier)
         _raise_operation_outcome_error(
@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+from enum import Enum
 from typing import Annotated, List, Literal, Optional
 
 from pydantic import BaseModel, Field, RootModel
@@ -397,10 +398,32 @@ class RequestQueryType(RootModel[str]):
     root: Annotated[str, Field(examples=["http://snomed.info/sct|736253002"])]
 
 
+class RequestQueryCategory(RootModel[str]):
+    root: Annotated[str, Field(examples=["http://snomed.info/sct|734163000"])]
+
+
 class NextPageToken(RootModel[str]):
     root: str
 
 
+class RequestQueryCount(RootModel[int]):
+    root: Annotated[int, Field(ge=1, le=100)]
+
+
+class RequestQueryDate(RootModel[str]):
+    root: Annotated[
+        str,
+        Field(
+            examples=["ge2024-01-01"],
+            pattern="^(eq|ge|gt|le|lt)?\\d{4}-\\d{2}-\\d{2}(T\\d{2}:\\d{2}:\\d{2}(\\.\\d{1,6})?(Z|[+-]\\d{2}:\\d{2}))?$",
+        ),
+    ]
+
+
+class RequestQuerySort(Enum):
+    field_date = "-date"
+
+
 class RequestHeaderOdsCode(RootModel[str]):
     root: str
 
@@ -435,9 +458,34 @@ class RequestParams(BaseModel):
         Optional[RequestQueryCustodian], Field(alias="custodian:identifier")
     ] = None
     type: Optional[RequestQueryType] = None
+    category: Optional[RequestQueryCategory] = None
+    date: Optional[List[RequestQueryDate]] = None
+    sort: Annotated[Optional[RequestQuerySort], Field(alias="_sort")] = None
+    next_page_token: Annotated[
+        Optional[NextPageToken], Field(alias="next-page-token")
+    ] = None
+    count: Annotated[Optional[RequestQueryCount], Field(alias="_count")] = None
+
+
+class SearchPostRequestParams(BaseModel):
+    subject_identifier: Annotated[
+        Optional[RequestQuerySubject], Field(alias="subject:identifier")
+    ] = None
+    subject_identifiers: Annotated[
+        Optional[List[RequestQuerySubject]],
+        Field(alias="subject:identifiers", min_length=1),
+    ] = None
+    custodian_identifier: Annotated[
+        Optional[RequestQueryCustodian], Field(alias="custodian:identifier")
+    ] = None
+    type: Optional[RequestQueryType] = None
+    category: Optional[RequestQueryCategory] = None
+    date: Optional[List[RequestQueryDate]] = None
+    sort: Annotated[Optional[RequestQuerySort], Field(alias="_sort")] = None
     next_page_token: Annotated[
         Optional[NextPageToken], Field(alias="next-page-token")
     ] = None
+    count: Annotated[Optional[RequestQueryCount], Field(alias="_count")] = None
 
 
 class CountRequestParams(BaseModel):
@@ -1,18 +1,47 @@
 import functools
+from typing import Optional
 
 import boto3
+from botocore.config import Config as BotocoreConfig
 
-from nrlf.core.types import DynamoDBServiceResource, S3Client
+from nrlf.core.config import BotoConfig
+from nrlf.core.dynamodb.attribute_values import serialize_item
+from nrlf.core.types import DynamoDBClient, DynamoDBServiceResource, S3Client
+
+# The key of an item that never exists, read to open a connection to DynamoDB
+PRIME_ITEM_KEY = {"pk": "D#NRLF-PRIME", "sk": "D#NRLF-PRIME"}
+
+
+@functools.cache
+def get_botocore_config() -> BotocoreConfig:
+    """
+    Returns the connection pool, timeout and retry settings used by all clients
+    """
+    config = BotoConfig()
+    return BotocoreConfig(
+        max_pool_connections=config.BOTO_MAX_POOL_CONNECTIONS,
+        connect_timeout=config.BOTO_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=config.BOTO_READ_TIMEOUT_SECONDS,
+        retries={
+            "max_attempts": config.BOTO_MAX_ATTEMPTS,
+            "mode": config.BOTO_RETRY_MODE,
+        },
+        tcp_keepalive=config.BOTO_TCP_KEEPALIVE,
+    )
 
 
 @functools.cache
 def get_boto3_client(service_name: str):
-    return boto3.client(service_name)  # type: ignore
+    return boto3.client(service_name, config=get_botocore_config())  # type: ignore
 
 
 @functools.cache
 def get_boto3_resource(service_name: str):
-    return boto3.resource(service_name)  # type: ignore
+    return boto3.resource(service_name, config=get_botocore_config())  # type: ignore
+
+
+def get_dynamodb_client() -> DynamoDBClient:
+    return get_boto3_client("dynamodb")
 
 
 def get_dynamodb_resource() -> DynamoDBServiceResource:
@@ -26,3 +55,20 @@ def get_dynamodb_table(table_name: str):
 
 def get_s3_client() -> S3Client:
     return get_boto3_client("s3")
+
+
+def prime_clients(table_name: Optional[str] = None):
+    """
+    Create the shared clients, and open a connection to the table if one is
+    provided, so the first request does not pay for credential loading,
+    endpoint resolution or the TLS handshake
+    """
+    get_s3_client()
+    client = get_dynamodb_client()
+
+    if table_name:
+        client.get_item(
+            TableName=table_name,
+            Key=serialize_item(PRIME_ITEM_KEY),
+            ProjectionExpression="pk",
+        )
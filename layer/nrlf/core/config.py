@@ -1,8 +1,27 @@
+from typing import Literal, Optional
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
-class Config(BaseSettings):
+class BotoConfig(BaseSettings):
+    """
+    The Environment Variables used to tune the AWS clients. These all have
+    defaults, so the clients can be built wherever the layer is used.
+    """
+
+    BOTO_MAX_POOL_CONNECTIONS: int = Field(default=20)
+    BOTO_CONNECT_TIMEOUT_SECONDS: float = Field(default=2)
+    BOTO_READ_TIMEOUT_SECONDS: float = Field(default=5)
+    BOTO_MAX_ATTEMPTS: int = Field(default=3)
+    BOTO_RETRY_MODE: Literal["legacy", "standard", "adaptive"] = Field(
+        default="adaptive"
+    )
+    BOTO_TCP_KEEPALIVE: bool = Field(default=True)
+    BOTO_PRIME_CLIENTS: bool = Field(default=True)
+
+
+class Config(BotoConfig):
     """
     The Config class defines all the Environment Variables that are needed for
     the business logic to execute successfully.
@@ -21,3 +40,16 @@ class Config(BaseSettings):
     SOURCE: str = Field(default=...)
     AUTH_STORE: str = Field(default=...)
     TABLE_NAME: str = Field(default=...)
+    REPOSITORY_BACKEND: Literal["dynamodb", "memory"] = Field(default="dynamodb")
+    STRICT_READ_VALIDATION: bool = Field(default=False)
+    DOCUMENT_ENCODING: Literal["json", "zlib"] = Field(default="json")
+    CUSTODIAN_INDEX_ENABLED: bool = Field(default=False)
+    PRODUCER_INDEX_ENABLED: bool = Field(default=False)
+    POINTER_COUNTS_ENABLED: bool = Field(default=False)
+    PAGE_TOKEN_KEY: Optional[str] = Field(default=None)
+    POINTER_CACHE_MAX_BYTES: int = Field(default=0)
+    POINTER_CACHE_TTL_SECONDS: float = Field(default=300)
+    POINTER_CACHE_REVALIDATE_SECONDS: float = Field(default=30)
+    TRANSACTION_MAX_ENTRIES: int = Field(default=1000)
+    SEARCH_MAX_NHS_NUMBERS: int = Field(default=50)
+    SEARCH_MAX_RESULTS: int = Field(default=1000)
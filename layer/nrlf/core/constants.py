@@ -31,6 +31,7 @@ CONNECTION_METADATA = "nhsd-connection-metadata"
 PERMISSION_AUDIT_DATES_FROM_PAYLOAD = "audit-dates-from-payload"
 PERMISSION_SUPERSEDE_IGNORE_DELETE_FAIL = "supersede-ignore-delete-fail"
 PERMISSION_ALLOW_ALL_POINTER_TYPES = "allow-all-pointer-types"
+PERMISSION_IDEMPOTENT_CREATE = "idempotent-create"
 
 
 NHSD_REQUEST_ID_HEADER = "NHSD-Request-Id"
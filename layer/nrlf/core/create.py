@@ -0,0 +1,78 @@
+from nrlf.core.constants import PERMISSION_AUDIT_DATES_FROM_PAYLOAD, TYPE_CATEGORIES
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.core.logger import LogReference, logger
+from nrlf.core.model import ConnectionMetadata
+from nrlf.core.response import Response, SpineErrorResponse
+from nrlf.producer.fhir.r4.model import DocumentReference, Meta
+
+
+def set_create_time_fields(
+    create_time: str, document_reference: DocumentReference, nrl_permissions: list[str]
+) -> DocumentReference:
+    """
+    Set the date and lastUpdated timestamps on the provided DocumentReference
+    """
+    if not document_reference.meta:
+        document_reference.meta = Meta()
+    document_reference.meta.lastUpdated = create_time
+
+    if (
+        document_reference.date
+        and PERMISSION_AUDIT_DATES_FROM_PAYLOAD in nrl_permissions
+    ):
+        # Perserving the original date if it exists and the permission is set
+        logger.log(
+            LogReference.PROCREATE011,
+            id=document_reference.id,
+            date=document_reference.date,
+        )
+    else:
+        document_reference.date = create_time
+
+    return document_reference
+
+
+def check_create_permissions(
+    core_model: DocumentPointer, metadata: ConnectionMetadata
+) -> Response | None:
+    """
+    Check the requester has permissions to create the DocumentReference
+    """
+    custodian_parts = tuple(
+        filter(None, (core_model.custodian, core_model.custodian_suffix))
+    )
+    if metadata.ods_code_parts != custodian_parts:
+        logger.log(
+            LogReference.PROCREATE004,
+            ods_code_parts=metadata.ods_code_parts,
+            custodian_parts=custodian_parts,
+        )
+        return SpineErrorResponse.BAD_REQUEST(
+            diagnostics="The custodian of the provided DocumentReference does not match the expected ODS code for this organisation",
+            expression="custodian.identifier.value",
+        )
+
+    if core_model.type not in metadata.pointer_types:
+        logger.log(
+            LogReference.PROCREATE005,
+            ods_code=metadata.ods_code,
+            type=core_model.type,
+            pointer_types=metadata.pointer_types,
+        )
+        return SpineErrorResponse.AUTHOR_CREDENTIALS_ERROR(
+            diagnostics="The type of the provided DocumentReference is not in the list of allowed types for this organisation",
+            expression="type.coding[0].code",
+        )
+
+    type_category = TYPE_CATEGORIES.get(core_model.type)
+    if type_category != core_model.category:
+        logger.log(
+            LogReference.PROCREATE005a,
+            ods_code=metadata.ods_code,
+            type=core_model.type,
+            category=core_model.category,
+        )
+        return SpineErrorResponse.BAD_REQUEST(
+            diagnostics=f"The Category code of the provided document '{core_model.category}' must match the allowed category for pointer type '{core_model.type}' with a category value of '{type_category}'",
+            expression="category.coding[0].code",
+        )
@@ -1,8 +1,10 @@
+import asyncio
 import functools
 import inspect
+import os
 import sys
 import warnings
-from typing import Any, Callable, Dict, Optional, Type, Union
+from typing import Any, Awaitable, Callable, Dict, Optional, Type, Union
 
 from aws_lambda_powertools.utilities.data_classes import (
     APIGatewayProxyEvent,
@@ -12,8 +14,9 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 from pydantic import BaseModel
 
 from nrlf.core.authoriser import get_pointer_types, parse_permissions_file
+from nrlf.core.boto import prime_clients
 from nrlf.core.codes import SpineErrorConcept
-from nrlf.core.config import Config
+from nrlf.core.config import BotoConfig, Config
 from nrlf.core.constants import (
     NHSD_CORRELATION_ID_HEADER,
     PERMISSION_ALLOW_ALL_POINTER_TYPES,
@@ -21,13 +24,15 @@ from nrlf.core.constants import (
     X_REQUEST_ID_HEADER,
     PointerTypes,
 )
+from nrlf.core.dynamodb.async_repository import AsyncDocumentPointerRepository
+from nrlf.core.dynamodb.cache import get_pointer_cache
 from nrlf.core.dynamodb.repository import DocumentPointerRepository
 from nrlf.core.errors import OperationOutcomeError, ParseError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.request import parse_body, parse_headers, parse_params, parse_path
 from nrlf.core.response import Response
 
-RequestHandler = Callable[..., Response]
+RequestHandler = Callable[..., Union[Response, Awaitable[Response]]]
 
 
 def error_handler(
@@ -66,7 +71,7 @@ def error_handler(
 
 
 def header_handler(
-    wrapped_func: Callable[..., Dict[str, Any]]
+    wrapped_func: Callable[..., Dict[str, Any]],
 ) -> Callable[..., Dict[str, Any]]:
     """
     Wraps the function to set the specific headers in the request and response
@@ -110,7 +115,7 @@ def header_handler(
 
 
 def logger_initialiser(
-    wrapper_func: Callable[..., Dict[str, Any]]
+    wrapper_func: Callable[..., Dict[str, Any]],
 ) -> Callable[..., Dict[str, Any]]:
     """
     Wraps the function and initialises the request logger
@@ -197,6 +202,27 @@ def verify_request_ids(event: APIGatewayProxyEvent):
         )
 
 
+def prime_lambda_clients():
+    """
+    Prime the shared AWS clients while the Lambda function is initialising,
+    which happens before the first request is received
+    """
+    if not os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+        return
+
+    if not BotoConfig().BOTO_PRIME_CLIENTS:
+        logger.log(LogReference.HANDLER018a)
+        return
+
+    table_name = os.getenv("TABLE_NAME")
+    try:
+        prime_clients(table_name)
+        logger.log(LogReference.HANDLER018, table_name=table_name)
+    except Exception as exc:
+        # The clients are still usable, the first request will connect instead
+        logger.log(LogReference.HANDLER019, error=str(exc))
+
+
 def basic_handler(
     event: APIGatewayProxyEvent,
     context: LambdaContext,
@@ -225,6 +251,9 @@ def request_handler(
     """
     Decorator for request handlers.
 
+    An async handler is run to completion in its own event loop and is given
+    an AsyncDocumentPointerRepository, so it can gather independent calls.
+
     Args:
         params (Optional[Type[BaseModel]]): The parameter model to parse query string parameters.
         body (Optional[Type[BaseModel]]): The body model to parse request body.
@@ -236,6 +265,8 @@ def request_handler(
     """
 
     def wrapped_func(func: RequestHandler):
+        prime_lambda_clients()
+
         def wrapper(*args, **kwargs):
             event: APIGatewayProxyEvent = args[0]
             context: LambdaContext = args[1]
@@ -275,18 +306,60 @@ def request_handler(
                 "context": context,
                 "config": metadata,
                 "metadata": metadata,
-                "params": parse_params(params, event.query_string_parameters),
+                "params": parse_params(
+                    params,
+                    event.query_string_parameters,
+                    event.multi_value_query_string_parameters,
+                ),
                 "body": parse_body(body, event.body),
                 "path": parse_path(path, event.path_parameters),
             }
 
             if repository is not None:
-                kwargs["repository"] = repository(table_name=config.TABLE_NAME)
+                repository_class = repository
+                if (
+                    repository is DocumentPointerRepository
+                    and config.REPOSITORY_BACKEND == "memory"
+                ):
+                    # Imported here so the in-memory backend is only loaded
+                    # by the local and test deployments that use it
+                    from nrlf.core.dynamodb.memory import (
+                        InMemoryDocumentPointerRepository,
+                    )
+
+                    repository_class = InMemoryDocumentPointerRepository
+
+                kwargs["repository"] = repository_class(
+                    table_name=config.TABLE_NAME,
+                    strict_read_validation=config.STRICT_READ_VALIDATION,
+                    pointer_cache=(
+                        get_pointer_cache(
+                            config.POINTER_CACHE_MAX_BYTES,
+                            config.POINTER_CACHE_TTL_SECONDS,
+                            config.POINTER_CACHE_REVALIDATE_SECONDS,
+                        )
+                        if config.POINTER_CACHE_MAX_BYTES
+                        else None
+                    ),
+                    document_encoding=config.DOCUMENT_ENCODING,
+                    custodian_index_enabled=config.CUSTODIAN_INDEX_ENABLED,
+                    producer_index_enabled=config.PRODUCER_INDEX_ENABLED,
+                    pointer_counts_enabled=config.POINTER_COUNTS_ENABLED,
+                )
+
+            is_async = inspect.iscoroutinefunction(func)
+            if is_async and "repository" in kwargs:
+                kwargs["repository"] = AsyncDocumentPointerRepository(
+                    kwargs["repository"]
+                )
 
             function_kwargs = filter_kwargs(func, kwargs)
 
-            logger.log(LogReference.HANDLER013)
-            response = func(**function_kwargs)
+            logger.log(LogReference.HANDLER013, is_async=is_async)
+            if is_async:
+                response = asyncio.run(func(**function_kwargs))
+            else:
+                response = func(**function_kwargs)
 
             logger.log(
                 LogReference.HANDLER999,
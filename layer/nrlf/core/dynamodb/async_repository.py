@@ -0,0 +1,76 @@
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+
+MAX_ASYNC_REPOSITORY_WORKERS = 8
+
+Result = TypeVar("Result")
+
+
+@functools.cache
+def get_repository_executor(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Returns the executor shared by all async repositories in this container,
+    so its threads and their connections are reused between requests
+    """
+    return ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="async-repository"
+    )
+
+
+class AsyncDocumentPointerRepository:
+    """
+    Asyncio interface to a DocumentPointerRepository
+
+    Each call runs the synchronous repository method on a shared executor, so
+    independent calls made by a handler can be awaited together with
+    asyncio.gather rather than one after another. An async method is built
+    below for every public DocumentPointerRepository method.
+    """
+
+    def __init__(
+        self,
+        repository: DocumentPointerRepository,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.repository = repository
+        self.executor = executor or get_repository_executor(
+            MAX_ASYNC_REPOSITORY_WORKERS
+        )
+
+    async def _run(self, func: Callable[..., Result], *args, **kwargs) -> Result:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+
+def _async_method(name: str) -> Callable[..., Awaitable[Any]]:
+    """
+    Build the async method that runs the named DocumentPointerRepository
+    method on the executor
+
+    Generator methods, such as search, are read in full on the executor rather
+    than yielded lazily.
+    """
+    method = getattr(DocumentPointerRepository, name)
+    read_in_full = inspect.isgeneratorfunction(method)
+
+    @functools.wraps(method)
+    async def async_method(self: AsyncDocumentPointerRepository, *args, **kwargs):
+        func = getattr(self.repository, name)
+        if read_in_full:
+            return await self._run(lambda: list(func(*args, **kwargs)))
+
+        return await self._run(func, *args, **kwargs)
+
+    return async_method
+
+
+for _name, _ in inspect.getmembers(DocumentPointerRepository, inspect.isfunction):
+    if not _name.startswith("_"):
+        setattr(AsyncDocumentPointerRepository, _name, _async_method(_name))
@@ -0,0 +1,115 @@
+from decimal import Decimal
+from typing import Any, Dict
+
+from boto3.dynamodb.types import Binary
+
+AttributeValue = Dict[str, Any]
+AttributeValueMap = Dict[str, AttributeValue]
+
+# Every stored DocumentPointer attribute is a string apart from these, so
+# pointers are converted without inspecting the type of each value. Optional
+# fields that are unset are stored as NULL, and a document stored in a
+# compressed encoding as binary.
+DOCUMENT_POINTER_NUMBER_FIELDS = frozenset({"version"})
+
+
+def serialize_value(value: Any) -> AttributeValue:
+    """
+    Convert a Python value to a low-level DynamoDB AttributeValue
+    """
+    value_type = type(value)
+    if value_type is str:
+        return {"S": value}
+    if value is None:
+        return {"NULL": True}
+    if value_type is bool:
+        return {"BOOL": value}
+    if value_type is int or value_type is Decimal:
+        return {"N": str(value)}
+    if value_type is bytes or value_type is bytearray:
+        return {"B": bytes(value)}
+    if value_type is Binary:
+        return {"B": value.value}
+    if value_type is list or value_type is tuple:
+        return {"L": [serialize_value(element) for element in value]}
+    if value_type is dict:
+        return {"M": serialize_item(value)}
+
+    raise TypeError(f"Unsupported DynamoDB attribute type: {value_type.__name__}")
+
+
+def deserialize_value(value: AttributeValue) -> Any:
+    """
+    Convert a low-level DynamoDB AttributeValue to a Python value, with
+    numbers as int unless they have a fractional part
+    """
+    if "S" in value:
+        return value["S"]
+    if "N" in value:
+        try:
+            return int(value["N"])
+        except ValueError:
+            return Decimal(value["N"])
+    if "NULL" in value:
+        return None
+    if "BOOL" in value:
+        return value["BOOL"]
+    if "B" in value:
+        return value["B"]
+    if "L" in value:
+        return [deserialize_value(element) for element in value["L"]]
+    if "M" in value:
+        return deserialize_item(value["M"])
+
+    raise TypeError(f"Unsupported DynamoDB attribute type: {next(iter(value), None)}")
+
+
+def serialize_item(item: Dict[str, Any]) -> AttributeValueMap:
+    """
+    Convert an item, key or set of expression attribute values to AttributeValues
+    """
+    return {name: serialize_value(value) for name, value in item.items()}
+
+
+def deserialize_item(item: AttributeValueMap) -> Dict[str, Any]:
+    """
+    Convert an item or key of AttributeValues to Python values
+    """
+    return {name: deserialize_value(value) for name, value in item.items()}
+
+
+def serialize_document_pointer(item: Dict[str, Any]) -> AttributeValueMap:
+    """
+    Convert a DocumentPointer item, as returned by model_dump, to AttributeValues
+    """
+    serialized = {}
+    for name, value in item.items():
+        if type(value) is str:
+            serialized[name] = {"S": value}
+        elif value is None:
+            serialized[name] = {"NULL": True}
+        elif name in DOCUMENT_POINTER_NUMBER_FIELDS:
+            serialized[name] = {"N": str(value)}
+        else:
+            serialized[name] = serialize_value(value)
+
+    return serialized
+
+
+def deserialize_document_pointer(item: AttributeValueMap) -> Dict[str, Any]:
+    """
+    Convert a DocumentPointer item of AttributeValues, or a projection of one,
+    to the values DocumentPointer.from_dynamo expects
+    """
+    values = {}
+    for name, value in item.items():
+        if "S" in value:
+            values[name] = value["S"]
+        elif name in DOCUMENT_POINTER_NUMBER_FIELDS:
+            values[name] = int(value["N"])
+        elif "NULL" in value:
+            values[name] = None
+        else:
+            values[name] = deserialize_value(value)
+
+    return values
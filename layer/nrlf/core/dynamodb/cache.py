@@ -0,0 +1,142 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from nrlf.core.dynamodb.model import DocumentPointer
+
+# Approximate size of an entry excluding the stored document
+ENTRY_OVERHEAD_BYTES = 512
+
+VersionStamp = Optional[Tuple[int, Optional[str]]]
+
+
+def get_version_stamp(pointer: Optional[DocumentPointer]) -> VersionStamp:
+    """
+    Returns the version stamp used to check a cached pointer is current,
+    which is None for a pointer that does not exist
+
+    Pointer versions are not incremented on update, so it is updated_on, set
+    by every update, that tells the stored pointer has changed.
+    """
+    if pointer is None:
+        return None
+
+    return int(pointer.version), pointer.updated_on
+
+
+@dataclass
+class CacheEntry:
+    pointer: Optional[DocumentPointer]
+    stamp: VersionStamp
+    size: int
+    expires_at: float
+    revalidate_at: float
+
+
+class PointerCache:
+    """
+    Bounded LRU cache of get_by_id results, including pointers that do not exist
+
+    Entries expire after ttl_seconds. After revalidate_seconds an entry is only
+    reused once its version stamp has been checked against the stored item.
+
+    That check is a GetItem projected to the stamp, which DynamoDB charges as a
+    full read of the item. So a revalidated hit saves the transfer and parsing
+    of the document, not read capacity. Only hits within revalidate_seconds of
+    the last check save a read.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float, revalidate_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.revalidate_seconds = revalidate_seconds
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, id_: str) -> Optional[CacheEntry]:
+        """
+        Get the entry for a pointer ID, or None if it is not cached or has expired
+        """
+        with self._lock:
+            entry = self._entries.get(id_)
+            if entry and entry.expires_at <= time.monotonic():
+                self._remove(id_)
+                entry = None
+
+            if not entry:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(id_)
+            self.hits += 1
+            return entry
+
+    def put(self, id_: str, pointer: Optional[DocumentPointer]):
+        """
+        Cache the result of reading a pointer ID, evicting the least recently
+        used entries to stay within max_bytes
+        """
+        size = ENTRY_OVERHEAD_BYTES + (len(pointer.document) if pointer else 0)
+        if size > self.max_bytes:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            self._remove(id_)
+            while self._entries and self.size + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+            self._entries[id_] = CacheEntry(
+                pointer=pointer,
+                stamp=get_version_stamp(pointer),
+                size=size,
+                expires_at=now + self.ttl_seconds,
+                revalidate_at=now + self.revalidate_seconds,
+            )
+            self.size += size
+
+    def revalidated(self, id_: str):
+        """
+        Mark an entry as checked against the stored item
+        """
+        with self._lock:
+            if entry := self._entries.get(id_):
+                entry.revalidate_at = time.monotonic() + self.revalidate_seconds
+
+    def invalidate(self, id_: str):
+        """
+        Remove a pointer ID from the cache after it has been written
+        """
+        with self._lock:
+            self._remove(id_)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size_bytes": self.size,
+        }
+
+    def _remove(self, id_: str):
+        if entry := self._entries.pop(id_, None):
+            self.size -= entry.size
+
+
+@functools.cache
+def get_pointer_cache(
+    max_bytes: int, ttl_seconds: float, revalidate_seconds: float
+) -> PointerCache:
+    """
+    Returns the pointer cache shared by all requests handled by this container
+    """
+    return PointerCache(max_bytes, ttl_seconds, revalidate_seconds)
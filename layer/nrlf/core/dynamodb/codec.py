@@ -0,0 +1,71 @@
+import functools
+import pathlib
+import zlib
+from typing import Any, Dict, Literal, Union
+
+from boto3.dynamodb.types import Binary
+
+DocumentEncoding = Literal["json", "zlib"]
+
+# Encoded documents are stored as binary, starting with a marker byte that
+# identifies the format. Documents stored as a string are plain JSON, so items
+# written in either format can be read side by side.
+ZLIB_V1_MARKER = b"\x01"
+
+# A preset dictionary is fixed for the lifetime of its marker, so a retrained
+# dictionary must be added under a new marker rather than replacing this one
+DICTIONARY_FILES: Dict[bytes, str] = {ZLIB_V1_MARKER: "document-v1.zdict"}
+DICTIONARIES_PATH = pathlib.Path(__file__).parent / "dictionaries"
+
+# zlib only uses the last 32KB of a preset dictionary
+MAX_DICTIONARY_BYTES = 32768
+
+ZLIB_LEVEL = 9
+
+
+@functools.cache
+def get_dictionary(marker: bytes) -> bytes:
+    """
+    Returns the preset dictionary for a document format marker
+    """
+    return (DICTIONARIES_PATH / DICTIONARY_FILES[marker]).read_bytes()
+
+
+def encode_document(document: str, encoding: DocumentEncoding) -> Union[str, bytes]:
+    """
+    Encode a DocumentReference JSON string for storage in the document attribute
+    """
+    if encoding == "json":
+        return document
+
+    compressor = zlib.compressobj(
+        level=ZLIB_LEVEL,
+        wbits=-zlib.MAX_WBITS,
+        zdict=get_dictionary(ZLIB_V1_MARKER),
+    )
+    return ZLIB_V1_MARKER + compressor.compress(document.encode()) + compressor.flush()
+
+
+def decode_document(value: Any) -> str:
+    """
+    Decode a document attribute read from DynamoDB, in any stored format
+    """
+    if isinstance(value, str):
+        return value
+
+    data = bytes(value.value if isinstance(value, Binary) else value)
+    marker, payload = data[:1], data[1:]
+    if marker not in DICTIONARY_FILES:
+        raise ValueError(f"Unknown document format marker {marker!r}")
+
+    decompressor = zlib.decompressobj(
+        wbits=-zlib.MAX_WBITS, zdict=get_dictionary(marker)
+    )
+    return (decompressor.decompress(payload) + decompressor.flush()).decode()
+
+
+def get_document_encoding(value: Any) -> DocumentEncoding:
+    """
+    Returns the encoding of a document attribute read from DynamoDB
+    """
+    return "json" if isinstance(value, str) else "zlib"
@@ -0,0 +1,1003 @@
+import bisect
+import functools
+import re
+import threading
+import zlib
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+from nrlf.core.dynamodb.attribute_values import deserialize_item, serialize_item
+from nrlf.core.dynamodb.cache import PointerCache
+from nrlf.core.dynamodb.codec import DocumentEncoding
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+
+TABLE_HASH_KEY = "pk"
+TABLE_RANGE_KEY = "sk"
+
+# The hash and range key of each global secondary index on the pointers table
+TABLE_INDEXES: Dict[str, Tuple[str, Optional[str]]] = {
+    "patient_gsi": ("patient_key", "patient_sort"),
+    "masterid_gsi": ("masterid_key", None),
+    "custodian_gsi": ("custodian_key", "patient_sort"),
+    "producer_gsi": ("producer_key", "producer_sort"),
+}
+
+_MISSING = object()
+
+# The arguments of low-level client requests that hold AttributeValues
+_SERIALIZED_ARGUMENTS = {
+    "Item",
+    "Key",
+    "ExpressionAttributeValues",
+    "ExclusiveStartKey",
+}
+
+_TOKEN_PATTERN = re.compile(r"\s*(<>|<=|>=|=|<|>|\(|\)|,|[#:]?[A-Za-z0-9_.\-]+)")
+_COMPARATORS = {"=", "<>", "<", "<=", ">", ">="}
+_FUNCTIONS = {
+    "attribute_exists",
+    "attribute_not_exists",
+    "attribute_type",
+    "begins_with",
+    "contains",
+}
+
+Item = Dict[str, Any]
+Condition = Callable[[Item], bool]
+
+
+def _client_error(code: str, message: str, operation: str, **response) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": code, "Message": message}, **response}, operation
+    )
+
+
+def _normalise(item: Item) -> Item:
+    """
+    Convert an item to the types DynamoDB returns, such as Decimal for numbers
+    """
+    serializer = TypeSerializer()
+    deserializer = TypeDeserializer()
+    return {
+        key: deserializer.deserialize(serializer.serialize(value))
+        for key, value in item.items()
+    }
+
+
+def _serialize(item: Item) -> Dict[str, Any]:
+    serializer = TypeSerializer()
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+
+def _attribute_type(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, (Decimal, int)):
+        return "N"
+    if isinstance(value, str):
+        return "S"
+    if isinstance(value, (bytes, bytearray)):
+        return "B"
+    if isinstance(value, list):
+        return "L"
+    if isinstance(value, dict):
+        return "M"
+
+    return "SS" if all(isinstance(each, str) for each in value) else "NS"
+
+
+def _compare(operator: str, left: Any, right: Any) -> bool:
+    if left is _MISSING or right is _MISSING:
+        return operator == "<>"
+
+    if operator == "=":
+        return left == right
+    if operator == "<>":
+        return left != right
+
+    try:
+        return {
+            "<": left < right,
+            "<=": left <= right,
+            ">": left > right,
+            ">=": left >= right,
+        }[operator]
+    except TypeError:
+        return False
+
+
+class _ExpressionParser:
+    """
+    Parser for the condition, filter and key condition expressions used by the
+    repository, producing a function that evaluates the expression for an item
+    """
+
+    def __init__(
+        self,
+        expression: str,
+        names: Optional[Dict[str, str]] = None,
+        values: Optional[Dict[str, Any]] = None,
+    ):
+        self.tokens = _TOKEN_PATTERN.findall(expression)
+        self.position = 0
+        self.names = names or {}
+        self.values = values or {}
+
+    def parse(self) -> Tuple[Condition, List[tuple]]:
+        """
+        Returns the condition along with the comparisons joined by AND at the
+        top level of the expression, which are used to plan key lookups
+        """
+        conditions = self._parse_and()
+        if self._peek_keyword("OR"):
+            alternatives = [_all(conditions)]
+            while self._accept("OR"):
+                alternatives.append(_all(self._parse_and()))
+            conditions = [_any(alternatives)]
+
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected '{self._peek()}' in expression")
+
+        comparisons = [
+            condition.comparison
+            for condition in conditions
+            if hasattr(condition, "comparison")
+        ]
+        return _all(conditions), comparisons
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _peek_keyword(self, keyword: str) -> bool:
+        token = self._peek()
+        return token is not None and token.upper() == keyword
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def _accept(self, keyword: str) -> bool:
+        if self._peek_keyword(keyword):
+            self.position += 1
+            return True
+        return False
+
+    def _expect(self, keyword: str):
+        if not self._accept(keyword):
+            raise ValueError(f"Expected '{keyword}' in expression")
+
+    def _parse_or(self) -> Condition:
+        alternatives = [_all(self._parse_and())]
+        while self._accept("OR"):
+            alternatives.append(_all(self._parse_and()))
+        return alternatives[0] if len(alternatives) == 1 else _any(alternatives)
+
+    def _parse_and(self) -> List[Condition]:
+        conditions = [self._parse_not()]
+        while self._accept("AND"):
+            conditions.append(self._parse_not())
+        return conditions
+
+    def _parse_not(self) -> Condition:
+        if not self._accept("NOT"):
+            return self._parse_primary()
+
+        negated = self._parse_not()
+
+        def condition(item: Item) -> bool:
+            return not negated(item)
+
+        return condition
+
+    def _parse_operands(self) -> List[Callable[[Optional[Item]], Any]]:
+        self._expect("(")
+        operands = [self._operand(self._next())]
+        while self._accept(","):
+            operands.append(self._operand(self._next()))
+        self._expect(")")
+        return operands
+
+    def _parse_primary(self) -> Condition:
+        if self._accept("("):
+            condition = self._parse_or()
+            self._expect(")")
+            return condition
+
+        token = self._next()
+        if token.lower() in _FUNCTIONS and self._peek() == "(":
+            return self._parse_function(token.lower(), self._parse_operands())
+
+        left = self._operand(token)
+        operator = self._next()
+        if operator in _COMPARATORS:
+            right = self._operand(self._next())
+
+            def compare(item: Item) -> bool:
+                return _compare(operator, left(item), right(item))
+
+            compare.comparison = (operator, left.path, right(None))
+            return compare
+
+        if operator.upper() == "BETWEEN":
+            low = self._operand(self._next())
+            self._expect("AND")
+            high = self._operand(self._next())
+
+            def between(item: Item) -> bool:
+                value = left(item)
+                return _compare(">=", value, low(item)) and _compare(
+                    "<=", value, high(item)
+                )
+
+            between.comparison = ("between", left.path, (low(None), high(None)))
+            return between
+
+        if operator.upper() == "IN":
+            options = self._parse_operands()
+
+            def is_in(item: Item) -> bool:
+                value = left(item)
+                return value is not _MISSING and any(
+                    value == option(item) for option in options
+                )
+
+            return is_in
+
+        raise ValueError(f"Unsupported operator '{operator}' in expression")
+
+    def _parse_function(
+        self, name: str, arguments: List[Callable[[Optional[Item]], Any]]
+    ) -> Condition:
+        path, *others = arguments
+
+        def function(item: Item) -> bool:
+            value = path(item)
+            if name == "attribute_not_exists":
+                return value is _MISSING
+            if value is _MISSING:
+                return False
+            if name == "attribute_exists":
+                return True
+
+            argument = others[0](item)
+            if name == "attribute_type":
+                return _attribute_type(value) == argument
+            if name == "begins_with":
+                return isinstance(value, str) and value.startswith(argument)
+            return not isinstance(value, (Decimal, bool)) and argument in value
+
+        if name == "begins_with":
+            function.comparison = ("begins_with", path.path, others[0](None))
+        return function
+
+    def _operand(self, token: str) -> Callable[[Optional[Item]], Any]:
+        if token.startswith(":"):
+            constant = self.values[token]
+
+            def value(item: Optional[Item]) -> Any:
+                return constant
+
+            value.path = None
+            return value
+
+        name = self.names.get(token, token)
+
+        def attribute(item: Optional[Item]) -> Any:
+            return _MISSING if item is None else item.get(name, _MISSING)
+
+        attribute.path = name
+        return attribute
+
+
+def _all(conditions: List[Condition]) -> Condition:
+    if len(conditions) == 1:
+        return conditions[0]
+
+    def condition(item: Item) -> bool:
+        return all(each(item) for each in conditions)
+
+    return condition
+
+
+def _any(conditions: List[Condition]) -> Condition:
+    def condition(item: Item) -> bool:
+        return any(each(item) for each in conditions)
+
+    return condition
+
+
+def parse_condition(
+    expression: Optional[str],
+    names: Optional[Dict[str, str]] = None,
+    values: Optional[Dict[str, Any]] = None,
+) -> Condition:
+    """
+    Parse a condition or filter expression, which is always true when empty
+    """
+    if not expression:
+        return _all([])
+    return _ExpressionParser(expression, names, values).parse()[0]
+
+
+def _parse_projection(
+    expression: Optional[str], names: Optional[Dict[str, str]] = None
+) -> Optional[List[str]]:
+    if not expression:
+        return None
+    names = names or {}
+    return [names.get(field.strip(), field.strip()) for field in expression.split(",")]
+
+
+def _project(item: Item, fields: Optional[List[str]]) -> Item:
+    if fields is None:
+        return dict(item)
+    return {field: item[field] for field in fields if field in item}
+
+
+class _SortedIndex:
+    """
+    Items grouped by hash key, each group kept sorted by range key
+    """
+
+    def __init__(self, hash_key: str, range_key: Optional[str]):
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.partitions: Dict[Any, List[tuple]] = {}
+
+    def _entry(self, item: Item) -> Optional[tuple]:
+        if self.hash_key not in item:
+            return None
+        if self.range_key and self.range_key not in item:
+            return None
+
+        range_value = item[self.range_key] if self.range_key else ""
+        return item[self.hash_key], (
+            range_value,
+            item[TABLE_HASH_KEY],
+            item[TABLE_RANGE_KEY],
+        )
+
+    def add(self, item: Item):
+        if entry := self._entry(item):
+            bisect.insort(self.partitions.setdefault(entry[0], []), entry[1])
+
+    def remove(self, item: Item):
+        entry = self._entry(item)
+        if not entry:
+            return
+
+        partition = self.partitions.get(entry[0], [])
+        position = bisect.bisect_left(partition, entry[1])
+        if position < len(partition) and partition[position] == entry[1]:
+            partition.pop(position)
+        if not partition:
+            self.partitions.pop(entry[0], None)
+
+    def scan(
+        self,
+        hash_value: Any,
+        comparison: Optional[tuple],
+        start_key: Optional[Item],
+        forward: bool,
+    ) -> List[Tuple[str, str]]:
+        """
+        Returns the table keys of the items in a partition, in range key order,
+        within the bounds of the range key comparison and after start_key
+        """
+        partition = self.partitions.get(hash_value, [])
+        low, high = 0, len(partition)
+
+        if comparison:
+            operator, value = comparison
+            if operator == "begins_with":
+                low = bisect.bisect_left(partition, (value,))
+                high = bisect.bisect_left(partition, (value + "\uffff",))
+            elif operator == "between":
+                low = bisect.bisect_left(partition, (value[0],))
+                high = bisect.bisect_right(partition, (value[1], "\uffff"))
+            elif operator == "=":
+                low = bisect.bisect_left(partition, (value,))
+                high = bisect.bisect_right(partition, (value, "\uffff"))
+            elif operator in (">", ">="):
+                bound = (value, "\uffff") if operator == ">" else (value,)
+                low = bisect.bisect_left(partition, bound)
+            elif operator in ("<", "<="):
+                bound = (value,) if operator == "<" else (value, "\uffff")
+                high = bisect.bisect_left(partition, bound)
+
+        if start_key:
+            range_value = start_key[self.range_key] if self.range_key else ""
+            start = (range_value, start_key[TABLE_HASH_KEY], start_key[TABLE_RANGE_KEY])
+            if forward:
+                low = max(low, bisect.bisect_right(partition, start))
+            else:
+                high = min(high, bisect.bisect_left(partition, start))
+
+        keys = [(pk, sk) for _, pk, sk in partition[low:high]]
+        return keys if forward else keys[::-1]
+
+    def scan_partitions(self, start_key: Optional[Item]) -> List[Tuple[str, str]]:
+        """
+        Returns the table keys of every item in the index, ordered by hash key
+        then range key, after start_key
+        """
+        start_hash = start_key[self.hash_key] if start_key else None
+        keys = []
+        for hash_value in sorted(self.partitions):
+            if start_key and hash_value < start_hash:
+                continue
+
+            keys.extend(
+                self.scan(
+                    hash_value,
+                    None,
+                    start_key if hash_value == start_hash else None,
+                    forward=True,
+                )
+            )
+        return keys
+
+
+class InMemoryTable:
+    """
+    In-process stand-in for a boto3 DynamoDB Table resource with the pointers
+    table key schema and global secondary indexes
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items: Dict[Tuple[str, str], Item] = {}
+        self.indexes = {
+            None: _SortedIndex(TABLE_HASH_KEY, TABLE_RANGE_KEY),
+            **{
+                index_name: _SortedIndex(hash_key, range_key)
+                for index_name, (hash_key, range_key) in TABLE_INDEXES.items()
+            },
+        }
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def _key(key: Item) -> Tuple[str, str]:
+        return key[TABLE_HASH_KEY], key[TABLE_RANGE_KEY]
+
+    def _check(
+        self,
+        key: Tuple[str, str],
+        expression: Optional[str],
+        names: Optional[Dict[str, str]],
+        values: Optional[Dict[str, Any]],
+    ) -> bool:
+        return parse_condition(expression, names, values)(self.items.get(key, {}))
+
+    def _write(self, key: Tuple[str, str], item: Optional[Item]):
+        if existing := self.items.pop(key, None):
+            for index in self.indexes.values():
+                index.remove(existing)
+
+        if item is not None:
+            self.items[key] = item
+            for index in self.indexes.values():
+                index.add(item)
+
+    def _condition_failed(
+        self, operation: str, key: Tuple[str, str], return_values: Optional[str]
+    ) -> ClientError:
+        response = {}
+        if return_values == "ALL_OLD" and key in self.items:
+            response["Item"] = _serialize(self.items[key])
+        return _client_error(
+            "ConditionalCheckFailedException",
+            "The conditional request failed",
+            operation,
+            **response,
+        )
+
+    def get_item(
+        self,
+        Key: Item,
+        ProjectionExpression: Optional[str] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        **_,
+    ) -> dict:
+        with self.lock:
+            item = self.items.get(self._key(Key))
+            if item is None:
+                return {}
+            fields = _parse_projection(ProjectionExpression, ExpressionAttributeNames)
+            return {"Item": _project(item, fields)}
+
+    def put_item(
+        self,
+        Item: Item,
+        ConditionExpression: Optional[str] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        ReturnValuesOnConditionCheckFailure: Optional[str] = None,
+        **_,
+    ) -> dict:
+        item = _normalise(Item)
+        key = self._key(item)
+        with self.lock:
+            if not self._check(
+                key,
+                ConditionExpression,
+                ExpressionAttributeNames,
+                ExpressionAttributeValues,
+            ):
+                raise self._condition_failed(
+                    "PutItem", key, ReturnValuesOnConditionCheckFailure
+                )
+            self._write(key, item)
+        return {}
+
+    def update_item(
+        self,
+        Key: Item,
+        UpdateExpression: str,
+        ConditionExpression: Optional[str] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        ReturnValues: str = "NONE",
+        ReturnValuesOnConditionCheckFailure: Optional[str] = None,
+        **_,
+    ) -> dict:
+        key = self._key(Key)
+        values = _normalise(ExpressionAttributeValues or {})
+        with self.lock:
+            if not self._check(
+                key, ConditionExpression, ExpressionAttributeNames, values
+            ):
+                raise self._condition_failed(
+                    "UpdateItem", key, ReturnValuesOnConditionCheckFailure
+                )
+
+            existing = self.items.get(key)
+            updated = _apply_update(
+                dict(existing or Key),
+                UpdateExpression,
+                ExpressionAttributeNames or {},
+                values,
+            )
+            self._write(key, updated)
+
+        if ReturnValues == "ALL_NEW":
+            return {"Attributes": dict(updated)}
+        if ReturnValues == "ALL_OLD" and existing:
+            return {"Attributes": dict(existing)}
+        return {}
+
+    def delete_item(
+        self,
+        Key: Item,
+        ConditionExpression: Optional[str] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        ReturnValues: str = "NONE",
+        ReturnValuesOnConditionCheckFailure: Optional[str] = None,
+        **_,
+    ) -> dict:
+        key = self._key(Key)
+        with self.lock:
+            if not self._check(
+                key,
+                ConditionExpression,
+                ExpressionAttributeNames,
+                ExpressionAttributeValues,
+            ):
+                raise self._condition_failed(
+                    "DeleteItem", key, ReturnValuesOnConditionCheckFailure
+                )
+
+            existing = self.items.get(key)
+            self._write(key, None)
+
+        if ReturnValues == "ALL_OLD" and existing:
+            return {"Attributes": dict(existing)}
+        return {}
+
+    def query(
+        self,
+        KeyConditionExpression: str,
+        IndexName: Optional[str] = None,
+        FilterExpression: Optional[str] = None,
+        ProjectionExpression: Optional[str] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        ExclusiveStartKey: Optional[Item] = None,
+        Limit: Optional[int] = None,
+        ScanIndexForward: bool = True,
+        Select: Optional[str] = None,
+        **_,
+    ) -> dict:
+        index = self.indexes[IndexName]
+        key_condition, comparisons = _ExpressionParser(
+            KeyConditionExpression,
+            ExpressionAttributeNames,
+            ExpressionAttributeValues,
+        ).parse()
+        hash_values = [
+            value
+            for operator, path, value in comparisons
+            if operator == "=" and path == index.hash_key
+        ]
+        if len(hash_values) != 1:
+            raise _client_error(
+                "ValidationException",
+                "Query condition missed key schema element",
+                "Query",
+            )
+        range_comparison = next(
+            (
+                (operator, value)
+                for operator, path, value in comparisons
+                if path == index.range_key and index.range_key
+            ),
+            None,
+        )
+        filter_condition = parse_condition(
+            FilterExpression, ExpressionAttributeNames, ExpressionAttributeValues
+        )
+        fields = _parse_projection(ProjectionExpression, ExpressionAttributeNames)
+
+        with self.lock:
+            keys = index.scan(
+                hash_values[0], range_comparison, ExclusiveStartKey, ScanIndexForward
+            )
+            evaluated = [self.items[key] for key in keys[:Limit]]
+            has_more = Limit is not None and len(keys) > Limit
+
+        return self._page(
+            index,
+            evaluated,
+            has_more,
+            _all([key_condition, filter_condition]),
+            fields,
+            Select,
+        )
+
+    def scan(
+        self,
+        IndexName: Optional[str] = None,
+        FilterExpression: Optional[str] = None,
+        ProjectionExpression: Optional[str] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        ExclusiveStartKey: Optional[Item] = None,
+        Limit: Optional[int] = None,
+        Segment: Optional[int] = None,
+        TotalSegments: Optional[int] = None,
+        Select: Optional[str] = None,
+        **_,
+    ) -> dict:
+        index = self.indexes[IndexName]
+        filter_condition = parse_condition(
+            FilterExpression, ExpressionAttributeNames, ExpressionAttributeValues
+        )
+        fields = _parse_projection(ProjectionExpression, ExpressionAttributeNames)
+
+        with self.lock:
+            keys = index.scan_partitions(ExclusiveStartKey)
+            if TotalSegments:
+                # Each item belongs to the segment its partition key hashes to
+                keys = [
+                    key
+                    for key in keys
+                    if zlib.crc32(key[0].encode()) % TotalSegments == Segment
+                ]
+            evaluated = [self.items[key] for key in keys[:Limit]]
+            has_more = Limit is not None and len(keys) > Limit
+
+        return self._page(index, evaluated, has_more, filter_condition, fields, Select)
+
+    @staticmethod
+    def _page(
+        index: _SortedIndex,
+        evaluated: List[Item],
+        has_more: bool,
+        condition: Condition,
+        fields: Optional[List[str]],
+        select: Optional[str],
+    ) -> dict:
+        """
+        Build the response to a query or scan from the items it evaluated
+        """
+        items = [_project(item, fields) for item in evaluated if condition(item)]
+        result = {"Count": len(items), "ScannedCount": len(evaluated)}
+        if select != "COUNT":
+            result["Items"] = items
+
+        if has_more and evaluated:
+            last_item = evaluated[-1]
+            key_attributes = [TABLE_HASH_KEY, TABLE_RANGE_KEY, index.hash_key]
+            if index.range_key:
+                key_attributes.append(index.range_key)
+            result["LastEvaluatedKey"] = {
+                attribute: last_item[attribute] for attribute in key_attributes
+            }
+
+        return result
+
+
+def _apply_update(
+    item: Item, expression: str, names: Dict[str, str], values: Dict[str, Any]
+) -> Item:
+    """
+    Apply the SET, ADD and REMOVE actions of an UpdateExpression to an item
+    """
+    clauses = re.split(r"\b(SET|ADD|REMOVE)\b", expression)
+    for action, arguments in zip(clauses[1::2], clauses[2::2], strict=True):
+        for argument in filter(None, map(str.strip, arguments.split(","))):
+            if action == "SET":
+                path, value = map(str.strip, argument.split("="))
+                item[names.get(path, path)] = values[value]
+            elif action == "ADD":
+                path, value = argument.split()
+                name = names.get(path, path)
+                item[name] = item.get(name, Decimal(0)) + values[value]
+            else:
+                item.pop(names.get(argument, argument), None)
+
+    return item
+
+
+def _deserialize_request(request: dict) -> dict:
+    """
+    Convert the AttributeValues in the arguments of a low-level client
+    request to the Python values taken by InMemoryTable
+    """
+    return {
+        argument: (
+            deserialize_item(value)
+            if argument in _SERIALIZED_ARGUMENTS and value is not None
+            else value
+        )
+        for argument, value in request.items()
+    }
+
+
+def _serialize_response(response: dict) -> dict:
+    """
+    Convert the items in an InMemoryTable response to AttributeValues, as
+    returned by the low-level client
+    """
+    serialized = dict(response)
+    for field in ("Item", "Attributes", "LastEvaluatedKey"):
+        if field in serialized:
+            serialized[field] = serialize_item(serialized[field])
+    if "Items" in serialized:
+        serialized["Items"] = [serialize_item(item) for item in serialized["Items"]]
+    return serialized
+
+
+class _InMemoryPaginator:
+    def __init__(self, operation: Callable[..., dict]):
+        self.operation = operation
+
+    def paginate(
+        self, PaginationConfig: Optional[dict] = None, **kwargs
+    ) -> Iterator[dict]:
+        page_size = (PaginationConfig or {}).get("PageSize")
+        start_key = kwargs.pop("ExclusiveStartKey", None)
+        while True:
+            page = self.operation(
+                **kwargs,
+                **({"Limit": page_size} if page_size else {}),
+                ExclusiveStartKey=start_key,
+            )
+            yield page
+            start_key = page.get("LastEvaluatedKey")
+            if not start_key:
+                return
+
+
+class _InMemoryClient:
+    """
+    In-process stand-in for the low-level boto3 DynamoDB client used by the
+    repository, taking and returning AttributeValue maps
+    """
+
+    def __init__(self, dynamodb: "InMemoryDynamoDB"):
+        self.dynamodb = dynamodb
+
+    def get_paginator(self, operation_name: str) -> _InMemoryPaginator:
+        if operation_name not in ("query", "scan"):
+            raise ValueError(
+                f"The in-memory client can only paginate query and scan, not {operation_name}"
+            )
+        return _InMemoryPaginator(getattr(self, operation_name))
+
+    def get_item(self, TableName: str, **kwargs) -> dict:
+        table = self.dynamodb.Table(TableName)
+        return _serialize_response(table.get_item(**_deserialize_request(kwargs)))
+
+    def put_item(self, TableName: str, **kwargs) -> dict:
+        table = self.dynamodb.Table(TableName)
+        return _serialize_response(table.put_item(**_deserialize_request(kwargs)))
+
+    def update_item(self, TableName: str, **kwargs) -> dict:
+        table = self.dynamodb.Table(TableName)
+        return _serialize_response(table.update_item(**_deserialize_request(kwargs)))
+
+    def delete_item(self, TableName: str, **kwargs) -> dict:
+        table = self.dynamodb.Table(TableName)
+        return _serialize_response(table.delete_item(**_deserialize_request(kwargs)))
+
+    def query(self, TableName: str, **kwargs) -> dict:
+        table = self.dynamodb.Table(TableName)
+        return _serialize_response(table.query(**_deserialize_request(kwargs)))
+
+    def scan(self, TableName: str, **kwargs) -> dict:
+        table = self.dynamodb.Table(TableName)
+        return _serialize_response(table.scan(**_deserialize_request(kwargs)))
+
+    def batch_get_item(self, RequestItems: Dict[str, dict], **_) -> dict:
+        responses = {}
+        for table_name, request in RequestItems.items():
+            responses[table_name] = [
+                result["Item"]
+                for key in request["Keys"]
+                if (
+                    result := self.get_item(
+                        TableName=table_name,
+                        Key=key,
+                        ProjectionExpression=request.get("ProjectionExpression"),
+                        ExpressionAttributeNames=request.get(
+                            "ExpressionAttributeNames"
+                        ),
+                    )
+                )
+            ]
+        return {"Responses": responses, "UnprocessedKeys": {}}
+
+    def batch_write_item(self, RequestItems: Dict[str, List[dict]], **_) -> dict:
+        for table_name, requests in RequestItems.items():
+            for request in requests:
+                if "PutRequest" in request:
+                    self.put_item(TableName=table_name, **request["PutRequest"])
+                else:
+                    self.delete_item(TableName=table_name, **request["DeleteRequest"])
+        return {"UnprocessedItems": {}}
+
+    def transact_write_items(self, TransactItems: List[dict], **_) -> dict:
+        operations = [
+            (
+                action,
+                _deserialize_request(request),
+                self.dynamodb.Table(request["TableName"]),
+            )
+            for transact_item in TransactItems
+            for action, request in transact_item.items()
+        ]
+        keys = [
+            (table.name, table._key(request.get("Key") or request.get("Item")))
+            for _, request, table in operations
+        ]
+        if len(set(keys)) != len(keys):
+            raise _client_error(
+                "ValidationException",
+                "Transaction request cannot include multiple operations on one item",
+                "TransactWriteItems",
+            )
+
+        with self.dynamodb.lock:
+            reasons = [
+                (
+                    {"Code": "None"}
+                    if table._check(
+                        key,
+                        request.get("ConditionExpression"),
+                        request.get("ExpressionAttributeNames"),
+                        request.get("ExpressionAttributeValues"),
+                    )
+                    else {
+                        "Code": "ConditionalCheckFailed",
+                        "Message": "The conditional request failed",
+                        **(
+                            {"Item": _serialize(table.items[key])}
+                            if request.get("ReturnValuesOnConditionCheckFailure")
+                            == "ALL_OLD"
+                            and key in table.items
+                            else {}
+                        ),
+                    }
+                )
+                for (_, request, table), (_, key) in zip(operations, keys, strict=True)
+            ]
+            if any(reason["Code"] != "None" for reason in reasons):
+                raise _client_error(
+                    "TransactionCanceledException",
+                    "Transaction cancelled, please refer cancellation reasons for specific reasons",
+                    "TransactWriteItems",
+                    CancellationReasons=reasons,
+                )
+
+            for action, request, table in operations:
+                if action == "Put":
+                    table.put_item(Item=request["Item"])
+                elif action == "Delete":
+                    table.delete_item(Key=request["Key"])
+                elif action == "Update":
+                    table.update_item(
+                        Key=request["Key"],
+                        UpdateExpression=request["UpdateExpression"],
+                        ExpressionAttributeNames=request.get(
+                            "ExpressionAttributeNames"
+                        ),
+                        ExpressionAttributeValues=request.get(
+                            "ExpressionAttributeValues"
+                        ),
+                    )
+
+        return {}
+
+
+class InMemoryDynamoDB:
+    """
+    In-process stand-in for DynamoDB, holding tables that are created on
+    first use and the low-level client used to access them
+    """
+
+    def __init__(self):
+        self.tables: Dict[str, InMemoryTable] = {}
+        self.lock = threading.RLock()
+        self.client = _InMemoryClient(self)
+
+    def Table(self, name: str) -> InMemoryTable:
+        with self.lock:
+            if name not in self.tables:
+                self.tables[name] = InMemoryTable(name)
+            return self.tables[name]
+
+    def reset(self):
+        """
+        Remove every table and the items they hold
+        """
+        with self.lock:
+            self.tables.clear()
+
+
+@functools.cache
+def get_in_memory_dynamodb() -> InMemoryDynamoDB:
+    """
+    Returns the in-memory tables shared by all requests handled by this process
+    """
+    return InMemoryDynamoDB()
+
+
+class InMemoryDocumentPointerRepository(DocumentPointerRepository):
+    """
+    DocumentPointerRepository backed by in-process tables rather than DynamoDB
+
+    Only the storage is replaced, so the repository logic, expressions and
+    error handling are the same as when running against DynamoDB.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        strict_read_validation: bool = False,
+        pointer_cache: Optional[PointerCache] = None,
+        dynamodb: Optional[InMemoryDynamoDB] = None,
+        document_encoding: DocumentEncoding = "json",
+        custodian_index_enabled: bool = False,
+        producer_index_enabled: bool = False,
+        pointer_counts_enabled: bool = False,
+    ):
+        super().__init__(
+            table_name=table_name,
+            strict_read_validation=strict_read_validation,
+            pointer_cache=pointer_cache,
+            client=(dynamodb or get_in_memory_dynamodb()).client,
+            document_encoding=document_encoding,
+            custodian_index_enabled=custodian_index_enabled,
+            producer_index_enabled=producer_index_enabled,
+            pointer_counts_enabled=pointer_counts_enabled,
+        )
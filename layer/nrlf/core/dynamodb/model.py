@@ -1,7 +1,10 @@
+import hashlib
+import json
 import re
+import zlib
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from nhs_number import is_valid as is_valid_nhs_number
 from pydantic import (
@@ -14,6 +17,8 @@ from pydantic import (
 )
 
 from nrlf.core.constants import SYSTEM_SHORT_IDS, VALID_SOURCES
+from nrlf.core.dynamodb.codec import decode_document
+from nrlf.core.errors import UnprojectedFieldError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.types import DocumentReference
 from nrlf.core.utils import create_fhir_instant
@@ -27,6 +32,42 @@ class DBPrefix(str, Enum):
     Category = "C"
     Type = "T"
     MasterIdentifier = "MI"
+    Counter = "CNT"
+    Shard = "S"
+
+
+# DocumentReference fields that cannot be changed by an update
+IMMUTABLE_FIELDS = [
+    "masterIdentifier",
+    "id",
+    "identifier",
+    "status",
+    "type",
+    "subject",
+    "custodian",
+    "relatesTo",
+    "author",
+]
+
+# DocumentReference fields that are carried over from the existing pointer on update
+PRESERVED_FIELDS = ["date"]
+
+# An update can only be written in place when none of these fields have
+# changed. The category is included as it forms part of the patient_sort key.
+UPDATE_FINGERPRINT_FIELDS = [*IMMUTABLE_FIELDS, *PRESERVED_FIELDS, "category"]
+
+
+def get_update_fingerprint(document: Dict[str, Any]) -> str:
+    """
+    Returns a hash of the fields in a DocumentReference that an in-place
+    update must leave unchanged
+    """
+    fingerprint_fields = {
+        field: document.get(field) for field in UPDATE_FINGERPRINT_FIELDS
+    }
+    return hashlib.sha256(
+        json.dumps(fingerprint_fields, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
 
 
 def get_id_for_system(system: str, attr_placement: str) -> str | None:
@@ -42,6 +83,117 @@ def get_id_for_system(system: str, attr_placement: str) -> str | None:
     return SYSTEM_SHORT_IDS.get(system)
 
 
+# Attribute of the per-patient counter item that is not a per-type count.
+# Every write to the counter raises its version.
+COUNTER_VERSION_ATTRIBUTE = "counter_version"
+
+
+def get_patient_counter_key(nhs_number: str) -> Dict[str, str]:
+    """
+    Returns the table key for the per-patient pointer counter item
+
+    The counter item holds the number of the patient's pointers of each type.
+    Writes that create or delete pointers ADD to these counts, which creates
+    the counter if the patient has none yet. Counters are only read once
+    POINTER_COUNTS_ENABLED is set, after scripts/rebuild_pointer_counters.py
+    has rebuilt the counters of patients with pointers written before.
+
+    Known limitation: the counter is adjusted with its own UpdateItem after
+    the pointer write (create, delete, delete_for_producer, and the
+    BatchWriteItem bulk writes create_many and delete_by_nhs_number), so a
+    single write is not charged for a transaction. Only supersede adjusts the
+    counter in the same transaction as its writes. Deltas that fail to apply
+    are logged under REPOSITORY065 for the patient's counter to be rebuilt
+    with scripts/rebuild_pointer_counters.py. A Lambda timeout between the two
+    leaves no such record, and negative counts found by count_by_nhs_number
+    are logged under REPOSITORY061.
+
+    Example: {"pk": "P#<nhs_number>", "sk": "CNT"}
+    """
+    return {
+        "pk": "#".join([DBPrefix.Patient.value, nhs_number]),
+        "sk": DBPrefix.Counter.value,
+    }
+
+
+def get_custodian_key(custodian: str, nhs_number: str) -> str:
+    """
+    Returns the custodian_gsi partition key of a producer's pointers for a patient
+
+    Example: O#<ods_code>#P#<nhs_number>
+    """
+    return "#".join(
+        [DBPrefix.Organisation.value, custodian, DBPrefix.Patient.value, nhs_number]
+    )
+
+
+def get_masterid_key(custodian: str, master_identifier: str) -> str:
+    """
+    Returns the masterid_gsi partition key of a producer's pointer with the
+    masterIdentifier value
+
+    Example: O#<ods_code>#MI#<master_identifier>
+    """
+    return "#".join(
+        [
+            DBPrefix.Organisation.value,
+            custodian,
+            DBPrefix.MasterIdentifier.value,
+            master_identifier,
+        ]
+    )
+
+
+# Each producer's pointers are spread over this many producer_gsi partitions,
+# so no single partition takes every write from a large producer. Changing it
+# requires every pointer's producer_key to be rewritten.
+PRODUCER_INDEX_SHARDS = 4
+
+
+def get_producer_shard(id_: str) -> int:
+    """
+    Returns the producer_gsi shard a pointer is written to, from its id
+    """
+    return zlib.crc32(id_.encode()) % PRODUCER_INDEX_SHARDS
+
+
+def get_producer_key(
+    custodian: str, custodian_suffix: Optional[str], shard: int
+) -> str:
+    """
+    Returns the producer_gsi partition key for a shard of the pointers owned by
+    the producer with the ODS code and (optional) ODS code suffix
+
+    Example: O#<ods_code>[.<ods_code_suffix>]#S#<shard>
+    """
+    producer = f"{custodian}.{custodian_suffix}" if custodian_suffix else custodian
+    return "#".join(
+        [DBPrefix.Organisation.value, producer, DBPrefix.Shard.value, str(shard)]
+    )
+
+
+def get_producer_sort(created_on: str, id_: str) -> str:
+    """
+    Returns the producer_gsi sort key, ordering a producer's pointers by creation
+
+    Example: CO#<created_on>#D#<id>
+    """
+    return "#".join(
+        [DBPrefix.CreatedOn.value, created_on, DBPrefix.DocumentPointer.value, id_]
+    )
+
+
+def _pop_encoded_document(values: Dict[str, Any]) -> Any:
+    """
+    Remove a document stored in a compressed encoding from the values read
+    from DynamoDB, so it is only decoded if it is accessed
+    """
+    if isinstance(values.get("document", ""), str):
+        return None
+
+    return values.pop("document")
+
+
 class DynamoDBModel(BaseModel):
     _from_dynamo: bool = PrivateAttr(default=False)
 
@@ -49,10 +201,33 @@ class DynamoDBModel(BaseModel):
         super().__init__(**data)
         self._from_dynamo = data.get("_from_dynamo", False)
 
+    def __getattr__(self, name: str) -> Any:
+        """
+        Fail loudly when accessing a field that was not projected from DynamoDB
+        """
+        if name in type(self).model_fields:
+            raise UnprojectedFieldError(
+                f"{type(self).__name__}.{name} was not included in the projection used to read this record"
+            )
+
+        return super().__getattr__(name)  # type: ignore
+
     @classmethod
     def public_alias(cls) -> str:
         return cls.__name__
 
+    @classmethod
+    def from_dynamo(
+        cls,
+        item: Dict[str, Any],
+        strict: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        """
+        Create the model from an item read from DynamoDB
+        """
+        return cls.model_validate({"_from_dynamo": True, **item})
+
 
 class DocumentPointer(DynamoDBModel):
     id: str
@@ -73,15 +248,34 @@ class DocumentPointer(DynamoDBModel):
     updated_on: Optional[str] = None
     document_id: str = Field(exclude=True)
     schemas: list = Field(default_factory=list)
+    _encoded_document: Any = PrivateAttr(default=None)
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Decode a document read in a compressed encoding on first access
+        """
+        if name == "document" and self._encoded_document is not None:
+            self._decode_document()
+            return self.__dict__["document"]
+
+        return super().__getattr__(name)
+
+    def _decode_document(self):
+        self.__dict__["document"] = decode_document(self._encoded_document)
+        self._encoded_document = None
 
     def model_dump(self, **kwargs) -> dict[str, Any]:
         """
-        Override model_dump() to include partition and sort keys
+        Override model_dump() to include partition and sort keys, and the
+        fingerprint used to write updates in place
         """
+        if self._encoded_document is not None:
+            self._decode_document()
         default_dict = super().model_dump(**kwargs)
         return {
             **default_dict,
             **self.indexes,
+            "update_fingerprint": self.update_fingerprint,
         }
 
     def dict(self, **kwargs) -> dict[str, Any]:
@@ -159,6 +353,82 @@ class DocumentPointer(DynamoDBModel):
         )
         return core_model
 
+    @classmethod
+    def from_dynamo(
+        cls,
+        item: Dict[str, Any],
+        strict: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> "DocumentPointer":
+        """
+        Create the DocumentPointer from an item read from DynamoDB
+
+        Items are validated before they are written, so unless strict is set
+        the field validators are skipped and only the derived fields are set.
+
+        When fields is provided the item only holds that projection, so a
+        partial DocumentPointer is returned which raises an UnprojectedFieldError
+        on access to any other field. Partial records cannot be validated.
+        """
+        if fields is not None:
+            return cls._from_projection(item, fields)
+
+        if strict:
+            return super().from_dynamo(
+                {**item, "document": decode_document(item["document"])}, strict=True
+            )
+
+        values = {field: item[field] for field in cls.model_fields if field in item}
+        values["version"] = int(values["version"])
+        encoded_document = _pop_encoded_document(values)
+
+        if not values.get("custodian_suffix"):
+            split_custodian = values["custodian"].split(".")
+            if len(split_custodian) == 2:
+                values["custodian"], values["custodian_suffix"] = split_custodian
+
+        values["producer_id"], values["document_id"] = values["id"].split(
+            "-", maxsplit=1
+        )
+
+        core_model = cls.model_construct(**values)
+        core_model._encoded_document = encoded_document
+        core_model._from_dynamo = True
+        return core_model
+
+    @classmethod
+    def _from_projection(
+        cls, item: Dict[str, Any], fields: Iterable[str]
+    ) -> "DocumentPointer":
+        """
+        Create a partial DocumentPointer holding only the projected fields
+        and the fields derived from them
+        """
+        values = {field: item[field] for field in fields if field in item}
+        encoded_document = _pop_encoded_document(values)
+
+        if "version" in values:
+            values["version"] = int(values["version"])
+
+        if "custodian" in values and not values.get("custodian_suffix"):
+            split_custodian = values["custodian"].split(".")
+            if len(split_custodian) == 2:
+                values["custodian"], values["custodian_suffix"] = split_custodian
+
+        if "id" in values:
+            values["producer_id"], values["document_id"] = values["id"].split(
+                "-", maxsplit=1
+            )
+
+        core_model = cls.model_construct(_fields_set=set(values), **values)
+        for field in cls.model_fields.keys() - values.keys():
+            # Drop the defaults model_construct fills in for unprojected fields
+            core_model.__dict__.pop(field, None)
+
+        core_model._encoded_document = encoded_document
+        core_model._from_dynamo = True
+        return core_model
+
     @model_validator(mode="before")
     @classmethod
     def extract_custodian_suffix(cls, values: Dict[str, Any]) -> Dict[str, Any]:
@@ -337,6 +607,9 @@ class DocumentPointer(DynamoDBModel):
             "sk": self.sk,
             "patient_key": self.patient_key,
             "patient_sort": self.patient_sort,
+            "custodian_key": self.custodian_key,
+            "producer_key": self.producer_key,
+            "producer_sort": self.producer_sort,
         }
 
         if self.masterid_key:
@@ -344,6 +617,22 @@ class DocumentPointer(DynamoDBModel):
 
         return indexes
 
+    @property
+    def update_fingerprint(self) -> Optional[str]:
+        """
+        Returns the fingerprint of the fields an in-place update must not change,
+        or None if the document cannot be parsed
+        """
+        try:
+            document = json.loads(self.document)
+        except ValueError:
+            return None
+
+        if not isinstance(document, dict):
+            return None
+
+        return get_update_fingerprint(document)
+
     @property
     def pk(self) -> str:
         """
@@ -387,6 +676,36 @@ class DocumentPointer(DynamoDBModel):
             ]
         )
 
+    @property
+    def custodian_key(self) -> str:
+        """
+        Returns the custodian gsi pk (partition key) for the DocumentPointer,
+        which shares patient_sort as its sort key
+
+        Example: O#<ods_code>#P#<nhs_number>
+        """
+        return get_custodian_key(self.custodian, self.nhs_number)
+
+    @property
+    def producer_key(self) -> str:
+        """
+        Returns the producer gsi pk (partition key) for the DocumentPointer
+
+        Example: O#<ods_code>[.<ods_code_suffix>]#S#<shard>
+        """
+        return get_producer_key(
+            self.custodian, self.custodian_suffix, get_producer_shard(self.id)
+        )
+
+    @property
+    def producer_sort(self) -> str:
+        """
+        Returns the producer gsi sk (sort key) for the DocumentPointer
+
+        Example: CO#<created_on>#D#<id>
+        """
+        return get_producer_sort(self.created_on, self.id)
+
     @property
     def masterid_key(self) -> str | None:
         """
@@ -397,14 +716,7 @@ class DocumentPointer(DynamoDBModel):
         if not self.master_identifier:
             return None
 
-        return "#".join(
-            [
-                DBPrefix.Organisation.value,
-                self.custodian,
-                DBPrefix.MasterIdentifier.value,
-                self.master_identifier,
-            ]
-        )
+        return get_masterid_key(self.custodian, self.master_identifier)
 
     @classmethod
     def public_alias(cls) -> str:
@@ -1,19 +1,90 @@
+import functools
+import heapq
+import itertools
+import random
 import sys
+import time
 from abc import ABC
-from typing import Generic, Iterator, List, Optional, Type, TypeVar
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from botocore.exceptions import ClientError
 from pydantic import ValidationError
 
-from nrlf.core.boto import get_dynamodb_resource, get_dynamodb_table
+from nrlf.core.boto import get_dynamodb_client
 from nrlf.core.codes import SpineErrorConcept
 from nrlf.core.constants import SYSTEM_SHORT_IDS, TYPE_CATEGORIES
-from nrlf.core.dynamodb.model import DocumentPointer, DynamoDBModel
+from nrlf.core.dynamodb.attribute_values import (
+    AttributeValueMap,
+    deserialize_document_pointer,
+    deserialize_item,
+    serialize_document_pointer,
+    serialize_item,
+)
+from nrlf.core.dynamodb.cache import PointerCache, VersionStamp
+from nrlf.core.dynamodb.codec import DocumentEncoding, encode_document
+from nrlf.core.dynamodb.model import (
+    COUNTER_VERSION_ATTRIBUTE,
+    PRODUCER_INDEX_SHARDS,
+    DBPrefix,
+    DocumentPointer,
+    DynamoDBModel,
+    get_custodian_key,
+    get_masterid_key,
+    get_patient_counter_key,
+    get_producer_key,
+    get_producer_sort,
+)
 from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
+from nrlf.core.types import DynamoDBClient
 
 RepositoryModel = TypeVar("RepositoryModel", bound=DynamoDBModel)
 
+MAX_SEARCH_FAN_OUT_WORKERS = 8
+
+# DynamoDB allows up to 100 items per transaction, including counter updates
+MAX_TRANSACTION_ITEMS = 100
+
+MAX_BATCH_GET_KEYS = 100
+BATCH_MAX_ATTEMPTS = 5
+BATCH_BACKOFF_BASE_SECONDS = 0.05
+
+MAX_BATCH_WRITE_ITEMS = 25
+MAX_BATCH_WRITE_WORKERS = 4
+MAX_DELETE_PAGE_SIZE = 100
+
+# Fields always projected by searches so results can be merged and paged on
+# their patient_gsi keys
+SEARCH_KEY_FIELDS = ["id", "nhs_number", "category_id", "type_id", "created_on"]
+
+# Fields always projected by producer listings so results can be merged and
+# paged on their producer_gsi keys
+LIST_KEY_FIELDS = ["id", "created_on"]
+
+# Fields always projected by master identifier lookups to pick the earliest match
+MASTER_IDENTIFIER_KEY_FIELDS = ["id", "created_on"]
+
+# Fields needed to delete a pointer and adjust its patient's counter
+DELETE_FIELDS = ["nhs_number", "type"]
+
+# Fields projected into custodian_gsi and producer_gsi alongside their keys, as
+# the non_key_attributes of the indexes in the pointers table modules. Any
+# other fields are read from the table by id.
+CUSTODIAN_INDEX_FIELDS = [*SEARCH_KEY_FIELDS, "custodian_suffix", "type"]
+PRODUCER_INDEX_FIELDS = [*LIST_KEY_FIELDS, "type", "updated_on"]
+
 
 def _get_sk_ids_for_type(pointer_type: str) -> tuple:
     if pointer_type not in TYPE_CATEGORIES:
@@ -33,23 +104,219 @@ def _get_sk_ids_for_type(pointer_type: str) -> tuple:
     return category_id, type_id
 
 
+def _is_conditional_check_failure(exc: ClientError) -> bool:
+    """
+    Check if the error was caused by a failed ConditionExpression, including
+    a failed condition within a cancelled transaction
+    """
+    error_code = exc.response.get("Error", {}).get("Code")
+    if error_code == "ConditionalCheckFailedException":
+        return True
+
+    if error_code == "TransactionCanceledException":
+        return any(
+            reason.get("Code") == "ConditionalCheckFailed"
+            for reason in exc.response.get("CancellationReasons", [])
+        )
+
+    return False
+
+
+def _get_custodian_condition(
+    ods_code_parts: Tuple[str, ...],
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the condition matching items that belong to the producer with the
+    provided ODS code, along with its expression attribute values
+    """
+    expression_values = {":custodian": ods_code_parts[0]}
+    if len(ods_code_parts) > 1:
+        custodian_suffix_condition = "custodian_suffix = :custodian_suffix"
+        expression_values[":custodian_suffix"] = ods_code_parts[1]
+    else:
+        custodian_suffix_condition = "(attribute_not_exists(custodian_suffix) OR attribute_type(custodian_suffix, :null_type))"
+        expression_values[":null_type"] = "NULL"
+
+    return f"custodian = :custodian AND {custodian_suffix_condition}", expression_values
+
+
+def _get_window_condition(
+    path: str, lower_name: str, upper_name: str, lower: bool, upper: bool
+) -> str:
+    """
+    Build the condition matching items with a value at path within an
+    inclusive window, where either bound may be left open
+    """
+    if lower and upper:
+        return f"{path} BETWEEN {lower_name} AND {upper_name}"
+    if lower:
+        return f"{path} >= {lower_name}"
+    return f"{path} <= {upper_name}"
+
+
+@functools.cache
+def _get_type_ids_for_category(category_id: str) -> frozenset:
+    type_ids = set()
+    for pointer_type in TYPE_CATEGORIES:
+        type_category_id, type_id = _get_sk_ids_for_type(pointer_type)
+        if type_category_id == category_id:
+            type_ids.add(type_id)
+
+    return frozenset(type_ids)
+
+
+def _get_patient_sort_prefixes(
+    pointer_types: List[str], by_type: bool = False
+) -> List[str]:
+    """
+    Get the patient_sort key prefixes that cover exactly the given pointer types.
+    A single category prefix is used where every type in that category is requested,
+    unless by_type is set, so every prefix is followed by the created_on segment.
+    """
+    type_ids_by_category = defaultdict(set)
+    for pointer_type in pointer_types:
+        category_id, type_id = _get_sk_ids_for_type(pointer_type)
+        type_ids_by_category[category_id].add(type_id)
+
+    prefixes = []
+    for category_id, type_ids in type_ids_by_category.items():
+        if not by_type and type_ids == _get_type_ids_for_category(category_id):
+            prefixes.append(f"C#{category_id}#")
+            continue
+
+        prefixes.extend(f"C#{category_id}#T#{type_id}#" for type_id in type_ids)
+
+    return sorted(prefixes)
+
+
+def _get_pointer_counts(counter: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Get the per-type pointer counts held by a patient's counter item
+    """
+    return {
+        pointer_type: int(count)
+        for pointer_type, count in counter.items()
+        if pointer_type not in ("pk", "sk", COUNTER_VERSION_ATTRIBUTE)
+    }
+
+
+@functools.cache
+def _get_fan_out_executor() -> ThreadPoolExecutor:
+    """
+    Returns the executor shared by every search fan out in this container, so
+    concurrent searches share one bounded pool of threads rather than each
+    starting their own
+    """
+    return ThreadPoolExecutor(
+        max_workers=MAX_SEARCH_FAN_OUT_WORKERS, thread_name_prefix="search-fan-out"
+    )
+
+
+def _get_created_sort(patient_sort: str) -> str:
+    """
+    Get the created_on and id segments of a patient_sort key, which order
+    pointers by creation whatever their type
+    """
+    return patient_sort.partition(f"#{DBPrefix.CreatedOn.value}#")[2]
+
+
 class Repository(ABC, Generic[RepositoryModel]):
     ITEM_TYPE: Type[RepositoryModel]
 
-    def __init__(self, table_name: str):
-        self.dynamodb = get_dynamodb_resource()
+    def __init__(
+        self,
+        table_name: str,
+        strict_read_validation: bool = False,
+        pointer_cache: Optional[PointerCache] = None,
+        client: Optional[DynamoDBClient] = None,
+        document_encoding: DocumentEncoding = "json",
+        custodian_index_enabled: bool = False,
+        producer_index_enabled: bool = False,
+        pointer_counts_enabled: bool = False,
+    ):
+        self.client = client or get_dynamodb_client()
         self.table_name = table_name
-        self.table = get_dynamodb_table(self.table_name)
+        self.strict_read_validation = strict_read_validation
+        self.pointer_cache = pointer_cache
+        self.document_encoding = document_encoding
+        self.custodian_index_enabled = custodian_index_enabled
+        self.producer_index_enabled = producer_index_enabled
+        self.pointer_counts_enabled = pointer_counts_enabled
         logger.log(
             LogReference.REPOSITORY001,
             table_name=self.table_name,
             item_type=self.ITEM_TYPE.__name__,
+            strict_read_validation=self.strict_read_validation,
+            pointer_cache_enabled=self.pointer_cache is not None,
+            document_encoding=self.document_encoding,
+            custodian_index_enabled=self.custodian_index_enabled,
+            producer_index_enabled=self.producer_index_enabled,
+            pointer_counts_enabled=self.pointer_counts_enabled,
+        )
+
+    def _deserialize(self, item: AttributeValueMap) -> Dict[str, Any]:
+        """
+        Convert an item read with the low-level client to Python values
+        """
+        return deserialize_item(item)
+
+    def _from_dynamo(
+        self, item: AttributeValueMap, fields: Optional[List[str]] = None
+    ) -> RepositoryModel:
+        """
+        Create the repository model from an item read from DynamoDB
+        """
+        return self.ITEM_TYPE.from_dynamo(
+            self._deserialize(item), strict=self.strict_read_validation, fields=fields
         )
 
+    def _get_projection(
+        self, fields: Optional[List[str]], required_fields: List[str]
+    ) -> Tuple[Optional[List[str]], Dict[str, Any]]:
+        """
+        Build the ProjectionExpression for reading only the provided fields
+        Returns the projected fields and the query arguments, which are both
+        empty when all fields are requested
+        """
+        if fields is None:
+            return None, {}
+
+        unknown_fields = set(fields) - self.ITEM_TYPE.model_fields.keys()
+        if unknown_fields:
+            logger.log(LogReference.REPOSITORY042, unknown_fields=unknown_fields)
+            raise ValueError(
+                f"Cannot project unknown {self.ITEM_TYPE.__name__} fields: {sorted(unknown_fields)}"
+            )
+
+        projected_fields = list(dict.fromkeys([*required_fields, *fields]))
+        return projected_fields, {
+            "ProjectionExpression": ", ".join(
+                f"#{field}" for field in projected_fields
+            ),
+            "ExpressionAttributeNames": {
+                f"#{field}": field for field in projected_fields
+            },
+        }
+
 
 class DocumentPointerRepository(Repository[DocumentPointer]):
     ITEM_TYPE = DocumentPointer
 
+    def _deserialize(self, item: AttributeValueMap) -> Dict[str, Any]:
+        return deserialize_document_pointer(item)
+
+    def _to_dynamo(self, item: DocumentPointer) -> AttributeValueMap:
+        """
+        Returns the item to write for a DocumentPointer, with its document
+        stored in the repository's document encoding
+        """
+        return serialize_document_pointer(
+            {
+                **item.model_dump(),
+                "document": encode_document(item.document, self.document_encoding),
+            }
+        )
+
     def create(self, item: DocumentPointer) -> DocumentPointer:
         """
         Create a DocumentPointer resource
@@ -61,20 +328,19 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
             source=item.source,
             version=item.version,
         )
+        self._invalidate_cached([item.id])
 
         try:
-            result = self.table.put_item(
-                Item=item.model_dump(),
+            result = self.client.put_item(
+                TableName=self.table_name,
+                Item=self._to_dynamo(item),
                 ConditionExpression="attribute_not_exists(pk) AND attribute_not_exists(sk)",
                 ReturnConsumedCapacity="INDEXES",
             )
             logger.log(LogReference.REPOSITORY003, result=result)
 
         except ClientError as exc:
-            if (
-                exc.response.get("Error", {}).get("Code")
-                == "ConditionalCheckFailedException"
-            ):
+            if _is_conditional_check_failure(exc):
                 logger.log(LogReference.REPOSITORY004)
                 raise OperationOutcomeError(
                     status_code="409",
@@ -91,18 +357,186 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
             )
             raise exc
 
+        self._adjust_pointer_counts({item.nhs_number: {item.type: 1}})
         return item
 
-    def get_by_id(self, id: str) -> Optional[DocumentPointer]:
+    def create_many(self, items: List[DocumentPointer]) -> List[str]:
+        """
+        Create DocumentPointer resources in BatchWriteItem chunks
+
+        BatchWriteItem does not support conditions, so unlike create this will
+        overwrite an existing item with the same ID. Callers must only provide
+        pointers with newly generated IDs.
+
+        Returns the IDs of any pointers that could not be written
+        """
+        logger.log(LogReference.REPOSITORY050, count=len(items))
+        if not items:
+            return []
+
+        self._invalidate_cached([item.id for item in items])
+
+        pointer_deltas = defaultdict(lambda: defaultdict(int))
+        for item in items:
+            pointer_deltas[item.nhs_number][item.type] += 1
+
+        try:
+            unprocessed_ids = {
+                request["PutRequest"]["Item"]["id"]["S"]
+                for request in self._batch_write(
+                    [{"PutRequest": {"Item": self._to_dynamo(item)}} for item in items]
+                )
+            }
+        except Exception:
+            # Chunks written before the failure have not been counted
+            self._log_unapplied_counts(pointer_deltas)
+            raise
+
+        for item in items:
+            if item.id in unprocessed_ids:
+                pointer_deltas[item.nhs_number][item.type] -= 1
+        self._adjust_pointer_counts(pointer_deltas)
+
+        logger.log(
+            LogReference.REPOSITORY051,
+            count=len(items) - len(unprocessed_ids),
+            unprocessed_ids=sorted(unprocessed_ids),
+        )
+        return [item.id for item in items if item.id in unprocessed_ids]
+
+    def get_by_id(
+        self, id: str, fields: Optional[List[str]] = None
+    ) -> Optional[DocumentPointer]:
         """
         Get a DocumentPointer resource by ID
+        When fields is provided, only those fields (and the id) are read
+
+        When the pointer cache is enabled, whole pointers are read and cached
+        regardless of fields, along with IDs that do not exist
+        """
+        if self.pointer_cache is None:
+            return self._get_by_id(id, fields)
+
+        entry = self.pointer_cache.get(id)
+        if entry and entry.revalidate_at <= time.monotonic():
+            if self._get_version_stamp(id) == entry.stamp:
+                self.pointer_cache.revalidated(id)
+            else:
+                entry = None
+
+        if entry:
+            logger.log(
+                LogReference.REPOSITORY048,
+                pointer_id=id,
+                cache_stats=self.pointer_cache.stats(),
+            )
+            return entry.pointer
+
+        pointer = self._get_by_id(id)
+        self.pointer_cache.put(id, pointer)
+        logger.log(
+            LogReference.REPOSITORY049,
+            pointer_id=id,
+            cache_stats=self.pointer_cache.stats(),
+        )
+        return pointer
+
+    def get_by_master_identifier(
+        self,
+        ods_code_parts: Tuple[str, ...],
+        master_identifier: str,
+        fields: Optional[List[str]] = None,
+    ) -> Optional[DocumentPointer]:
+        """
+        Get the producer's DocumentPointer with the masterIdentifier value
+        from its masterid_gsi partition, rather than searching the patient
+
+        The index is eventually consistent, so a pointer written moments ago
+        may not be found. Where more than one pointer has the masterIdentifier,
+        the earliest created is returned. When fields is provided, only those
+        fields (and the id and created_on) are read.
+        """
+        masterid_key = get_masterid_key(ods_code_parts[0], master_identifier)
+        logger.log(LogReference.REPOSITORY060, masterid_key=masterid_key)
+
+        custodian_condition, expression_values = _get_custodian_condition(
+            ods_code_parts
+        )
+        expression_values[":masterid_key"] = masterid_key
+        projected_fields, projection = self._get_projection(
+            fields, MASTER_IDENTIFIER_KEY_FIELDS
+        )
+
+        results = self._query(
+            IndexName="masterid_gsi",
+            KeyConditionExpression="masterid_key = :masterid_key",
+            FilterExpression=custodian_condition,
+            ExpressionAttributeValues=expression_values,
+            ReturnConsumedCapacity="INDEXES",
+            **projection,
+            fields=projected_fields,
+        )
+        return min(results, key=lambda item: (item.created_on, item.id), default=None)
+
+    def _get_version_stamp(self, id_: str) -> VersionStamp:
+        """
+        Read the version stamp of a stored pointer, to check a cached copy is current
+
+        The projection only reduces the data returned. The GetItem consumes the
+        same read capacity as reading the whole pointer.
+        """
+        doc_key = f"D#{id_}"
+        try:
+            result = self.client.get_item(
+                TableName=self.table_name,
+                Key=serialize_item({"pk": doc_key, "sk": doc_key}),
+                ProjectionExpression="#version, #updated_on",
+                ExpressionAttributeNames={
+                    "#version": "version",
+                    "#updated_on": "updated_on",
+                },
+                ReturnConsumedCapacity="INDEXES",
+            )
+        except ClientError as exc:
+            logger.log(
+                LogReference.REPOSITORY007,
+                exc_info=sys.exc_info(),
+                stacklevel=5,
+                error=str(exc),
+            )
+            raise exc
+
+        if "Item" not in result:
+            return None
+
+        item = deserialize_item(result["Item"])
+        return int(item["version"]), item.get("updated_on")
+
+    def _invalidate_cached(self, ids: List[str]):
+        """
+        Remove written pointers from the pointer cache
+        """
+        if self.pointer_cache is None:
+            return
+
+        for id_ in ids:
+            self.pointer_cache.invalidate(id_)
+
+    def _get_by_id(
+        self, id: str, fields: Optional[List[str]] = None
+    ) -> Optional[DocumentPointer]:
+        """
+        Read a DocumentPointer resource by ID from DynamoDB
         """
         doc_key = f"D#{id}"
+        projected_fields, projection = self._get_projection(fields, ["id"])
 
         try:
-            result = self.table.get_item(
-                Key={"pk": doc_key, "sk": doc_key},
+            result = self.client.get_item(
+                TableName=self.table_name,
+                Key=serialize_item({"pk": doc_key, "sk": doc_key}),
                 ReturnConsumedCapacity="INDEXES",
+                **projection,
             )
         except ClientError as exc:
             logger.log(
@@ -119,9 +553,16 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
 
         item = result["Item"]
         try:
-            parsed_item = self.ITEM_TYPE.model_validate({"_from_dynamo": True, **item})
+            parsed_item = self._from_dynamo(item, fields=projected_fields)
             logger.log(LogReference.REPOSITORY011)
-            logger.log(LogReference.REPOSITORY011a, result=parsed_item.model_dump())
+            logger.log(
+                LogReference.REPOSITORY011a,
+                result=(
+                    self._deserialize(item)
+                    if projected_fields
+                    else parsed_item.model_dump()
+                ),
+            )
             return parsed_item
         except ValidationError as exc:
             logger.log(
@@ -137,6 +578,172 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
                 details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
             ) from exc
 
+    def get_many_by_id(
+        self, ids: List[str], fields: Optional[List[str]] = None
+    ) -> Dict[str, DocumentPointer]:
+        """
+        Get multiple DocumentPointer resources by ID using BatchGetItem
+        Returns a mapping of ID to DocumentPointer for the IDs that exist
+        When fields is provided, only those fields (and the id) are read
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        logger.log(LogReference.REPOSITORY037, ids=unique_ids)
+        projected_fields, projection = self._get_projection(fields, ["id"])
+
+        items = []
+        for chunk_start in range(0, len(unique_ids), MAX_BATCH_GET_KEYS):
+            keys = [
+                serialize_item({"pk": f"D#{id_}", "sk": f"D#{id_}"})
+                for id_ in unique_ids[chunk_start : chunk_start + MAX_BATCH_GET_KEYS]
+            ]
+            items.extend(self._batch_get(keys, projection))
+
+        pointers = {}
+        for item in items:
+            try:
+                pointer = self._from_dynamo(item, fields=projected_fields)
+            except ValidationError as exc:
+                logger.log(
+                    LogReference.REPOSITORY010,
+                    exc_info=sys.exc_info(),
+                    stacklevel=5,
+                    error=str(exc),
+                )
+                raise OperationOutcomeError(
+                    status_code="500",
+                    severity="error",
+                    code="exception",
+                    details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+                ) from exc
+            pointers[pointer.id] = pointer
+
+        logger.log(LogReference.REPOSITORY039, count=len(pointers))
+        return pointers
+
+    def _read_from_table(
+        self,
+        results: Iterator[DocumentPointer],
+        fields: Optional[List[str]] = None,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[DocumentPointer]:
+        """
+        Read the provided fields of results from an index that does not project
+        them, in batches of up to batch_size results. Results keep their order,
+        and any deleted since the index was read are skipped.
+        """
+        batch_size = min(batch_size or MAX_BATCH_GET_KEYS, MAX_BATCH_GET_KEYS)
+        while batch := list(itertools.islice(results, batch_size)):
+            pointers = self.get_many_by_id([item.id for item in batch], fields=fields)
+            yield from (pointers[item.id] for item in batch if item.id in pointers)
+
+    def _batch_get(
+        self, keys: List[dict], projection: Optional[Dict[str, Any]] = None
+    ) -> List[dict]:
+        """
+        Wrapper around DynamoDB batch_get_item that retries any UnprocessedKeys
+        with exponential backoff
+        """
+        request_items = {self.table_name: {"Keys": keys, **(projection or {})}}
+        items = []
+
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(BATCH_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+
+            try:
+                result = self.client.batch_get_item(
+                    RequestItems=request_items,
+                    ReturnConsumedCapacity="INDEXES",
+                )
+            except ClientError as exc:
+                logger.log(
+                    LogReference.REPOSITORY007,
+                    exc_info=sys.exc_info(),
+                    stacklevel=5,
+                    error=str(exc),
+                )
+                raise exc
+
+            items.extend(result["Responses"].get(self.table_name, []))
+            request_items = result.get("UnprocessedKeys")
+            if not request_items:
+                return items
+
+            logger.log(
+                LogReference.REPOSITORY038,
+                attempt=attempt + 1,
+                unprocessed_count=len(request_items[self.table_name]["Keys"]),
+            )
+
+        logger.log(LogReference.REPOSITORY040, unprocessed_keys=request_items)
+        raise OperationOutcomeError(
+            status_code="500",
+            severity="error",
+            code="exception",
+            details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+        )
+
+    def _batch_write(self, write_requests: List[dict]) -> List[dict]:
+        """
+        Run the provided write requests in BatchWriteItem chunks concurrently
+        on a bounded thread pool
+        Returns any requests that were still unprocessed after the final attempt
+        """
+        chunks = [
+            write_requests[idx : idx + MAX_BATCH_WRITE_ITEMS]
+            for idx in range(0, len(write_requests), MAX_BATCH_WRITE_ITEMS)
+        ]
+        if not chunks:
+            return []
+
+        max_workers = min(len(chunks), MAX_BATCH_WRITE_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                itertools.chain.from_iterable(
+                    executor.map(self._batch_write_chunk, chunks)
+                )
+            )
+
+    def _batch_write_chunk(self, write_requests: List[dict]) -> List[dict]:
+        """
+        Wrapper around DynamoDB batch_write_item that retries any
+        UnprocessedItems with jittered exponential backoff
+        Returns any requests that were still unprocessed after the final attempt
+        """
+        request_items = {self.table_name: write_requests}
+
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(
+                    random.uniform(0, BATCH_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+                )
+
+            try:
+                result = self.client.batch_write_item(
+                    RequestItems=request_items,
+                    ReturnConsumedCapacity="INDEXES",
+                )
+            except ClientError as exc:
+                logger.log(
+                    LogReference.REPOSITORY052,
+                    exc_info=sys.exc_info(),
+                    stacklevel=5,
+                    error=str(exc),
+                )
+                raise exc
+
+            request_items = result.get("UnprocessedItems")
+            if not request_items:
+                return []
+
+            logger.log(
+                LogReference.REPOSITORY053,
+                attempt=attempt + 1,
+                unprocessed_count=len(request_items[self.table_name]),
+            )
+
+        return request_items[self.table_name]
+
     def count_by_nhs_number(
         self,
         nhs_number: str,
@@ -144,6 +751,12 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
     ) -> int:
         """
         Count all DocumentPointer records by NHS number
+
+        Served from the patient's pointer counter item when pointer counts are
+        enabled, otherwise counts the patient_gsi partition without reading the
+        counter. A patient with no counter item, or with negative counts logged
+        as counter drift to be repaired by rebuild_pointer_counts, is also
+        counted from the partition.
         """
         logger.log(
             LogReference.REPOSITORY013,
@@ -151,48 +764,58 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
             pointer_types=pointer_types,
         )
 
-        key_conditions = ["patient_key = :patient_key"]
-        filter_expressions = []
-        expression_names = {}
-        expression_values = {":patient_key": f"P#{nhs_number}"}
-
-        if len(pointer_types) == 1:
-            # Optimisation for single pointer type
-            category_id, type_id = _get_sk_ids_for_type(pointer_types[0])
-            patient_sort = f"C#{category_id}#T#{type_id}"
-            key_conditions.append("begins_with(patient_sort, :patient_sort)")
-            expression_values[":patient_sort"] = patient_sort
+        if not self.pointer_counts_enabled:
+            return self._count_by_query(nhs_number, pointer_types)
 
-        # Handle multiple categories and pointer types with filter expressions
-        if len(pointer_types) > 1:
-            expression_names["#pointer_type"] = "type"
-            types_filters = [
-                f"#pointer_type = :type_{i}" for i in range(len(pointer_types))
-            ]
-            types_filter_values = {
-                f":type_{i}": pointer_types[i] for i in range(len(pointer_types))
-            }
-            filter_expressions.append(f"({' OR '.join(types_filters)})")
-            expression_values.update(types_filter_values)
+        counter = self._get_pointer_counter(nhs_number)
+        if not counter:
+            logger.log(LogReference.REPOSITORY032, nhs_number=nhs_number)
+            return self._count_by_query(nhs_number, pointer_types)
 
-        query = {
-            "IndexName": "patient_gsi",
-            "KeyConditionExpression": " AND ".join(key_conditions),
-            "ExpressionAttributeValues": expression_values,
-            "Select": "COUNT",
-            "ReturnConsumedCapacity": "INDEXES",
+        pointer_counts = _get_pointer_counts(counter)
+        negative_counts = {
+            pointer_type: count
+            for pointer_type, count in pointer_counts.items()
+            if count < 0
         }
+        if negative_counts:
+            logger.log(
+                LogReference.REPOSITORY061,
+                nhs_number=nhs_number,
+                pointer_counts=negative_counts,
+            )
+            return self._count_by_query(nhs_number, pointer_types)
 
-        if filter_expressions:
-            query["FilterExpression"] = " AND ".join(filter_expressions)
+        count = sum(
+            pointer_counts.get(pointer_type, 0)
+            for pointer_type in pointer_types or pointer_counts.keys()
+        )
+        logger.log(LogReference.REPOSITORY018, count=count)
+        return count
 
-        if expression_names:
-            query["ExpressionAttributeNames"] = expression_names
+    def get_pointer_counts(self, nhs_number: str) -> Optional[Dict[str, int]]:
+        """
+        Get the per-type pointer counts for a patient from their counter item
+        """
+        counter = self._get_pointer_counter(nhs_number)
+        if counter is None:
+            return None
 
-        logger.log(LogReference.REPOSITORY017, query=query)
+        return _get_pointer_counts(counter)
 
+    def _get_pointer_counter(
+        self, nhs_number: str, consistent_read: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read a patient's pointer counter item
+        """
         try:
-            result = self.table.query(**query)
+            result = self.client.get_item(
+                TableName=self.table_name,
+                Key=serialize_item(get_patient_counter_key(nhs_number)),
+                ConsistentRead=consistent_read,
+                ReturnConsumedCapacity="INDEXES",
+            )
         except ClientError as exc:
             logger.log(
                 LogReference.REPOSITORY019,
@@ -207,51 +830,245 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
                 details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
             ) from exc
 
-        logger.log(LogReference.REPOSITORY018, count=result["Count"])
-        logger.log(LogReference.REPOSITORY018a, result=result)
+        if "Item" not in result:
+            return None
+
+        return deserialize_item(result["Item"])
 
-        return result["Count"]
+    def rebuild_pointer_counts(self, nhs_number: str) -> Dict[str, int]:
+        """
+        Recompute a patient's counter item from their patient_gsi partition
 
-    def search(
+        The counter is only replaced if no write has changed it since the
+        partition was counted, otherwise the partition is counted again, so
+        counter updates made while rebuilding are not lost. The index is
+        eventually consistent, so a pointer written moments before may be missed.
+        """
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            counter = self._get_pointer_counter(nhs_number, consistent_read=True)
+            counter_version = (
+                int(counter[COUNTER_VERSION_ATTRIBUTE])
+                if counter and COUNTER_VERSION_ATTRIBUTE in counter
+                else None
+            )
+            pointer_counts = self._count_pointer_types(nhs_number)
+
+            try:
+                self.put_pointer_counts(nhs_number, pointer_counts, counter_version)
+                return pointer_counts
+            except ClientError as exc:
+                if not _is_conditional_check_failure(exc):
+                    raise exc
+
+                logger.log(
+                    LogReference.REPOSITORY062,
+                    nhs_number=nhs_number,
+                    attempt=attempt + 1,
+                )
+
+        logger.log(LogReference.REPOSITORY063, nhs_number=nhs_number)
+        raise OperationOutcomeError(
+            status_code="500",
+            severity="error",
+            code="exception",
+            details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+        )
+
+    def _count_pointer_types(self, nhs_number: str) -> Dict[str, int]:
+        """
+        Count a patient's pointers of each type from their patient_gsi partition
+        """
+        pointer_counts = defaultdict(int)
+        paginator = self.client.get_paginator("query")
+        response_iterator = paginator.paginate(
+            TableName=self.table_name,
+            IndexName="patient_gsi",
+            KeyConditionExpression="patient_key = :patient_key",
+            ExpressionAttributeValues=serialize_item(
+                {":patient_key": f"P#{nhs_number}"}
+            ),
+            ExpressionAttributeNames={"#pointer_type": "type"},
+            ProjectionExpression="#pointer_type",
+        )
+
+        for page in response_iterator:
+            for item in page["Items"]:
+                pointer_counts[item["type"]["S"]] += 1
+
+        return dict(pointer_counts)
+
+    def put_pointer_counts(
         self,
         nhs_number: str,
-        custodian: Optional[str] = None,
-        custodian_suffix: Optional[str] = None,
-        pointer_types: Optional[List[str]] = [],
-    ) -> Iterator[DocumentPointer]:
-        """"""
+        pointer_counts: Dict[str, int],
+        counter_version: Optional[int] = None,
+    ):
+        """
+        Overwrite a patient's counter item with the provided per-type counts
+
+        The write only applies if the counter still has the counter_version
+        read before counting, or has no version where counter_version is None.
+        """
         logger.log(
-            LogReference.REPOSITORY020,
+            LogReference.REPOSITORY033,
             nhs_number=nhs_number,
-            custodian=custodian,
-            pointer_types=pointer_types,
+            pointer_counts=pointer_counts,
+            counter_version=counter_version,
         )
+        if counter_version is None:
+            condition = {
+                "ConditionExpression": "attribute_not_exists(#counter_version)",
+                "ExpressionAttributeNames": {
+                    "#counter_version": COUNTER_VERSION_ATTRIBUTE
+                },
+            }
+        else:
+            condition = {
+                "ConditionExpression": "#counter_version = :counter_version",
+                "ExpressionAttributeNames": {
+                    "#counter_version": COUNTER_VERSION_ATTRIBUTE
+                },
+                "ExpressionAttributeValues": serialize_item(
+                    {":counter_version": counter_version}
+                ),
+            }
 
-        key_conditions = ["patient_key = :patient_key"]
-        filter_expressions = []
-        expression_names = {}
-        expression_values = {":patient_key": f"P#{nhs_number}"}
+        self.client.put_item(
+            TableName=self.table_name,
+            Item=serialize_item(
+                {
+                    **get_patient_counter_key(nhs_number),
+                    **pointer_counts,
+                    COUNTER_VERSION_ATTRIBUTE: (counter_version or 0) + 1,
+                }
+            ),
+            **condition,
+            ReturnConsumedCapacity="INDEXES",
+        )
 
-        if len(pointer_types) == 1:
-            # Optimisation for single pointer type
-            category_id, type_id = _get_sk_ids_for_type(pointer_types[0])
-            patient_sort = f"C#{category_id}#T#{type_id}"
-            key_conditions.append("begins_with(patient_sort, :patient_sort)")
-            expression_values[":patient_sort"] = patient_sort
+    def search(
+        self,
+        nhs_number: str,
+        custodian: Optional[str] = None,
+        custodian_suffix: Optional[str] = None,
+        pointer_types: Optional[List[str]] = [],
+        limit: Optional[int] = None,
+        start_key: Optional[Dict[str, str]] = None,
+        fields: Optional[List[str]] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> Iterator[DocumentPointer]:
+        """
+        Search for DocumentPointer records by NHS number
+        See _search_index for how the search is read from the indexes
 
-        # Handle multiple categories and pointer types with filter expressions
-        if len(pointer_types) > 1:
-            expression_names["#pointer_type"] = "type"
-            types_filters = [
-                f"#pointer_type = :type_{i}" for i in range(len(pointer_types))
-            ]
-            types_filter_values = {
-                f":type_{i}": pointer_types[i] for i in range(len(pointer_types))
-            }
-            filter_expressions.append(f"({' OR '.join(types_filters)})")
-            expression_values.update(types_filter_values)
+        custodian_gsi only projects CUSTODIAN_INDEX_FIELDS, so when a custodian
+        search needs any other field, the results are read from the table by id.
+        """
+        query_fields = fields
+        in_index = set(fields or self.ITEM_TYPE.model_fields) <= set(
+            CUSTODIAN_INDEX_FIELDS
+        )
+        read_from_table = custodian and self.custodian_index_enabled and not in_index
+        if read_from_table:
+            query_fields = CUSTODIAN_INDEX_FIELDS
+
+        results = self._search_index(
+            nhs_number=nhs_number,
+            custodian=custodian,
+            custodian_suffix=custodian_suffix,
+            pointer_types=pointer_types,
+            limit=limit,
+            start_key=start_key,
+            fields=query_fields,
+            created_from=created_from,
+            created_to=created_to,
+            newest_first=newest_first,
+        )
+        if read_from_table:
+            results = self._read_from_table(
+                results,
+                fields=[*SEARCH_KEY_FIELDS, *fields] if fields else None,
+                batch_size=limit,
+            )
 
-        if custodian:
+        yield from results
+
+    def _search_index(
+        self,
+        nhs_number: str,
+        custodian: Optional[str] = None,
+        custodian_suffix: Optional[str] = None,
+        pointer_types: Optional[List[str]] = [],
+        limit: Optional[int] = None,
+        start_key: Optional[Dict[str, str]] = None,
+        fields: Optional[List[str]] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> Iterator[DocumentPointer]:
+        """
+        Search the patient_gsi or custodian_gsi index for DocumentPointer
+        records by NHS number
+
+        Each pointer type (or whole category) is served by its own
+        begins_with(patient_sort) key condition. Where more than one is needed,
+        the queries are run concurrently and merged back into patient_sort order.
+
+        When custodian is provided, only that producer's pointers are read from
+        the custodian_gsi partition for the patient, which shares patient_sort
+        as its sort key, rather than filtering every producer's pointers.
+
+        When created_from or created_to are provided, or newest_first is set,
+        there is a query per pointer type, so the created_on segment that follows
+        the type in patient_sort can bound the key condition. With newest_first,
+        each query reads backwards and the queries are merged into created_on
+        order, newest first, rather than patient_sort order. Where there is no
+        query per type, such as when no pointer types are provided, every pointer
+        is read and sorted newest first.
+
+        Results follow on from start_key when provided, and each query stops
+        reading once it has found limit items. When fields is provided, only
+        those fields (and the patient_gsi key fields) are read.
+        """
+        logger.log(
+            LogReference.REPOSITORY020,
+            nhs_number=nhs_number,
+            custodian=custodian,
+            pointer_types=pointer_types,
+            created_from=created_from,
+            created_to=created_to,
+            newest_first=newest_first,
+        )
+        has_created_window = bool(created_from or created_to)
+        if created_from and created_to and created_from > created_to:
+            # The date parameters exclude each other, so cannot match any pointer
+            return
+
+        filter_expressions = []
+        expression_names = {}
+
+        if custodian and self.custodian_index_enabled:
+            custodian_key = get_custodian_key(custodian, nhs_number)
+            logger.log(LogReference.REPOSITORY058, custodian_key=custodian_key)
+            index_name = "custodian_gsi"
+            hash_key_condition = "custodian_key = :custodian_key"
+            expression_values = {":custodian_key": custodian_key}
+            if start_key:
+                # Page tokens hold the patient_gsi key, so they work with either index
+                start_key = {
+                    "pk": start_key["pk"],
+                    "sk": start_key["sk"],
+                    "custodian_key": custodian_key,
+                    "patient_sort": start_key["patient_sort"],
+                }
+        else:
+            index_name = "patient_gsi"
+            hash_key_condition = "patient_key = :patient_key"
+            expression_values = {":patient_key": f"P#{nhs_number}"}
+
+        if custodian and index_name == "patient_gsi":
             logger.log(
                 LogReference.REPOSITORY016,
                 expression="custodian = :custodian",
@@ -269,11 +1086,48 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
             filter_expressions.append("custodian_suffix = :custodian_suffix")
             expression_values[":custodian_suffix"] = custodian_suffix
 
+        try:
+            patient_sort_prefixes = _get_patient_sort_prefixes(
+                pointer_types or [], by_type=has_created_window or newest_first
+            )
+        except ValueError as exc:
+            # Unknown types have no patient_sort prefix, so filter on type instead
+            logger.log(LogReference.REPOSITORY030, error=str(exc))
+            patient_sort_prefixes = []
+            expression_names["#pointer_type"] = "type"
+            types_filters = [
+                f"#pointer_type = :type_{i}" for i in range(len(pointer_types))
+            ]
+            types_filter_values = {
+                f":type_{i}": pointer_types[i] for i in range(len(pointer_types))
+            }
+            filter_expressions.append(f"({' OR '.join(types_filters)})")
+            expression_values.update(types_filter_values)
+
+        if has_created_window and not patient_sort_prefixes:
+            filter_expressions.append(
+                _get_window_condition(
+                    "created_on",
+                    ":created_from",
+                    ":created_to",
+                    bool(created_from),
+                    bool(created_to),
+                )
+            )
+            expression_values.update(
+                {":created_from": created_from, ":created_to": created_to}
+            )
+
+        projected_fields, projection = self._get_projection(fields, SEARCH_KEY_FIELDS)
+        if projection:
+            expression_names.update(projection.pop("ExpressionAttributeNames"))
+
         query = {
-            "IndexName": "patient_gsi",
-            "KeyConditionExpression": " AND ".join(key_conditions),
+            "IndexName": index_name,
+            "KeyConditionExpression": hash_key_condition,
             "ExpressionAttributeValues": expression_values,
             "ReturnConsumedCapacity": "INDEXES",
+            **projection,
         }
 
         if filter_expressions:
@@ -282,7 +1136,326 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
         if expression_names:
             query["ExpressionAttributeNames"] = expression_names
 
-        yield from self._query(**query)
+        if newest_first:
+            query["ScanIndexForward"] = False
+
+        if not patient_sort_prefixes and newest_first:
+            # Without a query per type, patient_sort orders the pointers by type
+            # before created_on, so every pointer is read and sorted newest first
+            results = sorted(
+                self._query(**query, fields=projected_fields),
+                key=lambda item: _get_created_sort(item.patient_sort),
+                reverse=True,
+            )
+            if start_key:
+                start_sort = _get_created_sort(start_key["patient_sort"])
+                results = [
+                    item
+                    for item in results
+                    if _get_created_sort(item.patient_sort) < start_sort
+                ]
+
+            yield from itertools.islice(results, limit)
+            return
+
+        if not patient_sort_prefixes:
+            yield from self._query(
+                **query,
+                ExclusiveStartKey=start_key,
+                max_items=limit,
+                fields=projected_fields,
+            )
+            return
+
+        start_sort = start_key["patient_sort"] if start_key else ""
+        created_prefix = f"{DBPrefix.CreatedOn.value}#"
+        queries = []
+        for patient_sort_prefix in patient_sort_prefixes:
+            query_start_key = None
+            if newest_first and start_key:
+                # Pages run newest first across every type, so each query resumes
+                # after the created_on and id of the last pointer returned
+                query_start_key = {
+                    **start_key,
+                    "patient_sort": f"{patient_sort_prefix}{created_prefix}{_get_created_sort(start_sort)}",
+                }
+            elif start_sort.startswith(patient_sort_prefix):
+                query_start_key = start_key
+            elif start_sort > patient_sort_prefix:
+                # Every item for this prefix was returned in an earlier page
+                continue
+
+            if has_created_window:
+                key_condition = (
+                    "patient_sort BETWEEN :patient_sort AND :patient_sort_to"
+                )
+                patient_sort_values = {
+                    ":patient_sort": f"{patient_sort_prefix}{created_prefix}{created_from or ''}",
+                    ":patient_sort_to": (
+                        f"{patient_sort_prefix}{created_prefix}{created_to}#\uffff"
+                        if created_to
+                        else f"{patient_sort_prefix}{created_prefix}\uffff"
+                    ),
+                }
+            else:
+                key_condition = "begins_with(patient_sort, :patient_sort)"
+                patient_sort_values = {":patient_sort": patient_sort_prefix}
+
+            queries.append(
+                {
+                    **query,
+                    "KeyConditionExpression": f"{hash_key_condition} AND {key_condition}",
+                    "ExpressionAttributeValues": {
+                        **expression_values,
+                        **patient_sort_values,
+                    },
+                    "ExclusiveStartKey": query_start_key,
+                }
+            )
+
+        if len(queries) <= 1:
+            for single_query in queries:
+                yield from self._query(
+                    **single_query, max_items=limit, fields=projected_fields
+                )
+            return
+
+        yield from self._fan_out_query(
+            queries,
+            max_items=limit,
+            fields=projected_fields,
+            newest_first=newest_first,
+        )
+
+    def search_page(
+        self,
+        nhs_number: str,
+        limit: int,
+        custodian: Optional[str] = None,
+        custodian_suffix: Optional[str] = None,
+        pointer_types: Optional[List[str]] = [],
+        start_key: Optional[Dict[str, str]] = None,
+        fields: Optional[List[str]] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> Tuple[List[DocumentPointer], Optional[Dict[str, str]]]:
+        """
+        Get a single page of DocumentPointer search results by NHS number
+        Returns the page of results and the key to start the next page from,
+        which is None when there are no more results
+        """
+        results = list(
+            itertools.islice(
+                self.search(
+                    nhs_number=nhs_number,
+                    custodian=custodian,
+                    custodian_suffix=custodian_suffix,
+                    pointer_types=pointer_types,
+                    limit=limit + 1,
+                    start_key=start_key,
+                    fields=fields,
+                    created_from=created_from,
+                    created_to=created_to,
+                    newest_first=newest_first,
+                ),
+                limit + 1,
+            )
+        )
+
+        if len(results) <= limit:
+            return results, None
+
+        last_item = results[limit - 1]
+        last_evaluated_key = {
+            "pk": last_item.pk,
+            "sk": last_item.sk,
+            "patient_key": last_item.patient_key,
+            "patient_sort": last_item.patient_sort,
+        }
+        logger.log(LogReference.REPOSITORY041, last_evaluated_key=last_evaluated_key)
+        return results[:limit], last_evaluated_key
+
+    def list_by_custodian(
+        self,
+        ods_code_parts: Tuple[str, ...],
+        pointer_types: List[str],
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        updated_from: Optional[str] = None,
+        updated_to: Optional[str] = None,
+        limit: Optional[int] = None,
+        start_key: Optional[Dict[str, str]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Iterator[DocumentPointer]:
+        """
+        List every DocumentPointer of the given types owned by the producer
+        with the provided ODS code (and suffix), in order of creation
+
+        Each of the producer's producer_gsi shards is read by its own query,
+        bounded by the created window, and the shards are merged back into
+        producer_sort order as they are read. The updated window, which matches
+        pointers last created or updated within it, is applied as a filter.
+        Window bounds are inclusive FHIR instants in the stored format.
+
+        Results follow on from start_key when provided, and each query stops
+        reading once it has found limit items. When fields is provided, only
+        those fields (and the producer_gsi key fields) are read. producer_gsi
+        only projects PRODUCER_INDEX_FIELDS, so any other fields are read from
+        the table by id.
+        """
+        logger.log(
+            LogReference.REPOSITORY059,
+            ods_code_parts=ods_code_parts,
+            pointer_types=pointer_types,
+            created_from=created_from,
+            created_to=created_to,
+            updated_from=updated_from,
+            updated_to=updated_to,
+        )
+        if not pointer_types:
+            return
+
+        key_condition = "producer_key = :producer_key"
+        expression_names = {"#pointer_type": "type"}
+        expression_values = {
+            f":type_{i}": pointer_type for i, pointer_type in enumerate(pointer_types)
+        }
+        filter_expressions = [
+            f"({' OR '.join(f'#pointer_type = {name}' for name in expression_values)})"
+        ]
+
+        if created_from or created_to:
+            # Pointers created at created_to sort after its prefix, so the
+            # upper bound is the highest sort key with that created_on
+            key_condition += " AND producer_sort BETWEEN :created_from AND :created_to"
+            expression_values[":created_from"] = (
+                get_producer_sort(created_from, "")
+                if created_from
+                else f"{DBPrefix.CreatedOn.value}#"
+            )
+            expression_values[":created_to"] = (
+                get_producer_sort(created_to, "\uffff")
+                if created_to
+                else f"{DBPrefix.CreatedOn.value}#\uffff"
+            )
+
+        if updated_from or updated_to:
+            window = (
+                ":updated_from",
+                ":updated_to",
+                updated_from is not None,
+                updated_to is not None,
+            )
+            filter_expressions.append(
+                f"({_get_window_condition('updated_on', *window)} OR "
+                "((attribute_not_exists(updated_on) OR attribute_type(updated_on, :null_type)) "
+                f"AND {_get_window_condition('created_on', *window)}))"
+            )
+            expression_values[":null_type"] = "NULL"
+            if updated_from:
+                expression_values[":updated_from"] = updated_from
+            if updated_to:
+                expression_values[":updated_to"] = updated_to
+
+        in_index = set(fields or self.ITEM_TYPE.model_fields) <= set(
+            PRODUCER_INDEX_FIELDS
+        )
+        read_from_table = not in_index
+        projected_fields, projection = self._get_projection(
+            PRODUCER_INDEX_FIELDS if read_from_table else fields, LIST_KEY_FIELDS
+        )
+        if projection:
+            expression_names.update(projection.pop("ExpressionAttributeNames"))
+
+        query = {
+            "IndexName": "producer_gsi",
+            "KeyConditionExpression": key_condition,
+            "FilterExpression": " AND ".join(filter_expressions),
+            "ExpressionAttributeNames": expression_names,
+            "ReturnConsumedCapacity": "INDEXES",
+            **projection,
+        }
+
+        custodian = ods_code_parts[0]
+        custodian_suffix = ods_code_parts[1] if len(ods_code_parts) > 1 else None
+        shard_results = []
+        for shard in range(PRODUCER_INDEX_SHARDS):
+            producer_key = get_producer_key(custodian, custodian_suffix, shard)
+            shard_results.append(
+                self._query(
+                    **query,
+                    ExpressionAttributeValues={
+                        **expression_values,
+                        ":producer_key": producer_key,
+                    },
+                    # A start key positions the query, so the last pointer of
+                    # the previous page can continue any of the shards
+                    ExclusiveStartKey=(
+                        {**start_key, "producer_key": producer_key}
+                        if start_key
+                        else None
+                    ),
+                    max_items=limit,
+                    fields=projected_fields,
+                )
+            )
+
+        results = heapq.merge(*shard_results, key=lambda item: item.producer_sort)
+        if read_from_table:
+            results = self._read_from_table(
+                results,
+                fields=[*LIST_KEY_FIELDS, *fields] if fields else None,
+                batch_size=limit,
+            )
+
+        yield from results
+
+    def list_page_by_custodian(
+        self,
+        ods_code_parts: Tuple[str, ...],
+        pointer_types: List[str],
+        limit: int,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        updated_from: Optional[str] = None,
+        updated_to: Optional[str] = None,
+        start_key: Optional[Dict[str, str]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[DocumentPointer], Optional[Dict[str, str]]]:
+        """
+        Get a single page of the DocumentPointers owned by a producer
+        Returns the page of results and the key to start the next page from,
+        which is None when there are no more results
+        """
+        results = list(
+            itertools.islice(
+                self.list_by_custodian(
+                    ods_code_parts=ods_code_parts,
+                    pointer_types=pointer_types,
+                    created_from=created_from,
+                    created_to=created_to,
+                    updated_from=updated_from,
+                    updated_to=updated_to,
+                    limit=limit + 1,
+                    start_key=start_key,
+                    fields=fields,
+                ),
+                limit + 1,
+            )
+        )
+
+        if len(results) <= limit:
+            return results, None
+
+        last_item = results[limit - 1]
+        last_evaluated_key = {
+            "pk": last_item.pk,
+            "sk": last_item.sk,
+            "producer_sort": last_item.producer_sort,
+        }
+        logger.log(LogReference.REPOSITORY041, last_evaluated_key=last_evaluated_key)
+        return results[:limit], last_evaluated_key
 
     def save(self, item: DocumentPointer) -> DocumentPointer:
         """
@@ -301,23 +1474,168 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
         ids_to_delete: List[str],
         can_ignore_delete_fail: bool = False,
     ) -> DocumentPointer:
-        """ """
-        saved_item = self.create(item)
+        """
+        Create a DocumentPointer and delete the pointers it replaces in a single transaction
+
+        The replaced pointers must exist and belong to the same patient and
+        type as the new pointer, unless can_ignore_delete_fail is set, in which
+        case the replaced pointers that exist are deleted unconditionally.
+        """
+        logger.log(
+            LogReference.REPOSITORY034,
+            pointer_id=item.id,
+            ids_to_delete=ids_to_delete,
+            can_ignore_delete_fail=can_ignore_delete_fail,
+        )
+        self._invalidate_cached([item.id, *ids_to_delete])
 
-        for id_ in ids_to_delete:
-            self.delete_by_id(id_, can_ignore_delete_fail)
+        operations = [
+            (
+                {
+                    "Put": {
+                        "TableName": self.table_name,
+                        "Item": self._to_dynamo(item),
+                        "ConditionExpression": "attribute_not_exists(pk) AND attribute_not_exists(sk)",
+                    }
+                },
+                item.nhs_number,
+                item.type,
+                1,
+            ),
+            *self._get_supersede_deletes(item, ids_to_delete, can_ignore_delete_fail),
+        ]
+        pointer_deltas = defaultdict(lambda: defaultdict(int))
+        for _, nhs_number, pointer_type, delta in operations:
+            pointer_deltas[nhs_number][pointer_type] += delta
 
-        return saved_item
+        transact_items = [
+            *(operation for operation, *_ in operations),
+            *self._counter_updates(pointer_deltas),
+        ]
+        if len(transact_items) > MAX_TRANSACTION_ITEMS:
+            # Splitting the supersede across transactions would leave it
+            # partly applied, and unable to be retried, if a later one failed
+            logger.log(
+                LogReference.REPOSITORY064,
+                transact_item_count=len(transact_items),
+                max_transact_items=MAX_TRANSACTION_ITEMS,
+            )
+            raise OperationOutcomeError(
+                severity="error",
+                code="invalid",
+                details=SpineErrorConcept.from_code("BAD_REQUEST"),
+                diagnostics=f"Too many relatesTo targets to supersede in a single request (Each DocumentReference can replace at most {MAX_TRANSACTION_ITEMS - 2} others)",
+                expression=["relatesTo"],
+            )
+
+        try:
+            result = self._transact_write(transact_items)
+            logger.log(LogReference.REPOSITORY003, result=result)
+
+        except ClientError as exc:
+            if _is_conditional_check_failure(exc):
+                self._raise_supersede_condition_failure(exc)
+
+            logger.log(
+                LogReference.REPOSITORY036,
+                exc_info=sys.exc_info(),
+                stacklevel=5,
+                error=str(exc),
+            )
+            raise OperationOutcomeError(
+                status_code="500",
+                severity="error",
+                code="exception",
+                details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+            ) from exc
+
+        return item
+
+    def _get_supersede_deletes(
+        self,
+        item: DocumentPointer,
+        ids_to_delete: List[str],
+        can_ignore_delete_fail: bool,
+    ) -> List[tuple]:
+        """
+        Build the delete operations for the pointers replaced during a supersede,
+        along with the counter adjustment each one makes
+        """
+        if can_ignore_delete_fail:
+            return [
+                (
+                    {
+                        "Delete": {
+                            "TableName": self.table_name,
+                            "Key": serialize_item({"pk": pointer.pk, "sk": pointer.sk}),
+                        }
+                    },
+                    pointer.nhs_number,
+                    pointer.type,
+                    -1,
+                )
+                for pointer in self.get_many_by_id(
+                    ids_to_delete, fields=DELETE_FIELDS
+                ).values()
+            ]
+
+        return [
+            (
+                {
+                    "Delete": {
+                        "TableName": self.table_name,
+                        "Key": serialize_item({"pk": f"D#{id_}", "sk": f"D#{id_}"}),
+                        "ConditionExpression": "attribute_exists(pk) AND nhs_number = :nhs_number AND #pointer_type = :pointer_type",
+                        "ExpressionAttributeNames": {"#pointer_type": "type"},
+                        "ExpressionAttributeValues": serialize_item(
+                            {
+                                ":nhs_number": item.nhs_number,
+                                ":pointer_type": item.type,
+                            }
+                        ),
+                    }
+                },
+                item.nhs_number,
+                item.type,
+                -1,
+            )
+            for id_ in dict.fromkeys(ids_to_delete)
+        ]
+
+    def _raise_supersede_condition_failure(self, exc: ClientError):
+        """
+        Raise the error response for a supersede transaction cancelled by a failed condition
+        """
+        reasons = exc.response.get("CancellationReasons", [])
+        logger.log(LogReference.REPOSITORY035, cancellation_reasons=reasons)
+
+        if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+            logger.log(LogReference.REPOSITORY004)
+            raise OperationOutcomeError(
+                status_code="409",
+                severity="error",
+                code="conflict",
+                details=SpineErrorConcept.from_code("DUPLICATE_REJECTED"),
+            ) from None
+
+        raise OperationOutcomeError(
+            severity="error",
+            code="invalid",
+            details=SpineErrorConcept.from_code("BAD_REQUEST"),
+            diagnostics="The relatesTo target document no longer exists or does not match the NHS number and type in the request",
+        ) from None
 
     def delete(self, item: DocumentPointer) -> None:
         """
         Delete a DocumentPointer
         """
         logger.log(LogReference.REPOSITORY025, partition_key=item.pk, sort_key=item.sk)
+        self._invalidate_cached([item.id])
 
         try:
-            result = self.table.delete_item(
-                Key={"pk": item.pk, "sk": item.sk},
+            result = self.client.delete_item(
+                TableName=self.table_name,
+                Key=serialize_item({"pk": item.pk, "sk": item.sk}),
                 ConditionExpression="attribute_exists(pk) AND attribute_exists(sk)",
                 ReturnConsumedCapacity="INDEXES",
             )
@@ -338,11 +1656,75 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
                 details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
             ) from exc
 
+        self._adjust_pointer_counts({item.nhs_number: {item.type: -1}})
+
+    def delete_for_producer(
+        self, id_: str, ods_code_parts: Tuple[str, ...]
+    ) -> Tuple[bool, Optional[DocumentPointer]]:
+        """
+        Delete a DocumentPointer with a single conditional DeleteItem, which only
+        applies if the pointer belongs to the producer with the provided ODS code
+
+        The patient and type of the deleted pointer are only known from the item
+        the delete returns, so its counter is adjusted by a follow-up write, and
+        any adjustment that could not be applied is logged for the counter to be
+        rebuilt. Returns whether the pointer was deleted along with the pointer
+        that was deleted or, when it was not deleted, the pointer currently
+        stored (or None if the pointer does not exist) as returned by the failed
+        delete.
+        """
+        doc_key = f"D#{id_}"
+        logger.log(LogReference.REPOSITORY025, partition_key=doc_key, sort_key=doc_key)
+        self._invalidate_cached([id_])
+
+        custodian_condition, expression_values = _get_custodian_condition(
+            ods_code_parts
+        )
+
+        try:
+            result = self.client.delete_item(
+                TableName=self.table_name,
+                Key=serialize_item({"pk": doc_key, "sk": doc_key}),
+                ConditionExpression=f"attribute_exists(pk) AND {custodian_condition}",
+                ExpressionAttributeValues=serialize_item(expression_values),
+                ReturnValues="ALL_OLD",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                ReturnConsumedCapacity="INDEXES",
+            )
+        except ClientError as exc:
+            if not _is_conditional_check_failure(exc):
+                logger.log(
+                    LogReference.REPOSITORY026,
+                    exc_info=sys.exc_info(),
+                    stacklevel=5,
+                    error=str(exc),
+                )
+                raise OperationOutcomeError(
+                    status_code="500",
+                    severity="error",
+                    code="exception",
+                    details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+                ) from exc
+
+            existing_item = exc.response.get("Item")
+            logger.log(LogReference.REPOSITORY046, item_exists=bool(existing_item))
+            if not existing_item:
+                return False, None
+
+            return False, self._from_dynamo(existing_item)
+
+        logger.log(LogReference.REPOSITORY027, result=result)
+        deleted_pointer = self._from_dynamo(result["Attributes"])
+        self._adjust_pointer_counts(
+            {deleted_pointer.nhs_number: {deleted_pointer.type: -1}}
+        )
+        return True, deleted_pointer
+
     def delete_by_id(self, id_: str, can_ignore_delete_fail: bool = False):
         """ """
-        key = f"D#{id_}"
         try:
-            self.table.delete_item(Key={"pk": key, "sk": key})
+            if item := self.get_by_id(id_, fields=DELETE_FIELDS):
+                self.delete(item)
         except Exception as exc:
             if can_ignore_delete_fail:
                 logger.log(
@@ -352,18 +1734,353 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
                     error=str(exc),
                 )
 
-    def _query(self, **kwargs) -> Iterator[DocumentPointer]:
+    def delete_by_nhs_number(
+        self,
+        nhs_number: str,
+        ods_code_parts: Tuple[str, ...],
+        pointer_types: List[str],
+        start_key: Optional[Dict[str, str]] = None,
+        deadline: Optional[float] = None,
+    ) -> Tuple[int, Optional[Dict[str, str]]]:
+        """
+        Delete a producer's DocumentPointers of the given types for a patient
+
+        The keys of matching pointers are read from patient_gsi a page at a time
+        and each page is deleted with BatchWriteItem. No further pages are
+        started once the deadline, a time.monotonic() value, has passed.
+
+        Returns the number of pointers deleted, and the key to continue from
+        when there are more pointers to delete
+        """
+        # Pointers can only be created with a type that has a category
+        pointer_types = [
+            pointer_type
+            for pointer_type in pointer_types
+            if pointer_type in TYPE_CATEGORIES
+        ]
+        if not pointer_types:
+            return 0, None
+
+        custodian_condition, expression_values = _get_custodian_condition(
+            ods_code_parts
+        )
+        types_by_sort_prefix = {
+            "C#{}#T#{}#".format(*_get_sk_ids_for_type(pointer_type)): pointer_type
+            for pointer_type in pointer_types
+        }
+        query = {
+            "IndexName": "patient_gsi",
+            "KeyConditionExpression": "patient_key = :patient_key",
+            "FilterExpression": custodian_condition,
+            "ProjectionExpression": "pk, sk, patient_sort",
+            "Limit": MAX_DELETE_PAGE_SIZE,
+        }
+        expression_values[":patient_key"] = f"P#{nhs_number}"
+
+        patient_sort_prefixes = _get_patient_sort_prefixes(pointer_types)
+        if len(patient_sort_prefixes) == 1:
+            query[
+                "KeyConditionExpression"
+            ] += " AND begins_with(patient_sort, :patient_sort)"
+            expression_values[":patient_sort"] = patient_sort_prefixes[0]
+
+        query["ExpressionAttributeValues"] = serialize_item(expression_values)
+
+        logger.log(
+            LogReference.REPOSITORY054,
+            nhs_number=nhs_number,
+            pointer_types=pointer_types,
+            start_key=start_key,
+        )
+
+        deleted_count = 0
+        while True:
+            try:
+                page = self.client.query(
+                    TableName=self.table_name,
+                    **query,
+                    **(
+                        {"ExclusiveStartKey": serialize_item(start_key)}
+                        if start_key
+                        else {}
+                    ),
+                    ReturnConsumedCapacity="INDEXES",
+                )
+            except ClientError as exc:
+                logger.log(
+                    LogReference.REPOSITORY022,
+                    exc_info=sys.exc_info(),
+                    stacklevel=5,
+                    error=str(exc),
+                )
+                raise exc
+
+            types_by_key = {}
+            for item in map(deserialize_item, page["Items"]):
+                sort_prefix = item["patient_sort"].split("#CO#", 1)[0] + "#"
+                if pointer_type := types_by_sort_prefix.get(sort_prefix):
+                    types_by_key[item["pk"], item["sk"]] = pointer_type
+
+            self._invalidate_cached([pk.removeprefix("D#") for pk, _ in types_by_key])
+            type_deltas = defaultdict(int)
+            for pointer_type in types_by_key.values():
+                type_deltas[pointer_type] -= 1
+
+            try:
+                unprocessed_keys = {
+                    (
+                        request["DeleteRequest"]["Key"]["pk"]["S"],
+                        request["DeleteRequest"]["Key"]["sk"]["S"],
+                    )
+                    for request in self._batch_write(
+                        [
+                            {
+                                "DeleteRequest": {
+                                    "Key": serialize_item({"pk": pk, "sk": sk})
+                                }
+                            }
+                            for pk, sk in types_by_key
+                        ]
+                    )
+                }
+            except Exception:
+                # Chunks deleted before the failure have not been counted
+                self._log_unapplied_counts({nhs_number: type_deltas})
+                raise
+
+            for key in unprocessed_keys:
+                type_deltas[types_by_key[key]] += 1
+            self._adjust_pointer_counts({nhs_number: type_deltas})
+
+            deleted_count += len(types_by_key) - len(unprocessed_keys)
+            logger.log(
+                LogReference.REPOSITORY055,
+                deleted_count=deleted_count,
+                scanned_count=page["ScannedCount"],
+            )
+
+            if unprocessed_keys:
+                logger.log(
+                    LogReference.REPOSITORY056,
+                    deleted_count=deleted_count,
+                    unprocessed_count=len(unprocessed_keys),
+                )
+                raise OperationOutcomeError(
+                    status_code="500",
+                    severity="error",
+                    code="transient",
+                    details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+                    diagnostics="Not all of the DocumentReferences could be deleted, the request can be retried",
+                )
+
+            if "LastEvaluatedKey" not in page:
+                return deleted_count, None
+
+            start_key = deserialize_item(page["LastEvaluatedKey"])
+
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.log(
+                    LogReference.REPOSITORY057,
+                    deleted_count=deleted_count,
+                    last_evaluated_key=start_key,
+                )
+                return deleted_count, start_key
+
+    def _counter_updates(self, pointer_deltas: Dict[str, Dict[str, int]]) -> List[dict]:
+        """
+        Build the transaction items that adjust each patient's counter by the
+        provided per-type deltas, with one item per patient
+        """
+        updates = []
+        for nhs_number, type_deltas in pointer_deltas.items():
+            type_deltas = {
+                pointer_type: delta
+                for pointer_type, delta in type_deltas.items()
+                if delta
+            }
+            if not type_deltas:
+                continue
+
+            updates.append(
+                {
+                    "Update": {
+                        "TableName": self.table_name,
+                        "Key": serialize_item(get_patient_counter_key(nhs_number)),
+                        "UpdateExpression": "ADD "
+                        + ", ".join(
+                            [
+                                *(
+                                    f"#pointer_type{idx} :delta{idx}"
+                                    for idx in range(len(type_deltas))
+                                ),
+                                "#counter_version :counter_version_delta",
+                            ]
+                        ),
+                        "ExpressionAttributeNames": {
+                            **{
+                                f"#pointer_type{idx}": pointer_type
+                                for idx, pointer_type in enumerate(type_deltas)
+                            },
+                            "#counter_version": COUNTER_VERSION_ATTRIBUTE,
+                        },
+                        "ExpressionAttributeValues": serialize_item(
+                            {
+                                **{
+                                    f":delta{idx}": delta
+                                    for idx, delta in enumerate(type_deltas.values())
+                                },
+                                ":counter_version_delta": 1,
+                            }
+                        ),
+                    }
+                }
+            )
+
+        return updates
+
+    def _adjust_pointer_counts(self, pointer_deltas: Dict[str, Dict[str, int]]):
+        """
+        Adjust each patient's counter by the provided per-type deltas, outside
+        of a transaction. A failure leaves the counter to be repaired by
+        rebuild_pointer_counts rather than failing the completed write.
+        """
+        for nhs_number, type_deltas in pointer_deltas.items():
+            for counter_update in self._counter_updates({nhs_number: type_deltas}):
+                update = counter_update["Update"]
+                try:
+                    self.client.update_item(**update, ReturnConsumedCapacity="INDEXES")
+                except ClientError as exc:
+                    logger.log(
+                        LogReference.REPOSITORY047,
+                        exc_info=sys.exc_info(),
+                        stacklevel=5,
+                        error=str(exc),
+                        key=update["Key"],
+                    )
+                    self._log_unapplied_counts({nhs_number: type_deltas})
+
+    def _log_unapplied_counts(self, pointer_deltas: Dict[str, Dict[str, int]]):
+        """
+        Log the per-type deltas that may not have been applied to each
+        patient's counter, so those counters can be rebuilt
+        """
+        for nhs_number, type_deltas in pointer_deltas.items():
+            logger.log(
+                LogReference.REPOSITORY065,
+                nhs_number=nhs_number,
+                pointer_deltas=dict(type_deltas),
+            )
+
+    def _transact_write(self, transact_items: List[dict]) -> dict:
+        """
+        Wrapper around DynamoDB transact_write_items
+        """
+        return self.client.transact_write_items(
+            TransactItems=transact_items,
+            ReturnConsumedCapacity="INDEXES",
+        )
+
+    def _count_by_query(
+        self,
+        nhs_number: str,
+        pointer_types: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Count DocumentPointer records by NHS number from the patient_gsi partition
+        """
+        key_conditions = ["patient_key = :patient_key"]
+        filter_expressions = []
+        expression_names = {}
+        expression_values = {":patient_key": f"P#{nhs_number}"}
+
+        pointer_types = pointer_types or []
+        if len(pointer_types) == 1:
+            # Optimisation for single pointer type
+            category_id, type_id = _get_sk_ids_for_type(pointer_types[0])
+            patient_sort = f"C#{category_id}#T#{type_id}"
+            key_conditions.append("begins_with(patient_sort, :patient_sort)")
+            expression_values[":patient_sort"] = patient_sort
+
+        # Handle multiple categories and pointer types with filter expressions
+        if len(pointer_types) > 1:
+            expression_names["#pointer_type"] = "type"
+            types_filters = [
+                f"#pointer_type = :type_{i}" for i in range(len(pointer_types))
+            ]
+            types_filter_values = {
+                f":type_{i}": pointer_types[i] for i in range(len(pointer_types))
+            }
+            filter_expressions.append(f"({' OR '.join(types_filters)})")
+            expression_values.update(types_filter_values)
+
+        query = {
+            "IndexName": "patient_gsi",
+            "KeyConditionExpression": " AND ".join(key_conditions),
+            "ExpressionAttributeValues": serialize_item(expression_values),
+            "Select": "COUNT",
+            "ReturnConsumedCapacity": "INDEXES",
+        }
+
+        if filter_expressions:
+            query["FilterExpression"] = " AND ".join(filter_expressions)
+
+        if expression_names:
+            query["ExpressionAttributeNames"] = expression_names
+
+        logger.log(LogReference.REPOSITORY017, query=query)
+
+        count = 0
+        try:
+            paginator = self.client.get_paginator("query")
+            for page in paginator.paginate(TableName=self.table_name, **query):
+                logger.log(LogReference.REPOSITORY018a, result=page)
+                count += page["Count"]
+        except ClientError as exc:
+            logger.log(
+                LogReference.REPOSITORY019,
+                exc_info=sys.exc_info(),
+                stacklevel=5,
+                error=str(exc),
+            )
+            raise OperationOutcomeError(
+                status_code="500",
+                severity="error",
+                code="exception",
+                details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+            ) from exc
+
+        logger.log(LogReference.REPOSITORY018, count=count)
+        return count
+
+    def _query(
+        self,
+        max_items: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Iterator[DocumentPointer]:
         """
         Wrapper around DynamoDB query method to handle pagination
-        Returns an iterator of DocumentPointer objects
+        Returns an iterator of DocumentPointer objects, stopping after
+        max_items when provided, holding only fields when provided
         """
         # Remove empty fields from the search query
-        query = {key: value for key, value in kwargs.items() if value}
+        query = {
+            key: value
+            for key, value in kwargs.items()
+            if value or isinstance(value, bool)
+        }
+        for serialized_argument in ("ExpressionAttributeValues", "ExclusiveStartKey"):
+            if serialized_argument in query:
+                query[serialized_argument] = serialize_item(query[serialized_argument])
+
+        if max_items and "FilterExpression" not in query:
+            query["PaginationConfig"] = {"PageSize": max_items}
 
         logger.log(LogReference.REPOSITORY021, query=query, table=self.table_name)
 
+        items_yielded = 0
         try:
-            paginator = self.dynamodb.meta.client.get_paginator("query")
+            paginator = self.client.get_paginator("query")
             response_iterator = paginator.paginate(TableName=self.table_name, **query)
 
             for page in response_iterator:
@@ -378,10 +2095,12 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
                 logger.log(LogReference.REPOSITORY028a, result=page)
 
                 for item in page["Items"]:
+                    if max_items and items_yielded >= max_items:
+                        return
+
                     try:
-                        yield self.ITEM_TYPE.model_validate(
-                            {"_from_dynamo": True, **item}
-                        )
+                        yield self._from_dynamo(item, fields=fields)
+                        items_yielded += 1
 
                     except ValidationError as exc:
                         logger.log(
@@ -408,18 +2127,155 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
             )
             raise exc
 
-    def update(self, item: DocumentPointer) -> DocumentPointer:
+    def _fan_out_query(
+        self,
+        queries: List[dict],
+        max_items: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        newest_first: bool = False,
+    ) -> Iterator[DocumentPointer]:
+        """
+        Run the provided queries concurrently on the shared fan out executor
+        Returns an iterator of DocumentPointer objects in patient_sort order,
+        or newest first by created_on when newest_first is set
+        """
+        logger.log(
+            LogReference.REPOSITORY031,
+            patient_sort_prefixes=[
+                query["ExpressionAttributeValues"][":patient_sort"] for query in queries
+            ],
+        )
+
+        results = list(
+            _get_fan_out_executor().map(
+                lambda query: list(
+                    self._query(**query, max_items=max_items, fields=fields)
+                ),
+                queries,
+            )
+        )
+
+        if newest_first:
+            yield from heapq.merge(
+                *results,
+                key=lambda item: _get_created_sort(item.patient_sort),
+                reverse=True,
+            )
+            return
+
+        yield from heapq.merge(*results, key=lambda item: item.patient_sort)
+
+    def update_in_place(
+        self, item: DocumentPointer
+    ) -> Tuple[bool, Optional[DocumentPointer]]:
+        """
+        Update a DocumentPointer with a single conditional UpdateItem, which only
+        applies if the stored pointer has the same update_fingerprint
+
+        Fields outside the fingerprint that are not set here, such as created_on,
+        are carried over from the stored pointer. Returns whether the update was
+        applied and, when it was not, the pointer currently stored (or None if
+        the pointer does not exist) as returned by the failed write.
+        """
+        logger.log(
+            LogReference.REPOSITORY043,
+            partition_key=item.pk,
+            update_fingerprint=item.update_fingerprint,
+        )
+        self._invalidate_cached([item.id])
+
+        try:
+            result = self.client.update_item(
+                TableName=self.table_name,
+                Key=serialize_item({"pk": item.pk, "sk": item.sk}),
+                UpdateExpression="SET document = :document, updated_on = :updated_on",
+                ConditionExpression="update_fingerprint = :update_fingerprint",
+                ExpressionAttributeValues=serialize_item(
+                    {
+                        ":document": encode_document(
+                            item.document, self.document_encoding
+                        ),
+                        ":updated_on": item.updated_on,
+                        ":update_fingerprint": item.update_fingerprint,
+                    }
+                ),
+                ReturnValues="NONE",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                ReturnConsumedCapacity="INDEXES",
+            )
+            logger.log(LogReference.REPOSITORY029a, result=result)
+
+        except ClientError as exc:
+            if not _is_conditional_check_failure(exc):
+                logger.log(
+                    LogReference.REPOSITORY023,
+                    exc_info=sys.exc_info(),
+                    stacklevel=5,
+                    error=str(exc),
+                )
+                raise OperationOutcomeError(
+                    status_code="500",
+                    severity="error",
+                    code="exception",
+                    details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+                ) from exc
+
+            existing_item = exc.response.get("Item")
+            logger.log(LogReference.REPOSITORY044, item_exists=bool(existing_item))
+            if not existing_item:
+                return False, None
+
+            return False, self._from_dynamo(existing_item)
+
+        return True, None
+
+    def update(
+        self, item: DocumentPointer, previous_item: Optional[DocumentPointer] = None
+    ) -> DocumentPointer:
         """
         Update a DocumentPointer resource
+
+        When previous_item is provided, the update is only applied if the stored
+        pointer has the same updated_on as previous_item, so has not been updated
+        since it was read. Every update sets updated_on, so this does not depend
+        on how the stored document is encoded. Updates read and written within
+        the same millisecond are not told apart.
         """
+        self._invalidate_cached([item.id])
+        condition_expression = "attribute_exists(pk) AND attribute_exists(sk)"
+        expression_values = {}
+        if previous_item is not None:
+            if previous_item.updated_on is None:
+                condition_expression += " AND (attribute_not_exists(updated_on) OR attribute_type(updated_on, :null_type))"
+                expression_values[":null_type"] = "NULL"
+            else:
+                condition_expression += " AND updated_on = :previous_updated_on"
+                expression_values[":previous_updated_on"] = previous_item.updated_on
+
         try:
-            result = self.table.put_item(
-                Item=item.model_dump(),
-                ConditionExpression="attribute_exists(pk) AND attribute_exists(sk)",
+            result = self.client.put_item(
+                TableName=self.table_name,
+                Item=self._to_dynamo(item),
+                ConditionExpression=condition_expression,
                 ReturnConsumedCapacity="INDEXES",
+                **(
+                    {"ExpressionAttributeValues": serialize_item(expression_values)}
+                    if expression_values
+                    else {}
+                ),
             )
             logger.log(LogReference.REPOSITORY029a, result=result)
         except ClientError as exc:
+            if previous_item is not None and _is_conditional_check_failure(exc):
+                logger.log(LogReference.REPOSITORY045, partition_key=item.pk)
+                raise OperationOutcomeError(
+                    status_code="409",
+                    severity="error",
+                    code="conflict",
+                    details=SpineErrorConcept.from_code("BAD_REQUEST"),
+                    diagnostics="The DocumentReference was modified by another request whilst being updated",
+                ) from None
+
             logger.log(
                 LogReference.REPOSITORY023,
                 exc_info=sys.exc_info(),
@@ -0,0 +1,148 @@
+import asyncio
+import inspect
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from moto import mock_aws
+
+from nrlf.core.dynamodb.async_repository import AsyncDocumentPointerRepository
+from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
+from nrlf.core.errors import OperationOutcomeError
+from nrlf.tests.data import load_document_reference
+from nrlf.tests.dynamodb import mock_repository
+
+
+def _build_pointer(document_id: str) -> DocumentPointer:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.id = f"Y05868-{document_id}"
+    return DocumentPointer.from_document_reference(doc_ref)
+
+
+@mock_aws
+@mock_repository
+def test_async_repository_create_and_get_by_id(repository: DocumentPointerRepository):
+    async_repository = AsyncDocumentPointerRepository(repository)
+    pointer = _build_pointer("async-1")
+
+    async def _run():
+        await async_repository.create(pointer)
+        return await async_repository.get_by_id(pointer.id)
+
+    result = asyncio.run(_run())
+
+    assert result is not None
+    assert result.id == pointer.id
+
+
+@mock_aws
+@mock_repository
+def test_async_repository_gathers_independent_calls(
+    repository: DocumentPointerRepository,
+):
+    for idx in range(2):
+        repository.create(_build_pointer(f"async-{idx}"))
+
+    async_repository = AsyncDocumentPointerRepository(repository)
+
+    async def _run():
+        return await asyncio.gather(
+            async_repository.get_by_id("Y05868-async-0"),
+            async_repository.search(nhs_number="6700028191"),
+            async_repository.get_pointer_counts("6700028191"),
+        )
+
+    pointer, search_results, pointer_counts = asyncio.run(_run())
+
+    assert pointer is not None
+    assert sorted(result.id for result in search_results) == [
+        "Y05868-async-0",
+        "Y05868-async-1",
+    ]
+    assert pointer_counts == {"http://snomed.info/sct|736253002": 2}
+
+
+def test_async_repository_runs_calls_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _get_by_id(id_, fields=None):
+        # Only returns once both calls are in progress at the same time
+        barrier.wait()
+        return id_
+
+    repository = Mock(get_by_id=Mock(side_effect=_get_by_id))
+    async_repository = AsyncDocumentPointerRepository(repository)
+
+    async def _run():
+        return await asyncio.gather(
+            async_repository.get_by_id("first"),
+            async_repository.get_by_id("second"),
+        )
+
+    start = time.monotonic()
+    assert asyncio.run(_run()) == ["first", "second"]
+    assert time.monotonic() - start < 5
+
+
+@mock_aws
+@mock_repository
+def test_async_repository_raises_repository_errors(
+    repository: DocumentPointerRepository,
+):
+    pointer = _build_pointer("async-1")
+    repository.create(pointer)
+    async_repository = AsyncDocumentPointerRepository(repository)
+
+    with pytest.raises(OperationOutcomeError) as error:
+        asyncio.run(async_repository.create(pointer))
+
+    assert error.value.response.statusCode == "409"
+
+
+def test_async_repository_has_every_repository_method():
+    repository_methods = {
+        name
+        for name, _ in inspect.getmembers(DocumentPointerRepository, inspect.isfunction)
+        if not name.startswith("_")
+    }
+    async_methods = {
+        name
+        for name, _ in inspect.getmembers(
+            AsyncDocumentPointerRepository, inspect.iscoroutinefunction
+        )
+        if not name.startswith("_")
+    }
+
+    assert async_methods == repository_methods
+    for name in repository_methods:
+        assert inspect.signature(
+            getattr(AsyncDocumentPointerRepository, name)
+        ) == inspect.signature(getattr(DocumentPointerRepository, name))
+
+
+@mock_aws
+@mock_repository
+def test_async_repository_producer_reads(repository: DocumentPointerRepository):
+    pointer = repository.create(
+        _build_pointer("async-1").model_copy(
+            update={"master_identifier": "async-request"}
+        )
+    )
+    async_repository = AsyncDocumentPointerRepository(repository)
+
+    async def _run():
+        return await asyncio.gather(
+            async_repository.get_by_master_identifier(("Y05868",), "async-request"),
+            async_repository.list_by_custodian(("Y05868",), [pointer.type]),
+            async_repository.list_page_by_custodian(
+                ("Y05868",), [pointer.type], limit=1
+            ),
+        )
+
+    by_master_identifier, listed, (page, start_key) = asyncio.run(_run())
+
+    assert by_master_identifier.id == pointer.id
+    assert [result.id for result in listed] == [pointer.id]
+    assert [result.id for result in page] == [pointer.id]
+    assert start_key is None
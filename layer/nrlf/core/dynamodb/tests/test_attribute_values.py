@@ -0,0 +1,97 @@
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import Binary, TypeSerializer
+
+from nrlf.core.dynamodb.attribute_values import (
+    deserialize_document_pointer,
+    deserialize_item,
+    deserialize_value,
+    serialize_document_pointer,
+    serialize_item,
+    serialize_value,
+)
+from nrlf.core.dynamodb.codec import encode_document
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.tests.data import load_document_reference
+
+
+def _build_pointer_item() -> dict:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    return DocumentPointer.from_document_reference(doc_ref).model_dump()
+
+
+@pytest.mark.parametrize(
+    "value, attribute_value",
+    [
+        ("text", {"S": "text"}),
+        (None, {"NULL": True}),
+        (True, {"BOOL": True}),
+        (3, {"N": "3"}),
+        (Decimal("1.5"), {"N": "1.5"}),
+        (b"\x01data", {"B": b"\x01data"}),
+        (Binary(b"\x01data"), {"B": b"\x01data"}),
+        (["a", 1], {"L": [{"S": "a"}, {"N": "1"}]}),
+        ({"a": None}, {"M": {"a": {"NULL": True}}}),
+    ],
+)
+def test_serialize_value(value, attribute_value):
+    assert serialize_value(value) == attribute_value
+
+
+def test_serialize_value_unsupported_type():
+    with pytest.raises(TypeError, match="Unsupported DynamoDB attribute type: float"):
+        serialize_value(1.5)
+
+
+def test_deserialize_value():
+    assert deserialize_value({"N": "3"}) == 3
+    assert type(deserialize_value({"N": "3"})) is int
+    assert deserialize_value({"N": "1.5"}) == Decimal("1.5")
+    assert deserialize_value({"B": b"data"}) == b"data"
+    assert deserialize_value({"L": [{"S": "a"}, {"BOOL": False}]}) == ["a", False]
+
+
+def test_item_round_trip():
+    item = {"pk": "P#9278693472", "sk": "CNT", "type": 2, "empty": None}
+
+    assert deserialize_item(serialize_item(item)) == item
+
+
+def test_serialize_document_pointer_matches_boto3_serializer():
+    item = _build_pointer_item()
+    serializer = TypeSerializer()
+
+    assert serialize_document_pointer(item) == {
+        name: serializer.serialize(value) for name, value in item.items()
+    }
+
+
+def test_serialize_document_pointer_encoded_document():
+    item = {**_build_pointer_item(), "document": encode_document("{}", "zlib")}
+
+    serialized = serialize_document_pointer(item)
+
+    assert serialized["document"] == {"B": item["document"]}
+    assert serialized["version"] == {"N": "1"}
+    assert serialized["custodian_suffix"] == {"NULL": True}
+
+
+def test_deserialize_document_pointer():
+    item = _build_pointer_item()
+    serialized = TypeSerializer().serialize(item)["M"]
+
+    values = deserialize_document_pointer(serialized)
+
+    assert values == item
+    assert type(values["version"]) is int
+    assert DocumentPointer.from_dynamo(values).model_dump() == item
+
+
+def test_deserialize_document_pointer_projection():
+    serialized = {"id": {"S": "Y05868-1"}, "version": {"N": "2"}}
+
+    assert deserialize_document_pointer(serialized) == {
+        "id": "Y05868-1",
+        "version": 2,
+    }
@@ -0,0 +1,117 @@
+from unittest.mock import patch
+
+from nrlf.core.dynamodb.cache import (
+    ENTRY_OVERHEAD_BYTES,
+    PointerCache,
+    get_version_stamp,
+)
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.tests.data import load_document_reference
+
+
+def _build_pointer(document_id: str) -> DocumentPointer:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.id = f"Y05868-{document_id}"
+    return DocumentPointer.from_document_reference(doc_ref)
+
+
+def test_pointer_cache_hit_and_miss():
+    cache = PointerCache(max_bytes=100_000, ttl_seconds=60, revalidate_seconds=10)
+    pointer = _build_pointer("doc1")
+
+    assert cache.get(pointer.id) is None
+    cache.put(pointer.id, pointer)
+    cache.put("Y05868-missing", None)
+
+    assert cache.get(pointer.id).pointer is pointer
+    assert cache.get(pointer.id).stamp == (1, None)
+    missing_entry = cache.get("Y05868-missing")
+    assert missing_entry.pointer is None
+    assert missing_entry.stamp is None
+    assert cache.stats() == {
+        "hits": 3,
+        "misses": 1,
+        "evictions": 0,
+        "entries": 2,
+        "size_bytes": 2 * ENTRY_OVERHEAD_BYTES + len(pointer.document),
+    }
+
+
+def test_pointer_cache_evicts_least_recently_used():
+    pointers = [_build_pointer(f"doc{idx}") for idx in range(3)]
+    entry_size = ENTRY_OVERHEAD_BYTES + len(pointers[0].document)
+    cache = PointerCache(
+        max_bytes=2 * entry_size, ttl_seconds=60, revalidate_seconds=10
+    )
+
+    cache.put(pointers[0].id, pointers[0])
+    cache.put(pointers[1].id, pointers[1])
+    cache.get(pointers[0].id)
+    cache.put(pointers[2].id, pointers[2])
+
+    assert cache.get(pointers[1].id) is None
+    assert cache.get(pointers[0].id) is not None
+    assert cache.get(pointers[2].id) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] == 2 * entry_size
+
+
+def test_pointer_cache_skips_entries_larger_than_cache():
+    cache = PointerCache(
+        max_bytes=ENTRY_OVERHEAD_BYTES, ttl_seconds=60, revalidate_seconds=10
+    )
+    pointer = _build_pointer("doc1")
+
+    cache.put(pointer.id, pointer)
+
+    assert cache.get(pointer.id) is None
+    assert cache.stats()["size_bytes"] == 0
+
+
+@patch("nrlf.core.dynamodb.cache.time.monotonic")
+def test_pointer_cache_entries_expire(mock_monotonic):
+    cache = PointerCache(max_bytes=100_000, ttl_seconds=60, revalidate_seconds=10)
+    pointer = _build_pointer("doc1")
+
+    mock_monotonic.return_value = 1000
+    cache.put(pointer.id, pointer)
+
+    mock_monotonic.return_value = 1059
+    assert cache.get(pointer.id) is not None
+
+    mock_monotonic.return_value = 1060
+    assert cache.get(pointer.id) is None
+    assert cache.stats()["entries"] == 0
+
+
+@patch("nrlf.core.dynamodb.cache.time.monotonic")
+def test_pointer_cache_revalidated(mock_monotonic):
+    cache = PointerCache(max_bytes=100_000, ttl_seconds=60, revalidate_seconds=10)
+    pointer = _build_pointer("doc1")
+
+    mock_monotonic.return_value = 1000
+    cache.put(pointer.id, pointer)
+    assert cache.get(pointer.id).revalidate_at == 1010
+
+    mock_monotonic.return_value = 1015
+    cache.revalidated(pointer.id)
+    assert cache.get(pointer.id).revalidate_at == 1025
+
+
+def test_pointer_cache_invalidate():
+    cache = PointerCache(max_bytes=100_000, ttl_seconds=60, revalidate_seconds=10)
+    pointer = _build_pointer("doc1")
+    cache.put(pointer.id, pointer)
+
+    cache.invalidate(pointer.id)
+
+    assert cache.get(pointer.id) is None
+    assert cache.stats()["size_bytes"] == 0
+
+
+def test_get_version_stamp():
+    pointer = _build_pointer("doc1")
+    pointer.updated_on = "2024-03-21T12:34:56.789Z"
+
+    assert get_version_stamp(pointer) == (1, "2024-03-21T12:34:56.789Z")
+    assert get_version_stamp(None) is None
@@ -0,0 +1,41 @@
+import zlib
+
+import pytest
+from boto3.dynamodb.types import Binary
+
+from nrlf.core.dynamodb.codec import (
+    ZLIB_V1_MARKER,
+    decode_document,
+    encode_document,
+    get_document_encoding,
+)
+from nrlf.tests.data import load_document_reference
+
+DOCUMENT = load_document_reference("Y05868-736253002-Valid").model_dump_json(
+    exclude_none=True
+)
+
+
+def test_encode_document_json():
+    assert encode_document(DOCUMENT, "json") == DOCUMENT
+    assert decode_document(DOCUMENT) == DOCUMENT
+    assert get_document_encoding(DOCUMENT) == "json"
+
+
+def test_encode_document_zlib():
+    encoded = encode_document(DOCUMENT, "zlib")
+
+    assert encoded[:1] == ZLIB_V1_MARKER
+    assert len(encoded) < len(zlib.compress(DOCUMENT.encode(), 9))
+    assert decode_document(encoded) == DOCUMENT
+    assert decode_document(Binary(encoded)) == DOCUMENT
+    assert get_document_encoding(Binary(encoded)) == "zlib"
+
+
+def test_encode_document_zlib_is_deterministic():
+    assert encode_document(DOCUMENT, "zlib") == encode_document(DOCUMENT, "zlib")
+
+
+def test_decode_document_unknown_marker():
+    with pytest.raises(ValueError, match="Unknown document format marker"):
+        decode_document(b"\xff" + encode_document(DOCUMENT, "zlib")[1:])
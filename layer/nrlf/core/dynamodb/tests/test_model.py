@@ -1,10 +1,19 @@
 import json
+from decimal import Decimal
 
 import pytest
+from boto3.dynamodb.types import Binary
 from freezegun import freeze_time
+from pydantic import ValidationError
 
 from nrlf.core.constants import PointerTypes
-from nrlf.core.dynamodb.model import DocumentPointer, DynamoDBModel
+from nrlf.core.dynamodb.codec import encode_document
+from nrlf.core.dynamodb.model import (
+    DocumentPointer,
+    DynamoDBModel,
+    get_update_fingerprint,
+)
+from nrlf.core.errors import UnprojectedFieldError
 from nrlf.core.utils import create_fhir_instant
 from nrlf.producer.fhir.r4.model import DocumentReference
 from nrlf.tests.data import load_document_reference, load_document_reference_json
@@ -72,9 +81,13 @@ def test_document_pointer_init():
         "sk": "D#X26-999999-999999-99999999",
         "patient_key": "P#9999999999",
         "patient_sort": "C#SCT-987654321#T#SCT-123456789#CO#2024-01-01T00:00:00.000Z#D#X26-999999-999999-99999999",
+        "custodian_key": "O#X26#P#9999999999",
+        "producer_key": "O#X26#S#0",
+        "producer_sort": "CO#2024-01-01T00:00:00.000Z#D#X26-999999-999999-99999999",
         "masterid_key": "O#X26#MI#1111-11111-111111",
         "schemas": [],
         "updated_on": None,
+        "update_fingerprint": None,
     }
 
 
@@ -85,6 +98,7 @@ def test_document_pointer_from_document_reference_valid():
 
     model_data = model.model_dump()
     document = model_data.pop("document")
+    update_fingerprint = model_data.pop("update_fingerprint")
 
     assert model_data == {
         "created_on": "2024-01-01T00:00:00.000Z",
@@ -107,9 +121,13 @@ def test_document_pointer_from_document_reference_valid():
         "sk": "D#Y05868-99999-99999-999999",
         "patient_key": "P#6700028191",
         "patient_sort": "C#SCT-734163000#T#SCT-736253002#CO#2024-01-01T00:00:00.000Z#D#Y05868-99999-99999-999999",
+        "custodian_key": "O#Y05868#P#6700028191",
+        "producer_key": "O#Y05868#S#0",
+        "producer_sort": "CO#2024-01-01T00:00:00.000Z#D#Y05868-99999-99999-999999",
     }
 
     assert json.loads(document) == doc_ref.model_dump(exclude_none=True)
+    assert update_fingerprint == get_update_fingerprint(json.loads(document))
 
 
 def test_document_pointer_from_document_reference_valid_with_created_on():
@@ -120,6 +138,7 @@ def test_document_pointer_from_document_reference_valid_with_created_on():
 
     model_data = model.model_dump()
     document = model_data.pop("document")
+    update_fingerprint = model_data.pop("update_fingerprint")
 
     assert model_data == {
         "created_on": "2024-02-02T12:34:56.000Z",
@@ -142,9 +161,13 @@ def test_document_pointer_from_document_reference_valid_with_created_on():
         "sk": "D#Y05868-99999-99999-999999",
         "patient_key": "P#6700028191",
         "patient_sort": "C#SCT-734163000#T#SCT-736253002#CO#2024-02-02T12:34:56.000Z#D#Y05868-99999-99999-999999",
+        "custodian_key": "O#Y05868#P#6700028191",
+        "producer_key": "O#Y05868#S#0",
+        "producer_sort": "CO#2024-02-02T12:34:56.000Z#D#Y05868-99999-99999-999999",
     }
 
     assert json.loads(document) == doc_ref.model_dump(exclude_none=True)
+    assert update_fingerprint == get_update_fingerprint(json.loads(document))
 
 
 def test_document_pointer_from_document_reference_invalid():
@@ -280,3 +303,124 @@ def test_validate_id(id_):
 def test_validate_id_invalid(id_):
     with pytest.raises(ValueError):
         DocumentPointer.validate_id(id_)
+
+
+def _load_dynamo_item() -> dict:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    item = DocumentPointer.from_document_reference(doc_ref).model_dump()
+    item["version"] = Decimal(item["version"])
+    return item
+
+
+def test_document_pointer_from_dynamo_matches_strict_validation():
+    item = _load_dynamo_item()
+
+    trusted = DocumentPointer.from_dynamo(item)
+    strict = DocumentPointer.from_dynamo(item, strict=True)
+
+    assert trusted._from_dynamo is True
+    assert strict._from_dynamo is True
+    assert trusted.model_dump() == strict.model_dump()
+    assert trusted.producer_id == strict.producer_id == "Y05868"
+    assert trusted.document_id == strict.document_id
+    assert trusted.version == 1
+    assert trusted.indexes == strict.indexes
+
+
+def test_document_pointer_from_dynamo_extracts_custodian_suffix():
+    item = {**_load_dynamo_item(), "custodian": "Y05868.001", "custodian_suffix": None}
+
+    model = DocumentPointer.from_dynamo(item)
+
+    assert model.custodian == "Y05868"
+    assert model.custodian_suffix == "001"
+
+
+def test_document_pointer_from_dynamo_strict_validates_item():
+    item = {**_load_dynamo_item(), "nhs_number": "1234567890"}
+
+    trusted = DocumentPointer.from_dynamo(item)
+    assert trusted.nhs_number == "1234567890"
+
+    with pytest.raises(ValidationError):
+        DocumentPointer.from_dynamo(item, strict=True)
+
+
+def test_document_pointer_from_dynamo_with_fields_returns_partial_pointer():
+    item = _load_dynamo_item()
+    projected_item = {"id": item["id"], "version": item["version"]}
+
+    model = DocumentPointer.from_dynamo(
+        projected_item, strict=True, fields=["id", "version"]
+    )
+
+    assert model._from_dynamo is True
+    assert model.id == item["id"]
+    assert model.producer_id == "Y05868"
+    assert model.version == 1
+    with pytest.raises(UnprojectedFieldError, match="DocumentPointer.schemas"):
+        model.schemas
+    with pytest.raises(UnprojectedFieldError, match="DocumentPointer.category_id"):
+        model.patient_sort
+
+
+def test_document_pointer_from_dynamo_decodes_compressed_document_on_access():
+    item = _load_dynamo_item()
+    encoded_item = {
+        **item,
+        "document": Binary(encode_document(item["document"], "zlib")),
+    }
+
+    model = DocumentPointer.from_dynamo(encoded_item)
+
+    assert "document" not in model.__dict__
+    assert model.document == item["document"]
+    assert model.__dict__["document"] == item["document"]
+    assert model.model_dump() == DocumentPointer.from_dynamo(item).model_dump()
+
+
+def test_document_pointer_from_dynamo_strict_decodes_compressed_document():
+    item = _load_dynamo_item()
+    encoded_item = {
+        **item,
+        "document": Binary(encode_document(item["document"], "zlib")),
+    }
+
+    model = DocumentPointer.from_dynamo(encoded_item, strict=True)
+
+    assert model.document == item["document"]
+
+
+def test_document_pointer_from_dynamo_with_fields_decodes_compressed_document():
+    item = _load_dynamo_item()
+    projected_item = {
+        "id": item["id"],
+        "document": Binary(encode_document(item["document"], "zlib")),
+    }
+
+    model = DocumentPointer.from_dynamo(projected_item, fields=["id", "document"])
+
+    assert model.document == item["document"]
+    with pytest.raises(UnprojectedFieldError, match="DocumentPointer.type"):
+        model.type
+
+
+def test_get_update_fingerprint_ignores_mutable_fields():
+    document = load_document_reference("Y05868-736253002-Valid").model_dump(
+        exclude_none=True
+    )
+    fingerprint = get_update_fingerprint(document)
+
+    document["description"] = "An updated description"
+    assert get_update_fingerprint(document) == fingerprint
+
+    document["date"] = "2024-06-01T00:00:00.000Z"
+    assert get_update_fingerprint(document) != fingerprint
+
+
+def test_document_pointer_update_fingerprint_invalid_document():
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    model = DocumentPointer.from_document_reference(doc_ref)
+    model.document = "not json"
+
+    assert model.update_fingerprint is None
@@ -1,7 +1,50 @@
+from unittest.mock import patch
+
 import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from nrlf.core.constants import Categories, PointerTypes
+from nrlf.core.dynamodb.attribute_values import (
+    serialize_document_pointer,
+    serialize_item,
+)
+from nrlf.core.dynamodb.cache import ENTRY_OVERHEAD_BYTES, PointerCache
+from nrlf.core.dynamodb.model import get_patient_counter_key
+from nrlf.core.dynamodb.repository import (
+    BATCH_MAX_ATTEMPTS,
+    DocumentPointer,
+    DocumentPointerRepository,
+    _get_patient_sort_prefixes,
+    _get_sk_ids_for_type,
+)
+from nrlf.core.errors import OperationOutcomeError, UnprojectedFieldError
+from nrlf.core.logger import LogReference
+from nrlf.tests.data import load_document_reference
+from nrlf.tests.dynamodb import mock_repository
+
 
-from nrlf.core.constants import PointerTypes
-from nrlf.core.dynamodb.repository import _get_sk_ids_for_type
+def _build_pointer_of_type(
+    pointer_type: PointerTypes, category: Categories, document_id: str
+) -> DocumentPointer:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.id = f"Y05868-{document_id}"
+    doc_ref.type.coding[0].system = pointer_type.coding_system()
+    doc_ref.type.coding[0].code = pointer_type.coding_value()
+    doc_ref.category[0].coding[0].system = category.coding_system()
+    doc_ref.category[0].coding[0].code = category.coding_value()
+    return DocumentPointer.from_document_reference(doc_ref)
+
+
+def _create_pointer_of_type(
+    repository: DocumentPointerRepository,
+    pointer_type: PointerTypes,
+    category: Categories,
+    document_id: str,
+) -> DocumentPointer:
+    return repository.create(
+        _build_pointer_of_type(pointer_type, category, document_id)
+    )
 
 
 def test_get_sk_ids_for_type_exception_thrown_for_invalid_type():
@@ -30,4 +73,1357 @@ def test_get_sk_ids_for_type_exception_thrown_if_new_type_has_no_category():
     )
 
 
-# TODO: Add unit tests for Repository Class
+def test_get_patient_sort_prefixes_single_type():
+    assert _get_patient_sort_prefixes([PointerTypes.MENTAL_HEALTH_PLAN.value]) == [
+        "C#SCT-734163000#T#SCT-736253002#"
+    ]
+
+
+def test_get_patient_sort_prefixes_uses_category_when_all_types_requested():
+    assert _get_patient_sort_prefixes(PointerTypes.list()) == [
+        "C#SCT-103693007#",
+        "C#SCT-1102421000000108#",
+        "C#SCT-721981007#",
+        "C#SCT-734163000#",
+        "C#SCT-823651000000106#",
+    ]
+
+
+def test_get_patient_sort_prefixes_mixed_types():
+    assert _get_patient_sort_prefixes(
+        [
+            PointerTypes.MENTAL_HEALTH_PLAN.value,
+            PointerTypes.NEWS2_CHART.value,
+            PointerTypes.EOL_CARE_PLAN.value,
+        ]
+    ) == [
+        "C#SCT-1102421000000108#",
+        "C#SCT-734163000#T#SCT-736253002#",
+        "C#SCT-734163000#T#SCT-736373009#",
+    ]
+
+
+def test_get_patient_sort_prefixes_unknown_type():
+    with pytest.raises(ValueError) as error:
+        _get_patient_sort_prefixes(["http://snomed.info/sct|736253001"])
+
+    assert (
+        str(error.value)
+        == "Cannot find category for pointer type: http://snomed.info/sct|736253001"
+    )
+
+
+@mock_aws
+@mock_repository
+def test_search_fan_out_returns_requested_types_in_patient_sort_order(
+    repository: DocumentPointerRepository,
+):
+    news2 = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    mental_health = _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+    _create_pointer_of_type(
+        repository, PointerTypes.EOL_CARE_PLAN, Categories.CARE_PLAN, "eol"
+    )
+    summary = _create_pointer_of_type(
+        repository, PointerTypes.SUMMARY_RECORD, Categories.CLINICAL_NOTE, "summary"
+    )
+
+    results = list(
+        repository.search(
+            nhs_number="6700028191",
+            pointer_types=[
+                PointerTypes.SUMMARY_RECORD.value,
+                PointerTypes.MENTAL_HEALTH_PLAN.value,
+                PointerTypes.NEWS2_CHART.value,
+            ],
+        )
+    )
+
+    assert [result.id for result in results] == [
+        news2.id,
+        mental_health.id,
+        summary.id,
+    ]
+    assert [result.patient_sort for result in results] == sorted(
+        result.patient_sort for result in results
+    )
+
+
+@mock_aws
+@mock_repository
+def test_search_fan_out_applies_custodian_filter(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+
+    results = list(
+        repository.search(
+            nhs_number="6700028191",
+            custodian="X26",
+            pointer_types=[
+                PointerTypes.MENTAL_HEALTH_PLAN.value,
+                PointerTypes.NEWS2_CHART.value,
+            ],
+        )
+    )
+
+    assert results == []
+
+
+@mock_aws
+@mock_repository
+def test_search_by_custodian_reads_custodian_index(
+    repository: DocumentPointerRepository,
+):
+    repository.custodian_index_enabled = True
+    mental_health = _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+
+    with patch.object(repository, "_query", wraps=repository._query) as mock_query:
+        results = list(
+            repository.search(
+                nhs_number="6700028191",
+                custodian="Y05868",
+                pointer_types=[PointerTypes.MENTAL_HEALTH_PLAN.value],
+            )
+        )
+
+    assert [result.id for result in results] == [mental_health.id]
+    query = mock_query.call_args.kwargs
+    assert query["IndexName"] == "custodian_gsi"
+    assert query["KeyConditionExpression"] == (
+        "custodian_key = :custodian_key AND begins_with(patient_sort, :patient_sort)"
+    )
+    assert (
+        query["ExpressionAttributeValues"][":custodian_key"] == "O#Y05868#P#6700028191"
+    )
+    assert "FilterExpression" not in query
+
+
+@mock_aws
+@mock_repository
+def test_search_by_custodian_reads_documents_from_table(
+    repository: DocumentPointerRepository,
+):
+    repository.custodian_index_enabled = True
+    mental_health = _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+
+    with patch.object(repository, "_query", wraps=repository._query) as mock_query:
+        results = list(
+            repository.search(
+                nhs_number="6700028191",
+                custodian="Y05868",
+                pointer_types=[PointerTypes.MENTAL_HEALTH_PLAN.value],
+                fields=["document"],
+            )
+        )
+
+    assert [result.document for result in results] == [mental_health.document]
+    query = mock_query.call_args.kwargs
+    assert "document" not in query["ExpressionAttributeNames"].values()
+
+
+@mock_aws
+@mock_repository
+def test_list_by_custodian_reads_documents_from_table(
+    repository: DocumentPointerRepository,
+):
+    mental_health = _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+
+    with patch.object(repository, "_query", wraps=repository._query) as mock_query:
+        results = list(
+            repository.list_by_custodian(
+                ods_code_parts=("Y05868",),
+                pointer_types=[PointerTypes.MENTAL_HEALTH_PLAN.value],
+                fields=["document"],
+            )
+        )
+
+    assert [result.document for result in results] == [mental_health.document]
+    for call in mock_query.call_args_list:
+        assert "document" not in call.kwargs["ExpressionAttributeNames"].values()
+
+
+@mock_aws
+@mock_repository
+def test_search_by_custodian_with_index_disabled_filters_patient_index(
+    repository: DocumentPointerRepository,
+):
+    with patch.object(repository, "_query", wraps=repository._query) as mock_query:
+        list(repository.search(nhs_number="6700028191", custodian="Y05868"))
+
+    query = mock_query.call_args.kwargs
+    assert query["IndexName"] == "patient_gsi"
+    assert query["FilterExpression"] == "custodian = :custodian"
+
+
+@mock_aws
+@mock_repository
+def test_search_with_unknown_type_falls_back_to_type_filter(
+    repository: DocumentPointerRepository,
+):
+    mental_health = _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+    _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+
+    results = list(
+        repository.search(
+            nhs_number="6700028191",
+            pointer_types=[
+                "http://snomed.info/sct|736253001",
+                PointerTypes.MENTAL_HEALTH_PLAN.value,
+            ],
+        )
+    )
+
+    assert [result.id for result in results] == [mental_health.id]
+
+
+@mock_aws
+@mock_repository
+def test_create_and_delete_maintain_pointer_counter(
+    repository: DocumentPointerRepository,
+):
+    repository.pointer_counts_enabled = True
+    news2 = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+    _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp2"
+    )
+
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.NEWS2_CHART.value: 1,
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 2,
+    }
+    assert repository.count_by_nhs_number("6700028191") == 3
+    assert (
+        repository.count_by_nhs_number(
+            "6700028191", pointer_types=[PointerTypes.MENTAL_HEALTH_PLAN.value]
+        )
+        == 2
+    )
+
+    repository.delete(news2)
+    repository.delete_by_id("Y05868-mhp")
+
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.NEWS2_CHART.value: 0,
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 1,
+    }
+    assert repository.count_by_nhs_number("6700028191") == 1
+
+
+@mock_aws
+@mock_repository
+def test_create_and_delete_without_transaction(
+    repository: DocumentPointerRepository,
+):
+    error = ClientError(
+        {"Error": {"Code": "InternalServerError", "Message": "Failed"}},
+        "UpdateItem",
+    )
+
+    with patch.object(
+        repository.client,
+        "transact_write_items",
+        wraps=repository.client.transact_write_items,
+    ) as mock_transact_write_items:
+        pointer = _create_pointer_of_type(
+            repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+        )
+        with patch("nrlf.core.dynamodb.repository.logger") as mock_logger:
+            with patch.object(repository.client, "update_item", side_effect=error):
+                repository.delete(pointer)
+
+    mock_transact_write_items.assert_not_called()
+    assert repository.get_by_id(pointer.id) is None
+    mock_logger.log.assert_any_call(
+        LogReference.REPOSITORY065,
+        nhs_number="6700028191",
+        pointer_deltas={PointerTypes.NEWS2_CHART.value: -1},
+    )
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.NEWS2_CHART.value: 1
+    }
+
+
+@mock_aws
+@mock_repository
+def test_delete_by_id_missing_pointer_does_not_change_counter(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+
+    repository.delete_by_id("Y05868-does-not-exist")
+
+    assert repository.count_by_nhs_number("6700028191") == 1
+
+
+@mock_aws
+@mock_repository
+def test_count_by_nhs_number_falls_back_to_index_without_counter(
+    repository: DocumentPointerRepository,
+):
+    repository.pointer_counts_enabled = True
+    _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+    repository.client.delete_item(
+        TableName=repository.table_name,
+        Key=serialize_item(get_patient_counter_key("6700028191")),
+    )
+
+    assert repository.get_pointer_counts("6700028191") is None
+    assert repository.count_by_nhs_number("6700028191") == 2
+    assert (
+        repository.count_by_nhs_number(
+            "6700028191", pointer_types=[PointerTypes.NEWS2_CHART.value]
+        )
+        == 1
+    )
+
+
+@mock_aws
+@mock_repository
+def test_rebuild_pointer_counts_repairs_counter(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+    repository.client.put_item(
+        TableName=repository.table_name,
+        Item=serialize_item(
+            {
+                **get_patient_counter_key("6700028191"),
+                PointerTypes.NEWS2_CHART.value: 5,
+                "counter_version": 7,
+            }
+        ),
+    )
+
+    result = repository.rebuild_pointer_counts("6700028191")
+
+    expected = {
+        PointerTypes.NEWS2_CHART.value: 1,
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 1,
+    }
+    assert result == expected
+    assert repository.get_pointer_counts("6700028191") == expected
+    repository.pointer_counts_enabled = True
+    with patch.object(repository, "_count_by_query") as mock_count_by_query:
+        assert repository.count_by_nhs_number("6700028191") == 2
+
+    mock_count_by_query.assert_not_called()
+
+
+@mock_aws
+@mock_repository
+def test_count_by_nhs_number_reads_counter_only_when_enabled(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    # A patient's pointers written before counters were maintained
+    repository.client.delete_item(
+        TableName=repository.table_name,
+        Key=serialize_item(get_patient_counter_key("6700028191")),
+    )
+    _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 1
+    }
+    with patch.object(repository, "_get_pointer_counter") as mock_get_pointer_counter:
+        assert repository.count_by_nhs_number("6700028191") == 2
+
+    mock_get_pointer_counter.assert_not_called()
+
+    repository.rebuild_pointer_counts("6700028191")
+    repository.pointer_counts_enabled = True
+    _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp2"
+    )
+
+    with patch.object(repository, "_count_by_query") as mock_count_by_query:
+        assert repository.count_by_nhs_number("6700028191") == 3
+
+    mock_count_by_query.assert_not_called()
+
+
+@mock_aws
+@mock_repository
+def test_count_by_nhs_number_negative_counter_counts_from_index(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    repository.rebuild_pointer_counts("6700028191")
+    repository.pointer_counts_enabled = True
+    repository._adjust_pointer_counts(
+        {"6700028191": {PointerTypes.NEWS2_CHART.value: -2}}
+    )
+
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.NEWS2_CHART.value: -1
+    }
+    assert repository.count_by_nhs_number("6700028191") == 1
+
+
+@mock_aws
+@mock_repository
+def test_rebuild_pointer_counts_recounts_when_counter_changes(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    count_pointer_types = repository._count_pointer_types
+
+    def count_during_create(nhs_number: str):
+        pointer_counts = count_pointer_types(nhs_number)
+        if not repository.get_by_id("Y05868-mhp"):
+            _create_pointer_of_type(
+                repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+            )
+        return pointer_counts
+
+    with patch.object(
+        repository, "_count_pointer_types", side_effect=count_during_create
+    ) as mock_count:
+        result = repository.rebuild_pointer_counts("6700028191")
+
+    expected = {
+        PointerTypes.NEWS2_CHART.value: 1,
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 1,
+    }
+    assert mock_count.call_count == 2
+    assert result == expected
+    assert repository.get_pointer_counts("6700028191") == expected
+
+
+@mock_aws
+@mock_repository
+def test_supersede_creates_pointer_and_deletes_replaced_pointers(
+    repository: DocumentPointerRepository,
+):
+    for document_id in ["old1", "old2"]:
+        _create_pointer_of_type(
+            repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, document_id
+        )
+    new_pointer = _build_pointer_of_type(
+        PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "new"
+    )
+
+    repository.supersede(new_pointer, ["Y05868-old1", "Y05868-old2"])
+
+    assert repository.get_by_id("Y05868-new").id == new_pointer.id
+    assert repository.get_by_id("Y05868-old1") is None
+    assert repository.get_by_id("Y05868-old2") is None
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.NEWS2_CHART.value: 1
+    }
+
+
+@mock_aws
+@mock_repository
+def test_supersede_missing_target_cancels_transaction(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "old1"
+    )
+    new_pointer = _build_pointer_of_type(
+        PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "new"
+    )
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.supersede(new_pointer, ["Y05868-old1", "Y05868-missing"])
+
+    assert error.value.status_code == "400"
+    assert repository.get_by_id("Y05868-new") is None
+    assert repository.get_by_id("Y05868-old1") is not None
+    assert repository.count_by_nhs_number("6700028191") == 1
+
+
+@mock_aws
+@mock_repository
+def test_supersede_target_of_different_type_cancels_transaction(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "old1"
+    )
+    new_pointer = _build_pointer_of_type(
+        PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "new"
+    )
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.supersede(new_pointer, ["Y05868-old1"])
+
+    assert error.value.status_code == "400"
+    assert repository.get_by_id("Y05868-new") is None
+
+
+@mock_aws
+@mock_repository
+def test_supersede_existing_pointer_id_rejected_as_duplicate(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "old1"
+    )
+    existing = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "new"
+    )
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.supersede(existing, ["Y05868-old1"])
+
+    assert error.value.status_code == "409"
+    assert repository.get_by_id("Y05868-old1") is not None
+
+
+@mock_aws
+@mock_repository
+def test_supersede_can_ignore_delete_fail_skips_missing_targets(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "old1"
+    )
+    new_pointer = _build_pointer_of_type(
+        PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "new"
+    )
+
+    repository.supersede(
+        new_pointer, ["Y05868-old1", "Y05868-missing"], can_ignore_delete_fail=True
+    )
+
+    assert repository.get_by_id("Y05868-new").id == new_pointer.id
+    assert repository.get_by_id("Y05868-old1") is None
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 0,
+        PointerTypes.NEWS2_CHART.value: 1,
+    }
+
+
+@mock_aws
+@mock_repository
+def test_supersede_rejects_more_operations_than_one_transaction(
+    repository: DocumentPointerRepository,
+):
+    ids_to_delete = []
+    for idx in range(3):
+        pointer = _create_pointer_of_type(
+            repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, f"old{idx}"
+        )
+        ids_to_delete.append(pointer.id)
+    new_pointer = _build_pointer_of_type(
+        PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "new"
+    )
+
+    with patch("nrlf.core.dynamodb.repository.MAX_TRANSACTION_ITEMS", 4):
+        with patch.object(repository, "_transact_write") as mock_transact_write:
+            with pytest.raises(OperationOutcomeError) as error:
+                repository.supersede(new_pointer, ids_to_delete)
+
+            # The put, the deletes and the counter update fit in one transaction
+            repository.supersede(new_pointer, ids_to_delete[:2])
+
+    assert error.value.status_code == "400"
+    assert error.value.operation_outcome.issue[0].expression[0].root == "relatesTo"
+    assert mock_transact_write.call_count == 1
+    assert len(mock_transact_write.call_args.args[0]) == 4
+
+
+@mock_aws
+@mock_repository
+def test_get_many_by_id_returns_existing_pointers(
+    repository: DocumentPointerRepository,
+):
+    news2 = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    mental_health = _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+
+    result = repository.get_many_by_id(
+        [news2.id, "Y05868-missing", mental_health.id, news2.id]
+    )
+
+    assert set(result) == {news2.id, mental_health.id}
+    assert result[news2.id].type == PointerTypes.NEWS2_CHART.value
+    assert result[mental_health.id].type == PointerTypes.MENTAL_HEALTH_PLAN.value
+
+
+@mock_aws
+@mock_repository
+def test_get_many_by_id_retries_unprocessed_keys(
+    repository: DocumentPointerRepository,
+):
+    news2 = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    mental_health = _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+    batch_get_item = repository.client.batch_get_item
+
+    def _partial_batch_get_item(RequestItems, **kwargs):
+        keys = RequestItems[repository.table_name]["Keys"]
+        result = batch_get_item(
+            RequestItems={repository.table_name: {"Keys": keys[:1]}}, **kwargs
+        )
+        if keys[1:]:
+            result["UnprocessedKeys"] = {repository.table_name: {"Keys": keys[1:]}}
+        return result
+
+    with patch("nrlf.core.dynamodb.repository.time.sleep") as mock_sleep:
+        with patch.object(
+            repository.client,
+            "batch_get_item",
+            side_effect=_partial_batch_get_item,
+        ) as mock_batch_get_item:
+            result = repository.get_many_by_id([news2.id, mental_health.id])
+
+    assert set(result) == {news2.id, mental_health.id}
+    assert mock_batch_get_item.call_count == 2
+    mock_sleep.assert_called_once()
+
+
+@mock_aws
+@mock_repository
+def test_get_many_by_id_raises_when_keys_remain_unprocessed(
+    repository: DocumentPointerRepository,
+):
+    def _unprocessed_batch_get_item(RequestItems, **kwargs):
+        return {"Responses": {}, "UnprocessedKeys": RequestItems}
+
+    with patch("nrlf.core.dynamodb.repository.time.sleep"):
+        with patch.object(
+            repository.client,
+            "batch_get_item",
+            side_effect=_unprocessed_batch_get_item,
+        ):
+            with pytest.raises(OperationOutcomeError) as error:
+                repository.get_many_by_id(["Y05868-news2"])
+
+    assert error.value.status_code == "500"
+
+
+@mock_aws
+@mock_repository
+def test_get_by_id_strict_read_validation_rejects_invalid_item(
+    repository: DocumentPointerRepository,
+):
+    pointer = _build_pointer_of_type(
+        PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    repository.client.put_item(
+        TableName=repository.table_name,
+        Item=serialize_document_pointer({**pointer.model_dump(), "nhs_number": "123"}),
+    )
+
+    assert repository.get_by_id(pointer.id).nhs_number == "123"
+
+    strict_repository = DocumentPointerRepository(
+        table_name=repository.table_name, strict_read_validation=True
+    )
+    with pytest.raises(OperationOutcomeError) as error:
+        strict_repository.get_by_id(pointer.id)
+
+    assert error.value.status_code == "500"
+
+
+@mock_aws
+@mock_repository
+def test_search_page_returns_pages_across_fan_out_queries(
+    repository: DocumentPointerRepository,
+):
+    pointers = [
+        _create_pointer_of_type(
+            repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, f"news2{idx}"
+        )
+        for idx in range(2)
+    ] + [
+        _create_pointer_of_type(
+            repository,
+            PointerTypes.MENTAL_HEALTH_PLAN,
+            Categories.CARE_PLAN,
+            f"mhp{idx}",
+        )
+        for idx in range(3)
+    ]
+    expected_ids = [
+        pointer.id for pointer in sorted(pointers, key=lambda p: p.patient_sort)
+    ]
+    pointer_types = [
+        PointerTypes.MENTAL_HEALTH_PLAN.value,
+        PointerTypes.NEWS2_CHART.value,
+    ]
+
+    result_ids = []
+    start_key = None
+    page_count = 0
+    while True:
+        page, start_key = repository.search_page(
+            nhs_number="6700028191",
+            limit=2,
+            pointer_types=pointer_types,
+            start_key=start_key,
+        )
+        page_count += 1
+        result_ids.extend(pointer.id for pointer in page)
+        if not start_key:
+            break
+
+    assert page_count == 3
+    assert result_ids == expected_ids
+
+
+@mock_aws
+@mock_repository
+def test_search_page_single_query(repository: DocumentPointerRepository):
+    for idx in range(3):
+        _create_pointer_of_type(
+            repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, f"news2{idx}"
+        )
+
+    first_page, start_key = repository.search_page(nhs_number="6700028191", limit=2)
+    second_page, next_start_key = repository.search_page(
+        nhs_number="6700028191", limit=2, start_key=start_key
+    )
+
+    assert len(first_page) == 2
+    assert start_key == {
+        "pk": first_page[1].pk,
+        "sk": first_page[1].sk,
+        "patient_key": first_page[1].patient_key,
+        "patient_sort": first_page[1].patient_sort,
+    }
+    assert [pointer.id for pointer in second_page] == ["Y05868-news22"]
+    assert next_start_key is None
+
+
+@mock_aws
+@mock_repository
+def test_search_page_exact_page_has_no_next_key(
+    repository: DocumentPointerRepository,
+):
+    for idx in range(2):
+        _create_pointer_of_type(
+            repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, f"news2{idx}"
+        )
+
+    page, start_key = repository.search_page(nhs_number="6700028191", limit=2)
+
+    assert len(page) == 2
+    assert start_key is None
+
+
+@mock_aws
+@mock_repository
+def test_get_by_id_with_fields_returns_partial_pointer(
+    repository: DocumentPointerRepository,
+):
+    pointer = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+
+    result = repository.get_by_id(pointer.id, fields=["type", "custodian"])
+
+    assert result.id == pointer.id
+    assert result.producer_id == "Y05868"
+    assert result.type == pointer.type
+    assert result.custodian == pointer.custodian
+    with pytest.raises(UnprojectedFieldError):
+        result.document
+
+
+@mock_aws
+@mock_repository
+def test_get_by_id_with_unknown_field_raises(repository: DocumentPointerRepository):
+    with pytest.raises(ValueError, match="Cannot project unknown"):
+        repository.get_by_id("Y05868-news2", fields=["patient_key"])
+
+
+@mock_aws
+@mock_repository
+def test_get_many_by_id_with_fields_returns_partial_pointers(
+    repository: DocumentPointerRepository,
+):
+    pointers = [
+        _create_pointer_of_type(
+            repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, f"news2{idx}"
+        )
+        for idx in range(2)
+    ]
+
+    results = repository.get_many_by_id(
+        [pointer.id for pointer in pointers], fields=["nhs_number"]
+    )
+
+    assert sorted(results) == sorted(pointer.id for pointer in pointers)
+    for result in results.values():
+        assert result.nhs_number == "6700028191"
+        with pytest.raises(UnprojectedFieldError):
+            result.type
+
+
+@mock_aws
+@mock_repository
+def test_search_page_with_fields_pages_partial_pointers(
+    repository: DocumentPointerRepository,
+):
+    pointers = [
+        _create_pointer_of_type(
+            repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, f"news2{idx}"
+        )
+        for idx in range(2)
+    ] + [
+        _create_pointer_of_type(
+            repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+        )
+    ]
+    pointer_types = [
+        PointerTypes.MENTAL_HEALTH_PLAN.value,
+        PointerTypes.NEWS2_CHART.value,
+    ]
+
+    first_page, start_key = repository.search_page(
+        nhs_number="6700028191",
+        limit=2,
+        pointer_types=pointer_types,
+        fields=["document"],
+    )
+    second_page, next_start_key = repository.search_page(
+        nhs_number="6700028191",
+        limit=2,
+        pointer_types=pointer_types,
+        start_key=start_key,
+        fields=["document"],
+    )
+
+    results = first_page + second_page
+    assert next_start_key is None
+    assert [result.id for result in results] == [
+        pointer.id for pointer in sorted(pointers, key=lambda p: p.patient_sort)
+    ]
+    assert [result.document for result in results] == [
+        pointer.document for pointer in sorted(pointers, key=lambda p: p.patient_sort)
+    ]
+    with pytest.raises(UnprojectedFieldError):
+        results[0].custodian
+
+
+@mock_aws
+@mock_repository
+def test_update_in_place_applies_update_with_matching_fingerprint(
+    repository: DocumentPointerRepository,
+):
+    pointer = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    update = pointer.model_copy()
+    update.document = pointer.document.replace('"final"', '"entered-in-error"')
+    update.updated_on = "2024-03-21T12:34:56.789Z"
+    update.created_on = "2024-03-21T12:34:56.789Z"
+
+    assert repository.update_in_place(update) == (True, None)
+
+    result = repository.get_by_id(pointer.id)
+    assert result.document == update.document
+    assert result.updated_on == update.updated_on
+    assert result.created_on == pointer.created_on
+
+
+@mock_aws
+@mock_repository
+def test_update_in_place_returns_stored_pointer_on_fingerprint_mismatch(
+    repository: DocumentPointerRepository,
+):
+    pointer = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    update = pointer.model_copy()
+    update.document = pointer.document.replace("6700028191", "9278693472")
+
+    updated, existing = repository.update_in_place(update)
+
+    assert updated is False
+    assert existing.id == pointer.id
+    assert existing.version == 1
+    assert existing.document == pointer.document
+    assert repository.get_by_id(pointer.id).document == pointer.document
+
+
+@mock_aws
+@mock_repository
+def test_update_in_place_missing_pointer(repository: DocumentPointerRepository):
+    pointer = _build_pointer_of_type(
+        PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+
+    assert repository.update_in_place(pointer) == (False, None)
+    assert repository.get_by_id(pointer.id) is None
+
+
+@mock_aws
+@mock_repository
+def test_update_with_changed_previous_item_raises_conflict(
+    repository: DocumentPointerRepository,
+):
+    pointer = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    stale = pointer.model_copy(update={"updated_on": "2024-01-02T00:00:00.000Z"})
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.update(pointer, previous_item=stale)
+
+    assert error.value.status_code == "409"
+
+
+@mock_aws
+@mock_repository
+def test_delete_for_producer_deletes_pointer_and_adjusts_counter(
+    repository: DocumentPointerRepository,
+):
+    pointer = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+
+    with patch.object(
+        repository.client, "delete_item", wraps=repository.client.delete_item
+    ) as mock_delete_item:
+        deleted, deleted_pointer = repository.delete_for_producer(
+            pointer.id, ("Y05868",)
+        )
+
+    assert deleted is True
+    assert deleted_pointer.id == pointer.id
+    assert repository.get_by_id(pointer.id) is None
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.NEWS2_CHART.value: 0
+    }
+    mock_delete_item.assert_called_once()
+    assert mock_delete_item.call_args.kwargs["ReturnValues"] == "ALL_OLD"
+
+
+@mock_aws
+@mock_repository
+def test_delete_for_producer_logs_count_not_applied(
+    repository: DocumentPointerRepository,
+):
+    pointer = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    error = ClientError(
+        {"Error": {"Code": "InternalServerError", "Message": "Failed"}},
+        "UpdateItem",
+    )
+
+    with patch("nrlf.core.dynamodb.repository.logger") as mock_logger:
+        with patch.object(repository.client, "update_item", side_effect=error):
+            deleted, _ = repository.delete_for_producer(pointer.id, ("Y05868",))
+
+    assert deleted is True
+    assert repository.get_by_id(pointer.id) is None
+    mock_logger.log.assert_any_call(
+        LogReference.REPOSITORY065,
+        nhs_number="6700028191",
+        pointer_deltas={PointerTypes.NEWS2_CHART.value: -1},
+    )
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.NEWS2_CHART.value: 1
+    }
+
+
+@mock_aws
+@mock_repository
+def test_delete_for_producer_other_custodian_not_deleted(
+    repository: DocumentPointerRepository,
+):
+    pointer = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+
+    deleted, existing = repository.delete_for_producer(pointer.id, ("Y05868", "001"))
+
+    assert deleted is False
+    assert existing.id == pointer.id
+    assert repository.get_by_id(pointer.id) is not None
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.NEWS2_CHART.value: 1
+    }
+
+
+@mock_aws
+@mock_repository
+def test_delete_for_producer_missing_pointer(repository: DocumentPointerRepository):
+    assert repository.delete_for_producer("Y05868-missing", ("Y05868",)) == (
+        False,
+        None,
+    )
+
+
+@mock_aws
+@mock_repository
+def test_get_by_id_with_pointer_cache(repository: DocumentPointerRepository):
+    pointer = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    repository.pointer_cache = PointerCache(
+        max_bytes=100_000, ttl_seconds=60, revalidate_seconds=60
+    )
+
+    first_result = repository.get_by_id(pointer.id)
+    assert repository.get_by_id("Y05868-missing") is None
+
+    with patch.object(repository.client, "get_item") as mock_get_item:
+        assert repository.get_by_id(pointer.id, fields=["document"]) is first_result
+        assert repository.get_by_id("Y05868-missing") is None
+
+    mock_get_item.assert_not_called()
+    assert repository.pointer_cache.stats() == {
+        "hits": 2,
+        "misses": 2,
+        "evictions": 0,
+        "entries": 2,
+        "size_bytes": 2 * ENTRY_OVERHEAD_BYTES + len(pointer.document),
+    }
+
+
+@mock_aws
+@mock_repository
+def test_pointer_cache_invalidated_by_writes(repository: DocumentPointerRepository):
+    pointer = _build_pointer_of_type(
+        PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    repository.pointer_cache = PointerCache(
+        max_bytes=100_000, ttl_seconds=60, revalidate_seconds=60
+    )
+
+    assert repository.get_by_id(pointer.id) is None
+    repository.create(pointer)
+    assert repository.get_by_id(pointer.id).id == pointer.id
+
+    repository.delete_for_producer(pointer.id, ("Y05868",))
+    assert repository.get_by_id(pointer.id) is None
+
+
+@mock_aws
+@mock_repository
+def test_pointer_cache_revalidates_version_stamp(
+    repository: DocumentPointerRepository,
+):
+    pointer = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    repository.pointer_cache = PointerCache(
+        max_bytes=100_000, ttl_seconds=60, revalidate_seconds=0
+    )
+    cached_pointer = repository.get_by_id(pointer.id)
+
+    assert repository.get_by_id(pointer.id) is cached_pointer
+
+    # Updated by another container, so the cached pointer is not invalidated
+    repository.client.update_item(
+        TableName=repository.table_name,
+        Key=serialize_item({"pk": pointer.pk, "sk": pointer.sk}),
+        UpdateExpression="SET updated_on = :updated_on",
+        ExpressionAttributeValues=serialize_item(
+            {":updated_on": "2024-03-21T12:34:56.789Z"}
+        ),
+    )
+
+    result = repository.get_by_id(pointer.id)
+    assert result is not cached_pointer
+    assert result.updated_on == "2024-03-21T12:34:56.789Z"
+
+
+@mock_aws
+@mock_repository
+def test_create_many_writes_all_chunks_and_counters(
+    repository: DocumentPointerRepository,
+):
+    pointers = [
+        _build_pointer_of_type(
+            PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, f"mhp-{idx}"
+        )
+        for idx in range(30)
+    ]
+    pointers.append(
+        _build_pointer_of_type(
+            PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+        )
+    )
+
+    result = repository.create_many(pointers)
+
+    assert result == []
+    assert set(repository.get_many_by_id([pointer.id for pointer in pointers])) == {
+        pointer.id for pointer in pointers
+    }
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 30,
+        PointerTypes.NEWS2_CHART.value: 1,
+    }
+
+
+@mock_aws
+@mock_repository
+def test_create_many_retries_unprocessed_items(
+    repository: DocumentPointerRepository,
+):
+    pointers = [
+        _build_pointer_of_type(
+            PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, f"mhp-{idx}"
+        )
+        for idx in range(2)
+    ]
+    batch_write_item = repository.client.batch_write_item
+
+    def _partial_batch_write_item(RequestItems, **kwargs):
+        requests = RequestItems[repository.table_name]
+        result = batch_write_item(
+            RequestItems={repository.table_name: requests[:1]}, **kwargs
+        )
+        if requests[1:]:
+            result["UnprocessedItems"] = {repository.table_name: requests[1:]}
+        return result
+
+    with patch("nrlf.core.dynamodb.repository.time.sleep") as mock_sleep:
+        with patch.object(
+            repository.client,
+            "batch_write_item",
+            side_effect=_partial_batch_write_item,
+        ) as mock_batch_write_item:
+            result = repository.create_many(pointers)
+
+    assert result == []
+    assert mock_batch_write_item.call_count == 2
+    mock_sleep.assert_called_once()
+    assert set(repository.get_many_by_id([pointer.id for pointer in pointers])) == {
+        pointer.id for pointer in pointers
+    }
+
+
+@mock_aws
+@mock_repository
+def test_create_many_returns_ids_that_remain_unprocessed(
+    repository: DocumentPointerRepository,
+):
+    pointer = _build_pointer_of_type(
+        PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+
+    def _unprocessed_batch_write_item(RequestItems, **kwargs):
+        return {"UnprocessedItems": RequestItems}
+
+    with patch("nrlf.core.dynamodb.repository.time.sleep") as mock_sleep:
+        with patch.object(
+            repository.client,
+            "batch_write_item",
+            side_effect=_unprocessed_batch_write_item,
+        ):
+            result = repository.create_many([pointer])
+
+    assert result == [pointer.id]
+    assert mock_sleep.call_count == BATCH_MAX_ATTEMPTS - 1
+    assert repository.get_by_id(pointer.id) is None
+    assert repository.get_pointer_counts("6700028191") is None
+
+
+@mock_aws
+@mock_repository
+def test_create_many_logs_counts_not_applied(
+    repository: DocumentPointerRepository,
+):
+    pointers = [
+        _build_pointer_of_type(
+            PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, f"mhp-{idx}"
+        )
+        for idx in range(2)
+    ]
+    error = ClientError(
+        {"Error": {"Code": "InternalServerError", "Message": "Failed"}},
+        "UpdateItem",
+    )
+
+    with patch("nrlf.core.dynamodb.repository.logger") as mock_logger:
+        with patch.object(repository.client, "update_item", side_effect=error):
+            assert repository.create_many(pointers) == []
+
+    mock_logger.log.assert_any_call(
+        LogReference.REPOSITORY065,
+        nhs_number="6700028191",
+        pointer_deltas={PointerTypes.MENTAL_HEALTH_PLAN.value: 2},
+    )
+    assert repository.get_pointer_counts("6700028191") is None
+
+
+@mock_aws
+@mock_repository
+def test_create_many_logs_counts_not_applied_when_batch_write_fails(
+    repository: DocumentPointerRepository,
+):
+    pointer = _build_pointer_of_type(
+        PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+    error = ClientError(
+        {"Error": {"Code": "InternalServerError", "Message": "Failed"}},
+        "BatchWriteItem",
+    )
+
+    with patch("nrlf.core.dynamodb.repository.logger") as mock_logger:
+        with patch.object(repository.client, "batch_write_item", side_effect=error):
+            with pytest.raises(ClientError):
+                repository.create_many([pointer])
+
+    mock_logger.log.assert_any_call(
+        LogReference.REPOSITORY065,
+        nhs_number="6700028191",
+        pointer_deltas={PointerTypes.MENTAL_HEALTH_PLAN.value: 1},
+    )
+
+
+@mock_aws
+@mock_repository
+def test_delete_by_nhs_number_deletes_producer_pointers_of_types(
+    repository: DocumentPointerRepository,
+):
+    mhp = _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+    news2 = _create_pointer_of_type(
+        repository, PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS, "news2"
+    )
+    eol = _create_pointer_of_type(
+        repository,
+        PointerTypes.EOL_CARE_PLAN,
+        Categories.CARE_PLAN,
+        "eol",
+    )
+    other_doc_ref = load_document_reference("Y05868-736253002-Valid")
+    other_doc_ref.id = "X26-other"
+    other_doc_ref.custodian.identifier.value = "X26"
+    other_producer = repository.create(
+        DocumentPointer.from_document_reference(other_doc_ref)
+    )
+
+    deleted_count, start_key = repository.delete_by_nhs_number(
+        "6700028191",
+        ("Y05868",),
+        [PointerTypes.MENTAL_HEALTH_PLAN.value, PointerTypes.NEWS2_CHART.value],
+    )
+
+    assert deleted_count == 2
+    assert start_key is None
+    assert repository.get_by_id(mhp.id) is None
+    assert repository.get_by_id(news2.id) is None
+    assert repository.get_by_id(eol.id) is not None
+    assert repository.get_by_id(other_producer.id) is not None
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 1,
+        PointerTypes.NEWS2_CHART.value: 0,
+        PointerTypes.EOL_CARE_PLAN.value: 1,
+    }
+
+
+@mock_aws
+@mock_repository
+def test_delete_by_nhs_number_logs_counts_not_applied(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer_of_type(
+        repository, PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN, "mhp"
+    )
+    error = ClientError(
+        {"Error": {"Code": "InternalServerError", "Message": "Failed"}},
+        "UpdateItem",
+    )
+
+    with patch("nrlf.core.dynamodb.repository.logger") as mock_logger:
+        with patch.object(repository.client, "update_item", side_effect=error):
+            deleted_count, _ = repository.delete_by_nhs_number(
+                "6700028191", ("Y05868",), [PointerTypes.MENTAL_HEALTH_PLAN.value]
+            )
+
+    assert deleted_count == 1
+    mock_logger.log.assert_any_call(
+        LogReference.REPOSITORY065,
+        nhs_number="6700028191",
+        pointer_deltas={PointerTypes.MENTAL_HEALTH_PLAN.value: -1},
+    )
+
+
+@mock_aws
+@mock_repository
+def test_delete_by_nhs_number_returns_start_key_at_deadline(
+    repository: DocumentPointerRepository,
+):
+    for idx in range(3):
+        _create_pointer_of_type(
+            repository,
+            PointerTypes.MENTAL_HEALTH_PLAN,
+            Categories.CARE_PLAN,
+            f"mhp-{idx}",
+        )
+
+    with patch("nrlf.core.dynamodb.repository.MAX_DELETE_PAGE_SIZE", 2):
+        deleted_count, start_key = repository.delete_by_nhs_number(
+            "6700028191",
+            ("Y05868",),
+            [PointerTypes.MENTAL_HEALTH_PLAN.value],
+            deadline=0,
+        )
+
+        assert deleted_count == 2
+        assert start_key is not None
+
+        deleted_count, start_key = repository.delete_by_nhs_number(
+            "6700028191",
+            ("Y05868",),
+            [PointerTypes.MENTAL_HEALTH_PLAN.value],
+            start_key=start_key,
+            deadline=0,
+        )
+
+    assert deleted_count == 1
+    assert start_key is None
+    assert repository.count_by_nhs_number("6700028191") == 0
@@ -0,0 +1,724 @@
+"""
+Behaviour shared by every DocumentPointerRepository backend, run against both
+DynamoDB (emulated by moto) and the in-memory tables
+"""
+
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from moto import mock_aws
+
+from nrlf.core.boto import get_dynamodb_resource
+from nrlf.core.config import Config
+from nrlf.core.constants import Categories, PointerTypes
+from nrlf.core.dynamodb.memory import (
+    InMemoryDocumentPointerRepository,
+    InMemoryDynamoDB,
+)
+from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
+from nrlf.core.errors import OperationOutcomeError, UnprojectedFieldError
+from nrlf.tests.data import load_document_reference
+from nrlf.tests.dynamodb import create_document_pointer_table
+
+NHS_NUMBER = "6700028191"
+
+
+@pytest.fixture(
+    params=[
+        ("dynamodb", "json"),
+        ("memory", "json"),
+        ("dynamodb", "zlib"),
+        ("memory", "zlib"),
+    ],
+    ids="-".join,
+)
+def repository(request):
+    backend, document_encoding = request.param
+    config = Config()
+    if backend == "memory":
+        yield InMemoryDocumentPointerRepository(
+            table_name=config.TABLE_NAME,
+            dynamodb=InMemoryDynamoDB(),
+            document_encoding=document_encoding,
+        )
+        return
+
+    with mock_aws():
+        create_document_pointer_table(config, get_dynamodb_resource())
+        yield DocumentPointerRepository(
+            table_name=config.TABLE_NAME, document_encoding=document_encoding
+        )
+
+
+def _build_pointer(
+    document_id: str,
+    pointer_type: PointerTypes = PointerTypes.MENTAL_HEALTH_PLAN,
+    category: Categories = Categories.CARE_PLAN,
+    custodian: str = "Y05868",
+    nhs_number: str = NHS_NUMBER,
+    created_on: Optional[str] = None,
+) -> DocumentPointer:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.id = f"{custodian}-{document_id}"
+    doc_ref.custodian.identifier.value = custodian
+    doc_ref.subject.identifier.value = nhs_number
+    doc_ref.type.coding[0].system = pointer_type.coding_system()
+    doc_ref.type.coding[0].code = pointer_type.coding_value()
+    doc_ref.category[0].coding[0].system = category.coding_system()
+    doc_ref.category[0].coding[0].code = category.coding_value()
+    return DocumentPointer.from_document_reference(doc_ref, created_on=created_on)
+
+
+def _create_pointers(repository: DocumentPointerRepository) -> list[DocumentPointer]:
+    return [
+        repository.create(pointer)
+        for pointer in [
+            _build_pointer("care-plan-1"),
+            _build_pointer("care-plan-2"),
+            _build_pointer("news2", PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS),
+            _build_pointer(
+                "eol", PointerTypes.EOL_CARE_PLAN, Categories.CARE_PLAN, "X26"
+            ),
+            _build_pointer("other-patient", nhs_number="9278693472"),
+        ]
+    ]
+
+
+def test_create_and_get_by_id(repository: DocumentPointerRepository):
+    pointer = repository.create(_build_pointer("1"))
+
+    result = repository.get_by_id(pointer.id)
+
+    assert result.model_dump() == pointer.model_dump()
+    assert repository.get_by_id("Y05868-missing") is None
+
+
+def test_create_duplicate_rejected(repository: DocumentPointerRepository):
+    pointer = repository.create(_build_pointer("1"))
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.create(pointer)
+
+    assert error.value.status_code == "409"
+    assert repository.get_pointer_counts(NHS_NUMBER) == {
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 1
+    }
+
+
+def test_get_by_id_with_fields(repository: DocumentPointerRepository):
+    pointer = repository.create(_build_pointer("1"))
+
+    result = repository.get_by_id(pointer.id, fields=["type"])
+
+    assert result.id == pointer.id
+    assert result.type == pointer.type
+    with pytest.raises(UnprojectedFieldError):
+        result.document
+
+
+def test_get_many_by_id(repository: DocumentPointerRepository):
+    pointers = _create_pointers(repository)
+
+    result = repository.get_many_by_id(
+        [pointers[0].id, "Y05868-missing", pointers[2].id], fields=["type"]
+    )
+
+    assert sorted(result) == sorted([pointers[0].id, pointers[2].id])
+
+
+def test_search_in_patient_sort_order(repository: DocumentPointerRepository):
+    pointers = _create_pointers(repository)
+
+    results = list(
+        repository.search(
+            NHS_NUMBER,
+            pointer_types=[
+                PointerTypes.MENTAL_HEALTH_PLAN.value,
+                PointerTypes.NEWS2_CHART.value,
+                PointerTypes.EOL_CARE_PLAN.value,
+            ],
+        )
+    )
+
+    assert [result.id for result in results] == [
+        pointer.id
+        for pointer in sorted(pointers[:4], key=lambda pointer: pointer.patient_sort)
+    ]
+
+
+def test_search_filters_by_custodian(repository: DocumentPointerRepository):
+    _create_pointers(repository)
+
+    results = list(repository.search(NHS_NUMBER, custodian="X26"))
+
+    assert [result.id for result in results] == ["X26-eol"]
+
+
+@pytest.mark.parametrize("custodian_index_enabled", [True, False])
+def test_search_page_by_custodian(
+    repository: DocumentPointerRepository, custodian_index_enabled: bool
+):
+    pointers = _create_pointers(repository)
+    repository.custodian_index_enabled = custodian_index_enabled
+
+    ids, start_key = [], None
+    for _ in range(4):
+        page, start_key = repository.search_page(
+            NHS_NUMBER,
+            limit=1,
+            custodian="Y05868",
+            pointer_types=[
+                PointerTypes.MENTAL_HEALTH_PLAN.value,
+                PointerTypes.NEWS2_CHART.value,
+            ],
+            start_key=start_key,
+        )
+        ids.extend(result.id for result in page)
+        # Page tokens can be continued with the other index
+        repository.custodian_index_enabled = not repository.custodian_index_enabled
+        if not start_key:
+            break
+
+    assert start_key is None
+    assert ids == [
+        pointer.id
+        for pointer in sorted(pointers[:3], key=lambda pointer: pointer.patient_sort)
+    ]
+
+
+def test_search_page_pagination(repository: DocumentPointerRepository):
+    pointers = _create_pointers(repository)
+
+    ids, start_key = [], None
+    for _ in range(3):
+        page, start_key = repository.search_page(
+            NHS_NUMBER, limit=2, start_key=start_key
+        )
+        ids.extend(result.id for result in page)
+        if not start_key:
+            break
+
+    assert start_key is None
+    assert ids == [
+        pointer.id
+        for pointer in sorted(pointers[:4], key=lambda pointer: pointer.patient_sort)
+    ]
+
+
+def _create_patient_history(
+    repository: DocumentPointerRepository,
+) -> dict[str, DocumentPointer]:
+    """
+    Create pointers of several types for one patient, created on consecutive
+    days so their types interleave when ordered by creation
+    """
+    history = [
+        ("mhp-1", PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN),
+        ("news2-1", PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS),
+        ("eol-1", PointerTypes.EOL_CARE_PLAN, Categories.CARE_PLAN),
+        ("mhp-2", PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN),
+        ("news2-2", PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS),
+        ("mhp-3", PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN),
+    ]
+    return {
+        document_id: repository.create(
+            _build_pointer(
+                document_id,
+                pointer_type,
+                category,
+                created_on=f"2024-01-{idx + 1:02}T09:00:00.000Z",
+            )
+        )
+        for idx, (document_id, pointer_type, category) in enumerate(history)
+    }
+
+
+HISTORY_POINTER_TYPES = [
+    PointerTypes.MENTAL_HEALTH_PLAN.value,
+    PointerTypes.NEWS2_CHART.value,
+    PointerTypes.EOL_CARE_PLAN.value,
+]
+
+
+def test_search_created_window(repository: DocumentPointerRepository):
+    history = _create_patient_history(repository)
+
+    def _search_ids(pointer_types: list[str], **window) -> list[str]:
+        return [
+            result.id
+            for result in repository.search(
+                NHS_NUMBER, pointer_types=pointer_types, **window
+            )
+        ]
+
+    assert _search_ids(
+        HISTORY_POINTER_TYPES,
+        created_from="2024-01-02T00:00:00.000Z",
+        created_to="2024-01-05T23:59:59.999Z",
+    ) == [
+        pointer.id
+        for pointer in sorted(
+            [history[key] for key in ("news2-1", "eol-1", "mhp-2", "news2-2")],
+            key=lambda pointer: pointer.patient_sort,
+        )
+    ]
+    assert _search_ids(
+        [PointerTypes.MENTAL_HEALTH_PLAN.value],
+        created_from="2024-01-04T09:00:00.000Z",
+    ) == [history["mhp-2"].id, history["mhp-3"].id]
+    assert _search_ids(
+        HISTORY_POINTER_TYPES, created_to="2024-01-01T09:00:00.000Z"
+    ) == [history["mhp-1"].id]
+    assert (
+        _search_ids(
+            HISTORY_POINTER_TYPES,
+            created_from="2024-01-05T00:00:00.000Z",
+            created_to="2024-01-04T00:00:00.000Z",
+        )
+        == []
+    )
+
+
+@pytest.mark.parametrize("custodian", [None, "Y05868"])
+def test_search_page_newest_first(
+    repository: DocumentPointerRepository, custodian: Optional[str]
+):
+    history = _create_patient_history(repository)
+
+    pages, start_key = [], None
+    for _ in range(4):
+        page, start_key = repository.search_page(
+            NHS_NUMBER,
+            limit=2,
+            custodian=custodian,
+            pointer_types=HISTORY_POINTER_TYPES,
+            start_key=start_key,
+            newest_first=True,
+        )
+        pages.append([result.id for result in page])
+        if not start_key:
+            break
+
+    assert start_key is None
+    assert pages == [
+        [history["mhp-3"].id, history["news2-2"].id],
+        [history["mhp-2"].id, history["eol-1"].id],
+        [history["news2-1"].id, history["mhp-1"].id],
+    ]
+
+
+def test_search_page_newest_first_without_pointer_types(
+    repository: DocumentPointerRepository,
+):
+    history = _create_patient_history(repository)
+
+    pages, start_key = [], None
+    for _ in range(4):
+        page, start_key = repository.search_page(
+            NHS_NUMBER, limit=2, start_key=start_key, newest_first=True
+        )
+        pages.append([result.id for result in page])
+        if not start_key:
+            break
+
+    assert start_key is None
+    assert pages == [
+        [history["mhp-3"].id, history["news2-2"].id],
+        [history["mhp-2"].id, history["eol-1"].id],
+        [history["news2-1"].id, history["mhp-1"].id],
+    ]
+
+
+def test_search_newest_first_in_created_window(
+    repository: DocumentPointerRepository,
+):
+    history = _create_patient_history(repository)
+
+    results = repository.search(
+        NHS_NUMBER,
+        pointer_types=[PointerTypes.MENTAL_HEALTH_PLAN.value],
+        created_to="2024-01-05T23:59:59.999Z",
+        newest_first=True,
+    )
+
+    assert [result.id for result in results] == [
+        history["mhp-2"].id,
+        history["mhp-1"].id,
+    ]
+
+
+def test_search_newest_first_reads_only_limit_items(
+    repository: DocumentPointerRepository,
+):
+    history = _create_patient_history(repository)
+
+    with patch.object(repository, "_query", wraps=repository._query) as query_spy:
+        page, start_key = repository.search_page(
+            NHS_NUMBER,
+            limit=1,
+            pointer_types=[PointerTypes.MENTAL_HEALTH_PLAN.value],
+            newest_first=True,
+        )
+
+    assert [result.id for result in page] == [history["mhp-3"].id]
+    assert start_key is not None
+    query_spy.assert_called_once()
+    assert query_spy.call_args.kwargs["ScanIndexForward"] is False
+    assert query_spy.call_args.kwargs["max_items"] == 2
+
+
+def _create_producer_estate(
+    repository: DocumentPointerRepository,
+) -> list[DocumentPointer]:
+    """
+    Create pointers for one producer, across its producer_gsi shards, along
+    with pointers owned by the same ODS code with a suffix and another producer
+    """
+    pointers = [
+        repository.create(
+            _build_pointer(
+                f"estate-{idx}",
+                nhs_number=nhs_number,
+                created_on=f"2024-01-{idx + 1:02}T09:00:00.000Z",
+            )
+        )
+        for idx, nhs_number in enumerate([NHS_NUMBER, "9278693472"] * 4)
+    ]
+    repository.create(
+        _build_pointer(
+            "news2",
+            PointerTypes.NEWS2_CHART,
+            Categories.OBSERVATIONS,
+            created_on="2024-01-04T12:00:00.000Z",
+        )
+    )
+    repository.create(_build_pointer("suffixed", custodian="Y05868.ABC"))
+    repository.create(_build_pointer("other", custodian="X26"))
+    return pointers
+
+
+def test_list_by_custodian(repository: DocumentPointerRepository):
+    pointers = _create_producer_estate(repository)
+
+    results = list(
+        repository.list_by_custodian(
+            ods_code_parts=("Y05868",),
+            pointer_types=[PointerTypes.MENTAL_HEALTH_PLAN.value],
+        )
+    )
+
+    assert len({pointer.producer_key for pointer in pointers}) > 1
+    assert [result.id for result in results] == [pointer.id for pointer in pointers]
+    assert [
+        result.id
+        for result in repository.list_by_custodian(
+            ods_code_parts=("Y05868", "ABC"),
+            pointer_types=[PointerTypes.MENTAL_HEALTH_PLAN.value],
+        )
+    ] == ["Y05868.ABC-suffixed"]
+
+
+def test_list_page_by_custodian_pagination(repository: DocumentPointerRepository):
+    pointers = _create_producer_estate(repository)
+
+    ids, start_key = [], None
+    for _ in range(4):
+        page, start_key = repository.list_page_by_custodian(
+            ods_code_parts=("Y05868",),
+            pointer_types=[
+                PointerTypes.MENTAL_HEALTH_PLAN.value,
+                PointerTypes.NEWS2_CHART.value,
+            ],
+            limit=3,
+            start_key=start_key,
+            fields=["document"],
+        )
+        ids.extend(result.id for result in page)
+        if not start_key:
+            break
+
+    assert start_key is None
+    assert ids == [
+        *(pointer.id for pointer in pointers[:4]),
+        "Y05868-news2",
+        *(pointer.id for pointer in pointers[4:]),
+    ]
+
+
+def test_list_by_custodian_windows(repository: DocumentPointerRepository):
+    pointers = _create_producer_estate(repository)
+    updated = repository.update(
+        pointers[0].model_copy(update={"updated_on": "2024-01-06T10:00:00.000Z"})
+    )
+
+    def _list_ids(**windows) -> list[str]:
+        return [
+            result.id
+            for result in repository.list_by_custodian(
+                ods_code_parts=("Y05868",),
+                pointer_types=[PointerTypes.MENTAL_HEALTH_PLAN.value],
+                **windows,
+            )
+        ]
+
+    assert _list_ids(
+        created_from="2024-01-02T09:00:00.000Z", created_to="2024-01-03T09:00:00.000Z"
+    ) == [pointers[1].id, pointers[2].id]
+    assert _list_ids(created_to="2024-01-01T23:59:59.999Z") == [updated.id]
+    assert _list_ids(created_from="2024-01-08T00:00:00.000Z") == [pointers[7].id]
+    assert _list_ids(
+        updated_from="2024-01-06T00:00:00.000Z", updated_to="2024-01-06T23:59:59.999Z"
+    ) == [updated.id, pointers[5].id]
+    assert _list_ids(updated_from="2024-01-08T00:00:00.000Z") == [pointers[7].id]
+
+
+def test_get_by_master_identifier(repository: DocumentPointerRepository):
+    def _create(document_id: str, custodian: str, created_on: str) -> DocumentPointer:
+        pointer = _build_pointer(
+            document_id, custodian=custodian, created_on=created_on
+        )
+        return repository.create(
+            pointer.model_copy(update={"master_identifier": "retried-request"})
+        )
+
+    later = _create("later", "Y05868", "2024-01-02T09:00:00.000Z")
+    earliest = _create("earliest", "Y05868", "2024-01-01T09:00:00.000Z")
+    suffixed = _create("suffixed", "Y05868.001", "2024-01-01T08:00:00.000Z")
+    _create("other", "X26", "2024-01-01T07:00:00.000Z")
+
+    result = repository.get_by_master_identifier(("Y05868",), "retried-request")
+    assert result.id == earliest.id != later.id
+    assert result.document == earliest.document
+
+    result = repository.get_by_master_identifier(
+        ("Y05868", "001"), "retried-request", fields=["nhs_number", "type"]
+    )
+    assert result.id == suffixed.id
+    assert result.nhs_number == NHS_NUMBER
+    assert result.type == PointerTypes.MENTAL_HEALTH_PLAN.value
+
+    assert repository.get_by_master_identifier(("Y05868",), "unknown") is None
+    assert repository.get_by_master_identifier(("RX898",), "retried-request") is None
+
+
+def test_count_by_nhs_number(repository: DocumentPointerRepository):
+    _create_pointers(repository)
+
+    assert repository.count_by_nhs_number(NHS_NUMBER) == 4
+    assert (
+        repository.count_by_nhs_number(
+            NHS_NUMBER, pointer_types=[PointerTypes.MENTAL_HEALTH_PLAN.value]
+        )
+        == 2
+    )
+
+    repository.client.delete_item(
+        TableName=repository.table_name,
+        Key={"pk": {"S": f"P#{NHS_NUMBER}"}, "sk": {"S": "CNT"}},
+    )
+    assert repository.count_by_nhs_number(NHS_NUMBER) == 4
+    assert repository.rebuild_pointer_counts(NHS_NUMBER) == {
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 2,
+        PointerTypes.NEWS2_CHART.value: 1,
+        PointerTypes.EOL_CARE_PLAN.value: 1,
+    }
+
+
+def test_create_many(repository: DocumentPointerRepository):
+    pointers = [_build_pointer(f"{idx}") for idx in range(30)]
+
+    assert repository.create_many(pointers) == []
+    assert len(repository.get_many_by_id([pointer.id for pointer in pointers])) == 30
+    assert repository.count_by_nhs_number(NHS_NUMBER) == 30
+
+
+def test_supersede(repository: DocumentPointerRepository):
+    old = repository.create(_build_pointer("old"))
+
+    repository.supersede(_build_pointer("new"), [old.id])
+
+    assert repository.get_by_id(old.id) is None
+    assert repository.get_by_id("Y05868-new") is not None
+    assert repository.count_by_nhs_number(NHS_NUMBER) == 1
+
+
+def test_supersede_target_mismatch_cancels_transaction(
+    repository: DocumentPointerRepository,
+):
+    old = repository.create(
+        _build_pointer("old", PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS)
+    )
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.supersede(_build_pointer("new"), [old.id])
+
+    assert error.value.status_code == "400"
+    assert repository.get_by_id("Y05868-new") is None
+    assert repository.get_by_id(old.id) is not None
+
+
+def test_supersede_existing_id_rejected(repository: DocumentPointerRepository):
+    old = repository.create(_build_pointer("old"))
+    existing = repository.create(_build_pointer("new"))
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.supersede(existing, [old.id])
+
+    assert error.value.status_code == "409"
+
+
+def test_delete_for_producer(repository: DocumentPointerRepository):
+    pointer = repository.create(_build_pointer("1"))
+
+    assert repository.delete_for_producer("Y05868-missing", ("Y05868",)) == (
+        False,
+        None,
+    )
+
+    deleted, existing = repository.delete_for_producer(pointer.id, ("X26",))
+    assert deleted is False
+    assert existing.model_dump() == pointer.model_dump()
+
+    deleted, existing = repository.delete_for_producer(pointer.id, ("Y05868",))
+    assert deleted is True
+    assert existing.id == pointer.id
+    assert repository.get_by_id(pointer.id) is None
+    assert repository.count_by_nhs_number(NHS_NUMBER) == 0
+
+
+def test_update_in_place(repository: DocumentPointerRepository):
+    pointer = repository.create(_build_pointer("1"))
+    pointer.updated_on = "2024-01-01T00:00:00.000Z"
+
+    assert repository.update_in_place(pointer) == (True, None)
+    assert repository.get_by_id(pointer.id).updated_on == pointer.updated_on
+
+    changed = _build_pointer("1", PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS)
+    updated, existing = repository.update_in_place(changed)
+    assert updated is False
+    assert existing.type == pointer.type
+
+    assert repository.update_in_place(_build_pointer("missing")) == (False, None)
+
+
+def test_update_with_previous_item(repository: DocumentPointerRepository):
+    pointer = repository.create(_build_pointer("1"))
+    stored = repository.get_by_id(pointer.id)
+    updated = stored.model_copy(update={"updated_on": "2024-01-02T00:00:00.000Z"})
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.update(stored, previous_item=updated)
+
+    assert error.value.status_code == "409"
+    assert repository.update(updated, previous_item=stored) == updated
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.update(stored, previous_item=stored)
+
+    assert error.value.status_code == "409"
+    assert repository.update(stored, previous_item=updated) == stored
+
+
+def test_documents_in_either_encoding_are_readable(
+    repository: DocumentPointerRepository,
+):
+    pointer = repository.create(_build_pointer("1"))
+    other_encoding = "json" if repository.document_encoding == "zlib" else "zlib"
+    repository.document_encoding = other_encoding
+    other = repository.create(_build_pointer("2"))
+
+    stored_documents = [
+        repository.client.get_item(
+            TableName=repository.table_name,
+            Key={"pk": {"S": item.pk}, "sk": {"S": item.sk}},
+        )["Item"]["document"]
+        for item in (pointer, other)
+    ]
+    assert sorted(attribute_type for (attribute_type,) in stored_documents) == [
+        "B",
+        "S",
+    ]
+
+    results = {result.id: result for result in repository.search(NHS_NUMBER)}
+    assert results[pointer.id].document == pointer.document
+    assert results[other.id].document == other.document
+
+    stored = repository.get_by_id(pointer.id)
+    assert repository.update(stored, previous_item=stored) == stored
+
+
+def test_delete_by_nhs_number(repository: DocumentPointerRepository):
+    _create_pointers(repository)
+
+    with patch("nrlf.core.dynamodb.repository.MAX_DELETE_PAGE_SIZE", 1):
+        deleted_count, start_key = repository.delete_by_nhs_number(
+            NHS_NUMBER,
+            ("Y05868",),
+            [PointerTypes.MENTAL_HEALTH_PLAN.value, PointerTypes.NEWS2_CHART.value],
+            deadline=0,
+        )
+        assert deleted_count == 1
+        assert start_key is not None
+
+        deleted_count, start_key = repository.delete_by_nhs_number(
+            NHS_NUMBER,
+            ("Y05868",),
+            [PointerTypes.MENTAL_HEALTH_PLAN.value, PointerTypes.NEWS2_CHART.value],
+            start_key=start_key,
+        )
+
+    assert deleted_count == 2
+    assert start_key is None
+    assert [result.id for result in repository.search(NHS_NUMBER)] == ["X26-eol"]
+    assert repository.count_by_nhs_number(NHS_NUMBER) == 1
+
+
+def test_scan_paginator(repository: DocumentPointerRepository):
+    pointers = [
+        repository.create(_build_pointer(f"scan-{idx}", nhs_number=nhs_number))
+        for idx, nhs_number in enumerate(["6700028191", "9278693472", "6700028191"])
+    ]
+
+    pages = list(
+        repository.client.get_paginator("scan").paginate(
+            TableName=repository.table_name,
+            IndexName="patient_gsi",
+            ExpressionAttributeNames={"#patient_key": "patient_key"},
+            ProjectionExpression="pk, #patient_key",
+            PaginationConfig={"PageSize": 2},
+        )
+    )
+
+    assert len(pages) > 1
+    items = [item for page in pages for item in page["Items"]]
+    assert sorted(item["pk"]["S"] for item in items) == sorted(
+        pointer.pk for pointer in pointers
+    )
+    assert all(set(item) == {"pk", "patient_key"} for item in items)
+
+
+def test_scan_paginator_segments(repository: DocumentPointerRepository):
+    pointers = [repository.create(_build_pointer(f"segment-{idx}")) for idx in range(4)]
+
+    scanned = set()
+    for segment in range(2):
+        for page in repository.client.get_paginator("scan").paginate(
+            TableName=repository.table_name,
+            FilterExpression="begins_with(pk, :pk)",
+            ExpressionAttributeValues={":pk": {"S": "D#"}},
+            Segment=segment,
+            TotalSegments=2,
+        ):
+            scanned.update(item["pk"]["S"] for item in page["Items"])
+
+    assert scanned == {pointer.pk for pointer in pointers}
+
+
+def test_in_memory_client_rejects_unsupported_paginator():
+    repository = InMemoryDocumentPointerRepository(
+        table_name=Config().TABLE_NAME, dynamodb=InMemoryDynamoDB()
+    )
+
+    with pytest.raises(ValueError, match="can only paginate query and scan"):
+        repository.client.get_paginator("list_tables")
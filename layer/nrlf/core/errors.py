@@ -76,3 +76,10 @@ class ParseError(Exception):
                 issue=self.issues,
             ).model_dump_json(exclude_none=True, indent=2),
         )
+
+
+class UnprojectedFieldError(Exception):
+    """
+    Raised when accessing a field that was not included in the projection
+    used to read a partial record from DynamoDB
+    """
@@ -35,6 +35,9 @@ class LogReference(Enum):
     )
     HANDLER016 = _Reference("INFO", "Set response headers")
     HANDLER017 = _Reference("WARN", "Correlation ID not found in request headers")
+    HANDLER018 = _Reference("INFO", "Primed AWS clients during Lambda init")
+    HANDLER018a = _Reference("INFO", "Skipped priming AWS clients during Lambda init")
+    HANDLER019 = _Reference("WARN", "Failed to prime AWS clients during Lambda init")
     HANDLER999 = _Reference("INFO", "Request handler returned successfully")
 
     # Error Logs
@@ -126,6 +129,89 @@ class LogReference(Enum):
     REPOSITORY028 = _Reference("INFO", "Received page of search results")
     REPOSITORY028a = _Reference("DEBUG", "Received page of search results with result")
     REPOSITORY029a = _Reference("DEBUG", "Updated item with result")
+    REPOSITORY030 = _Reference(
+        "WARN", "Unable to build patient_sort key conditions for pointer types"
+    )
+    REPOSITORY031 = _Reference("INFO", "Performing fan-out search across pointer types")
+    REPOSITORY032 = _Reference(
+        "WARN", "No pointer counter item found for patient, counting from index"
+    )
+    REPOSITORY033 = _Reference("INFO", "Writing pointer counter item for patient")
+    REPOSITORY034 = _Reference("INFO", "Superseding items in DynamoDB transaction")
+    REPOSITORY035 = _Reference(
+        "WARN", "Supersede transaction cancelled due to failed condition"
+    )
+    REPOSITORY036 = _Reference(
+        "EXCEPTION", "Failed to supersede items in DynamoDB transaction"
+    )
+    REPOSITORY037 = _Reference("INFO", "Retrieving batch of items from DynamoDB")
+    REPOSITORY038 = _Reference(
+        "WARN", "Retrying unprocessed keys from DynamoDB batch get"
+    )
+    REPOSITORY039 = _Reference(
+        "INFO", "Successfully retrieved batch of items from DynamoDB"
+    )
+    REPOSITORY040 = _Reference(
+        "ERROR", "Unprocessed keys remain after retrying DynamoDB batch get"
+    )
+    REPOSITORY041 = _Reference("INFO", "More search results available after page")
+    REPOSITORY042 = _Reference(
+        "ERROR", "Attempted to project unknown fields from DynamoDB"
+    )
+    REPOSITORY043 = _Reference(
+        "INFO", "Updating item in place where the update fingerprint matches"
+    )
+    REPOSITORY044 = _Reference(
+        "INFO", "Stored item did not match the update fingerprint, update not applied"
+    )
+    REPOSITORY045 = _Reference(
+        "WARN", "Stored item changed whilst being updated, update not applied"
+    )
+    REPOSITORY046 = _Reference(
+        "INFO", "Item missing or owned by another producer, delete not applied"
+    )
+    REPOSITORY047 = _Reference(
+        "EXCEPTION", "Failed to adjust pointer counter item after write"
+    )
+    REPOSITORY048 = _Reference("INFO", "Pointer cache hit")
+    REPOSITORY049 = _Reference("INFO", "Pointer cache miss, read item from DynamoDB")
+    REPOSITORY050 = _Reference("INFO", "Creating document pointers in batches")
+    REPOSITORY051 = _Reference("INFO", "Created document pointers in batches")
+    REPOSITORY052 = _Reference("EXCEPTION", "Failed to batch write items to DynamoDB")
+    REPOSITORY053 = _Reference(
+        "WARN", "Retrying unprocessed items from DynamoDB batch write"
+    )
+    REPOSITORY054 = _Reference("INFO", "Deleting document pointers for patient")
+    REPOSITORY055 = _Reference("DEBUG", "Deleted page of document pointers")
+    REPOSITORY056 = _Reference(
+        "ERROR", "Document pointers for patient could not all be deleted"
+    )
+    REPOSITORY057 = _Reference(
+        "INFO", "Stopped deleting document pointers at the request deadline"
+    )
+    REPOSITORY058 = _Reference(
+        "DEBUG", "Searching the custodian index for the producer's pointers"
+    )
+    REPOSITORY059 = _Reference("INFO", "Listing document pointers for producer")
+    REPOSITORY060 = _Reference(
+        "INFO", "Reading document pointer by master identifier from masterid_gsi"
+    )
+    REPOSITORY061 = _Reference(
+        "ERROR", "Pointer counter item has negative counts, counting from index"
+    )
+    REPOSITORY062 = _Reference(
+        "WARN", "Pointer counter item changed whilst being rebuilt, recounting"
+    )
+    REPOSITORY063 = _Reference(
+        "ERROR", "Pointer counter item kept changing and could not be rebuilt"
+    )
+    REPOSITORY064 = _Reference(
+        "WARN", "Supersede has too many operations for a single DynamoDB transaction"
+    )
+    REPOSITORY065 = _Reference(
+        "ERROR",
+        "Pointer counter adjustment not applied after write, rebuild the patient's pointer counter",
+    )
 
     # Model logs
     DOCPOINTER001 = _Reference("DEBUG", "Extracting custodian suffix from custodian")
@@ -175,6 +261,10 @@ class LogReference(Enum):
     CONSEARCH002 = _Reference(
         "INFO", "Invalid document type provided in the query parameters"
     )
+    CONSEARCH002a = _Reference(
+        "INFO", "Invalid category provided in the query parameters"
+    )
+    CONSEARCH002b = _Reference("INFO", "Invalid date provided in the query parameters")
     CONSEARCH003 = _Reference("DEBUG", "Performing search by NHS number")
     CONSEARCH004 = _Reference(
         "DEBUG", "Parsed DocumentReference and added to search results"
@@ -182,6 +272,15 @@ class LogReference(Enum):
     CONSEARCH005 = _Reference(
         "EXCEPTION", "The DocumentReference resource could not be parsed"
     )
+    CONSEARCH006 = _Reference(
+        "INFO", "No permitted pointer types in the requested category"
+    )
+    CONSEARCH007 = _Reference(
+        "INFO", "Invalid next-page-token provided in the query parameters"
+    )
+    CONSEARCH008 = _Reference(
+        "INFO", "More results available, adding next link to Bundle"
+    )
     CONSEARCH999 = _Reference(
         "INFO", "Successfully completed consumer searchDocumentReference"
     )
@@ -196,6 +295,10 @@ class LogReference(Enum):
     CONPOSTSEARCH002 = _Reference(
         "INFO", "Invalid document type provided in the request body"
     )
+    CONPOSTSEARCH002a = _Reference(
+        "INFO", "Invalid category provided in the request body"
+    )
+    CONPOSTSEARCH002b = _Reference("INFO", "Invalid date provided in the request body")
     CONPOSTSEARCH003 = _Reference("DEBUG", "Performing search by NHS number")
     CONPOSTSEARCH004 = _Reference(
         "DEBUG", "Parsed DocumentReference and added to search results"
@@ -203,6 +306,31 @@ class LogReference(Enum):
     CONPOSTSEARCH005 = _Reference(
         "EXCEPTION", "The DocumentReference resource could not be parsed"
     )
+    CONPOSTSEARCH006 = _Reference(
+        "INFO", "No permitted pointer types in the requested category"
+    )
+    CONPOSTSEARCH007 = _Reference(
+        "INFO", "Invalid next-page-token provided in the request body"
+    )
+    CONPOSTSEARCH008 = _Reference(
+        "INFO", "More results available, adding next link to Bundle"
+    )
+    CONPOSTSEARCH009 = _Reference(
+        "INFO", "Invalid combination of parameters provided in the request body"
+    )
+    CONPOSTSEARCH010 = _Reference(
+        "INFO", "Too many NHS numbers provided in the request body"
+    )
+    CONPOSTSEARCH011 = _Reference("DEBUG", "Performing search by multiple NHS numbers")
+    CONPOSTSEARCH012 = _Reference(
+        "INFO", "Invalid NHS number provided in subject:identifiers"
+    )
+    CONPOSTSEARCH013 = _Reference(
+        "EXCEPTION", "Search failed for one of the requested NHS numbers"
+    )
+    CONPOSTSEARCH014 = _Reference(
+        "INFO", "Too many document references found for the requested NHS numbers"
+    )
     CONPOSTSEARCH999 = _Reference(
         "INFO", "Successfully completed consumer searchPostDocumentReference"
     )
@@ -248,10 +376,31 @@ class LogReference(Enum):
     PROCREATE011 = _Reference(
         "INFO", "Preserved .date field when creating new document reference"
     )
+    PROCREATE012 = _Reference(
+        "INFO", "Document reference already created with this master identifier"
+    )
+    PROCREATE013 = _Reference(
+        "INFO", "Master identifier already used by a different document reference"
+    )
     PROCREATE999 = _Reference(
         "INFO", "Successfully completed producer createDocumentReference"
     )
 
+    # Producer - ProcessTransaction
+    PROTRANS000 = _Reference("INFO", "Starting to process producer processTransaction")
+    PROTRANS001 = _Reference("WARN", "Bundle type is not supported")
+    PROTRANS002 = _Reference("WARN", "Bundle has no entries or too many entries")
+    PROTRANS003 = _Reference("WARN", "Bundle entry is not a DocumentReference create")
+    PROTRANS004 = _Reference("WARN", "Bundle entry failed validation")
+    PROTRANS005 = _Reference("WARN", "Bundle entry relatesTo is not supported")
+    PROTRANS007 = _Reference("INFO", "Creating document references from Bundle")
+    PROTRANS008 = _Reference(
+        "ERROR", "Document references from Bundle could not be written"
+    )
+    PROTRANS999 = _Reference(
+        "INFO", "Successfully completed producer processTransaction"
+    )
+
     # Producer - UpsertDocumentReference
     PROUPSERT000 = _Reference(
         "INFO", "Starting to process producer upsertDocumentReference"
@@ -320,10 +469,69 @@ class LogReference(Enum):
         "Organisation is not allowed to delete pointer as it is not the producer",
     )
     PRODELETE002 = _Reference("WARN", "Cannot delete pointer as it does not exist")
+    PRODELETE003 = _Reference(
+        "WARN",
+        "Organisation is not allowed to delete pointer as it is not the custodian",
+    )
     PRODELETE999 = _Reference(
         "INFO", "Successfully completed producer deleteDocumentReference"
     )
 
+    # Producer - BulkDeleteDocumentReference
+    PROBULKDELETE000 = _Reference(
+        "INFO", "Starting to process producer bulkDeleteDocumentReference"
+    )
+    PROBULKDELETE001 = _Reference(
+        "INFO", "Invalid NHS number provided in the query parameters"
+    )
+    PROBULKDELETE002 = _Reference(
+        "INFO", "Invalid document type provided in the query parameters"
+    )
+    PROBULKDELETE002a = _Reference(
+        "INFO", "Invalid category provided in the query parameters"
+    )
+    PROBULKDELETE003 = _Reference("INFO", "Deleting document references by NHS number")
+    PROBULKDELETE004 = _Reference(
+        "INFO", "No permitted pointer types in the requested category"
+    )
+    PROBULKDELETE005 = _Reference(
+        "INFO", "Invalid next-page-token provided in the query parameters"
+    )
+    PROBULKDELETE006 = _Reference(
+        "INFO", "More document references to delete, adding next link to response"
+    )
+    PROBULKDELETE999 = _Reference(
+        "INFO", "Successfully completed producer bulkDeleteDocumentReference"
+    )
+
+    # Producer - ListDocumentReference
+    PROLIST000 = _Reference(
+        "INFO", "Starting to process producer listDocumentReference"
+    )
+    PROLIST000a = _Reference(
+        "WARN", "Producer index is not enabled, unable to list document references"
+    )
+    PROLIST001 = _Reference(
+        "INFO", "Invalid document type provided in the query parameters"
+    )
+    PROLIST001a = _Reference(
+        "INFO", "Invalid category provided in the query parameters"
+    )
+    PROLIST002 = _Reference(
+        "INFO", "Invalid date or dateTime provided in the query parameters"
+    )
+    PROLIST003 = _Reference("INFO", "Listing document references for organisation")
+    PROLIST004 = _Reference(
+        "INFO", "Invalid next-page-token provided in the query parameters"
+    )
+    PROLIST005 = _Reference("EXCEPTION", "Unable to parse DocumentReference")
+    PROLIST006 = _Reference(
+        "INFO", "More document references available, adding next link to response"
+    )
+    PROLIST999 = _Reference(
+        "INFO", "Successfully completed producer listDocumentReference"
+    )
+
     # Producer - ReadDocumentReference
     PROREAD000 = _Reference(
         "INFO", "Starting to process producer readDocumentReference"
@@ -350,6 +558,10 @@ class LogReference(Enum):
     PROSEARCH002 = _Reference(
         "INFO", "Invalid document type provided in the query parameters"
     )
+    PROSEARCH002a = _Reference(
+        "INFO", "Invalid category provided in the query parameters"
+    )
+    PROSEARCH002b = _Reference("INFO", "Invalid date provided in the query parameters")
     PROSEARCH003 = _Reference("DEBUG", "Performing search by custodian")
     PROSEARCH004 = _Reference(
         "DEBUG", "Parsed DocumentReference and added to search results"
@@ -357,6 +569,18 @@ class LogReference(Enum):
     PROSEARCH005 = _Reference(
         "EXCEPTION", "The DocumentReference esource could not be parsed"
     )
+    PROSEARCH006 = _Reference(
+        "INFO", "No permitted pointer types in the requested category"
+    )
+    PROSEARCH007 = _Reference(
+        "INFO", "Invalid next-page-token provided in the query parameters"
+    )
+    PROSEARCH008 = _Reference(
+        "INFO", "More results available, adding next link to Bundle"
+    )
+    PROSEARCH009 = _Reference(
+        "INFO", "Searching for document reference by master identifier"
+    )
     PROSEARCH999 = _Reference(
         "INFO", "Successfully completed producer searchDocumentReference"
     )
@@ -371,6 +595,10 @@ class LogReference(Enum):
     PROPOSTSEARCH002 = _Reference(
         "INFO", "Invalid document type provided in the request body"
     )
+    PROPOSTSEARCH002a = _Reference(
+        "INFO", "Invalid category provided in the request body"
+    )
+    PROPOSTSEARCH002b = _Reference("INFO", "Invalid date provided in the request body")
     PROPOSTSEARCH003 = _Reference("DEBUG", "Performing search by custodian")
     PROPOSTSEARCH004 = _Reference(
         "DEBUG", "Parsed DocumentReference and added to search results"
@@ -378,6 +606,18 @@ class LogReference(Enum):
     PROPOSTSEARCH005 = _Reference(
         "EXCEPTION", "The DocumentReference resource could not be parsed"
     )
+    PROPOSTSEARCH006 = _Reference(
+        "INFO", "No permitted pointer types in the requested category"
+    )
+    PROPOSTSEARCH007 = _Reference(
+        "INFO", "Invalid next-page-token provided in the request body"
+    )
+    PROPOSTSEARCH008 = _Reference(
+        "INFO", "More results available, adding next link to Bundle"
+    )
+    PROPOSTSEARCH009 = _Reference(
+        "INFO", "Searching for document reference by master identifier"
+    )
     PROPOSTSEARCH999 = _Reference(
         "INFO", "Successfully completed producer searchDocumentReference"
     )
@@ -402,6 +642,11 @@ class LogReference(Enum):
         "WARN",
         "Update provided for DocumentReference with invalid preserved field, ignoring",
     )
+    PROUPDATE008 = _Reference("INFO", "Updated DocumentReference in place")
+    PROUPDATE009 = _Reference(
+        "INFO",
+        "Existing DocumentReference does not match update fingerprint, comparing fields",
+    )
     PROUPDATE999 = _Reference(
         "INFO", "Successfully completed producer updateDocumentReference"
     )
@@ -1,34 +1,92 @@
-from typing import Union
+from typing import List, Optional, Tuple, Union
 
 from nhs_number import is_valid as is_valid_nhs_number
 from pydantic import BaseModel, Field, StrictStr
 
 import nrlf.consumer.fhir.r4.model as consumer_model
 import nrlf.producer.fhir.r4.model as producer_model
+from nrlf.core.utils import get_date_search_window
+
+
+def _get_nhs_number(subject_identifier) -> Union[str, None]:
+    if subject_identifier is None:
+        return None
+
+    nhs_number = subject_identifier.root.split("|", 1)[1]
+
+    if not is_valid_nhs_number(nhs_number):
+        return None
+
+    return nhs_number
 
 
 class _NhsNumberMixin:
     @property
     def nhs_number(self) -> Union[str, None]:
-        if self.subject_identifier is None:
-            return None
+        return _get_nhs_number(self.subject_identifier)
+
+
+class _DateSearchMixin:
+    @property
+    def created_window(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        The inclusive window of created_on <instant>s matched by the date
+        parameters, with either end None when open
+
+        Raises a ValueError if a date is not a valid date or dateTime
+        """
+        return get_date_search_window([date.root for date in self.date or []])
+
+    @property
+    def newest_first(self) -> bool:
+        return self.sort is not None and self.sort.value == "-date"
 
-        nhs_number = self.subject_identifier.root.split("|", 1)[1]
 
-        if not is_valid_nhs_number(nhs_number):
+class ProducerRequestParams(
+    producer_model.RequestParams, _NhsNumberMixin, _DateSearchMixin
+):
+    @property
+    def master_identifier(self) -> Union[str, None]:
+        """
+        The masterIdentifier value searched for, without any system
+        """
+        if self.identifier is None:
             return None
 
-        return nhs_number
+        return self.identifier.root.split("|", 1)[-1] or None
 
 
-class ProducerRequestParams(producer_model.RequestParams, _NhsNumberMixin):
-    pass
+class ProducerDeleteRequestParams(producer_model.DeleteRequestParams, _NhsNumberMixin):
+    model_config = {"extra": "forbid"}
+
+
+class ProducerListRequestParams(producer_model.ListRequestParams):
+    model_config = {"extra": "forbid"}
 
 
-class ConsumerRequestParams(consumer_model.RequestParams, _NhsNumberMixin):
+class ConsumerRequestParams(
+    consumer_model.RequestParams, _NhsNumberMixin, _DateSearchMixin
+):
     model_config = {"extra": "forbid"}
 
 
+class ConsumerSearchPostRequestParams(
+    consumer_model.SearchPostRequestParams, _NhsNumberMixin, _DateSearchMixin
+):
+    model_config = {"extra": "forbid"}
+
+    @property
+    def nhs_numbers(self) -> List[Union[str, None]]:
+        """
+        The NHS number for each of the subject:identifiers, or None for any
+        identifier without a valid NHS number
+        """
+        return [
+            _get_nhs_number(subject_identifier)
+            for subject_identifier in self.subject_identifiers or []
+        ]
+
+
 class CountRequestParams(consumer_model.CountRequestParams, _NhsNumberMixin):
     pass
 
@@ -0,0 +1,132 @@
+import base64
+import hashlib
+import hmac
+import json
+from typing import Dict, List, Optional
+
+from nrlf.core.codes import SpineErrorConcept
+from nrlf.core.config import Config
+from nrlf.core.errors import OperationOutcomeError
+from nrlf.core.logger import LogReference, logger
+
+
+def _get_page_token_key() -> bytes:
+    """
+    Get the key used to sign page tokens from the config
+    """
+    key = Config().PAGE_TOKEN_KEY
+    if not key:
+        raise ValueError("PAGE_TOKEN_KEY must be configured to page search results")
+
+    return key.encode()
+
+
+def _sign(payload: str, context: str) -> str:
+    """
+    Sign the page token payload along with the search it was issued for
+    """
+    return hmac.new(
+        _get_page_token_key(),
+        f"{context}\n{payload}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def get_search_context(
+    nhs_number: str,
+    pointer_types: List[str],
+    custodian: Optional[str] = None,
+    custodian_suffix: Optional[str] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    newest_first: bool = False,
+) -> str:
+    """
+    Build the string identifying a search, which a page token is bound to
+    """
+    context = [
+        nhs_number,
+        custodian or "",
+        custodian_suffix or "",
+        ",".join(sorted(pointer_types)),
+    ]
+    if created_from or created_to or newest_first:
+        context.extend([created_from or "", created_to or "", str(newest_first)])
+
+    return "|".join(context)
+
+
+def encode_page_token(last_evaluated_key: Dict[str, str], context: str) -> str:
+    """
+    Encode a DynamoDB LastEvaluatedKey into an opaque, signed page token
+    """
+    payload = (
+        base64.urlsafe_b64encode(
+            json.dumps(last_evaluated_key, separators=(",", ":")).encode()
+        )
+        .decode()
+        .rstrip("=")
+    )
+    return f"{payload}.{_sign(payload, context)}"
+
+
+def decode_page_token(page_token: str, context: str) -> Dict[str, str]:
+    """
+    Decode a page token into a DynamoDB ExclusiveStartKey
+
+    Raises a ValueError if the token has been modified or was issued for a
+    different search
+    """
+    payload, _, signature = page_token.partition(".")
+    if not hmac.compare_digest(signature, _sign(payload, context)):
+        raise ValueError("Page token signature is invalid")
+
+    padding = "=" * (-len(payload) % 4)
+    start_key = json.loads(base64.urlsafe_b64decode(payload + padding))
+    if not isinstance(start_key, dict) or not all(
+        isinstance(value, str) for value in start_key.values()
+    ):
+        raise ValueError("Page token does not contain a valid key")
+
+    return start_key
+
+
+def get_start_key(
+    page_token: Optional[str],
+    context: str,
+    log_reference: LogReference,
+    diagnostics: str = "Invalid next-page-token (The token is invalid or was issued for a different search)",
+) -> Optional[Dict[str, str]]:
+    """
+    Decode the next-page-token of a request into the key its page starts after
+
+    Raises an OperationOutcomeError if the token is invalid or was issued for
+    a different search
+    """
+    if not page_token:
+        return None
+
+    try:
+        return decode_page_token(page_token, context)
+    except ValueError as exc:
+        logger.log(log_reference, error=str(exc))
+        raise OperationOutcomeError(
+            severity="error",
+            code="invalid",
+            details=SpineErrorConcept.from_code("INVALID_PARAMETER"),
+            diagnostics=diagnostics,
+            expression=["next-page-token"],
+        ) from exc
+
+
+def get_next_link(
+    search_link: str, count: int, last_evaluated_key: Dict[str, str], context: str
+) -> Dict[str, str]:
+    """
+    Build the Bundle next link for the page following last_evaluated_key
+    """
+    page_token = encode_page_token(last_evaluated_key, context)
+    return {
+        "relation": "next",
+        "url": f"{search_link}&_count={count}&next-page-token={page_token}",
+    }
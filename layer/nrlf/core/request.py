@@ -1,7 +1,8 @@
 import json
-from typing import Dict, Type
+from typing import Dict, List, Type, get_args, get_origin
 
 from pydantic import BaseModel, ValidationError
+from pydantic.fields import FieldInfo
 
 from nrlf.core.codes import SpineErrorConcept
 from nrlf.core.constants import CLIENT_RP_DETAILS, CONNECTION_METADATA
@@ -42,9 +43,18 @@ def parse_headers(headers: Dict[str, str]) -> ConnectionMetadata:
         ) from None
 
 
+def _is_list_field(field: FieldInfo) -> bool:
+    """
+    Check if the model field holds a list of values, so can be repeated
+    """
+    annotations = (field.annotation, *get_args(field.annotation))
+    return any(get_origin(annotation) is list for annotation in annotations)
+
+
 def parse_params(
     model: Type[BaseModel] | None,
     query_string_params: Dict[str, str] | None,
+    multi_value_query_string_params: Dict[str, List[str]] | None = None,
 ) -> BaseModel | None:
     if not model:
         return None
@@ -55,8 +65,17 @@ def parse_params(
         model=model.__name__,
     )
 
+    params = dict(query_string_params or {})
+    for name, field in model.model_fields.items():
+        alias = field.alias or name
+        if alias in params and _is_list_field(field):
+            # Every value of a repeated parameter, not just the last
+            params[alias] = (multi_value_query_string_params or {}).get(alias) or [
+                params[alias]
+            ]
+
     try:
-        result = model.model_validate(query_string_params or {})
+        result = model.model_validate(params)
         logger.log(LogReference.HANDLER007, parsed_params=result.model_dump())
         return result
 
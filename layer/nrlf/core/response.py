@@ -1,6 +1,7 @@
 # ruff: noqa: N803, N815
 
-from typing import List
+import json
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -30,6 +31,92 @@ class Response(BaseModel):
             **kwargs,
         )
 
+    @classmethod
+    def from_searchset(
+        cls,
+        resources: List[str],
+        link: Optional[List[dict]] = None,
+        outcomes: Optional[List[str]] = None,
+        **kwargs,
+    ) -> "Response":
+        """
+        Create a searchset Bundle response from resources already serialised to JSON
+
+        The resource JSON is spliced into the Bundle without being parsed,
+        so it must come from a source that has already been validated.
+        Any OperationOutcomes are added as entries with a search mode of
+        outcome, which are not included in the total.
+        """
+        status_code = kwargs.pop("statusCode", "200")
+        envelope = {"resourceType": "Bundle", "type": "searchset"}
+        if link:
+            envelope["link"] = link
+        envelope["total"] = len(resources)
+
+        entries = ", ".join(
+            [
+                *(f'{{"resource": {resource}}}' for resource in resources),
+                *(
+                    f'{{"resource": {outcome}, "search": {{"mode": "outcome"}}}}'
+                    for outcome in outcomes or []
+                ),
+            ]
+        )
+        return cls(
+            statusCode=status_code,
+            body=f'{json.dumps(envelope)[:-1]}, "entry": [{entries}]}}',
+            **kwargs,
+        )
+
+    @classmethod
+    def from_ndjson(
+        cls, resources: List[str], next_link: Optional[str] = None, **kwargs
+    ) -> "Response":
+        """
+        Create a newline delimited JSON response with one resource per line,
+        from resources already serialised to compact JSON
+
+        When there are more resources, the URL of the next page is returned
+        in a Link header.
+        """
+        status_code = kwargs.pop("statusCode", "200")
+        headers = {"Content-Type": "application/fhir+ndjson"}
+        if next_link:
+            headers["Link"] = f'<{next_link}>; rel="next"'
+
+        return cls(
+            statusCode=status_code,
+            body="".join(f"{resource}\n" for resource in resources),
+            headers=headers,
+            **kwargs,
+        )
+
+    @classmethod
+    def from_entry_responses(
+        cls, bundle_type: str, responses: List["Response"], **kwargs
+    ) -> "Response":
+        """
+        Create a batch-response or transaction-response Bundle with one entry
+        holding the outcome of each entry in the request Bundle
+        """
+        status_code = kwargs.pop("statusCode", "200")
+        entries = []
+        for response in responses:
+            entry_response = {"status": response.statusCode}
+            if location := response.headers.get("Location"):
+                entry_response["location"] = location
+            entry_response["outcome"] = json.loads(response.body)
+            entries.append({"response": entry_response})
+
+        return cls(
+            statusCode=status_code,
+            body=json.dumps(
+                {"resourceType": "Bundle", "type": bundle_type, "entry": entries},
+                indent=2,
+            ),
+            **kwargs,
+        )
+
     @classmethod
     def from_issues(cls, issues: List[BaseModel], **kwargs) -> "Response":
         return cls(
@@ -74,6 +161,21 @@ class NRLResponse(Response):
             headers={"Location": f"{PRODUCER_URL_PATH}/{resource_id}"},
         )
 
+    @classmethod
+    def RESOURCE_EXISTS(cls, resource_id: str):
+        return cls.from_issues(
+            issues=[
+                producer_model.OperationOutcomeIssue(
+                    severity="information",
+                    code="informational",
+                    details=NRLResponseConcept.from_code("RESOURCE_CREATED"),
+                    diagnostics="The document has already been created",
+                )
+            ],
+            statusCode="200",
+            headers={"Location": f"{PRODUCER_URL_PATH}/{resource_id}"},
+        )
+
     @classmethod
     def RESOURCE_SUPERSEDED(cls, resource_id: str):
         return cls.from_issues(
@@ -117,6 +219,27 @@ class NRLResponse(Response):
             statusCode="200",
         )
 
+    @classmethod
+    def RESOURCES_DELETED(cls, count: int, next_link: Optional[str] = None):
+        diagnostics = f"{count} DocumentReferences have been deleted"
+        headers = {}
+        if next_link:
+            diagnostics += ", repeat the request using the next link to delete the remaining DocumentReferences"
+            headers["Link"] = f'<{next_link}>; rel="next"'
+
+        return cls.from_issues(
+            issues=[
+                producer_model.OperationOutcomeIssue(
+                    severity="information",
+                    code="informational",
+                    details=NRLResponseConcept.from_code("RESOURCE_DELETED"),
+                    diagnostics=diagnostics,
+                )
+            ],
+            statusCode="200",
+            headers=headers,
+        )
+
 
 class SpineErrorResponse(Response):
     @classmethod
@@ -214,6 +337,27 @@ class SpineErrorResponse(Response):
             statusCode="400",
         )
 
+    @classmethod
+    def INVALID_PARAMETER(
+        cls, diagnostics: str = "Invalid parameter", expression: str | None = None
+    ) -> "Response":
+        return cls.from_issues(
+            issues=[
+                producer_model.OperationOutcomeIssue(
+                    severity="error",
+                    code="invalid",
+                    details=SpineErrorConcept.from_code("INVALID_PARAMETER"),
+                    diagnostics=diagnostics,
+                    expression=(
+                        [producer_model.ExpressionItem(root=expression)]
+                        if expression
+                        else None
+                    ),
+                )
+            ],
+            statusCode="400",
+        )
+
     @classmethod
     def BAD_REQUEST(
         cls, diagnostics: str = "Bad request", expression: str | None = None
@@ -255,3 +399,24 @@ class SpineErrorResponse(Response):
             ],
             statusCode="403",
         )
+
+    @classmethod
+    def DUPLICATE_REJECTED(
+        cls, diagnostics: str = "Duplicate rejected", expression: str | None = None
+    ) -> "Response":
+        return cls.from_issues(
+            issues=[
+                producer_model.OperationOutcomeIssue(
+                    severity="error",
+                    code="conflict",
+                    details=SpineErrorConcept.from_code("DUPLICATE_REJECTED"),
+                    diagnostics=diagnostics,
+                    expression=(
+                        [producer_model.ExpressionItem(root=expression)]
+                        if expression
+                        else None
+                    ),
+                )
+            ],
+            statusCode="409",
+        )
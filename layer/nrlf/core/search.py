@@ -0,0 +1,113 @@
+from typing import Iterable, List, Literal, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from nrlf.core.codes import SpineErrorConcept
+from nrlf.core.config import Config
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+from nrlf.core.errors import OperationOutcomeError
+from nrlf.core.logger import LogReference, logger
+
+
+def get_search_link(
+    api: Literal["consumer", "producer"],
+    nhs_number: str,
+    custodian: Optional[str] = None,
+    pointer_type: Optional[str] = None,
+    category: Optional[str] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    newest_first: bool = False,
+) -> str:
+    """
+    Build the GET URL for a search by NHS number, used as the Bundle self link
+    and as the base of its next link
+    """
+    config = Config()
+    search_link = f"https://{config.ENVIRONMENT}.api.service.nhs.uk/record-locator/{api}/FHIR/R4/DocumentReference?subject:identifier=https://fhir.nhs.uk/Id/nhs-number|{nhs_number}"
+
+    if custodian:
+        search_link += f"&custodian:identifier=https://fhir.nhs.uk/Id/ods-organization-code|{custodian}"
+
+    if pointer_type:
+        search_link += f"&type={pointer_type}"
+
+    if category:
+        search_link += f"&category={category}"
+
+    if created_from:
+        search_link += f"&date=ge{created_from}"
+
+    if created_to:
+        search_link += f"&date=le{created_to}"
+
+    if newest_first:
+        search_link += "&_sort=-date"
+
+    return search_link
+
+
+def get_by_master_identifier(
+    repository: DocumentPointerRepository,
+    ods_code_parts: tuple[str, ...],
+    master_identifier: str,
+    pointer_types: List[str],
+    nhs_number: Optional[str] = None,
+) -> List[DocumentPointer]:
+    """
+    Find the organisation's pointer with the requested masterIdentifier, if it
+    also matches the requested types and any requested NHS number
+    """
+    pointer = repository.get_by_master_identifier(
+        ods_code_parts=ods_code_parts,
+        master_identifier=master_identifier,
+        fields=["document", "nhs_number", "type"],
+    )
+    if (
+        pointer is None
+        or pointer.type not in pointer_types
+        or nhs_number not in (None, pointer.nhs_number)
+    ):
+        return []
+
+    return [pointer]
+
+
+def get_resources(
+    repository: DocumentPointerRepository,
+    results: Iterable[DocumentPointer],
+    document_model: Type[BaseModel],
+    invalid_log_reference: LogReference,
+    found_log_reference: Optional[LogReference] = None,
+    diagnostics: str = "An error occurred whilst parsing the document reference search results",
+) -> List[str]:
+    """
+    Get the DocumentReference JSON for each of the results, re-validated
+    against document_model when the repository has strict read validation
+
+    Raises an OperationOutcomeError if a document is not a valid DocumentReference
+    """
+    resources = []
+    for result in results:
+        document = result.document
+        if repository.strict_read_validation:
+            try:
+                document = document_model.model_validate_json(document).model_dump_json(
+                    exclude_none=True
+                )
+            except ValidationError as exc:
+                logger.log(invalid_log_reference, error=str(exc), document=document)
+                raise OperationOutcomeError(
+                    status_code="500",
+                    severity="error",
+                    code="exception",
+                    details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+                    diagnostics=diagnostics,
+                ) from exc
+
+        resources.append(document)
+        if found_log_reference:
+            logger.log(found_log_reference, id=result.id, count=len(resources))
+
+    return resources
@@ -0,0 +1,88 @@
+import os
+from unittest.mock import patch
+
+from nrlf.core.boto import get_botocore_config, prime_clients
+from nrlf.core.decorators import prime_lambda_clients
+
+
+def test_get_botocore_config_defaults():
+    config = get_botocore_config.__wrapped__()
+
+    assert config.max_pool_connections == 20
+    assert config.connect_timeout == 2
+    assert config.read_timeout == 5
+    assert config.retries == {"max_attempts": 3, "mode": "adaptive"}
+    assert config.tcp_keepalive is True
+
+
+@patch.dict(
+    os.environ,
+    {
+        "BOTO_MAX_POOL_CONNECTIONS": "50",
+        "BOTO_READ_TIMEOUT_SECONDS": "1.5",
+        "BOTO_RETRY_MODE": "standard",
+        "BOTO_TCP_KEEPALIVE": "false",
+    },
+)
+def test_get_botocore_config_from_environment():
+    config = get_botocore_config.__wrapped__()
+
+    assert config.max_pool_connections == 50
+    assert config.read_timeout == 1.5
+    assert config.retries == {"max_attempts": 3, "mode": "standard"}
+    assert config.tcp_keepalive is False
+
+
+@patch("nrlf.core.boto.get_dynamodb_client")
+def test_prime_clients_reads_from_table(mock_get_dynamodb_client):
+    prime_clients("unit-test-document-pointer")
+
+    mock_get_dynamodb_client.return_value.get_item.assert_called_once_with(
+        TableName="unit-test-document-pointer",
+        Key={"pk": {"S": "D#NRLF-PRIME"}, "sk": {"S": "D#NRLF-PRIME"}},
+        ProjectionExpression="pk",
+    )
+
+
+@patch("nrlf.core.boto.get_dynamodb_client")
+def test_prime_clients_without_table(mock_get_dynamodb_client):
+    prime_clients()
+
+    mock_get_dynamodb_client.return_value.get_item.assert_not_called()
+
+
+@patch("nrlf.core.decorators.prime_clients")
+def test_prime_lambda_clients_outside_lambda(mock_prime_clients):
+    prime_lambda_clients()
+
+    mock_prime_clients.assert_not_called()
+
+
+@patch.dict(os.environ, {"AWS_LAMBDA_FUNCTION_NAME": "nrlf--api--consumer--read"})
+@patch("nrlf.core.decorators.prime_clients")
+def test_prime_lambda_clients_in_lambda(mock_prime_clients):
+    prime_lambda_clients()
+
+    mock_prime_clients.assert_called_once_with("unit-test-document-pointer")
+
+
+@patch.dict(
+    os.environ,
+    {
+        "AWS_LAMBDA_FUNCTION_NAME": "nrlf--api--consumer--read",
+        "BOTO_PRIME_CLIENTS": "false",
+    },
+)
+@patch("nrlf.core.decorators.prime_clients")
+def test_prime_lambda_clients_disabled(mock_prime_clients):
+    prime_lambda_clients()
+
+    mock_prime_clients.assert_not_called()
+
+
+@patch.dict(os.environ, {"AWS_LAMBDA_FUNCTION_NAME": "nrlf--api--consumer--read"})
+@patch("nrlf.core.decorators.prime_clients", side_effect=Exception("no network"))
+def test_prime_lambda_clients_ignores_errors(mock_prime_clients):
+    prime_lambda_clients()
+
+    mock_prime_clients.assert_called_once()
@@ -0,0 +1,71 @@
+from freezegun import freeze_time
+from pytest import mark
+
+from nrlf.core.create import set_create_time_fields
+from nrlf.tests.data import load_document_reference
+
+
+@freeze_time("2024-03-25")
+@mark.parametrize(
+    "doc_ref_name",
+    [
+        "Y05868-736253002-Valid",
+        "Y05868-736253002-Valid-with-date",
+        "Y05868-736253002-Valid-with-date-and-meta-lastupdated",
+    ],
+)
+def test_set_create_time_fields(doc_ref_name: str):
+    test_time = "2024-03-24T12:34:56.789Z"
+    test_doc_ref = load_document_reference(doc_ref_name)
+    test_perms = []
+
+    response = set_create_time_fields(test_time, test_doc_ref, test_perms)
+
+    assert response.model_dump(exclude_none=True) == {
+        **test_doc_ref.model_dump(exclude_none=True),
+        "meta": {
+            "lastUpdated": "2024-03-24T12:34:56.789Z",
+        },
+        "date": "2024-03-24T12:34:56.789Z",
+    }
+
+
+@freeze_time("2024-03-25")
+@mark.parametrize(
+    "doc_ref_name",
+    [
+        "Y05868-736253002-Valid-with-date",
+        "Y05868-736253002-Valid-with-date-and-meta-lastupdated",
+    ],
+)
+def test_set_create_time_fields_when_doc_has_date_and_perms(doc_ref_name: str):
+    test_time = "2024-03-24T12:34:56.789Z"
+    test_doc_ref = load_document_reference(doc_ref_name)
+    test_perms = ["audit-dates-from-payload"]
+
+    response = set_create_time_fields(test_time, test_doc_ref, test_perms)
+
+    assert response.model_dump(exclude_none=True) == {
+        **test_doc_ref.model_dump(exclude_none=True),
+        "meta": {
+            "lastUpdated": test_time,
+        },
+        "date": test_doc_ref.date,
+    }
+
+
+@freeze_time("2024-03-25")
+def test_set_create_time_fields_when_no_date_but_perms():
+    test_time = "2024-03-24T12:34:56.789Z"
+    test_doc_ref = load_document_reference("Y05868-736253002-Valid")
+    test_perms = ["audit-dates-from-payload"]
+
+    response = set_create_time_fields(test_time, test_doc_ref, test_perms)
+
+    assert response.model_dump(exclude_none=True) == {
+        **test_doc_ref.model_dump(exclude_none=True),
+        "meta": {
+            "lastUpdated": test_time,
+        },
+        "date": test_time,
+    }
@@ -1,11 +1,17 @@
 import json
+import os
+import subprocess
+import sys
 import warnings
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from aws_lambda_powertools.utilities.data_classes import APIGatewayProxyEvent
 from pydantic import BaseModel
 from pytest_mock import MockerFixture
 
+import nrlf
 from nrlf.core.authoriser import parse_permissions_file
 from nrlf.core.codes import SpineErrorConcept
 from nrlf.core.config import Config
@@ -23,6 +29,8 @@ from nrlf.core.decorators import (
     request_handler,
     verify_request_ids,
 )
+from nrlf.core.dynamodb.async_repository import AsyncDocumentPointerRepository
+from nrlf.core.dynamodb.memory import InMemoryDocumentPointerRepository
 from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference
 from nrlf.core.request import parse_headers
@@ -783,6 +791,12 @@ def test_request_handler_with_custom_repository(mocker: MockerFixture):
     repository_mock.assert_called_once()
     assert repository_mock.call_args.kwargs == {
         "table_name": "unit-test-document-pointer",
+        "strict_read_validation": False,
+        "pointer_cache": None,
+        "document_encoding": "json",
+        "custodian_index_enabled": False,
+        "producer_index_enabled": False,
+        "pointer_counts_enabled": False,
     }
 
 
@@ -800,3 +814,53 @@ def test_deprecated_decorator():
             str(warning_list[0].message)
             == "Call to deprecated function deprecated_function. This function is deprecated."
         )
+
+
+def test_request_handler_with_async_handler(mocker: MockerFixture):
+    repository_mock = mocker.Mock()
+
+    @request_handler(repository=repository_mock)
+    async def decorated_function(repository) -> Response:
+        assert isinstance(repository, AsyncDocumentPointerRepository)
+        assert repository.repository == repository_mock.return_value
+        return Response(
+            statusCode="200",
+            body=json.dumps({"message": "Hello, World!"}),
+        )
+
+    event = create_test_api_gateway_event(headers=create_headers())
+    context = create_mock_context()
+
+    result = decorated_function(event, context)
+
+    assert result["statusCode"] == "200"
+    assert json.loads(result["body"]) == {"message": "Hello, World!"}
+
+
+@patch.dict(os.environ, {"REPOSITORY_BACKEND": "memory"})
+def test_request_handler_with_in_memory_repository_backend():
+    @request_handler()
+    def decorated_function(repository) -> Response:
+        assert isinstance(repository, InMemoryDocumentPointerRepository)
+        return Response(statusCode="200", body=json.dumps({}))
+
+    event = create_test_api_gateway_event(headers=create_headers())
+    context = create_mock_context()
+
+    result = decorated_function(event, context)
+
+    assert result["statusCode"] == "200"
+
+
+def test_request_handler_does_not_load_in_memory_repository_backend():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, nrlf.core.decorators; "
+            "sys.exit('nrlf.core.dynamodb.memory' in sys.modules)",
+        ],
+        env={**os.environ, "PYTHONPATH": str(Path(nrlf.__file__).parents[1])},
+    )
+
+    assert result.returncode == 0
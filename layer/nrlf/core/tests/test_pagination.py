@@ -0,0 +1,140 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from nrlf.core.errors import OperationOutcomeError
+from nrlf.core.logger import LogReference
+from nrlf.core.pagination import (
+    decode_page_token,
+    encode_page_token,
+    get_next_link,
+    get_search_context,
+    get_start_key,
+)
+
+LAST_EVALUATED_KEY = {
+    "pk": "D#Y05868-99999-99999-999999",
+    "sk": "D#Y05868-99999-99999-999999",
+    "patient_key": "P#6700028191",
+    "patient_sort": "C#SCT-734163000#T#SCT-736253002#CO#2024-01-01T00:00:00.000Z#D#Y05868-99999-99999-999999",
+}
+
+
+def test_get_search_context():
+    context = get_search_context(
+        "6700028191",
+        ["http://snomed.info/sct|736253002", "http://snomed.info/sct|1363501000000100"],
+        custodian="Y05868",
+    )
+
+    assert context == (
+        "6700028191|Y05868||"
+        "http://snomed.info/sct|1363501000000100,http://snomed.info/sct|736253002"
+    )
+
+
+def test_get_search_context_with_date_search():
+    context = get_search_context(
+        "6700028191",
+        ["http://snomed.info/sct|736253002"],
+        created_from="2024-01-01T00:00:00.000Z",
+        newest_first=True,
+    )
+
+    assert context == (
+        "6700028191|||http://snomed.info/sct|736253002|"
+        "2024-01-01T00:00:00.000Z||True"
+    )
+
+
+def test_encode_decode_page_token():
+    context = get_search_context("6700028191", ["http://snomed.info/sct|736253002"])
+
+    page_token = encode_page_token(LAST_EVALUATED_KEY, context)
+
+    assert "P#6700028191" not in page_token
+    assert decode_page_token(page_token, context) == LAST_EVALUATED_KEY
+
+
+def test_decode_page_token_tampered_payload():
+    context = get_search_context("6700028191", ["http://snomed.info/sct|736253002"])
+    page_token = encode_page_token(LAST_EVALUATED_KEY, context)
+
+    other_token = encode_page_token(
+        {**LAST_EVALUATED_KEY, "patient_key": "P#9278693472"}, context
+    )
+    tampered_token = f"{other_token.split('.')[0]}.{page_token.split('.')[1]}"
+
+    with pytest.raises(ValueError, match="signature is invalid"):
+        decode_page_token(tampered_token, context)
+
+
+def test_decode_page_token_different_search():
+    page_token = encode_page_token(
+        LAST_EVALUATED_KEY,
+        get_search_context("6700028191", ["http://snomed.info/sct|736253002"]),
+    )
+
+    with pytest.raises(ValueError, match="signature is invalid"):
+        decode_page_token(
+            page_token,
+            get_search_context("9278693472", ["http://snomed.info/sct|736253002"]),
+        )
+
+
+def test_decode_page_token_invalid_token():
+    with pytest.raises(ValueError, match="signature is invalid"):
+        decode_page_token("not-a-valid-token", "context")
+
+
+@patch.dict(os.environ, {"PAGE_TOKEN_KEY": ""})
+def test_encode_page_token_requires_key():
+    with pytest.raises(ValueError, match="PAGE_TOKEN_KEY must be configured"):
+        encode_page_token(LAST_EVALUATED_KEY, "context")
+
+
+def test_get_next_link():
+    context = get_search_context("6700028191", ["http://snomed.info/sct|736253002"])
+
+    next_link = get_next_link(
+        "https://example.com/DocumentReference?subject:identifier=abc",
+        10,
+        LAST_EVALUATED_KEY,
+        context,
+    )
+
+    page_token = encode_page_token(LAST_EVALUATED_KEY, context)
+    assert next_link == {
+        "relation": "next",
+        "url": f"https://example.com/DocumentReference?subject:identifier=abc&_count=10&next-page-token={page_token}",
+    }
+
+
+def test_get_start_key():
+    context = get_search_context("6700028191", ["http://snomed.info/sct|736253002"])
+    page_token = encode_page_token(LAST_EVALUATED_KEY, context)
+
+    assert get_start_key(page_token, context, LogReference.PROSEARCH007) == (
+        LAST_EVALUATED_KEY
+    )
+    assert get_start_key(None, context, LogReference.PROSEARCH007) is None
+
+
+def test_get_start_key_different_search():
+    page_token = encode_page_token(
+        LAST_EVALUATED_KEY,
+        get_search_context("6700028191", ["http://snomed.info/sct|736253002"]),
+    )
+
+    with pytest.raises(OperationOutcomeError) as error:
+        get_start_key(
+            page_token,
+            get_search_context("9278693472", ["http://snomed.info/sct|736253002"]),
+            LogReference.PROSEARCH007,
+        )
+
+    issue = error.value.operation_outcome.issue[0]
+    assert error.value.status_code == "400"
+    assert issue.details.coding[0].code == "INVALID_PARAMETER"
+    assert issue.expression[0].root == "next-page-token"
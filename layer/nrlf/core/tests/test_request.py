@@ -3,7 +3,8 @@ import json
 import pytest
 
 from nrlf.core.errors import OperationOutcomeError
-from nrlf.core.request import parse_headers
+from nrlf.core.model import ConsumerRequestParams
+from nrlf.core.request import parse_headers, parse_params
 
 
 def test_parse_headers_empty_headers():
@@ -129,3 +130,34 @@ def test_parse_headers_case_insensitive():
     assert metadata.client_rp_details.developer_app_name == "TestApp"
     assert metadata.client_rp_details.developer_app_id == "12345"
     assert metadata.ods_code_parts == ("X26", "001")
+
+
+def test_parse_params_repeated_list_parameter():
+    result = parse_params(
+        ConsumerRequestParams,
+        {
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            "date": "le2024-01-31",
+        },
+        {
+            "subject:identifier": ["https://fhir.nhs.uk/Id/nhs-number|6700028191"],
+            "date": ["ge2024-01-01", "le2024-01-31"],
+        },
+    )
+
+    assert [date.root for date in result.date] == ["ge2024-01-01", "le2024-01-31"]
+    assert result.subject_identifier.root == (
+        "https://fhir.nhs.uk/Id/nhs-number|6700028191"
+    )
+
+
+def test_parse_params_single_list_parameter():
+    result = parse_params(
+        ConsumerRequestParams,
+        {
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            "date": "ge2024-01-01",
+        },
+    )
+
+    assert [date.root for date in result.date] == ["ge2024-01-01"]
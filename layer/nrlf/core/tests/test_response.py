@@ -21,6 +21,90 @@ def test_from_resource():
     assert parsed_body == {"id": "test-doc-ref"}
 
 
+def test_from_searchset():
+    resources = [
+        json.dumps({"resourceType": "DocumentReference", "id": "test-doc-ref-1"}),
+        json.dumps({"resourceType": "DocumentReference", "id": "test-doc-ref-2"}),
+    ]
+    response = Response.from_searchset(
+        resources,
+        link=[{"relation": "self", "url": "https://example.com"}],
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert isinstance(response, Response)
+    assert response.statusCode == "200"
+    assert response.headers == {"Content-Type": "application/json"}
+
+    parsed_body = json.loads(response.body)
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "link": [{"relation": "self", "url": "https://example.com"}],
+        "total": 2,
+        "entry": [
+            {"resource": {"resourceType": "DocumentReference", "id": "test-doc-ref-1"}},
+            {"resource": {"resourceType": "DocumentReference", "id": "test-doc-ref-2"}},
+        ],
+    }
+
+
+def test_from_searchset_with_outcomes():
+    response = Response.from_searchset(
+        [json.dumps({"resourceType": "DocumentReference", "id": "test-doc-ref-1"})],
+        outcomes=[json.dumps({"resourceType": "OperationOutcome", "issue": []})],
+    )
+
+    parsed_body = json.loads(response.body)
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "total": 1,
+        "entry": [
+            {"resource": {"resourceType": "DocumentReference", "id": "test-doc-ref-1"}},
+            {
+                "resource": {"resourceType": "OperationOutcome", "issue": []},
+                "search": {"mode": "outcome"},
+            },
+        ],
+    }
+
+
+def test_from_searchset_empty():
+    response = Response.from_searchset([])
+
+    parsed_body = json.loads(response.body)
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "total": 0,
+        "entry": [],
+    }
+
+
+def test_from_ndjson():
+    resources = [
+        json.dumps({"resourceType": "DocumentReference", "id": "test-doc-ref-1"}),
+        json.dumps({"resourceType": "DocumentReference", "id": "test-doc-ref-2"}),
+    ]
+    response = Response.from_ndjson(resources, next_link="https://example.com")
+
+    assert response.statusCode == "200"
+    assert response.headers == {
+        "Content-Type": "application/fhir+ndjson",
+        "Link": '<https://example.com>; rel="next"',
+    }
+    assert response.body.splitlines() == resources
+    assert response.body.endswith("\n")
+
+
+def test_from_ndjson_empty():
+    response = Response.from_ndjson([])
+
+    assert response.headers == {"Content-Type": "application/fhir+ndjson"}
+    assert response.body == ""
+
+
 def test_from_issues():
     response = Response.from_issues(
         issues=[
@@ -0,0 +1,89 @@
+from unittest.mock import Mock
+
+import pytest
+
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.core.errors import OperationOutcomeError
+from nrlf.core.logger import LogReference
+from nrlf.core.search import (
+    get_by_master_identifier,
+    get_resources,
+    get_search_link,
+)
+from nrlf.producer.fhir.r4.model import DocumentReference
+from nrlf.tests.data import load_document_reference
+
+LAST_EVALUATED_KEY = {
+    "pk": "D#Y05868-99999-99999-999999",
+    "sk": "D#Y05868-99999-99999-999999",
+    "patient_key": "P#6700028191",
+    "patient_sort": "C#SCT-734163000#T#SCT-736253002#CO#2024-01-01T00:00:00.000Z#D#Y05868-99999-99999-999999",
+}
+
+
+def test_get_search_link():
+    search_link = get_search_link(
+        "consumer",
+        "6700028191",
+        custodian="Y05868",
+        pointer_type="http://snomed.info/sct|736253002",
+        created_from="2024-01-01T00:00:00.000Z",
+        newest_first=True,
+    )
+
+    assert search_link == (
+        "https://pytest.api.service.nhs.uk/record-locator/consumer/FHIR/R4/DocumentReference"
+        "?subject:identifier=https://fhir.nhs.uk/Id/nhs-number|6700028191"
+        "&custodian:identifier=https://fhir.nhs.uk/Id/ods-organization-code|Y05868"
+        "&type=http://snomed.info/sct|736253002"
+        "&date=ge2024-01-01T00:00:00.000Z"
+        "&_sort=-date"
+    )
+
+
+def _build_pointer() -> DocumentPointer:
+    return DocumentPointer.from_document_reference(
+        load_document_reference("Y05868-736253002-Valid")
+    )
+
+
+@pytest.mark.parametrize(
+    "pointer_types, nhs_number, found",
+    [
+        (["http://snomed.info/sct|736253002"], None, True),
+        (["http://snomed.info/sct|736253002"], "6700028191", True),
+        (["http://snomed.info/sct|736253002"], "9278693472", False),
+        (["http://snomed.info/sct|1363501000000100"], None, False),
+    ],
+)
+def test_get_by_master_identifier(
+    pointer_types: list[str], nhs_number: str, found: bool
+):
+    pointer = _build_pointer()
+    repository = Mock(get_by_master_identifier=Mock(return_value=pointer))
+
+    results = get_by_master_identifier(
+        repository, ("Y05868",), "request-1", pointer_types, nhs_number=nhs_number
+    )
+
+    assert results == ([pointer] if found else [])
+
+
+def test_get_resources_strict_read_validation():
+    pointer = _build_pointer()
+    invalid_pointer = pointer.model_copy(update={"document": '{"status": "current"}'})
+    repository = Mock(strict_read_validation=True)
+
+    assert get_resources(
+        repository, [pointer], DocumentReference, LogReference.PROSEARCH005
+    ) == [
+        DocumentReference.model_validate_json(pointer.document).model_dump_json(
+            exclude_none=True
+        )
+    ]
+    with pytest.raises(OperationOutcomeError) as error:
+        get_resources(
+            repository, [invalid_pointer], DocumentReference, LogReference.PROSEARCH005
+        )
+
+    assert error.value.status_code == "500"
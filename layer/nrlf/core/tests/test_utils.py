@@ -1,9 +1,14 @@
 from datetime import datetime, timezone
 from re import match
 
+import pytest
 from freezegun import freeze_time
 
-from layer.nrlf.core.utils import create_fhir_instant
+from layer.nrlf.core.utils import (
+    create_fhir_instant,
+    get_date_search_window,
+    normalise_fhir_datetime,
+)
 
 # FHIR INSTANT refex taken from the spec: https://www.hl7.org/fhir/datatypes.html#instant
 SPEC_REGEX = r"([0-9]([0-9]([0-9][1-9]|[1-9]0)|[1-9]00)|[1-9]000)-(0[1-9]|1[0-2])-(0[1-9]|[1-2][0-9]|3[0-1])T([01][0-9]|2[0-3]):[0-5][0-9]:([0-5][0-9]|60)(\.[0-9]{1,9})?(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))"
@@ -25,3 +30,52 @@ def test_create_fhir_instant_no_time():
 
     assert result == "2021-01-01T00:00:00.000Z"
     assert match(SPEC_REGEX, result) != None
+
+
+@pytest.mark.parametrize(
+    "value, end_of_day, expected",
+    [
+        ("2024-01-31", False, "2024-01-31T00:00:00.000Z"),
+        ("2024-01-31", True, "2024-01-31T23:59:59.999Z"),
+        ("2024-01-31T10:15:00Z", True, "2024-01-31T10:15:00.000Z"),
+        ("2024-01-31T10:15:00.123456+01:00", False, "2024-01-31T09:15:00.123Z"),
+        ("2024-01-31T10:15:00", False, "2024-01-31T10:15:00.000Z"),
+    ],
+)
+def test_normalise_fhir_datetime(value: str, end_of_day: bool, expected: str):
+    result = normalise_fhir_datetime(value, end_of_day=end_of_day)
+
+    assert result == expected
+    assert match(SPEC_REGEX, result) != None
+
+
+def test_normalise_fhir_datetime_invalid():
+    with pytest.raises(ValueError):
+        normalise_fhir_datetime("2024-02-30")
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        ([], (None, None)),
+        (["2024-01-31"], ("2024-01-31T00:00:00.000Z", "2024-01-31T23:59:59.999Z")),
+        (
+            ["ge2024-01-01", "le2024-01-31"],
+            ("2024-01-01T00:00:00.000Z", "2024-01-31T23:59:59.999Z"),
+        ),
+        (["gt2024-01-01"], ("2024-01-02T00:00:00.000Z", None)),
+        (["lt2024-01-31T10:15:00Z"], (None, "2024-01-31T10:14:59.999Z")),
+        (
+            ["ge2024-01-01", "ge2024-01-15", "le2024-02-01T00:00:00+01:00"],
+            ("2024-01-15T00:00:00.000Z", "2024-01-31T23:00:00.000Z"),
+        ),
+    ],
+)
+def test_get_date_search_window(values: list[str], expected: tuple):
+    assert get_date_search_window(values) == expected
+
+
+@pytest.mark.parametrize("value", ["ne2024-01-01", "ge2024-02-30"])
+def test_get_date_search_window_invalid(value: str):
+    with pytest.raises(ValueError):
+        get_date_search_window([value])
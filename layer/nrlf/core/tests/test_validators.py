@@ -2,16 +2,19 @@ from unittest.mock import Mock
 
 import pytest
 
-from nrlf.core.constants import PointerTypes
+from nrlf.core.constants import Categories, PointerTypes
 from nrlf.core.errors import ParseError
 from nrlf.core.validators import (
     DocumentReferenceValidator,
     ValidationResult,
+    filter_pointer_types_by_category,
+    validate_category,
     validate_type_system,
 )
 from nrlf.producer.fhir.r4.model import (
     DocumentReference,
     OperationOutcomeIssue,
+    RequestQueryCategory,
     RequestQueryType,
 )
 from nrlf.tests.data import load_document_reference_json
@@ -41,6 +44,38 @@ def test_validate_type_system_empty():
     assert validate_type_system(type_, pointer_types) is True
 
 
+def test_validate_category_valid():
+    category = RequestQueryCategory(root=Categories.CARE_PLAN.value)
+    assert validate_category(category) is True
+
+
+def test_validate_category_invalid():
+    category = RequestQueryCategory(root="http://snomed.info/sct|invalid")
+    assert validate_category(category) is False
+
+
+def test_validate_category_empty():
+    assert validate_category(None) is True
+
+
+def test_filter_pointer_types_by_category():
+    category = RequestQueryCategory(root=Categories.CARE_PLAN.value)
+    pointer_types = [
+        PointerTypes.MENTAL_HEALTH_PLAN.value,
+        PointerTypes.NEWS2_CHART.value,
+        PointerTypes.EOL_CARE_PLAN.value,
+    ]
+    assert filter_pointer_types_by_category(pointer_types, category) == [
+        PointerTypes.MENTAL_HEALTH_PLAN.value,
+        PointerTypes.EOL_CARE_PLAN.value,
+    ]
+
+
+def test_filter_pointer_types_by_category_empty():
+    pointer_types = [PointerTypes.NEWS2_CHART.value]
+    assert filter_pointer_types_by_category(pointer_types, None) == pointer_types
+
+
 def test_validation_result_reset():
     validation_result = ValidationResult(
         resource=DocumentReference.model_construct(id="example_resource"),
@@ -22,3 +22,6 @@ DocumentReference = Union[
 RequestQueryType = Union[
     producer_model.RequestQueryType, consumer_model.RequestQueryType
 ]
+RequestQueryCategory = Union[
+    producer_model.RequestQueryCategory, consumer_model.RequestQueryCategory
+]
@@ -1,4 +1,7 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+DATE_SEARCH_PREFIXES = ("eq", "ge", "gt", "le", "lt")
 
 
 def create_fhir_instant(time: datetime = None) -> str:
@@ -12,3 +15,69 @@ def create_fhir_instant(time: datetime = None) -> str:
         time = datetime.now(timezone.utc)
 
     return time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def _parse_fhir_datetime(value: str, end_of_day: bool = False) -> datetime:
+    """
+    Parses a FHIR date or dateTime as a UTC datetime. A date is the first
+    instant of that day, or the last when end_of_day is set.
+
+    Raises a ValueError if the value is not a valid date or dateTime
+    """
+    if "T" in value:
+        instant = datetime.fromisoformat(value)
+        if instant.tzinfo is None:
+            # A dateTime without an offset is read as UTC, not the server's time
+            instant = instant.replace(tzinfo=timezone.utc)
+        return instant.astimezone(timezone.utc)
+
+    day = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+    if end_of_day:
+        day += timedelta(days=1, milliseconds=-1)
+
+    return day
+
+
+def normalise_fhir_datetime(value: str, end_of_day: bool = False) -> str:
+    """
+    Converts a FHIR date or dateTime to the <instant> format pointer dates are
+    stored in, so they can be compared as strings. A date is the first instant
+    of that day, or the last when end_of_day is set.
+
+    Raises a ValueError if the value is not a valid date or dateTime
+    """
+    return create_fhir_instant(_parse_fhir_datetime(value, end_of_day=end_of_day))
+
+
+def get_date_search_window(values: List[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Converts the values of a FHIR date search parameter, each a date or dateTime
+    with an optional eq, ge, gt, le or lt prefix, to the inclusive window of
+    <instant>s matching all of them. Either end of the window is None when open.
+
+    Raises a ValueError if a value has an unsupported prefix or is not a valid
+    date or dateTime
+    """
+    one_millisecond = timedelta(milliseconds=1)
+    lower, upper = None, None
+    for value in values:
+        prefix, moment = (
+            (value[:2], value[2:]) if value[:2].isalpha() else ("eq", value)
+        )
+        if prefix not in DATE_SEARCH_PREFIXES:
+            raise ValueError(f"Unsupported date search prefix: {prefix}")
+
+        start = _parse_fhir_datetime(moment)
+        end = _parse_fhir_datetime(moment, end_of_day=True)
+
+        if prefix in ("eq", "ge", "gt"):
+            bound = end + one_millisecond if prefix == "gt" else start
+            lower = max(lower, bound) if lower else bound
+        if prefix in ("eq", "le", "lt"):
+            bound = start - one_millisecond if prefix == "lt" else end
+            upper = min(upper, bound) if upper else bound
+
+    return (
+        create_fhir_instant(lower) if lower else None,
+        create_fhir_instant(upper) if upper else None,
+    )
@@ -5,10 +5,19 @@ from typing import Any, Dict, List, Optional
 from pydantic import ValidationError
 
 from nrlf.core.codes import SpineErrorConcept
-from nrlf.core.constants import CATEGORY_ATTRIBUTES, REQUIRED_CREATE_FIELDS
+from nrlf.core.constants import (
+    CATEGORY_ATTRIBUTES,
+    REQUIRED_CREATE_FIELDS,
+    TYPE_CATEGORIES,
+)
 from nrlf.core.errors import ParseError
 from nrlf.core.logger import LogReference, logger
-from nrlf.core.types import DocumentReference, OperationOutcomeIssue, RequestQueryType
+from nrlf.core.types import (
+    DocumentReference,
+    OperationOutcomeIssue,
+    RequestQueryCategory,
+    RequestQueryType,
+)
 from nrlf.producer.fhir.r4 import model as producer_model
 
 
@@ -29,6 +38,32 @@ def validate_type_system(
     return type_system in pointer_type_systems
 
 
+def validate_category(category_: Optional[RequestQueryCategory]) -> bool:
+    """
+    Validates if the given category is one of the supported categories.
+    """
+    if not category_:
+        return True
+
+    return category_.root in CATEGORY_ATTRIBUTES
+
+
+def filter_pointer_types_by_category(
+    pointer_types: List[str], category_: Optional[RequestQueryCategory]
+) -> List[str]:
+    """
+    Filters the list of pointer types to those within the given category.
+    """
+    if not category_:
+        return pointer_types
+
+    return [
+        pointer_type
+        for pointer_type in pointer_types
+        if TYPE_CATEGORIES.get(pointer_type) == category_.root
+    ]
+
+
 @dataclass
 class ValidationResult:
     resource: DocumentReference
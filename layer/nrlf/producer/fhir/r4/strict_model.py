@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+from enum import Enum
 from typing import Annotated, List, Literal, Optional
 
 from pydantic import (
@@ -342,10 +343,55 @@ class RequestQueryType(RootModel[StrictStr]):
     root: Annotated[StrictStr, Field(examples=["http://snomed.info/sct|736253002"])]
 
 
+class RequestQueryCategory(RootModel[StrictStr]):
+    root: Annotated[StrictStr, Field(examples=["http://snomed.info/sct|734163000"])]
+
+
+class RequestQueryIdentifier(RootModel[StrictStr]):
+    root: StrictStr
+
+
 class NextPageToken(RootModel[StrictStr]):
     root: StrictStr
 
 
+class RequestQueryCount(RootModel[StrictInt]):
+    root: Annotated[StrictInt, Field(ge=1, le=100)]
+
+
+class RequestQueryDate(RootModel[StrictStr]):
+    root: Annotated[
+        StrictStr,
+        Field(
+            examples=["ge2024-01-01"],
+            pattern="^(eq|ge|gt|le|lt)?\\d{4}-\\d{2}-\\d{2}(T\\d{2}:\\d{2}:\\d{2}(\\.\\d{1,6})?(Z|[+-]\\d{2}:\\d{2}))?$",
+        ),
+    ]
+
+
+class RequestQuerySort(Enum):
+    field_date = "-date"
+
+
+class RequestQueryDateTime(RootModel[StrictStr]):
+    root: Annotated[
+        StrictStr,
+        Field(
+            examples=["2024-01-31T09:00:00Z"],
+            pattern="^\\d{4}-\\d{2}-\\d{2}(T\\d{2}:\\d{2}:\\d{2}(\\.\\d{1,6})?(Z|[+-]\\d{2}:\\d{2}))?$",
+        ),
+    ]
+
+
+class RequestQueryFormat(Enum):
+    json = "json"
+    ndjson = "ndjson"
+
+
+class RequestQueryListCount(RootModel[StrictInt]):
+    root: Annotated[StrictInt, Field(ge=1, le=1000)]
+
+
 class RequestHeaderOdsCode(RootModel[StrictStr]):
     root: StrictStr
 
@@ -371,9 +417,47 @@ class RequestParams(BaseModel):
         Optional[RequestQuerySubject], Field(alias="subject:identifier")
     ] = None
     type: Optional[RequestQueryType] = None
+    category: Optional[RequestQueryCategory] = None
+    identifier: Optional[RequestQueryIdentifier] = None
+    date: Optional[List[RequestQueryDate]] = None
+    sort: Annotated[Optional[RequestQuerySort], Field(alias="_sort")] = None
+    next_page_token: Annotated[
+        Optional[NextPageToken], Field(alias="next-page-token")
+    ] = None
+    count: Annotated[Optional[RequestQueryCount], Field(alias="_count")] = None
+
+
+class DeleteRequestParams(BaseModel):
+    subject_identifier: Annotated[
+        Optional[RequestQuerySubject], Field(alias="subject:identifier")
+    ] = None
+    type: Optional[RequestQueryType] = None
+    category: Optional[RequestQueryCategory] = None
+    next_page_token: Annotated[
+        Optional[NextPageToken], Field(alias="next-page-token")
+    ] = None
+
+
+class ListRequestParams(BaseModel):
+    type: Optional[RequestQueryType] = None
+    category: Optional[RequestQueryCategory] = None
+    created_from: Annotated[
+        Optional[RequestQueryDateTime], Field(alias="created-from")
+    ] = None
+    created_to: Annotated[Optional[RequestQueryDateTime], Field(alias="created-to")] = (
+        None
+    )
+    updated_from: Annotated[
+        Optional[RequestQueryDateTime], Field(alias="updated-from")
+    ] = None
+    updated_to: Annotated[Optional[RequestQueryDateTime], Field(alias="updated-to")] = (
+        None
+    )
+    format: Annotated[Optional[RequestQueryFormat], Field(alias="_format")] = None
     next_page_token: Annotated[
         Optional[NextPageToken], Field(alias="next-page-token")
     ] = None
+    count: Annotated[Optional[RequestQueryListCount], Field(alias="_count")] = None
 
 
 class OperationOutcome(BaseModel):
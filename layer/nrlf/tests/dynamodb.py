@@ -17,6 +17,9 @@ def create_document_pointer_table(config: Config, dynamodb: DynamoDBServiceResou
             {"AttributeName": "patient_key", "AttributeType": "S"},
             {"AttributeName": "patient_sort", "AttributeType": "S"},
             {"AttributeName": "masterid_key", "AttributeType": "S"},
+            {"AttributeName": "custodian_key", "AttributeType": "S"},
+            {"AttributeName": "producer_key", "AttributeType": "S"},
+            {"AttributeName": "producer_sort", "AttributeType": "S"},
         ],
         ProvisionedThroughput={"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
         GlobalSecondaryIndexes=[
@@ -35,6 +38,36 @@ def create_document_pointer_table(config: Config, dynamodb: DynamoDBServiceResou
                 ],
                 "Projection": {"ProjectionType": "ALL"},
             },
+            {
+                "IndexName": "custodian_gsi",
+                "KeySchema": [
+                    {"AttributeName": "custodian_key", "KeyType": "HASH"},
+                    {"AttributeName": "patient_sort", "KeyType": "RANGE"},
+                ],
+                "Projection": {
+                    "ProjectionType": "INCLUDE",
+                    "NonKeyAttributes": [
+                        "id",
+                        "nhs_number",
+                        "category_id",
+                        "type_id",
+                        "created_on",
+                        "custodian_suffix",
+                        "type",
+                    ],
+                },
+            },
+            {
+                "IndexName": "producer_gsi",
+                "KeySchema": [
+                    {"AttributeName": "producer_key", "KeyType": "HASH"},
+                    {"AttributeName": "producer_sort", "KeyType": "RANGE"},
+                ],
+                "Projection": {
+                    "ProjectionType": "INCLUDE",
+                    "NonKeyAttributes": ["id", "created_on", "type", "updated_on"],
+                },
+            },
         ],
     )
 
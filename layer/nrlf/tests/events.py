@@ -46,7 +46,15 @@ def create_test_api_gateway_event(
     query_string_parameters: Optional[Dict[str, str]] = None,
     path_parameters: Optional[Dict[str, str]] = None,
     body: Optional[str] = None,
+    multi_value_query_string_parameters: Optional[Dict[str, List[str]]] = None,
 ):
+    if multi_value_query_string_parameters and not query_string_parameters:
+        # API Gateway sets queryStringParameters to the last value of each
+        query_string_parameters = {
+            key: values[-1]
+            for key, values in multi_value_query_string_parameters.items()
+        }
+
     return {
         "resource": "/",
         "path": "/",
@@ -59,7 +67,7 @@ def create_test_api_gateway_event(
         "headers": headers or create_headers(),
         "multiValueHeaders": {},
         "queryStringParameters": query_string_parameters or {},
-        "multiValueQueryStringParameters": None,
+        "multiValueQueryStringParameters": multi_value_query_string_parameters,
         "pathParameters": path_parameters,
         "stageVariables": None,
         "body": body,
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+import aws_session_assume
+import fire
+from botocore.exceptions import ClientError
+
+from nrlf.core.dynamodb.model import (
+    get_custodian_key,
+    get_producer_key,
+    get_producer_shard,
+    get_producer_sort,
+)
+
+
+def backfill_index_keys(
+    table_name: str,
+    session: any,
+    segment: int = 0,
+    total_segments: int = 1,
+) -> dict[str, int]:
+    """
+    Set the custodian_gsi and producer_gsi keys of every pointer written
+    before those indexes existed, so the pointer can be found by producer
+    searches and listings
+
+    Pointers deleted since they were read are skipped. Large tables can be
+    split into total_segments parallel scans, each run with a different segment.
+    """
+    client = session.client("dynamodb")
+    paginator = client.get_paginator("scan")
+
+    counts = {"scanned": 0, "backfilled": 0, "skipped": 0}
+    print(
+        f"Backfilling index keys in {table_name} "
+        f"(segment {segment + 1} of {total_segments})...."
+    )
+    for page in paginator.paginate(
+        TableName=table_name,
+        FilterExpression="begins_with(pk, :pointer_prefix) AND (attribute_not_exists(custodian_key) OR attribute_not_exists(producer_key))",
+        ProjectionExpression="pk, sk, id, custodian, custodian_suffix, nhs_number, created_on",
+        ExpressionAttributeValues={":pointer_prefix": {"S": "D#"}},
+        Segment=segment,
+        TotalSegments=total_segments,
+    ):
+        for item in page["Items"]:
+            counts["scanned"] += 1
+            # Older pointers may hold the ODS code suffix in the custodian
+            custodian, _, custodian_suffix = item["custodian"]["S"].partition(".")
+            custodian_suffix = (
+                item.get("custodian_suffix", {}).get("S") or custodian_suffix or None
+            )
+            pointer_id = item["id"]["S"]
+            index_keys = {
+                ":custodian_key": get_custodian_key(custodian, item["nhs_number"]["S"]),
+                ":producer_key": get_producer_key(
+                    custodian, custodian_suffix, get_producer_shard(pointer_id)
+                ),
+                ":producer_sort": get_producer_sort(
+                    item["created_on"]["S"], pointer_id
+                ),
+            }
+            try:
+                client.update_item(
+                    TableName=table_name,
+                    Key={"pk": item["pk"], "sk": item["sk"]},
+                    UpdateExpression="SET custodian_key = :custodian_key, producer_key = :producer_key, producer_sort = :producer_sort",
+                    ConditionExpression="attribute_exists(pk)",
+                    ExpressionAttributeValues={
+                        name: {"S": value} for name, value in index_keys.items()
+                    },
+                )
+                counts["backfilled"] += 1
+            except ClientError as exc:
+                if exc.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+                counts["skipped"] += 1
+
+    print(
+        f"Complete. Scanned {counts['scanned']} pointers, backfilled "
+        f"{counts['backfilled']} and skipped {counts['skipped']} deleted since read"
+    )
+    return counts
+
+
+def main(table_name: str, env: str, segment: int = 0, total_segments: int = 1):
+    boto_session = aws_session_assume.get_boto_session(env)
+    backfill_index_keys(
+        table_name,
+        session=boto_session,
+        segment=segment,
+        total_segments=total_segments,
+    )
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
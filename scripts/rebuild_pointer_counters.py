@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+import aws_session_assume
+import fire
+
+from nrlf.core.dynamodb.model import DBPrefix
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+
+
+def _get_nhs_numbers(table_name: str, client: any) -> list[str]:
+    """
+    Find every patient with pointers or with a pointer counter item, so the
+    counters of patients whose pointers have all been deleted are also rebuilt
+    """
+    paginator = client.get_paginator("scan")
+
+    nhs_numbers = set()
+    for page in paginator.paginate(
+        TableName=table_name,
+        ExpressionAttributeNames={"#patient_key": "patient_key"},
+        ProjectionExpression="pk, sk, #patient_key",
+    ):
+        for item in page["Items"]:
+            if item["sk"]["S"] == DBPrefix.Counter.value:
+                patient_key = item["pk"]["S"]
+            elif "patient_key" in item:
+                patient_key = item["patient_key"]["S"]
+            else:
+                continue
+
+            nhs_numbers.add(patient_key.removeprefix(f"{DBPrefix.Patient.value}#"))
+
+    return sorted(nhs_numbers)
+
+
+def rebuild_pointer_counters(
+    table_name: str, session: any, nhs_numbers: tuple[str, ...] = ()
+) -> dict[str, dict[str, int]]:
+    """
+    Rebuild the pointer counter item of each of the provided patients, or of
+    every patient with pointers or a counter item when none are provided, from
+    their pointers
+
+    Counters changed by a write while being rebuilt are recounted, so the
+    script can be run against a table that is in use. Roll counters out by
+    deploying with POINTER_COUNTS_ENABLED false, so every write maintains the
+    counters, then running this script, and only then enabling the counts.
+    """
+    client = session.client("dynamodb")
+    repository = DocumentPointerRepository(table_name=table_name, client=client)
+
+    if not nhs_numbers:
+        print(f"Finding patients with pointers or counters in {table_name}....")
+        nhs_numbers = _get_nhs_numbers(table_name, client)
+
+    print(f"Rebuilding pointer counters for {len(nhs_numbers)} patients....")
+    pointer_counts = {
+        nhs_number: repository.rebuild_pointer_counts(nhs_number)
+        for nhs_number in nhs_numbers
+    }
+
+    print(f"Complete. Rebuilt {len(pointer_counts)} pointer counters")
+    return pointer_counts
+
+
+def main(table_name: str, env: str, *nhs_numbers: str):
+    boto_session = aws_session_assume.get_boto_session(env)
+    rebuild_pointer_counters(
+        table_name,
+        session=boto_session,
+        nhs_numbers=tuple(str(nhs_number) for nhs_number in nhs_numbers),
+    )
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
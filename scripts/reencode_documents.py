@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+from typing import Literal
+
+import aws_session_assume
+import fire
+from botocore.exceptions import ClientError
+
+from nrlf.core.dynamodb.codec import (
+    decode_document,
+    encode_document,
+    get_document_encoding,
+)
+
+
+def _to_attribute_value(document: str | bytes) -> dict:
+    return {"S": document} if isinstance(document, str) else {"B": document}
+
+
+def reencode_documents(
+    table_name: str,
+    session: any,
+    encoding: Literal["json", "zlib"] = "zlib",
+    segment: int = 0,
+    total_segments: int = 1,
+) -> dict[str, int]:
+    """
+    Rewrite the document of every pointer not already stored in the encoding
+
+    Each document is only replaced if it has not changed since it was read, so
+    this can run alongside live traffic. Large tables can be split into
+    total_segments parallel scans, each run with a different segment.
+    """
+    client = session.client("dynamodb")
+    paginator = client.get_paginator("scan")
+
+    counts = {"scanned": 0, "reencoded": 0, "skipped": 0}
+    print(
+        f"Re-encoding documents in {table_name} as {encoding} "
+        f"(segment {segment + 1} of {total_segments})...."
+    )
+    for page in paginator.paginate(
+        TableName=table_name,
+        FilterExpression="begins_with(pk, :pointer_prefix) AND attribute_exists(#document)",
+        ProjectionExpression="pk, sk, #document",
+        ExpressionAttributeNames={"#document": "document"},
+        ExpressionAttributeValues={":pointer_prefix": {"S": "D#"}},
+        Segment=segment,
+        TotalSegments=total_segments,
+    ):
+        for item in page["Items"]:
+            counts["scanned"] += 1
+            current = item["document"]
+            stored_document = current.get("S", current.get("B"))
+            if get_document_encoding(stored_document) == encoding:
+                continue
+
+            document = encode_document(decode_document(stored_document), encoding)
+            try:
+                client.update_item(
+                    TableName=table_name,
+                    Key={"pk": item["pk"], "sk": item["sk"]},
+                    UpdateExpression="SET #document = :document",
+                    ConditionExpression="#document = :current",
+                    ExpressionAttributeNames={"#document": "document"},
+                    ExpressionAttributeValues={
+                        ":document": _to_attribute_value(document),
+                        ":current": current,
+                    },
+                )
+                counts["reencoded"] += 1
+            except ClientError as exc:
+                if exc.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+                # Changed since it was read, so it was written by the API
+                counts["skipped"] += 1
+
+    print(
+        f"Complete. Scanned {counts['scanned']} pointers, re-encoded "
+        f"{counts['reencoded']} and skipped {counts['skipped']} changed since read"
+    )
+    return counts
+
+
+def main(
+    table_name: str,
+    env: str,
+    encoding: Literal["json", "zlib"] = "zlib",
+    segment: int = 0,
+    total_segments: int = 1,
+):
+    boto_session = aws_session_assume.get_boto_session(env)
+    reencode_documents(
+        table_name,
+        session=boto_session,
+        encoding=encoding,
+        segment=segment,
+        total_segments=total_segments,
+    )
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
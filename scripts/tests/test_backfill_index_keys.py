@@ -0,0 +1,72 @@
+import boto3
+from moto import mock_aws
+
+from nrlf.core.config import Config
+from nrlf.core.constants import PointerTypes
+from nrlf.core.dynamodb.attribute_values import serialize_item
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+from nrlf.tests.data import load_document_reference
+from nrlf.tests.dynamodb import create_document_pointer_table
+from scripts.backfill_index_keys import backfill_index_keys
+
+
+def _create_pointers_without_index_keys(
+    repository: DocumentPointerRepository,
+) -> list[DocumentPointer]:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    pointers = []
+    for idx in range(3):
+        doc_ref.id = f"Y05868-backfill-{idx}"
+        pointer = repository.create(DocumentPointer.from_document_reference(doc_ref))
+        repository.client.update_item(
+            TableName=repository.table_name,
+            Key=serialize_item({"pk": pointer.pk, "sk": pointer.sk}),
+            UpdateExpression="REMOVE custodian_key, producer_key, producer_sort",
+        )
+        pointers.append(pointer)
+
+    return pointers
+
+
+def _search_ids(repository: DocumentPointerRepository, nhs_number: str) -> list[str]:
+    return [
+        pointer.id
+        for pointer in repository.search(nhs_number=nhs_number, custodian="Y05868")
+    ]
+
+
+def _list_ids(repository: DocumentPointerRepository) -> list[str]:
+    return [
+        pointer.id
+        for pointer in repository.list_by_custodian(
+            ods_code_parts=("Y05868",),
+            pointer_types=[PointerTypes.MENTAL_HEALTH_PLAN.value],
+        )
+    ]
+
+
+@mock_aws
+def test_backfill_index_keys():
+    session = boto3.Session(region_name="eu-west-2")
+    config = Config()
+    create_document_pointer_table(config, session.resource("dynamodb"))
+    repository = DocumentPointerRepository(
+        table_name=config.TABLE_NAME,
+        custodian_index_enabled=True,
+        producer_index_enabled=True,
+    )
+    pointers = _create_pointers_without_index_keys(repository)
+    nhs_number = pointers[0].nhs_number
+
+    assert _search_ids(repository, nhs_number) == []
+    assert _list_ids(repository) == []
+
+    counts = backfill_index_keys(config.TABLE_NAME, session)
+
+    assert counts == {"scanned": 3, "backfilled": 3, "skipped": 0}
+    assert _search_ids(repository, nhs_number) == [pointer.id for pointer in pointers]
+    assert sorted(_list_ids(repository)) == [pointer.id for pointer in pointers]
+
+    counts = backfill_index_keys(config.TABLE_NAME, session)
+    assert counts == {"scanned": 0, "backfilled": 0, "skipped": 0}
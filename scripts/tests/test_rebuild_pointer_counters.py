@@ -0,0 +1,97 @@
+import boto3
+from moto import mock_aws
+
+from nrlf.core.config import Config
+from nrlf.core.constants import PointerTypes
+from nrlf.core.dynamodb.attribute_values import serialize_item
+from nrlf.core.dynamodb.model import DocumentPointer, get_patient_counter_key
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+from nrlf.tests.data import load_document_reference
+from nrlf.tests.dynamodb import create_document_pointer_table
+from scripts.rebuild_pointer_counters import rebuild_pointer_counters
+
+
+def _create_pointers(
+    repository: DocumentPointerRepository, nhs_number: str, count: int
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.subject.identifier.value = nhs_number
+    for idx in range(count):
+        doc_ref.id = f"Y05868-{nhs_number}-{idx}"
+        repository.create(DocumentPointer.from_document_reference(doc_ref))
+
+    # Drift the counter from the pointers it counts
+    repository.client.put_item(
+        TableName=repository.table_name,
+        Item=serialize_item(
+            {
+                **get_patient_counter_key(nhs_number),
+                PointerTypes.MENTAL_HEALTH_PLAN.value: count + 5,
+            }
+        ),
+    )
+
+
+@mock_aws
+def test_rebuild_pointer_counters():
+    session = boto3.Session(region_name="eu-west-2")
+    config = Config()
+    create_document_pointer_table(config, session.resource("dynamodb"))
+    repository = DocumentPointerRepository(table_name=config.TABLE_NAME)
+    _create_pointers(repository, "6700028191", 2)
+    _create_pointers(repository, "9278693472", 1)
+
+    counts = rebuild_pointer_counters(config.TABLE_NAME, session)
+
+    assert counts == {
+        "6700028191": {PointerTypes.MENTAL_HEALTH_PLAN.value: 2},
+        "9278693472": {PointerTypes.MENTAL_HEALTH_PLAN.value: 1},
+    }
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 2
+    }
+    assert repository.get_pointer_counts("9278693472") == {
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 1
+    }
+
+
+@mock_aws
+def test_rebuild_pointer_counters_for_patients():
+    session = boto3.Session(region_name="eu-west-2")
+    config = Config()
+    create_document_pointer_table(config, session.resource("dynamodb"))
+    repository = DocumentPointerRepository(table_name=config.TABLE_NAME)
+    _create_pointers(repository, "6700028191", 2)
+    _create_pointers(repository, "9278693472", 1)
+
+    counts = rebuild_pointer_counters(
+        config.TABLE_NAME, session, nhs_numbers=("9278693472", "3495456481")
+    )
+
+    assert counts == {
+        "9278693472": {PointerTypes.MENTAL_HEALTH_PLAN.value: 1},
+        "3495456481": {},
+    }
+    assert repository.get_pointer_counts("6700028191") == {
+        PointerTypes.MENTAL_HEALTH_PLAN.value: 7
+    }
+    assert repository.get_pointer_counts("3495456481") == {}
+
+
+@mock_aws
+def test_rebuild_pointer_counters_repairs_counters_without_pointers():
+    session = boto3.Session(region_name="eu-west-2")
+    config = Config()
+    create_document_pointer_table(config, session.resource("dynamodb"))
+    repository = DocumentPointerRepository(table_name=config.TABLE_NAME)
+    _create_pointers(repository, "6700028191", 1)
+    _create_pointers(repository, "9278693472", 1)
+    repository.delete_by_id("Y05868-9278693472-0")
+
+    counts = rebuild_pointer_counters(config.TABLE_NAME, session)
+
+    assert counts == {
+        "6700028191": {PointerTypes.MENTAL_HEALTH_PLAN.value: 1},
+        "9278693472": {},
+    }
+    assert repository.get_pointer_counts("9278693472") == {}
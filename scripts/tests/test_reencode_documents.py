@@ -0,0 +1,54 @@
+import boto3
+from moto import mock_aws
+
+from nrlf.core.config import Config
+from nrlf.core.dynamodb.attribute_values import deserialize_item, serialize_item
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+from nrlf.tests.data import load_document_reference
+from nrlf.tests.dynamodb import create_document_pointer_table
+from scripts.reencode_documents import reencode_documents
+
+
+def _create_pointers(repository: DocumentPointerRepository) -> list[DocumentPointer]:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    pointers = []
+    for idx in range(3):
+        doc_ref.id = f"Y05868-reencode-{idx}"
+        pointers.append(
+            repository.create(DocumentPointer.from_document_reference(doc_ref))
+        )
+
+    return pointers
+
+
+def _get_stored_document(repository: DocumentPointerRepository, pointer_id: str):
+    key = f"D#{pointer_id}"
+    result = repository.client.get_item(
+        TableName=repository.table_name, Key=serialize_item({"pk": key, "sk": key})
+    )
+    return deserialize_item(result["Item"])["document"]
+
+
+@mock_aws
+def test_reencode_documents():
+    session = boto3.Session(region_name="eu-west-2")
+    config = Config()
+    create_document_pointer_table(config, session.resource("dynamodb"))
+    repository = DocumentPointerRepository(table_name=config.TABLE_NAME)
+    pointers = _create_pointers(repository)
+
+    counts = reencode_documents(config.TABLE_NAME, session, encoding="zlib")
+
+    assert counts == {"scanned": 3, "reencoded": 3, "skipped": 0}
+    for pointer in pointers:
+        assert not isinstance(_get_stored_document(repository, pointer.id), str)
+        assert repository.get_by_id(pointer.id).document == pointer.document
+
+    counts = reencode_documents(config.TABLE_NAME, session, encoding="zlib")
+    assert counts == {"scanned": 3, "reencoded": 0, "skipped": 0}
+
+    counts = reencode_documents(config.TABLE_NAME, session, encoding="json")
+    assert counts == {"scanned": 3, "reencoded": 3, "skipped": 0}
+    for pointer in pointers:
+        assert _get_stored_document(repository, pointer.id) == pointer.document
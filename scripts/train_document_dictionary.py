@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+import pathlib
+import re
+from collections import Counter
+
+import fire
+
+from nrlf.core.dynamodb.codec import MAX_DICTIONARY_BYTES
+from nrlf.producer.fhir.r4.model import DocumentReference
+
+SAMPLES_PATH = "tests/data/DocumentReference"
+
+# An object key with the structure that opens its value, or a string value
+# with the structure that closes it
+FRAGMENT_PATTERN = re.compile(r'[{,]?"[^"]*":[\[{]*|"[^"]*"[\]}]*')
+
+
+def _load_samples(samples_path: str) -> list[str]:
+    """
+    Load the sample DocumentReferences in the form they are stored in
+    """
+    return [
+        DocumentReference.model_validate_json(path.read_text()).model_dump_json(
+            exclude_none=True
+        )
+        for path in sorted(pathlib.Path(samples_path).glob("*.json"))
+    ]
+
+
+def train_dictionary(samples: list[str], max_size: int = MAX_DICTIONARY_BYTES) -> bytes:
+    """
+    Build a preset dictionary from the JSON fragments shared by the samples
+
+    zlib finds matches nearest the end of the dictionary most cheaply, so the
+    fragments are ordered from least to most common and followed by the sample
+    sharing the most fragments with the others.
+    """
+    sample_fragments = [set(FRAGMENT_PATTERN.findall(sample)) for sample in samples]
+    fragment_counts = Counter(
+        fragment for fragments in sample_fragments for fragment in fragments
+    )
+
+    min_count = 2 if len(samples) > 1 else 1
+    shared_fragments = sorted(
+        (fragment for fragment, count in fragment_counts.items() if count >= min_count),
+        key=lambda fragment: (fragment_counts[fragment], len(fragment), fragment),
+    )
+
+    representative = max(
+        range(len(samples)),
+        key=lambda idx: sum(
+            fragment_counts[fragment] for fragment in sample_fragments[idx]
+        ),
+    )
+
+    dictionary = ("".join(shared_fragments) + samples[representative]).encode()
+    return dictionary[-max_size:]
+
+
+def main(out: str, samples_path: str = SAMPLES_PATH):
+    samples = _load_samples(samples_path)
+    dictionary = train_dictionary(samples)
+
+    pathlib.Path(out).write_bytes(dictionary)
+    print(f"Trained {len(dictionary)} byte dictionary from {len(samples)} samples")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
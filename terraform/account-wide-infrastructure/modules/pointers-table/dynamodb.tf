@@ -30,6 +30,21 @@ resource "aws_dynamodb_table" "pointers" {
     type = "S"
   }
 
+  attribute {
+    name = "custodian_key"
+    type = "S"
+  }
+
+  attribute {
+    name = "producer_key"
+    type = "S"
+  }
+
+  attribute {
+    name = "producer_sort"
+    type = "S"
+  }
+
   global_secondary_index {
     name            = "patient_gsi"
     hash_key        = "patient_key"
@@ -43,6 +58,28 @@ resource "aws_dynamodb_table" "pointers" {
     projection_type = "ALL"
   }
 
+  # Documents are read from the table rather than copied into this index.
+  # Keep non_key_attributes in step with CUSTODIAN_INDEX_FIELDS in
+  # nrlf.core.dynamodb.repository
+  global_secondary_index {
+    name               = "custodian_gsi"
+    hash_key           = "custodian_key"
+    range_key          = "patient_sort"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["id", "nhs_number", "category_id", "type_id", "created_on", "custodian_suffix", "type"]
+  }
+
+  # Documents are read from the table rather than copied into this index.
+  # Keep non_key_attributes in step with PRODUCER_INDEX_FIELDS in
+  # nrlf.core.dynamodb.repository
+  global_secondary_index {
+    name               = "producer_gsi"
+    hash_key           = "producer_key"
+    range_key          = "producer_sort"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["id", "created_on", "type", "updated_on"]
+  }
+
   server_side_encryption {
     enabled     = true
     kms_key_arn = aws_kms_key.pointers-table-key.arn
@@ -1,3 +1,8 @@
+resource "random_password" "page_token_key" {
+  length  = 64
+  special = false
+}
+
 module "consumer__readDocumentReference" {
   source                 = "./modules/lambda"
   parent_path            = "api/consumer"
@@ -8,12 +13,13 @@ module "consumer__readDocumentReference" {
   api_gateway_source_arn = ["arn:aws:execute-api:${local.region}:${local.aws_account_id}:${module.consumer__gateway.api_gateway_id}/*/GET/DocumentReference/{id}"]
   kms_key_id             = module.kms__cloudwatch.kms_arn
   environment_variables = {
-    PREFIX               = "${local.prefix}--"
-    ENVIRONMENT          = local.environment
-    POWERTOOLS_LOG_LEVEL = local.log_level
-    SPLUNK_INDEX         = module.firehose__processor.splunk.index
-    AUTH_STORE           = local.auth_store_id
-    TABLE_NAME           = local.pointers_table_name
+    PREFIX                  = "${local.prefix}--"
+    ENVIRONMENT             = local.environment
+    POWERTOOLS_LOG_LEVEL    = local.log_level
+    SPLUNK_INDEX            = module.firehose__processor.splunk.index
+    AUTH_STORE              = local.auth_store_id
+    TABLE_NAME              = local.pointers_table_name
+    POINTER_CACHE_MAX_BYTES = var.pointer_cache_max_bytes
   }
   additional_policies = [
     local.pointers_table_read_policy_arn,
@@ -37,12 +43,13 @@ module "consumer__countDocumentReference" {
   api_gateway_source_arn = ["arn:aws:execute-api:${local.region}:${local.aws_account_id}:${module.consumer__gateway.api_gateway_id}/*/GET/DocumentReference/_count"]
   kms_key_id             = module.kms__cloudwatch.kms_arn
   environment_variables = {
-    PREFIX               = "${local.prefix}--"
-    ENVIRONMENT          = local.environment
-    AUTH_STORE           = local.auth_store_id
-    POWERTOOLS_LOG_LEVEL = local.log_level
-    SPLUNK_INDEX         = module.firehose__processor.splunk.index
-    TABLE_NAME           = local.pointers_table_name
+    PREFIX                 = "${local.prefix}--"
+    ENVIRONMENT            = local.environment
+    AUTH_STORE             = local.auth_store_id
+    POWERTOOLS_LOG_LEVEL   = local.log_level
+    SPLUNK_INDEX           = module.firehose__processor.splunk.index
+    TABLE_NAME             = local.pointers_table_name
+    POINTER_COUNTS_ENABLED = var.pointer_counts_enabled
   }
   additional_policies = [
     local.pointers_table_read_policy_arn,
@@ -72,6 +79,7 @@ module "consumer__searchDocumentReference" {
     POWERTOOLS_LOG_LEVEL = local.log_level
     SPLUNK_INDEX         = module.firehose__processor.splunk.index
     TABLE_NAME           = local.pointers_table_name
+    PAGE_TOKEN_KEY       = random_password.page_token_key.result
   }
   additional_policies = [
     local.pointers_table_read_policy_arn,
@@ -101,6 +109,7 @@ module "consumer__searchPostDocumentReference" {
     POWERTOOLS_LOG_LEVEL = local.log_level
     SPLUNK_INDEX         = module.firehose__processor.splunk.index
     TABLE_NAME           = local.pointers_table_name
+    PAGE_TOKEN_KEY       = random_password.page_token_key.result
   }
   additional_policies = [
     local.pointers_table_read_policy_arn,
@@ -130,6 +139,7 @@ module "producer__createDocumentReference" {
     SPLUNK_INDEX         = module.firehose__processor.splunk.index
     POWERTOOLS_LOG_LEVEL = local.log_level
     TABLE_NAME           = local.pointers_table_name
+    DOCUMENT_ENCODING    = var.document_encoding
   }
   additional_policies = [
     local.pointers_table_write_policy_arn,
@@ -144,6 +154,37 @@ module "producer__createDocumentReference" {
   retention = var.log_retention_period
 }
 
+module "producer__processTransaction" {
+  source                 = "./modules/lambda"
+  parent_path            = "api/producer"
+  name                   = "processTransaction"
+  region                 = local.region
+  prefix                 = local.prefix
+  layers                 = [module.nrlf.layer_arn, module.third_party.layer_arn, module.nrlf_permissions.layer_arn]
+  api_gateway_source_arn = ["arn:aws:execute-api:${local.region}:${local.aws_account_id}:${module.producer__gateway.api_gateway_id}/*/POST/"]
+  kms_key_id             = module.kms__cloudwatch.kms_arn
+  environment_variables = {
+    PREFIX               = "${local.prefix}--"
+    ENVIRONMENT          = local.environment
+    AUTH_STORE           = local.auth_store_id
+    SPLUNK_INDEX         = module.firehose__processor.splunk.index
+    POWERTOOLS_LOG_LEVEL = local.log_level
+    TABLE_NAME           = local.pointers_table_name
+    DOCUMENT_ENCODING    = var.document_encoding
+  }
+  additional_policies = [
+    local.pointers_table_write_policy_arn,
+    local.pointers_table_read_policy_arn,
+    local.pointers_kms_read_write_arn,
+    local.auth_store_read_policy_arn
+  ]
+  firehose_subscriptions = [
+    module.firehose__processor.firehose_subscription
+  ]
+  handler   = "process_transaction.handler"
+  retention = var.log_retention_period
+}
+
 module "producer__deleteDocumentReference" {
   source                 = "./modules/lambda"
   parent_path            = "api/producer"
@@ -174,6 +215,37 @@ module "producer__deleteDocumentReference" {
   retention = var.log_retention_period
 }
 
+module "producer__bulkDeleteDocumentReference" {
+  source                 = "./modules/lambda"
+  parent_path            = "api/producer"
+  name                   = "bulkDeleteDocumentReference"
+  region                 = local.region
+  prefix                 = local.prefix
+  layers                 = [module.nrlf.layer_arn, module.third_party.layer_arn, module.nrlf_permissions.layer_arn]
+  api_gateway_source_arn = ["arn:aws:execute-api:${local.region}:${local.aws_account_id}:${module.producer__gateway.api_gateway_id}/*/DELETE/DocumentReference"]
+  kms_key_id             = module.kms__cloudwatch.kms_arn
+  environment_variables = {
+    PREFIX               = "${local.prefix}--"
+    ENVIRONMENT          = local.environment
+    AUTH_STORE           = local.auth_store_id
+    POWERTOOLS_LOG_LEVEL = local.log_level
+    SPLUNK_INDEX         = module.firehose__processor.splunk.index
+    TABLE_NAME           = local.pointers_table_name
+    PAGE_TOKEN_KEY       = random_password.page_token_key.result
+  }
+  additional_policies = [
+    local.pointers_table_write_policy_arn,
+    local.pointers_table_read_policy_arn,
+    local.pointers_kms_read_write_arn,
+    local.auth_store_read_policy_arn
+  ]
+  firehose_subscriptions = [
+    module.firehose__processor.firehose_subscription
+  ]
+  handler   = "bulk_delete_document_reference.handler"
+  retention = var.log_retention_period
+}
+
 module "producer__readDocumentReference" {
   source                 = "./modules/lambda"
   parent_path            = "api/producer"
@@ -213,12 +285,14 @@ module "producer__searchDocumentReference" {
   api_gateway_source_arn = ["arn:aws:execute-api:${local.region}:${local.aws_account_id}:${module.producer__gateway.api_gateway_id}/*/GET/DocumentReference"]
   kms_key_id             = module.kms__cloudwatch.kms_arn
   environment_variables = {
-    PREFIX               = "${local.prefix}--"
-    ENVIRONMENT          = local.environment
-    AUTH_STORE           = local.auth_store_id
-    POWERTOOLS_LOG_LEVEL = local.log_level
-    SPLUNK_INDEX         = module.firehose__processor.splunk.index
-    TABLE_NAME           = local.pointers_table_name
+    PREFIX                  = "${local.prefix}--"
+    ENVIRONMENT             = local.environment
+    AUTH_STORE              = local.auth_store_id
+    POWERTOOLS_LOG_LEVEL    = local.log_level
+    SPLUNK_INDEX            = module.firehose__processor.splunk.index
+    TABLE_NAME              = local.pointers_table_name
+    PAGE_TOKEN_KEY          = random_password.page_token_key.result
+    CUSTODIAN_INDEX_ENABLED = var.custodian_index_enabled
   }
   additional_policies = [
     local.pointers_table_read_policy_arn,
@@ -232,6 +306,37 @@ module "producer__searchDocumentReference" {
   retention = var.log_retention_period
 }
 
+module "producer__listDocumentReference" {
+  source                 = "./modules/lambda"
+  parent_path            = "api/producer"
+  name                   = "listDocumentReference"
+  region                 = local.region
+  prefix                 = local.prefix
+  layers                 = [module.nrlf.layer_arn, module.third_party.layer_arn, module.nrlf_permissions.layer_arn]
+  api_gateway_source_arn = ["arn:aws:execute-api:${local.region}:${local.aws_account_id}:${module.producer__gateway.api_gateway_id}/*/GET/DocumentReference/_list"]
+  kms_key_id             = module.kms__cloudwatch.kms_arn
+  environment_variables = {
+    PREFIX                 = "${local.prefix}--"
+    ENVIRONMENT            = local.environment
+    AUTH_STORE             = local.auth_store_id
+    POWERTOOLS_LOG_LEVEL   = local.log_level
+    SPLUNK_INDEX           = module.firehose__processor.splunk.index
+    TABLE_NAME             = local.pointers_table_name
+    PAGE_TOKEN_KEY         = random_password.page_token_key.result
+    PRODUCER_INDEX_ENABLED = var.producer_index_enabled
+  }
+  additional_policies = [
+    local.pointers_table_read_policy_arn,
+    local.pointers_kms_read_write_arn,
+    local.auth_store_read_policy_arn
+  ]
+  firehose_subscriptions = [
+    module.firehose__processor.firehose_subscription
+  ]
+  handler   = "list_document_reference.handler"
+  retention = var.log_retention_period
+}
+
 module "producer__searchPostDocumentReference" {
   source                 = "./modules/lambda"
   parent_path            = "api/producer"
@@ -242,12 +347,14 @@ module "producer__searchPostDocumentReference" {
   api_gateway_source_arn = ["arn:aws:execute-api:${local.region}:${local.aws_account_id}:${module.producer__gateway.api_gateway_id}/*/POST/DocumentReference/_search"]
   kms_key_id             = module.kms__cloudwatch.kms_arn
   environment_variables = {
-    PREFIX               = "${local.prefix}--"
-    ENVIRONMENT          = local.environment
-    AUTH_STORE           = local.auth_store_id
-    POWERTOOLS_LOG_LEVEL = local.log_level
-    SPLUNK_INDEX         = module.firehose__processor.splunk.index
-    TABLE_NAME           = local.pointers_table_name
+    PREFIX                  = "${local.prefix}--"
+    ENVIRONMENT             = local.environment
+    AUTH_STORE              = local.auth_store_id
+    POWERTOOLS_LOG_LEVEL    = local.log_level
+    SPLUNK_INDEX            = module.firehose__processor.splunk.index
+    TABLE_NAME              = local.pointers_table_name
+    PAGE_TOKEN_KEY          = random_password.page_token_key.result
+    CUSTODIAN_INDEX_ENABLED = var.custodian_index_enabled
   }
   additional_policies = [
     local.pointers_table_read_policy_arn,
@@ -277,6 +384,7 @@ module "producer__updateDocumentReference" {
     POWERTOOLS_LOG_LEVEL = local.log_level
     SPLUNK_INDEX         = module.firehose__processor.splunk.index
     TABLE_NAME           = local.pointers_table_name
+    DOCUMENT_ENCODING    = var.document_encoding
   }
   additional_policies = [
     local.pointers_table_read_policy_arn,
@@ -307,6 +415,7 @@ module "producer__upsertDocumentReference" {
     POWERTOOLS_LOG_LEVEL = local.log_level
     SPLUNK_INDEX         = module.firehose__processor.splunk.index
     TABLE_NAME           = local.pointers_table_name
+    DOCUMENT_ENCODING    = var.document_encoding
   }
   additional_policies = [
     local.pointers_table_write_policy_arn,
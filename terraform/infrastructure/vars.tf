@@ -48,3 +48,33 @@ variable "log_retention_period" {
   default = 90
   type    = number
 }
+
+variable "document_encoding" {
+  description = "Encoding producer writes store documents in, json or zlib. Documents in either encoding can always be read"
+  type        = string
+  default     = "json"
+}
+
+variable "custodian_index_enabled" {
+  description = "Serve producer searches from the custodian_gsi index. Set to true in an environment's tfvars only once scripts/backfill_index_keys.py has run against its pointers table"
+  type        = bool
+  default     = false
+}
+
+variable "producer_index_enabled" {
+  description = "Serve the producer _list endpoint from the producer_gsi index. Set to true in an environment's tfvars only once scripts/backfill_index_keys.py has run against its pointers table"
+  type        = bool
+  default     = false
+}
+
+variable "pointer_counts_enabled" {
+  description = "Serve counts from the per-patient pointer counter items. Roll out by deploying with this false, so every write maintains the counters, then running scripts/rebuild_pointer_counters.py against the pointers table, and only then setting this to true in the environment's tfvars"
+  type        = bool
+  default     = false
+}
+
+variable "pointer_cache_max_bytes" {
+  description = "Size of the in-container pointer cache used by consumer readDocumentReference, 0 to disable. Revalidating an entry costs the same read capacity as reading the pointer, so only hits within POINTER_CACHE_REVALIDATE_SECONDS save reads, the rest save CPU"
+  type        = number
+  default     = 0
+}
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+import fire
+from botocore.client import BaseClient
+from moto import mock_aws
+
+from nrlf.core.boto import get_dynamodb_resource
+from nrlf.core.config import Config
+from nrlf.core.constants import PointerTypes
+from nrlf.core.dynamodb.async_repository import AsyncDocumentPointerRepository
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+from nrlf.core.logger import logger
+from nrlf.tests.data import load_document_reference
+from nrlf.tests.dynamodb import create_document_pointer_table
+
+BENCHMARK_ENVIRONMENT = {
+    "AWS_REGION": "eu-west-2",
+    "AWS_DEFAULT_REGION": "eu-west-2",
+    "ENVIRONMENT": "benchmark",
+    "PREFIX": "nrlf",
+    "SPLUNK_INDEX": "logs",
+    "SOURCE": "app",
+    "AUTH_STORE": "auth-store",
+    "TABLE_NAME": "benchmark-document-pointer",
+}
+NHS_NUMBER = "6700028191"
+POINTER_TYPES = [
+    PointerTypes.MENTAL_HEALTH_PLAN.value,
+    PointerTypes.EOL_CARE_PLAN.value,
+    PointerTypes.LLOYD_GEORGE_FOLDER.value,
+]
+
+
+def _with_latency(latency_seconds: float):
+    """
+    Add a fixed round trip time to every AWS call made against moto
+    """
+    make_api_call = BaseClient._make_api_call
+
+    def _make_api_call(self, operation_name, api_params):
+        time.sleep(latency_seconds)
+        return make_api_call(self, operation_name, api_params)
+
+    return patch.object(BaseClient, "_make_api_call", _make_api_call)
+
+
+def _create_pointers(repository: DocumentPointerRepository, count: int):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    for idx in range(count):
+        doc_ref.id = f"Y05868-benchmark-{idx:08d}"
+        repository.create(DocumentPointer.from_document_reference(doc_ref))
+
+
+def _sync_handler(repository: DocumentPointerRepository):
+    repository.get_by_id("Y05868-benchmark-00000000")
+    repository.get_pointer_counts(NHS_NUMBER)
+    for pointer_type in POINTER_TYPES:
+        list(repository.search(NHS_NUMBER, pointer_types=[pointer_type]))
+
+
+async def _async_handler(repository: AsyncDocumentPointerRepository):
+    await asyncio.gather(
+        repository.get_by_id("Y05868-benchmark-00000000"),
+        repository.get_pointer_counts(NHS_NUMBER),
+        *[
+            repository.search(NHS_NUMBER, pointer_types=[pointer_type])
+            for pointer_type in POINTER_TYPES
+        ],
+    )
+
+
+def _time_ms(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main(latency_ms: float = 10, iterations: int = 20, pointers: int = 10):
+    """
+    Compare the latency of a handler making five independent repository calls
+    one after another and gathered with the async repository, against moto
+    with latency_ms added to every call
+    """
+    logger.setLevel("WARNING")
+    for name, value in BENCHMARK_ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+
+    with mock_aws():
+        config = Config()
+        create_document_pointer_table(config, get_dynamodb_resource())
+        repository = DocumentPointerRepository(table_name=config.TABLE_NAME)
+        async_repository = AsyncDocumentPointerRepository(repository)
+        _create_pointers(repository, pointers)
+
+        with _with_latency(latency_ms / 1000):
+            sync_ms = _time_ms(lambda: _sync_handler(repository), iterations)
+            async_ms = _time_ms(
+                lambda: asyncio.run(_async_handler(async_repository)), iterations
+            )
+
+    print("latency ms, sync ms/request, async ms/request, reduction")  # noqa: T201
+    print(  # noqa: T201
+        f"{latency_ms}, {sync_ms:.1f}, {async_ms:.1f}, "
+        f"{(1 - async_ms / sync_ms) * 100:.0f}%"
+    )
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,120 @@
+"""
+Synthetic data for the pytest-benchmark suite
+"""
+
+import math
+import pathlib
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import count
+from typing import Any
+
+from nrlf.core.constants import TYPE_CATEGORIES, Categories, PointerTypes
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.producer.fhir.r4.model import DocumentReference
+from nrlf.tests.data import load_document_reference
+
+ODS_CODE = "Y05868"
+DATA_PATH = pathlib.Path(__file__).parent / "../../data"
+
+# DynamoDB capacity unit sizes
+READ_UNIT_BYTES = 4096
+WRITE_UNIT_BYTES = 1024
+
+
+@dataclass
+class SeededTable:
+    nhs_numbers: list[str]
+    pointer_ids: list[str]
+    # Writes go to a patient outside nhs_numbers, so reads are unaffected
+    writer_nhs_number: str
+
+    @property
+    def nhs_number(self) -> str:
+        return self.nhs_numbers[len(self.nhs_numbers) // 2]
+
+    @property
+    def pointer_id(self) -> str:
+        return self.pointer_ids[len(self.pointer_ids) // 2]
+
+
+_document_ids = count()
+
+
+def build_document_reference(
+    nhs_number: str, pointer_type: str, document_id: str | None = None
+) -> DocumentReference:
+    """
+    Build a DocumentReference for the patient and pointer type, with a new ID
+    unless one is provided
+    """
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    document_id = document_id or f"benchmark-{next(_document_ids):010d}"
+    doc_ref.id = f"{ODS_CODE}-{document_id}"
+    doc_ref.subject.identifier.value = nhs_number
+    doc_ref.type.coding[0].system = PointerTypes(pointer_type).coding_system()
+    doc_ref.type.coding[0].code = PointerTypes(pointer_type).coding_value()
+    category = Categories(TYPE_CATEGORIES[pointer_type])
+    doc_ref.category[0].coding[0].system = category.coding_system()
+    doc_ref.category[0].coding[0].code = category.coding_value()
+    return doc_ref
+
+
+def build_pointer(nhs_number: str, pointer_type: str) -> DocumentPointer:
+    return DocumentPointer.from_document_reference(
+        build_document_reference(nhs_number, pointer_type)
+    )
+
+
+def load_stored_document(path: str) -> str:
+    """
+    Load a DocumentReference from tests/data in the form it is stored in
+    """
+    return DocumentReference.model_validate_json(
+        (DATA_PATH / path).read_text()
+    ).model_dump_json(exclude_none=True)
+
+
+def get_attribute_size(value: Any) -> int:
+    """
+    Returns the size DynamoDB bills for an attribute value
+    """
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, bool) or value is None:
+        return 1
+    if isinstance(value, (int, float, Decimal)):
+        return math.ceil(len(str(value).lstrip("-").replace(".", "")) / 2) + 1
+    if isinstance(value, dict):
+        return 3 + sum(
+            len(key.encode()) + get_attribute_size(item) + 1
+            for key, item in value.items()
+        )
+    return 3 + sum(get_attribute_size(item) + 1 for item in value)
+
+
+def get_item_size(item: dict) -> int:
+    return sum(
+        len(name.encode()) + get_attribute_size(value) for name, value in item.items()
+    )
+
+
+def get_capacity_units(item: dict) -> dict[str, float]:
+    """
+    Returns the capacity units used to write an item, with and without its
+    index entries, and to read it with strongly and eventually consistent reads
+    """
+    item_size = get_item_size(item)
+    read_units = math.ceil(item_size / READ_UNIT_BYTES)
+    write_units = math.ceil(item_size / WRITE_UNIT_BYTES)
+    # Both indexes project all attributes, so each write is billed again per index
+    index_count = 1 + ("masterid_key" in item)
+    return {
+        "item_bytes": item_size,
+        "wcu": write_units,
+        "wcu_with_indexes": write_units * (1 + index_count),
+        "rcu": read_units,
+        "rcu_eventually_consistent": read_units / 2,
+    }
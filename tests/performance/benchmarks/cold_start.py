@@ -0,0 +1,83 @@
+# flake8: noqa
+import os
+import statistics
+import time
+
+import fire
+from moto import mock_aws
+
+from nrlf.core import boto
+from nrlf.core.config import Config
+from nrlf.core.dynamodb.attribute_values import serialize_item
+from nrlf.core.logger import logger
+from nrlf.tests.dynamodb import create_document_pointer_table
+
+BENCHMARK_ENVIRONMENT = {
+    "AWS_REGION": "eu-west-2",
+    "AWS_DEFAULT_REGION": "eu-west-2",
+    "ENVIRONMENT": "benchmark",
+    "PREFIX": "nrlf",
+    "SPLUNK_INDEX": "logs",
+    "SOURCE": "app",
+    "AUTH_STORE": "auth-store",
+    "TABLE_NAME": "benchmark-document-pointer",
+}
+
+
+def _reset_clients():
+    """
+    Drop the shared clients, as if the container had just started
+    """
+    for cached in (
+        boto.get_botocore_config,
+        boto.get_boto3_client,
+        boto.get_boto3_resource,
+        boto.get_dynamodb_table,
+    ):
+        cached.cache_clear()
+
+
+def _first_request(table_name: str):
+    boto.get_dynamodb_client().get_item(
+        TableName=table_name,
+        Key=serialize_item({"pk": "D#Y05868-benchmark", "sk": "D#Y05868-benchmark"}),
+    )
+
+
+def _time_ms(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def _measure(table_name: str, prime: bool) -> tuple[float, float]:
+    _reset_clients()
+    init_ms = _time_ms(lambda: boto.prime_clients(table_name)) if prime else 0
+    return init_ms, _time_ms(lambda: _first_request(table_name))
+
+
+def main(runs: int = 10):
+    """
+    Compare the time spent during init and on the first request of a new
+    container, with and without priming the shared clients
+    """
+    logger.setLevel("WARNING")
+    for name, value in BENCHMARK_ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+
+    table_name = os.environ["TABLE_NAME"]
+    with mock_aws():
+        create_document_pointer_table(Config(), boto.get_dynamodb_resource())
+
+        print("mode, init ms (median), first request ms (median)")
+        for prime in (False, True):
+            results = [_measure(table_name, prime) for _ in range(runs)]
+            print(
+                f"{'primed' if prime else 'unprimed'}, "
+                f"{statistics.median(init for init, _ in results):.1f}, "
+                f"{statistics.median(first for _, first in results):.1f}"
+            )
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
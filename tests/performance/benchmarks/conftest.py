@@ -0,0 +1,91 @@
+"""
+Shared fixtures for the pytest-benchmark suite
+
+The table is seeded once per session with BENCHMARK_PATIENTS patients, each
+holding BENCHMARK_POINTERS_PER_TYPE pointers of every pointer type.
+BENCHMARK_BACKEND selects the repository backend, either the in-memory tables
+(the default, which times the Python hot paths) or DynamoDB emulated by moto.
+DOCUMENT_ENCODING selects how documents are stored, as it does for the API.
+Run with `make test-performance-suite`, which stores the results as JSON for
+comparison between commits, e.g. BENCHMARK_ARGS=--benchmark-compare compares
+against the previous run.
+"""
+
+import os
+import random
+from importlib.util import find_spec
+
+import pytest
+from benchmark_data import SeededTable, build_pointer
+from moto import mock_aws
+from nhs_number import generate
+
+from nrlf.core import boto
+from nrlf.core.config import Config
+from nrlf.core.constants import TYPE_CATEGORIES
+from nrlf.core.dynamodb.memory import (
+    InMemoryDocumentPointerRepository,
+    get_in_memory_dynamodb,
+)
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+from nrlf.core.logger import logger
+from nrlf.tests.dynamodb import create_document_pointer_table
+
+if not find_spec("pytest_benchmark"):
+    collect_ignore_glob = ["test_*.py"]
+
+
+def _create_repository(config: Config) -> DocumentPointerRepository:
+    repository_class = (
+        InMemoryDocumentPointerRepository
+        if config.REPOSITORY_BACKEND == "memory"
+        else DocumentPointerRepository
+    )
+    return repository_class(
+        table_name=config.TABLE_NAME, document_encoding=config.DOCUMENT_ENCODING
+    )
+
+
+@pytest.fixture(scope="session")
+def seeded_table():
+    logger.setLevel("WARNING")
+    patients = int(os.getenv("BENCHMARK_PATIENTS", "100"))
+    pointers_per_type = int(os.getenv("BENCHMARK_POINTERS_PER_TYPE", "2"))
+    backend = os.getenv("BENCHMARK_BACKEND", "memory")
+
+    for cached in (
+        boto.get_boto3_client,
+        boto.get_boto3_resource,
+        boto.get_dynamodb_table,
+    ):
+        cached.cache_clear()
+
+    get_in_memory_dynamodb().reset()
+
+    with mock_aws(), pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("REPOSITORY_BACKEND", backend)
+        config = Config()
+        create_document_pointer_table(config, boto.get_dynamodb_resource())
+        repository = _create_repository(config)
+
+        random.seed(0)
+        writer_nhs_number, *nhs_numbers = generate(quantity=patients + 1)
+        nhs_numbers = sorted(set(nhs_numbers) - {writer_nhs_number})
+        pointers = [
+            build_pointer(nhs_number, pointer_type)
+            for nhs_number in nhs_numbers
+            for pointer_type in TYPE_CATEGORIES
+            for _ in range(pointers_per_type)
+        ]
+        repository.create_many(pointers)
+
+        yield SeededTable(
+            nhs_numbers=nhs_numbers,
+            pointer_ids=[pointer.id for pointer in pointers],
+            writer_nhs_number=writer_nhs_number,
+        )
+
+
+@pytest.fixture
+def repository(seeded_table: SeededTable) -> DocumentPointerRepository:
+    return _create_repository(Config())
@@ -0,0 +1,53 @@
+# flake8: noqa
+import time
+from decimal import Decimal
+
+import fire
+
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.core.logger import logger
+from nrlf.tests.data import load_document_reference
+
+
+def _build_items(size: int) -> list[dict]:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    items = []
+    for idx in range(size):
+        doc_ref.id = f"Y05868-benchmark-{idx:08d}"
+        item = DocumentPointer.from_document_reference(doc_ref).model_dump()
+        item["version"] = Decimal(item["version"])
+        items.append(item)
+
+    return items
+
+
+def _time_hydration(items: list[dict], strict: bool) -> float:
+    start = time.process_time()
+    for item in items:
+        DocumentPointer.from_dynamo(item, strict=strict)
+
+    return time.process_time() - start
+
+
+def main(sizes: tuple[int, ...] = (1000, 10000)):
+    """
+    Compare the CPU time per item of trusted and strict DocumentPointer hydration
+    """
+    logger.setLevel("WARNING")
+    if isinstance(sizes, int):
+        sizes = (sizes,)
+
+    print("items, strict us/item, trusted us/item, reduction")
+    for size in sizes:
+        items = _build_items(size)
+        strict_time = _time_hydration(items, strict=True)
+        trusted_time = _time_hydration(items, strict=False)
+
+        print(
+            f"{size}, {strict_time / size * 1e6:.1f}, {trusted_time / size * 1e6:.1f}, "
+            f"{(1 - trusted_time / strict_time) * 100:.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,60 @@
+import pytest
+from benchmark_data import get_capacity_units, load_stored_document
+
+from nrlf.core.dynamodb.codec import decode_document, encode_document
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.tests.data import load_document_reference
+
+# The first sample is one of those the dictionary was trained on, the second
+# is a real producer's document that it was not
+SAMPLES = [
+    "DocumentReference/Y05868-736253002-Valid.json",
+    "bars/2_bars_sample_fhir_compliant.json",
+]
+ENCODINGS = ["json", "zlib"]
+
+
+def _record_storage(benchmark, document: str, encoding: str):
+    """
+    Add the stored size and capacity units of a pointer holding the document
+    to the benchmark results
+    """
+    pointer = DocumentPointer.from_document_reference(
+        load_document_reference("Y05868-736253002-Valid")
+    )
+    encoded = encode_document(document, encoding)
+    item = {**pointer.model_dump(), "document": encoded}
+
+    benchmark.extra_info.update(
+        {
+            "document_bytes": len(document.encode()),
+            "stored_document_bytes": len(
+                encoded.encode() if isinstance(encoded, str) else encoded
+            ),
+            **get_capacity_units(item),
+        }
+    )
+    benchmark.extra_info["compression_ratio"] = round(
+        benchmark.extra_info["document_bytes"]
+        / benchmark.extra_info["stored_document_bytes"],
+        2,
+    )
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_encode_document(benchmark, sample: str, encoding: str):
+    document = load_stored_document(sample)
+    _record_storage(benchmark, document, encoding)
+
+    benchmark(encode_document, document, encoding)
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_decode_document(benchmark, sample: str, encoding: str):
+    document = load_stored_document(sample)
+    encoded = encode_document(document, encoding)
+    _record_storage(benchmark, document, encoding)
+
+    assert benchmark(decode_document, encoded) == document
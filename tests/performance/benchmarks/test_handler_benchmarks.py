@@ -0,0 +1,253 @@
+import json
+
+from benchmark_data import (
+    SeededTable,
+    build_document_reference,
+    build_pointer,
+)
+from nhs_number import generate
+
+from api.consumer.countDocumentReference.count_document_reference import (
+    handler as consumer_count,
+)
+from api.consumer.readDocumentReference.read_document_reference import (
+    handler as consumer_read,
+)
+from api.consumer.searchDocumentReference.search_document_reference import (
+    handler as consumer_search,
+)
+from api.consumer.searchPostDocumentReference.search_post_document_reference import (
+    handler as consumer_search_post,
+)
+from api.consumer.status.status import handler as consumer_status
+from api.producer.bulkDeleteDocumentReference.bulk_delete_document_reference import (
+    handler as producer_bulk_delete,
+)
+from api.producer.createDocumentReference.create_document_reference import (
+    handler as producer_create,
+)
+from api.producer.deleteDocumentReference.delete_document_reference import (
+    handler as producer_delete,
+)
+from api.producer.processTransaction.process_transaction import (
+    handler as producer_process_transaction,
+)
+from api.producer.readDocumentReference.read_document_reference import (
+    handler as producer_read,
+)
+from api.producer.searchDocumentReference.search_document_reference import (
+    handler as producer_search,
+)
+from api.producer.searchPostDocumentReference.search_post_document_reference import (
+    handler as producer_search_post,
+)
+from api.producer.status.status import handler as producer_status
+from api.producer.updateDocumentReference.update_document_reference import (
+    handler as producer_update,
+)
+from api.producer.upsertDocumentReference.upsert_document_reference import (
+    handler as producer_upsert,
+)
+from nrlf.core.constants import (
+    PERMISSION_ALLOW_ALL_POINTER_TYPES,
+    TYPE_CATEGORIES,
+    PointerTypes,
+)
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+from nrlf.tests.events import (
+    create_headers,
+    create_mock_context,
+    create_test_api_gateway_event,
+)
+
+POINTER_TYPE = PointerTypes.MENTAL_HEALTH_PLAN.value
+HEADERS = create_headers(nrl_permissions=[PERMISSION_ALLOW_ALL_POINTER_TYPES])
+TRANSACTION_SIZE = 10
+
+
+def _subject_identifier(nhs_number: str) -> str:
+    return f"https://fhir.nhs.uk/Id/nhs-number|{nhs_number}"
+
+
+def _create_context():
+    context = create_mock_context()
+    context.get_remaining_time_in_millis.return_value = 30000
+    return context
+
+
+def _invoke(benchmark, handler, status_code: str = "200", setup=None, **event_kwargs):
+    """
+    Time a handler end to end with a synthetic API Gateway event. When setup is
+    provided it is called before every round and returns the event arguments.
+    """
+    context = _create_context()
+
+    if setup is None:
+        event = create_test_api_gateway_event(headers=HEADERS, **event_kwargs)
+        result = benchmark(handler, event, context)
+    else:
+        result = benchmark.pedantic(
+            handler,
+            setup=lambda: (
+                (create_test_api_gateway_event(headers=HEADERS, **setup()), context),
+                {},
+            ),
+            rounds=100,
+        )
+
+    assert result["statusCode"] == status_code, result["body"]
+
+
+def test_consumer_read(benchmark, seeded_table: SeededTable):
+    _invoke(benchmark, consumer_read, path_parameters={"id": seeded_table.pointer_id})
+
+
+def test_consumer_count(benchmark, seeded_table: SeededTable):
+    _invoke(
+        benchmark,
+        consumer_count,
+        query_string_parameters={
+            "subject:identifier": _subject_identifier(seeded_table.nhs_number)
+        },
+    )
+
+
+def test_consumer_search(benchmark, seeded_table: SeededTable):
+    _invoke(
+        benchmark,
+        consumer_search,
+        query_string_parameters={
+            "subject:identifier": _subject_identifier(seeded_table.nhs_number)
+        },
+    )
+
+
+def test_consumer_search_post(benchmark, seeded_table: SeededTable):
+    _invoke(
+        benchmark,
+        consumer_search_post,
+        body=json.dumps(
+            {"subject:identifier": _subject_identifier(seeded_table.nhs_number)}
+        ),
+    )
+
+
+def test_consumer_status(benchmark, seeded_table: SeededTable):
+    _invoke(benchmark, consumer_status)
+
+
+def test_producer_read(benchmark, seeded_table: SeededTable):
+    _invoke(benchmark, producer_read, path_parameters={"id": seeded_table.pointer_id})
+
+
+def test_producer_search(benchmark, seeded_table: SeededTable):
+    _invoke(
+        benchmark,
+        producer_search,
+        query_string_parameters={
+            "subject:identifier": _subject_identifier(seeded_table.nhs_number)
+        },
+    )
+
+
+def test_producer_search_post(benchmark, seeded_table: SeededTable):
+    _invoke(
+        benchmark,
+        producer_search_post,
+        body=json.dumps(
+            {"subject:identifier": _subject_identifier(seeded_table.nhs_number)}
+        ),
+    )
+
+
+def test_producer_status(benchmark, seeded_table: SeededTable):
+    _invoke(benchmark, producer_status)
+
+
+def test_producer_create(benchmark, seeded_table: SeededTable):
+    doc_ref = build_document_reference(seeded_table.writer_nhs_number, POINTER_TYPE)
+
+    _invoke(
+        benchmark,
+        producer_create,
+        status_code="201",
+        body=doc_ref.model_dump_json(exclude_none=True),
+    )
+
+
+def test_producer_update(
+    benchmark, repository: DocumentPointerRepository, seeded_table: SeededTable
+):
+    doc_ref = build_document_reference(seeded_table.writer_nhs_number, POINTER_TYPE)
+    repository.create(DocumentPointer.from_document_reference(doc_ref))
+
+    _invoke(
+        benchmark,
+        producer_update,
+        path_parameters={"id": doc_ref.id},
+        body=doc_ref.model_dump_json(exclude_none=True),
+    )
+
+
+def test_producer_upsert(benchmark, seeded_table: SeededTable):
+    def setup():
+        doc_ref = build_document_reference(seeded_table.writer_nhs_number, POINTER_TYPE)
+        return {"body": doc_ref.model_dump_json(exclude_none=True)}
+
+    _invoke(benchmark, producer_upsert, status_code="201", setup=setup)
+
+
+def test_producer_delete(
+    benchmark, repository: DocumentPointerRepository, seeded_table: SeededTable
+):
+    def setup():
+        pointer = repository.create(
+            build_pointer(seeded_table.writer_nhs_number, POINTER_TYPE)
+        )
+        return {"path_parameters": {"id": pointer.id}}
+
+    _invoke(benchmark, producer_delete, setup=setup)
+
+
+def test_producer_bulk_delete(
+    benchmark, repository: DocumentPointerRepository, seeded_table: SeededTable
+):
+    def setup():
+        (nhs_number,) = generate()
+        repository.create_many(
+            [
+                build_pointer(nhs_number, pointer_type)
+                for pointer_type in TYPE_CATEGORIES
+            ]
+        )
+        return {
+            "query_string_parameters": {
+                "subject:identifier": _subject_identifier(nhs_number)
+            }
+        }
+
+    _invoke(benchmark, producer_bulk_delete, setup=setup)
+
+
+def test_producer_process_transaction(benchmark, seeded_table: SeededTable):
+    doc_ref = build_document_reference(seeded_table.writer_nhs_number, POINTER_TYPE)
+    resource = doc_ref.model_dump(exclude_none=True)
+
+    _invoke(
+        benchmark,
+        producer_process_transaction,
+        body=json.dumps(
+            {
+                "resourceType": "Bundle",
+                "type": "batch",
+                "entry": [
+                    {
+                        "resource": resource,
+                        "request": {"method": "POST", "url": "DocumentReference"},
+                    }
+                ]
+                * TRANSACTION_SIZE,
+            }
+        ),
+    )
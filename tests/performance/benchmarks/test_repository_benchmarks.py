@@ -0,0 +1,62 @@
+from benchmark_data import SeededTable, build_pointer
+
+from nrlf.core.constants import PointerTypes
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+
+POINTER_TYPE = PointerTypes.MENTAL_HEALTH_PLAN.value
+
+
+def test_search(
+    benchmark, repository: DocumentPointerRepository, seeded_table: SeededTable
+):
+    results = benchmark(
+        lambda: list(repository.search(seeded_table.nhs_number, pointer_types=[]))
+    )
+
+    assert results
+
+
+def test_search_by_type(
+    benchmark, repository: DocumentPointerRepository, seeded_table: SeededTable
+):
+    results = benchmark(
+        lambda: list(
+            repository.search(seeded_table.nhs_number, pointer_types=[POINTER_TYPE])
+        )
+    )
+
+    assert results
+
+
+def test_count_by_nhs_number(
+    benchmark, repository: DocumentPointerRepository, seeded_table: SeededTable
+):
+    assert benchmark(repository.count_by_nhs_number, seeded_table.nhs_number) > 0
+
+
+def test_get_by_id(
+    benchmark, repository: DocumentPointerRepository, seeded_table: SeededTable
+):
+    assert benchmark(repository.get_by_id, seeded_table.pointer_id) is not None
+
+
+def test_create(
+    benchmark, repository: DocumentPointerRepository, seeded_table: SeededTable
+):
+    def setup():
+        return (build_pointer(seeded_table.writer_nhs_number, POINTER_TYPE),), {}
+
+    benchmark.pedantic(repository.create, setup=setup, rounds=100)
+
+
+def test_supersede(
+    benchmark, repository: DocumentPointerRepository, seeded_table: SeededTable
+):
+    def setup():
+        existing = repository.create(
+            build_pointer(seeded_table.writer_nhs_number, POINTER_TYPE)
+        )
+        pointer = build_pointer(seeded_table.writer_nhs_number, POINTER_TYPE)
+        return (pointer, [existing.id]), {}
+
+    benchmark.pedantic(repository.supersede, setup=setup, rounds=100)
@@ -0,0 +1,57 @@
+import pytest
+from benchmark_data import build_pointer
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from nrlf.core.constants import PointerTypes
+from nrlf.core.dynamodb.attribute_values import (
+    deserialize_document_pointer,
+    serialize_document_pointer,
+)
+
+POINTER_TYPE = PointerTypes.MENTAL_HEALTH_PLAN.value
+NHS_NUMBER = "9278693472"
+
+# The boto3 resource layer (de)serialisation the repository used before
+# moving to the low-level client, as a baseline for the pointer codec
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _serialize_with_boto3(item: dict) -> dict:
+    return {name: _serializer.serialize(value) for name, value in item.items()}
+
+
+def _deserialize_with_boto3(item: dict) -> dict:
+    return {name: _deserializer.deserialize(value) for name, value in item.items()}
+
+
+SERIALIZERS = {
+    "codec": serialize_document_pointer,
+    "boto3": _serialize_with_boto3,
+}
+DESERIALIZERS = {
+    "codec": deserialize_document_pointer,
+    "boto3": _deserialize_with_boto3,
+}
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS)
+def test_write_pointer(benchmark, serializer: str):
+    """
+    Time converting a dumped pointer to the AttributeValues written to DynamoDB
+    """
+    item = build_pointer(NHS_NUMBER, POINTER_TYPE).model_dump()
+
+    assert benchmark(SERIALIZERS[serializer], item) == _serialize_with_boto3(item)
+
+
+@pytest.mark.parametrize("deserializer", DESERIALIZERS)
+def test_read_pointer(benchmark, deserializer: str):
+    """
+    Time converting the AttributeValues read from DynamoDB to the values a
+    pointer is created from
+    """
+    values = build_pointer(NHS_NUMBER, POINTER_TYPE).model_dump()
+    item = _serialize_with_boto3(values)
+
+    assert benchmark(DESERIALIZERS[deserializer], item) == values